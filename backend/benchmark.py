@@ -0,0 +1,246 @@
+"""
+benchmark.py — 합성 데이터 규모별 로딩·필터·그래프·지표·API 성능을 측정합니다.
+
+핵심 설계 결정:
+  - 규모마다 synthetic_data.py로 DATA_DIR를 만들고, 별도 프로세스에서 측정합니다.
+    (DATA_DIR는 import 시점에 고정되고, 전역 캐시가 규모 간에 섞이지 않도록 격리)
+  - API는 라우트 함수를 직접 호출한 뒤 JSON 인코딩까지 포함해 측정합니다.
+    (async 라우트는 asyncio.run으로 결과까지 기다림)
+  - 자식 프로세스는 입장 제어를 끄고 실행합니다 (ADMISSION_CONTROL=0 — 503으로 거절된 요청이
+    정상 응답처럼 측정되지 않도록, 계산 비용 자체를 잼).
+  - 결과는 JSON으로 기록하고, --compare로 이전 결과 대비 회귀를 검사합니다 (회귀 시 종료 코드 1).
+
+실행 방법 (backend 디렉토리에서):
+    python benchmark.py --sizes 1000,10000,50000 --output bench_results.json
+    python benchmark.py --sizes 1000,10000 --output new.json --compare bench_results.json --threshold 1.25
+    python benchmark.py --sizes 200000 --skip "metrics.individual*,api.metrics/individual*"
+"""
+import argparse
+import asyncio
+import fnmatch
+import inspect
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# 이보다 짧은 구간은 측정 잡음이 커서 회귀 판정에서 제외 (ms)
+MIN_COMPARABLE_MS = 5.0
+
+
+# ══════════════════════════════════════════════
+#  측정 (규모별 자식 프로세스에서 실행)
+# ══════════════════════════════════════════════
+
+def _run_size(data_dir: str, years: list[int], repeat: int, skip: list[str]) -> dict:
+    """하나의 DATA_DIR에 대해 모든 단계를 측정합니다. (DATA_DIR 환경변수가 설정된 상태)"""
+    sys.path.insert(0, BACKEND_DIR)
+    from fastapi.encoders import jsonable_encoder
+    from services import data_loader
+    from services.network_builder import build_graph
+    from services.metrics_calculator import (
+        calculate_system_health_metrics,
+        calculate_individual_metrics,
+        compute_individual_metric_table,
+        calculate_subgroup_metrics,
+        calculate_dynamic_benchmarks,
+    )
+    from services.feedback_analyzer import calculate_feedback_metrics
+    from routers import network as api
+
+    timings: dict[str, dict] = {}
+
+    def measure(name: str, fn, runs: int = repeat):
+        if any(fnmatch.fnmatch(name, pattern) for pattern in skip):
+            return None
+        samples, result = [], None
+        for _ in range(runs):
+            started = time.perf_counter()
+            result = fn()
+            samples.append((time.perf_counter() - started) * 1000)
+        timings[name] = {
+            "runs": [round(s, 3) for s in samples],
+            "median_ms": round(statistics.median(samples), 3),
+            "min_ms": round(min(samples), 3),
+        }
+        print(f"  {name:<40} {timings[name]['median_ms']:>10.1f} ms", flush=True)
+        return result
+
+    latest = max(years)
+
+    # ── 1. 로딩 (콜드: 캐시가 비어 있는 첫 호출만 의미 있음) ──
+    for year in years:
+        measure(f"load.qualitative.{year}", lambda y=year: data_loader.load_qualitative_data(y), runs=1)
+    measure("load.hr", data_loader.load_hr_master_data, runs=1)
+    measure("load.preload_all_data", data_loader.preload_all_data, runs=1)
+    measure("load.prepare_combined.all_years", lambda: data_loader.prepare_combined_network_data(years), runs=1)
+
+    raw_edges, all_nodes = data_loader.prepare_combined_network_data([latest])
+    largest_org1 = all_nodes['ORG1_OP'].value_counts().index[0]
+    largest_org2 = all_nodes['ORG2_OP'].value_counts().index[0]
+
+    # ── 2. 필터 ──
+    nodes, edges = measure(
+        "filter.all",
+        lambda: data_loader.filter_network_data(all_nodes, raw_edges, [], [], [], [])
+    )
+    measure("filter.org1", lambda: data_loader.filter_network_data(all_nodes, raw_edges, [largest_org1], [], [], []))
+
+    # ── 3. 그래프 + 지표 (전체 조직, 최신 연도) ──
+    G = measure("build_graph", lambda: build_graph(nodes, edges))
+    measure("metrics.system_health", lambda: calculate_system_health_metrics(G, nodes, edges))
+    measure("metrics.individual", lambda: calculate_individual_metrics(G, nodes, edges))
+    measure("metrics.individual_table", lambda: compute_individual_metric_table(G, nodes, edges))
+    measure("metrics.subgroup.ORG1_OP", lambda: calculate_subgroup_metrics(nodes, edges, G, "ORG1_OP"))
+    measure("metrics.subgroup.ORG2_OP", lambda: calculate_subgroup_metrics(nodes, edges, G, "ORG2_OP"))
+    measure("metrics.feedback", lambda: calculate_feedback_metrics(raw_edges, all_nodes, nodes))
+
+    history = {}
+    for year in years:
+        e, n = data_loader.prepare_combined_network_data([year])
+        if n is not None:
+            yn, ye = data_loader.filter_network_data(n, e, [], [], [], [])
+            history[year] = calculate_system_health_metrics(build_graph(yn, ye), yn, ye)
+    measure("metrics.dynamic_benchmarks", lambda: calculate_dynamic_benchmarks(history))
+
+    # ── 4. API 엔드포인트 (라우트 함수 + JSON 인코딩) ──
+    def call(fn, *args):
+        if inspect.iscoroutinefunction(fn):
+            return lambda: json.dumps(jsonable_encoder(asyncio.run(fn(*args))), ensure_ascii=False)
+        return lambda: json.dumps(jsonable_encoder(fn(*args)), ensure_ascii=False)
+
+    scenarios = {
+        "all": api.FilterRequest(years=[latest]),
+        "org1": api.FilterRequest(years=[latest], orgs1=[largest_org1]),
+        "org2": api.FilterRequest(years=[latest], orgs2=[largest_org2]),
+        "all_years": api.FilterRequest(years=years),
+    }
+    measure("api.filter-options", call(api.api_filter_options, ",".join(map(str, years)), ""))
+    measure("api.filter-options.cascade", call(api.api_filter_options, str(latest), largest_org1))
+    for label, req in scenarios.items():
+        sub_req = api.SubgroupRequest(**req.model_dump(), group_col="ORG2_OP")
+        measure(f"api.network.{label}", call(api.api_network, req))
+        measure(f"api.metrics/organization.{label}", call(api.api_org_metrics, req))
+        measure(f"api.metrics/individual.{label}", call(api.api_individual_metrics, req))
+        measure(f"api.metrics/subgroup.{label}", call(api.api_subgroup_metrics, sub_req))
+        measure(f"api.metrics/feedback.{label}", call(api.api_feedback_metrics, req))
+
+    return {
+        "counts": {
+            "nodes": int(len(nodes)),
+            "edges": int(len(edges)),
+            "all_years_rows": int(sum(len(df) for df in data_loader.get_loaded_data()[0].values() if df is not None)),
+        },
+        "timings": timings,
+    }
+
+
+# ══════════════════════════════════════════════
+#  회귀 비교
+# ══════════════════════════════════════════════
+
+def compare_results(baseline: dict, current: dict, threshold: float) -> list[str]:
+    """baseline 대비 median이 threshold배를 넘은 항목을 반환합니다."""
+    regressions = []
+    for size, result in current["results"].items():
+        base = baseline.get("results", {}).get(size)
+        if not base:
+            continue
+        for name, stat in result["timings"].items():
+            base_stat = base["timings"].get(name)
+            if not base_stat or base_stat["median_ms"] < MIN_COMPARABLE_MS:
+                continue
+            ratio = stat["median_ms"] / base_stat["median_ms"]
+            if ratio > threshold:
+                regressions.append(
+                    f"[{size}] {name}: {base_stat['median_ms']:.1f} → {stat['median_ms']:.1f} ms (x{ratio:.2f})"
+                )
+    return regressions
+
+
+# ══════════════════════════════════════════════
+#  진입점
+# ══════════════════════════════════════════════
+
+def main():
+    parser = argparse.ArgumentParser(description="동료평가 분석기 성능 벤치마크")
+    parser.add_argument("--sizes", default="1000,10000", help="연도별 인원 규모 (쉼표 구분, 1,000 ~ 200,000)")
+    parser.add_argument("--years", default="2023,2024,2025")
+    parser.add_argument("--repeat", type=int, default=3, help="웜 단계 반복 횟수")
+    parser.add_argument("--data-root", default=os.path.join(tempfile.gettempdir(), "peer_eval_bench"),
+                        help="규모별 합성 데이터 보관 경로 (이미 있으면 재사용)")
+    parser.add_argument("--skip", default="", help="건너뛸 측정 이름 패턴 (쉼표 구분, fnmatch)")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON")
+    parser.add_argument("--threshold", type=float, default=1.25, help="회귀 판정 배율")
+    # 내부용: 규모별 자식 프로세스
+    parser.add_argument("--run-size", help=argparse.SUPPRESS)
+    parser.add_argument("--result-file", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    years = [int(y) for y in args.years.split(",") if y.strip()]
+    skip = [p.strip() for p in args.skip.split(",") if p.strip()]
+
+    if args.run_size:
+        result = _run_size(os.environ["DATA_DIR"], years, args.repeat, skip)
+        with open(args.result_file, "w", encoding="utf-8") as f:
+            json.dump(result, f)
+        return
+
+    sys.path.insert(0, BACKEND_DIR)
+    from synthetic_data import generate_dataset, write_dataset
+
+    report = {
+        "meta": {
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "years": years,
+            "repeat": args.repeat,
+        },
+        "results": {},
+    }
+    for size in [int(s) for s in args.sizes.split(",") if s.strip()]:
+        data_dir = os.path.join(args.data_root, f"n{size}_{'-'.join(map(str, years))}")
+        if not os.path.exists(os.path.join(data_dir, "00.HR기본정보.xlsx")):
+            print(f"[INFO] 합성 데이터 생성: {size}명 → {data_dir}")
+            write_dataset(data_dir, *generate_dataset(size, years))
+
+        print(f"[INFO] 벤치마크 실행: {size}명")
+        with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as tmp:
+            result_file = tmp.name
+        try:
+            subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--run-size", str(size), "--result-file", result_file,
+                 "--years", args.years, "--repeat", str(args.repeat), "--skip", args.skip],
+                env={**os.environ, "DATA_DIR": data_dir, "ADMISSION_CONTROL": "0"}, cwd=BACKEND_DIR, check=True,
+            )
+            with open(result_file, encoding="utf-8") as f:
+                report["results"][str(size)] = json.load(f)
+        finally:
+            os.remove(result_file)
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"[INFO] 결과 기록: {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare_results(baseline, report, args.threshold)
+        if regressions:
+            print(f"[WARN] 성능 회귀 {len(regressions)}건 (기준 x{args.threshold}):")
+            for line in regressions:
+                print(f"  ⚠️ {line}")
+            sys.exit(1)
+        print("  ✓ 성능 회귀 없음")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,7 @@ config.py — 전체 설정값을 한 곳에서 관리합니다.
 Why: 하드코딩된 경로/상수를 분산시키면 유지보수가 어려워지므로 중앙 집중 관리합니다.
 """
 import os
+import tempfile
 
 # 데이터 디렉토리 경로
 DATA_DIR = os.environ.get(
@@ -29,3 +30,92 @@ TOP_PERCENT = 0.10  # 10%
 # Betweenness Centrality 샘플링 임계값 (노드 수 초과 시 샘플링)
 BETWEENNESS_SAMPLING_THRESHOLD = 500
 BETWEENNESS_SAMPLE_SIZE = 100
+
+# 백그라운드 잡 (장시간 분석용)
+JOB_WORKERS = 2                # 동시에 실행할 잡 수
+JOB_RESULT_TTL_SEC = 600       # 완료된 잡 결과 보관 시간 (초)
+
+# CPU 집약 분석용 프로세스 풀 (개인 지표 테이블, 하위 조직 비교, 피드백, 큐브 밖 조직 지표)
+# Why: 지표 계산은 GIL 때문에 스레드로는 한 코어에 직렬화되므로, 미리 띄운 프로세스에서 실행합니다.
+#      0이면 풀을 쓰지 않고 요청 프로세스에서 계산합니다. (uvicorn --workers N이면 워커마다 풀이 생기므로 줄여서 설정)
+COMPUTE_WORKERS = int(os.environ.get("COMPUTE_WORKERS", os.cpu_count() or 1))
+COMPUTE_POOL_START_TIMEOUT_SEC = 120  # 워커 초기화(데이터 설치) 대기 한도 — 넘으면 풀 없이 동작
+
+# 분석 요청 입장 제어 (admission control): 계산 전에 추정한 비용(노드 수 + 엣지 수)으로 등급을 나누고,
+# 등급별 동시 실행 수를 제한합니다. 대기열이 차면 기다리게 하지 않고 503 + Retry-After로 바로 응답합니다.
+ADMISSION_ENABLED = os.environ.get("ADMISSION_CONTROL", "1") == "1"
+ADMISSION_LIGHT_COST = 5_000       # 이 미만(팀·실 단위)은 제한 없이 바로 실행
+ADMISSION_HEAVY_COST = 50_000      # 이 이상(전사·여러 본부)은 heavy 등급
+ADMISSION_SLOTS = {"medium": max(2, COMPUTE_WORKERS), "heavy": max(1, COMPUTE_WORKERS // 2)}  # 등급별 동시 실행 수
+ADMISSION_QUEUE = {"medium": 16, "heavy": 4}   # 등급별 대기열 길이 (가득 차면 즉시 503)
+ADMISSION_MAX_WAIT_SEC = 20        # 대기열에서 기다리는 최대 시간 (넘으면 503)
+ADMISSION_RETRY_AFTER_MAX_SEC = 60
+
+# 멀티 워커 공유 데이터 모드
+# Why: uvicorn --workers N 실행 시 워커마다 엑셀을 다시 읽지 않고,
+#      로더 프로세스가 만든 Arrow IPC 파일을 읽기 전용 memory-map으로 공유합니다.
+SHARED_DATA_DIR = os.environ.get("SHARED_DATA_DIR", "")
+SHARED_DATA_POLL_SEC = 5       # 새 버전(CURRENT 파일) 확인 주기 (초)
+SHARED_DATA_KEEP_VERSIONS = 2  # 보관할 이전 버전 수 (워커가 매핑 중일 수 있음)
+
+# 성능 계측 (Server-Timing 헤더 + /api/debug/perf)
+PERF_WINDOW = 500              # 엔드포인트·단계별 최근 N개 요청으로 백분위 계산
+PERF_BUCKETS_MS = [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+# 요청 단위 cProfile 캡처 허용 여부 (X-Profile: 1 헤더 또는 ?profile=1)
+PERF_PROFILING_ENABLED = os.environ.get("PERF_PROFILING", "0") == "1"
+PERF_PROFILE_KEEP = 20         # 보관할 최근 프로파일 수
+# 상태를 바꾸는 운영 엔드포인트(/api/debug/caches/evict, /warm) 허용 여부 — 기본은 막음
+# Why: 운영 중(평가 기간) API에 접근할 수 있는 누구나 워밍된 캐시를 비울 수 있으면 안 됨
+DEBUG_ADMIN_ENABLED = os.environ.get("DEBUG_ADMIN", "0") == "1"
+
+# 캐시 크기 제한 (LRU 축출)
+COMBINED_CACHE_MAX_ENTRIES = 32  # 연도 조합별 결합 데이터 캐시
+
+# 전체 명단 내보내기 (CSV/Parquet 스트리밍)
+EXPORT_CHUNK_ROWS = 5000       # 청크(=Parquet row group)당 행 수
+
+# 개인 지표 테이블 (필터별 캐시 + 정렬/페이지 조회)
+PERSON_TABLE_CACHE_MAX_ENTRIES = 64  # 필터 조합별 테이블 캐시
+PERSON_QUERY_MAX_LIMIT = 1000        # 한 번에 조회 가능한 최대 행 수
+
+# 연도 간 평가 관계 변화 (churn) 캐시
+CHURN_CACHE_MAX_ENTRIES = 64   # 코드표 + 연도별 쌍 키 + 연도 쌍 결과 + 연속 유지 결과
+
+# 조직 계층 트리 (필터 캐스케이드용, 연도 조합별 캐시 + ETag)
+ORG_TREE_CACHE_MAX_ENTRIES = 32
+
+# 필터별 연도 추세 (/api/metrics/trend) — (연도 + 필터)별 지표 캐시
+TREND_CACHE_MAX_ENTRIES = 256  # 연도 수 × 필터 조합 (추세 요청끼리 겹치는 연도는 재사용)
+
+# 에고 네트워크 (연도별 인접 인덱스에서 k-hop 조회)
+EGO_MAX_HOPS = 3               # 허용 최대 hop 수
+EGO_MAX_NODES = 2000           # 응답 노드 상한 (2-hop 이상에서 초과 시 그 hop부터 생략, truncated 표시)
+
+# 인원 검색 자동완성 (/api/search — 사번 접두 + 이름 n-gram 인덱스)
+SEARCH_DEFAULT_LIMIT = 10
+SEARCH_MAX_LIMIT = 50
+
+# 엑셀 로딩 엔진 (필요한 컬럼만 스트리밍으로 읽기)
+# auto: python-calamine이 설치되어 있으면 사용, 없으면 xml(시트 XML iterparse 스트리밍)
+#       xml 엔진이 파일을 읽지 못하면 openpyxl read-only 스트리밍으로 다시 읽음
+# 알 수 없는 값은 경고 후 auto로 처리
+EXCEL_ENGINE = os.environ.get("EXCEL_ENGINE", "auto")   # auto | calamine | xml | openpyxl
+
+# 쿼리 엔진 (선택): DuckDB로 연도별 Parquet 파티션에 필터·조직 결합·집계를 쿼리로 실행
+# auto: duckdb가 설치되어 있으면 사용, 없으면 pandas (pandas는 항상 대체 경로로 남음)
+QUERY_ENGINE = os.environ.get("QUERY_ENGINE", "auto")   # auto | duckdb | pandas
+QUERY_ENGINE_DIR = os.environ.get("QUERY_ENGINE_DIR", os.path.join(tempfile.gettempdir(), "peer-eval-query-engine"))
+QUERY_ENGINE_THREADS = int(os.environ.get("QUERY_ENGINE_THREADS", os.cpu_count() or 1))
+QUERY_ENGINE_MEMORY_LIMIT = os.environ.get("QUERY_ENGINE_MEMORY_LIMIT", "2GB")  # 넘으면 임시 디렉토리로 spill (out-of-core)
+QUERY_ENGINE_KEEP_VERSIONS = 2   # 보관할 이전 데이터 버전 파티션 수 (풀 워커가 읽는 중일 수 있음)
+
+# 웜 스냅샷: 워밍업이 끝난 상태(정규화 테이블, 결합 노드, 벤치마크, 인덱스)를 파일로 저장해 두고,
+# 재시작 시 원본 파일 지문과 코드가 같으면 한 번에 복원합니다 (엑셀 파싱·결합·벤치마크 계산 생략)
+# ★ 기본 위치는 서버 사용자의 홈 아래(다른 사용자가 쓸 수 없는 경로) — 공유 임시 디렉토리에 두지 않음
+#   (스냅샷은 pickle이라 다른 사용자가 심어 둔 파일을 읽으면 서버 권한으로 코드가 실행될 수 있음)
+WARM_SNAPSHOT_ENABLED = os.environ.get("WARM_SNAPSHOT", "1") == "1"
+WARM_SNAPSHOT_PATH = os.environ.get(
+    "WARM_SNAPSHOT_PATH", os.path.join(os.path.expanduser("~"), ".cache", "peer-eval", "warm-snapshot.pkl")
+)
+# 스냅샷 인증 키 (HMAC-SHA256) — 비워 두면 스냅샷 옆 "<경로>.key" 파일을 만들어 사용 (권한 0600)
+WARM_SNAPSHOT_KEY = os.environ.get("WARM_SNAPSHOT_KEY", "")
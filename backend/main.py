@@ -4,11 +4,18 @@ main.py — FastAPI 서버 진입점
 실행 방법:
     uvicorn main:app --reload --port 8000
 
+멀티 워커 (공유 데이터 모드):
+    python -m services.shared_store --out <공유 경로>
+    SHARED_DATA_DIR=<공유 경로> uvicorn main:app --workers 4 --port 8000
+
 핵심 설계 결정:
   - startup 이벤트에서 데이터를 미리 로드하여 첫 요청 지연을 방지합니다.
+  - 원본이 바뀌지 않았으면 이전 실행의 웜 스냅샷(정규화 테이블·결합 데이터·벤치마크·인덱스)을 한 번에 복원합니다.
+  - CPU 집약 분석용 프로세스 풀(COMPUTE_WORKERS)도 startup에서 띄워 워커마다 데이터를 설치해 둡니다.
   - CORS를 허용하여 프론트엔드(localhost:3000)에서 API를 호출할 수 있게 합니다.
   - /frontend 경로에서 정적 파일(HTML/JS/CSS)을 서빙하여 별도 서버 없이도 동작합니다.
 """
+import asyncio
 import sys
 import os
 
@@ -21,8 +28,21 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
 from routers.network import router as network_router
+from routers.jobs import router as jobs_router
+from routers.churn import router as churn_router
+from routers.trend import router as trend_router
+from routers.debug import router as debug_router
 from services.data_loader import preload_all_data
-from config import FRONTEND_DIR
+from services.shared_store import attach_shared_data, watch_shared_data
+from services.adjacency_index import build_adjacency_indexes
+from services.metric_cube import build_metric_cube
+from services.search_index import build_search_index
+from services.admission import build_admission_tables
+from services.query_engine import build_query_engine
+from services.warm_snapshot import restore_snapshot, save_snapshot
+from services.compute_pool import start_compute_pool, shutdown_compute_pool
+from services.perf import ServerTimingMiddleware
+from config import FRONTEND_DIR, SHARED_DATA_DIR
 
 
 @asynccontextmanager
@@ -34,9 +54,32 @@ async def lifespan(app: FastAPI):
          이렇게 하면 첫 번째 API 요청도 빠르게 응답할 수 있습니다.
     """
     # Startup: 데이터 사전 로딩
-    preload_all_data()
+    # ★ 공유 데이터 모드: 로더가 만든 memory-map 파일을 연결 (실패 시 직접 로딩)
+    shared = bool(SHARED_DATA_DIR and attach_shared_data())
+    # ★ 원본 파일이 스냅샷과 같으면 워밍업 상태를 한 번에 복원 (엑셀 파싱·HR 결합·벤치마크 계산 생략)
+    restored = not shared and restore_snapshot()
+    if not shared and not restored:
+        preload_all_data()
+    # 에고 네트워크 조회용 연도별 인접 인덱스 + 한 해 × 조직 지표 큐브
+    build_adjacency_indexes()
+    build_metric_cube()
+    # 인원 검색(자동완성)용 사번 접두 + 이름 n-gram 인덱스
+    build_search_index()
+    # 입장 제어용 연도별 비용 추정 표 (조직·직군·직급 조합별 인원/엣지 수)
+    build_admission_tables()
+    # (선택) DuckDB 쿼리 엔진용 연도별 Parquet 파티션 — 풀 워커는 같은 데이터 버전의 파티션을 그대로 엶
+    build_query_engine()
+    if not shared and not restored:
+        save_snapshot()
+    # 무거운 분석용 프로세스 풀 (공유 데이터 모드면 워커도 memory-map으로 직접 연결)
+    start_compute_pool(shared_dir=SHARED_DATA_DIR if shared else None)
+    # 공유 데이터 모드: 로더가 새 버전을 게시하면 백그라운드에서 전환 (요청 경로는 기다리지 않음)
+    watcher = asyncio.create_task(watch_shared_data()) if shared else None
     yield
-    # Shutdown: 정리 작업 (필요 시)
+    # Shutdown: 정리 작업
+    if watcher is not None:
+        watcher.cancel()
+    shutdown_compute_pool()
     print("[INFO] 서버 종료")
 
 
@@ -56,8 +99,17 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+# 단계별 처리 시간을 Server-Timing 헤더로 노출
+# Why: 가장 바깥 미들웨어로 두어야 요청 전체(total)와 JSON 인코딩(encode) 시간을 잴 수 있습니다.
+app.add_middleware(ServerTimingMiddleware)
+
 # API 라우터 등록
 app.include_router(network_router)
+app.include_router(jobs_router)
+app.include_router(churn_router)
+app.include_router(trend_router)
+app.include_router(debug_router)
 
 # 프론트엔드 정적 파일 서빙
 # Why: index.html에서 'css/style.css', 'js/app.js'로 접근하므로 
@@ -0,0 +1,253 @@
+"""
+precompute.py — 표준 필터 조합의 분석 결과를 미리 계산해 정적 번들로 기록합니다.
+
+핵심 설계 결정:
+  - 서버 라우트와 같은 실행 함수(routers.network.run_*)를 그대로 호출하므로 결과가 API 응답과 같습니다.
+  - 부모 프로세스가 데이터를 한 번 로드(+벤치마크 계산)한 뒤, 프로세스 풀의 워커에 넘겨
+    셀(연도 조합 × [전체 | ORG1 하나]) 단위로 전체 코어에서 병렬 계산합니다.
+  - 결과는 항목마다 gzip JSON 파일로, 버전 디렉토리에 모두 기록한 뒤 CURRENT를 교체합니다 (원자적 전환).
+  - frontend/js/api.js는 백엔드가 없으면 CURRENT → manifest.json → 항목 파일 순으로 읽습니다.
+    (HTTP 정적 서버로 제공해야 함 — file://에서는 fetch가 막힘. 기본 출력 frontend/bundle/은 .gitignore 대상)
+
+번들 구조:
+    OUT/
+      CURRENT                       ← 현재 버전 디렉토리 이름
+      v20261019-031500-1234/
+        manifest.json               ← 버전, 원본 파일 지문, 셀 목록, 항목 키 → 파일 경로
+        network/3f2a….json.gz
+        organization/….json.gz
+        ...
+
+항목 키 (api.js의 _bundleKey와 같은 규칙 — 바꿀 때는 함께 수정):
+    JSON [종류, 연도(오름차순), ORG1, ORG2, 직군, 직급(각 문자열 오름차순), 추가 파라미터]
+    예) ["subgroup",[2025],["영업본부"],[],[],[],["ORG2_OP"]]
+
+실행 방법 (backend 디렉토리에서):
+    python precompute.py                                  # 전체 연도 × (전체 + ORG1별) → ../frontend/bundle
+    python precompute.py --years 2024,2025 --year-sets "2024,2025" --workers 8
+    python precompute.py --no-org1 --out D:\\web\\peer-eval-bundle   # 웹 서버가 제공하는 경로
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_OUT = os.path.join(os.path.dirname(BACKEND_DIR), "frontend", "bundle")
+CURRENT_FILE = "CURRENT"
+BUNDLE_FORMAT = 1
+
+# 셀마다 계산하는 하위 조직 비교 기준 (프론트엔드 라디오 버튼)
+SUBGROUP_LEVELS = ["ORG1_OP", "ORG2_OP"]
+# 개인 지표 테이블 번들의 순위 컬럼 (프론트엔드 지표 탭, 내림차순)
+RANKING_COLUMNS = ["selection_burden", "in_degree", "cross_org_rate", "mutual_selection", "group_closure"]
+
+
+def bundle_key(kind: str, years, orgs1=(), orgs2=(), jobs=(), grades=(), extra=()) -> str:
+    """번들 항목 키 — api.js의 _bundleKey와 같은 문자열을 만듭니다."""
+    return json.dumps(
+        [kind, sorted(set(int(y) for y in years)),
+         sorted(set(map(str, orgs1))), sorted(set(map(str, orgs2))),
+         sorted(set(map(str, jobs))), sorted(set(map(str, grades))), list(extra)],
+        ensure_ascii=False, separators=(",", ":"),
+    )
+
+
+# ══════════════════════════════════════════════
+#  워커 (셀 단위 계산)
+# ══════════════════════════════════════════════
+
+def _init_worker(qualitative, hr_df, benchmarks) -> None:
+    """부모가 로드한 데이터를 설치합니다 (워커마다 엑셀을 다시 읽지 않음)."""
+    sys.path.insert(0, BACKEND_DIR)
+    from services.data_loader import install_shared_data
+    install_shared_data(qualitative, hr_df, benchmarks)
+
+
+def _write_entry(version_dir: str, kind: str, key: str, payload) -> tuple[str, int]:
+    """항목 하나를 gzip JSON으로 기록하고 (상대 경로, 압축 크기)를 반환합니다."""
+    rel_path = f"{kind}/{hashlib.sha1(key.encode('utf-8')).hexdigest()[:20]}.json.gz"
+    data = gzip.compress(
+        json.dumps(payload, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8"),
+        compresslevel=6,
+    )
+    path = os.path.join(version_dir, rel_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+    return rel_path, len(data)
+
+
+def _org_tree_payload(result):
+    """get_org_tree 결과(JSON 바이트, ETag)를 번들 항목으로 — 데이터가 없으면 라우트와 같은 404"""
+    from fastapi import HTTPException
+    if result is None:
+        raise HTTPException(status_code=404, detail="선택한 연도에 해당하는 데이터가 없습니다.")
+    return json.loads(result[0])
+
+
+def _compute_cell(version_dir: str, years: list[int], orgs1: list[str]) -> dict:
+    """
+    셀 하나의 모든 분석을 계산해 기록합니다.
+
+    ★ 라우트가 HTTPException으로 응답하는 경우(엣지 없음 등)는 {"error": {status, detail}}로 기록해
+      번들 모드에서도 같은 오류 메시지를 보여줍니다.
+
+    Returns:
+        { "entries": {키: 경로}, "bytes": 압축 크기 합, "seconds": 소요 시간 }
+    """
+    from fastapi import HTTPException
+    from fastapi.encoders import jsonable_encoder
+    from routers import network as api
+    from services.person_table import export_rankings
+    from services.org_tree import get_org_tree
+
+    started = time.perf_counter()
+    req = api.FilterRequest(years=years, orgs1=orgs1)
+    jobs = [
+        ("filter_options", (), lambda: api.api_filter_options(",".join(map(str, years)), ",".join(orgs1))),
+        ("network", (), lambda: api.run_network(req)),
+        ("organization", (), lambda: api.run_org_metrics(req)),
+        ("individual", (), lambda: api.run_individual_metrics(req)),
+        ("individual_table", (), lambda: export_rankings(api.run_person_table(req), RANKING_COLUMNS)),
+        ("feedback", (), lambda: api.run_feedback_metrics(req)),
+    ]
+    if not orgs1:
+        # 조직 트리는 연도 조합 단위 (필터 캐스케이드용)
+        jobs.append(("org_tree", (), lambda: _org_tree_payload(get_org_tree(years))))
+    for level in SUBGROUP_LEVELS:
+        sub_req = api.SubgroupRequest(years=years, orgs1=orgs1, group_col=level)
+        jobs.append(("subgroup", (level,), lambda r=sub_req: api.run_subgroup_metrics(r)))
+
+    entries, total_bytes = {}, 0
+    for kind, extra, fn in jobs:
+        try:
+            payload = jsonable_encoder(fn())
+        except HTTPException as e:
+            payload = {"error": {"status": e.status_code, "detail": e.detail}}
+        key = bundle_key(kind, years, orgs1, extra=extra)
+        entries[key], size = _write_entry(version_dir, kind, key, payload)
+        total_bytes += size
+    return {"entries": entries, "bytes": total_bytes, "seconds": time.perf_counter() - started}
+
+
+# ══════════════════════════════════════════════
+#  부모 (셀 목록 + 풀 실행 + 버전 전환)
+# ══════════════════════════════════════════════
+
+def _parse_year_sets(text: str) -> list[list[int]]:
+    return [sorted({int(y) for y in part.split(",") if y.strip()}) for part in text.split(";") if part.strip()]
+
+
+def _build_cells(year_sets: list[list[int]], per_org1: bool) -> list[tuple[list[int], list[str]]]:
+    from services.data_loader import get_filter_options
+    cells = []
+    for years in year_sets:
+        cells.append((years, []))
+        if per_org1:
+            cells.extend((years, [org1]) for org1 in get_filter_options(years)["orgs1"])
+    return cells
+
+
+def _source_fingerprints() -> dict:
+    """번들이 만들어진 원본 엑셀의 (크기, 수정 시각) — 번들이 오래되었는지 판단용"""
+    from config import DATA_DIR
+    from services.excel_reader import file_fingerprint
+    sources = {}
+    if os.path.isdir(DATA_DIR):
+        for name in sorted(os.listdir(DATA_DIR)):
+            fp = file_fingerprint(os.path.join(DATA_DIR, name)) if name.endswith(".xlsx") else None
+            if fp is not None:
+                sources[name] = {"size": fp[0], "mtime_ns": fp[1]}
+    return sources
+
+
+def _publish(out_dir: str, version: str, keep: int) -> None:
+    """CURRENT를 새 버전으로 원자적으로 교체하고, 오래된 버전을 정리합니다."""
+    tmp_path = os.path.join(out_dir, CURRENT_FILE + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(version)
+    os.replace(tmp_path, os.path.join(out_dir, CURRENT_FILE))
+
+    old = sorted(d for d in os.listdir(out_dir)
+                 if d.startswith("v") and d != version and os.path.isdir(os.path.join(out_dir, d)))
+    for name in old[:-keep] if keep else old:
+        shutil.rmtree(os.path.join(out_dir, name), ignore_errors=True)
+
+
+def run(args) -> str:
+    sys.path.insert(0, BACKEND_DIR)
+    from config import AVAILABLE_YEARS
+    from services.data_loader import preload_all_data, get_loaded_data, get_cached_benchmarks
+
+    preload_all_data()
+    qualitative, hr_df = get_loaded_data()
+    qualitative = {y: df for y, df in qualitative.items() if df is not None}
+    if not qualitative:
+        raise SystemExit("[ERROR] 로드된 정성평가 데이터가 없습니다. DATA_DIR를 확인하세요.")
+
+    years = sorted(int(y) for y in args.years.split(",")) if args.years else sorted(qualitative)
+    years = [y for y in years if y in qualitative and y in AVAILABLE_YEARS]
+    year_sets = [[y] for y in years] + _parse_year_sets(args.year_sets)
+    cells = _build_cells(year_sets, not args.no_org1)
+
+    version = time.strftime("v%Y%m%d-%H%M%S") + f"-{os.getpid()}"
+    version_dir = os.path.join(args.out, version)
+    os.makedirs(version_dir, exist_ok=True)
+    print(f"[INFO] 사전 계산 시작: 셀 {len(cells)}개, 워커 {args.workers}개 → {version_dir}")
+
+    started = time.perf_counter()
+    entries, total_bytes = {}, 0
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker,
+                             initargs=(qualitative, hr_df, get_cached_benchmarks())) as pool:
+        futures = {pool.submit(_compute_cell, version_dir, y, o): (y, o) for y, o in cells}
+        for done, future in enumerate(as_completed(futures), 1):
+            years_, orgs1 = futures[future]
+            result = future.result()
+            entries.update(result["entries"])
+            total_bytes += result["bytes"]
+            label = f"{','.join(map(str, years_))} / {orgs1[0] if orgs1 else '전체'}"
+            print(f"  ✓ [{done}/{len(cells)}] {label} ({result['seconds']:.1f}s)")
+
+    manifest = {
+        "format": BUNDLE_FORMAT,
+        "version": version,
+        "created_at": time.time(),
+        "sources": _source_fingerprints(),
+        "cells": [{"years": y, "orgs1": o} for y, o in cells],
+        "subgroup_levels": SUBGROUP_LEVELS,
+        "entries": entries,
+    }
+    with open(os.path.join(version_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, separators=(",", ":"))
+    _publish(args.out, version, args.keep)
+
+    print(f"[INFO] 번들 기록 완료: 항목 {len(entries)}개, {total_bytes / 2**20:.1f} MiB (gzip), "
+          f"{time.perf_counter() - started:.1f}s")
+    return version
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="표준 필터 조합의 분석 결과 정적 번들 생성")
+    parser.add_argument("--out", default=DEFAULT_OUT, help="번들 디렉토리 (기본: ../frontend/bundle)")
+    parser.add_argument("--years", default="", help="연도별 셀을 만들 연도 (쉼표 구분, 기본: 데이터가 있는 전체 연도)")
+    parser.add_argument("--year-sets", default="", help='추가 다년도 조합 (예: "2024,2025;2023,2024,2025")')
+    parser.add_argument("--no-org1", action="store_true", help="ORG1별 셀 생략 (연도 조합 전체만)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="프로세스 수 (기본: 전체 코어)")
+    parser.add_argument("--keep", type=int, default=2, help="보관할 이전 버전 수")
+    parser.add_argument("--data-dir", default="", help="DATA_DIR 대신 사용할 데이터 디렉토리")
+    args = parser.parse_args()
+
+    if args.data_dir:
+        # ★ config는 import 시점에 DATA_DIR를 읽으므로 서비스 import 전에 설정 (워커에도 상속)
+        os.environ["DATA_DIR"] = args.data_dir
+    run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+routers/churn.py — 연도 간 평가 관계 변화(churn) API를 정의합니다.
+
+★ 여러 연도를 선택해 행을 합치는 기존 분석과 달리, 연도별 엣지 테이블을 서로 비교합니다.
+  조직 필터는 피평가자 기준으로 적용합니다 (그 사람이 선정한 평가자 집합의 변화).
+"""
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel, Field
+from config import AVAILABLE_YEARS
+from services.data_loader import prepare_combined_network_data, filter_nodes
+from services.churn_analyzer import calculate_pair_churn, calculate_pair_chains
+from services.perf import TimedRoute, stage
+
+router = APIRouter(prefix="/api/churn", tags=["churn"], route_class=TimedRoute)
+
+
+class ChurnFilter(BaseModel):
+    """피평가자 범위 필터 (연도 제외)"""
+    orgs1: list[str] = []
+    orgs2: list[str] = []
+    jobs: list[str] = []
+    grades: list[str] = []
+    limit: int = Field(50, ge=1, le=1000)
+
+
+class ChurnRequest(ChurnFilter):
+    """연도 쌍 비교: year_from → year_to"""
+    year_from: int
+    year_to: int
+
+
+def _scope(req: ChurnFilter, years: list[int]):
+    """필터 대상 사번 목록(필터 없으면 None)과 사번 → 표시 정보 매핑을 반환합니다."""
+    with stage("prepare_combined"):
+        _, all_nodes = prepare_combined_network_data(years)
+    if all_nodes is None:
+        raise HTTPException(status_code=404, detail="선택한 연도에 해당하는 데이터가 없습니다.")
+
+    target_ids = None
+    if req.orgs1 or req.orgs2 or req.jobs or req.grades:
+        with stage("filter"):
+            target_ids = filter_nodes(all_nodes, req.orgs1, req.orgs2, req.jobs, req.grades)['사번'].tolist()
+
+    info = all_nodes.drop_duplicates(subset=['사번']).set_index('사번')[['성명', 'ORG1_OP', 'ORG2_OP']]
+    return target_ids, info
+
+
+def _describe(person_ids: list[str], info) -> list[dict]:
+    """사번 목록 → [{성명, ORG1_OP, ORG2_OP}] (정보가 없으면 기본값)"""
+    rows = info.reindex(person_ids).fillna({'성명': '-', 'ORG1_OP': 'Unknown', 'ORG2_OP': 'Unknown'})
+    return rows.to_dict(orient='records')
+
+
+@router.post("")
+def api_pair_churn(req: ChurnRequest):
+    """
+    두 연도 사이 평가자→피평가자 쌍의 신규/유지/중단과 피평가자별 평가자 집합 안정성(Jaccard)을 반환합니다.
+
+    Returns:
+        {
+            "year_from", "year_to",
+            "pairs": { from_count, to_count, repeated, new, dropped, retention_rate, new_rate },
+            "stability": { person_count, only_from, only_to, mean_jaccard, median_jaccard, histogram },
+            "persons": [ 안정성 낮은 순 (두 해 모두 평가받은 사람) ],
+        }
+    """
+    if req.year_from == req.year_to:
+        raise HTTPException(status_code=400, detail="서로 다른 두 연도를 선택해주세요.")
+    target_ids, info = _scope(req, [req.year_from, req.year_to])
+
+    with stage("churn"):
+        result = calculate_pair_churn(req.year_from, req.year_to, target_ids, req.limit)
+    if result is None:
+        raise HTTPException(status_code=404, detail="선택한 연도에 해당하는 데이터가 없습니다.")
+
+    for person, attrs in zip(result["persons"], _describe([p["사번"] for p in result["persons"]], info)):
+        person.update(attrs)
+    return {"year_from": req.year_from, "year_to": req.year_to, **result}
+
+
+@router.post("/chains")
+def api_pair_chains(req: ChurnFilter):
+    """
+    전체 연도(AVAILABLE_YEARS)에 걸쳐 같은 평가자→피평가자 쌍이 몇 해 연속 유지되었는지 반환합니다.
+
+    Returns:
+        { "years", "pair_count", "length_distribution", "all_years_count", "top_chains": [...] }
+    """
+    target_ids, info = _scope(req, list(AVAILABLE_YEARS))
+
+    with stage("chains"):
+        result = calculate_pair_chains(target_ids, req.limit)
+    if result is None:
+        raise HTTPException(status_code=404, detail="데이터가 없습니다.")
+
+    chains = result["top_chains"]
+    sources = _describe([c["source"] for c in chains], info)
+    targets = _describe([c["target"] for c in chains], info)
+    for chain, src, tgt in zip(chains, sources, targets):
+        chain.update({
+            "source_name": src['성명'],
+            "target_name": tgt['성명'],
+            "target_ORG1_OP": tgt['ORG1_OP'],
+            "target_ORG2_OP": tgt['ORG2_OP'],
+        })
+    return result
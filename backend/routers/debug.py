@@ -0,0 +1,128 @@
+"""
+routers/debug.py — 운영 진단용 API (성능 통계, 프로파일, 캐시)를 정의합니다.
+
+★ 대시보드 사용자용이 아닌 운영자용 엔드포인트입니다.
+  캐시를 바꾸는 엔드포인트(축출/워밍)는 DEBUG_ADMIN=1로 실행한 서버에서만 허용합니다.
+"""
+import time
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import PlainTextResponse
+from pydantic import BaseModel
+from config import DEBUG_ADMIN_ENABLED, PERF_PROFILING_ENABLED, PERF_WINDOW
+from services.cache_registry import registry
+from services.data_loader import prepare_combined_network_data
+from services.single_flight import single_flight_stats
+from services.perf import TimedRoute, perf_stats, get_profile, list_profiles
+from services.compute_pool import compute_pool_stats
+from services.admission import admission_stats
+
+router = APIRouter(prefix="/api/debug", tags=["debug"], route_class=TimedRoute)
+
+
+@router.get("/perf")
+def api_perf_stats():
+    """
+    엔드포인트 × 단계별 롤링 지연 통계를 반환합니다.
+
+    Returns:
+        {
+            "window": 백분위 계산에 쓰는 최근 요청 수,
+            "profiling_enabled": cProfile 캡처 허용 여부,
+            "endpoints": { "POST /api/network": { "build_graph": {p50_ms, p90_ms, p99_ms, histogram, ...} } },
+            "profiles": [ 최근 캡처된 프로파일 목록 ],
+            "compute_pool": { 워커 수, 워커 데이터 버전, 제출/실패/재시작 횟수 },
+            "admission": { 등급별 슬롯/대기열 사용량, 입장·거절·대기 시간 초과 횟수, 평균 실행 시간 },
+        }
+    """
+    return {
+        "window": PERF_WINDOW,
+        "profiling_enabled": PERF_PROFILING_ENABLED,
+        "endpoints": perf_stats.snapshot(),
+        "profiles": list_profiles(),
+        "compute_pool": compute_pool_stats(),
+        "admission": admission_stats(),
+    }
+
+
+@router.post("/perf/reset")
+def api_perf_reset():
+    """롤링 통계를 초기화합니다."""
+    perf_stats.reset()
+    return {"status": "ok"}
+
+
+@router.get("/perf/profiles/{profile_id}", response_class=PlainTextResponse)
+def api_perf_profile(profile_id: str):
+    """
+    캡처된 cProfile 결과(누적 시간 상위 50개 함수)를 텍스트로 반환합니다.
+
+    캡처 방법: PERF_PROFILING=1로 서버 실행 후, 요청에 `X-Profile: 1` 헤더(또는 ?profile=1)를 붙이면
+               응답의 `X-Profile-Id` 헤더로 id가 전달됩니다.
+               다른 요청을 캡처 중이면 측정하지 않고 `X-Profile-Skipped: busy`를 붙입니다.
+    ★ async 엔드포인트는 이벤트 루프 구간만 담깁니다 (스레드/프로세스 풀의 계산은 빠짐).
+    """
+    profile = get_profile(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="프로파일을 찾을 수 없습니다.")
+    return profile["stats"]
+
+
+# ──────────────────────────────────────────────
+# 캐시 조회 / 관리
+# ──────────────────────────────────────────────
+
+class EvictRequest(BaseModel):
+    pattern: str                 # str(키)에 대한 fnmatch 패턴 (예: "*2025*", "(2024, 2025)")
+    cache: str | None = None     # 대상 캐시 이름 (없으면 전체)
+
+
+class WarmRequest(BaseModel):
+    years: list[int]
+
+
+def _require_admin() -> None:
+    if not DEBUG_ADMIN_ENABLED:
+        raise HTTPException(status_code=403, detail="캐시 관리 엔드포인트가 꺼져 있습니다 (DEBUG_ADMIN=1로 실행).")
+
+
+@router.get("/caches")
+def api_cache_stats(detail: bool = False):
+    """
+    등록된 모든 캐시의 항목 수, 추정 메모리, 적중/실패/축출 횟수를 반환합니다.
+
+    ?detail=true 이면 항목별 키·크기·나이를 포함합니다.
+    single_flight: 키별 동시 계산 병합 통계 (실행/병합 횟수, 진행 중인 키와 대기 수)
+    """
+    return {**registry.stats(detail), "single_flight": single_flight_stats()}
+
+
+@router.post("/caches/evict")
+def api_cache_evict(req: EvictRequest):
+    """
+    키 패턴과 일치하는 캐시 항목을 축출합니다.
+
+    ★ 원본(qualitative/hr)만 축출하면 이미 결합된 combined 항목은 남아 있으므로,
+      데이터를 다시 읽히려면 combined도 함께 축출해야 합니다.
+    ★ DEBUG_ADMIN=1일 때만 허용 (아니면 403)
+    """
+    _require_admin()
+    if req.cache and registry.get(req.cache) is None:
+        raise HTTPException(status_code=404, detail=f"알 수 없는 캐시: {req.cache}")
+    return {"evicted": registry.evict(req.pattern, req.cache)}
+
+
+@router.post("/caches/warm")
+def api_cache_warm(req: WarmRequest):
+    """지정한 연도 조합의 원본·결합 데이터를 미리 캐시에 올립니다. (DEBUG_ADMIN=1일 때만 허용)"""
+    _require_admin()
+    if not req.years:
+        raise HTTPException(status_code=400, detail="years가 비어 있습니다.")
+    started = time.perf_counter()
+    edges, nodes = prepare_combined_network_data(req.years)
+    if nodes is None:
+        raise HTTPException(status_code=404, detail="데이터가 없습니다.")
+    return {
+        "years": sorted(req.years),
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        "caches": registry.stats()["caches"],
+    }
@@ -0,0 +1,59 @@
+"""
+routers/jobs.py — 장시간 분석용 백그라운드 잡 API를 정의합니다.
+
+사용 흐름:
+  1. POST   /api/jobs            {kind, filters} → job_id 발급 (같은 필터면 기존 잡 재사용)
+  2. GET    /api/jobs/{job_id}   → 상태, 단계별 진행률, 완료 시 결과
+  3. DELETE /api/jobs/{job_id}   → 취소 요청 (다음 단계 진입 시 중단)
+"""
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel, ValidationError
+from routers.network import ANALYSES, analysis_stages, filter_key
+from services.job_manager import job_manager
+from services.perf import TimedRoute
+
+router = APIRouter(prefix="/api/jobs", tags=["jobs"], route_class=TimedRoute)
+
+
+class JobRequest(BaseModel):
+    """잡 제출 요청: 분석 종류 + 해당 분석의 필터 조건"""
+    kind: str
+    filters: dict = {}
+
+
+@router.post("", status_code=202)
+def api_submit_job(req: JobRequest):
+    """
+    분석을 백그라운드 잡으로 제출합니다.
+
+    ★ 중복 제거: 같은 분석 종류 + 정규화된 필터의 잡이 진행 중이거나
+      결과가 TTL 내에 있으면 새로 계산하지 않고 기존 잡을 반환합니다.
+    """
+    if req.kind not in ANALYSES:
+        raise HTTPException(status_code=400, detail=f"지원하지 않는 분석 종류입니다: {req.kind}")
+
+    model, fn = ANALYSES[req.kind][:2]
+    try:
+        filters = model(**req.filters)
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    job = job_manager.submit(req.kind, filter_key(filters), analysis_stages(req.kind), lambda progress: fn(filters, progress))
+    return job.to_dict(include_result=False)
+
+
+@router.get("/{job_id}")
+def api_get_job(job_id: str):
+    """잡 상태와 단계별 진행률을 반환합니다. 완료된 잡은 결과를 포함합니다."""
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="잡을 찾을 수 없거나 결과 보관 기간이 지났습니다.")
+    return job.to_dict()
+
+
+@router.delete("/{job_id}")
+def api_cancel_job(job_id: str):
+    """잡 취소를 요청합니다."""
+    job = job_manager.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="잡을 찾을 수 없거나 결과 보관 기간이 지났습니다.")
+    return job.to_dict(include_result=False)
@@ -5,25 +5,69 @@ routers/network.py — 네트워크 분석 API 엔드포인트를 정의합니
   - 캐스케이드 필터: ORG1 선택 시 ORG2/직군/직급 옵션 동적 변경
   - Ghost Node: 필터 외부 연결 노드 표시
   - 정성 피드백 분석: 평균 길이, 크로스-조직 비교, 담합 경고
+  - 전체 명단 내보내기: 개인 지표 전체 테이블을 CSV/Parquet로 스트리밍
+  - 개인 지표 테이블: 필터별 1회 계산 후 캐시, 정렬/임계값/페이지 조회
+  - 에고 네트워크: 연도별 인접 인덱스에서 특정 인원의 k-hop 이웃만 조회
+  - 지표 큐브: 한 해 × ORG1/ORG2 하나(또는 전체) 조직 지표는 사전 계산값으로 응답
+  - 동시 요청 병합: 같은 분석 + 같은 필터의 동기 요청은 계산 한 번의 결과를 함께 받음
+  - 데이터 버전: 브라우저 응답 캐시(IndexedDB)가 키에 포함해 데이터 변경 시 이전 결과를 버림
+  - 프로세스 풀: 개인 지표 테이블·하위 조직·피드백·큐브 밖 조직 지표는 async 핸들러에서 미리 띄운 워커로 계산
+  - 조직 트리: 연도 조합별 ORG1 → ORG2 → ORG3 트리(+ 직군/직급 인원)를 ETag와 함께 제공, 캐스케이드는 브라우저에서 계산
+  - 쌍 엣지: 여러 연도의 같은 (평가자, 피평가자) 쌍은 엣지 하나(평가 건수 weight)로 분석·전송,
+    weighted=true면 차수 기반 지표를 평가 건수로 계산
+  - 쿼리 엔진(선택): duckdb가 있으면 큐브 밖 조직 지표·하위 조직 비교를 연도별 Parquet 파티션에 대한
+    쿼리(필터 + 조직 결합 + 집계)로 계산, 없거나 실패하면 pandas 경로
+  - 인원 검색: 사번 접두 / 이름 n-gram 인덱스로 자동완성 (조직 정보 + 등장 연도 포함)
+  - 입장 제어: 계산을 시작하기 전에 필터의 노드/엣지 수로 비용을 추정하고, 비용 등급별 슬롯·대기열을 넘으면
+    503 + Retry-After로 바로 응답 (무거운 분석은 async 핸들러에서 이벤트 루프 밖으로 넘겨 동기 스레드 풀을 쓰지 않음)
 """
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+import asyncio
+import json
+import pandas as pd
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel, Field
+from config import PERSON_QUERY_MAX_LIMIT, EGO_MAX_HOPS, SEARCH_DEFAULT_LIMIT, SEARCH_MAX_LIMIT
 from services.data_loader import (
     prepare_combined_network_data,
     filter_network_data,
     get_filter_options,
-    get_cached_benchmarks
+    get_cached_benchmarks,
+    data_version,
+    canonical_filter_key,
+    filter_nodes,
 )
 from services.network_builder import build_graph, graph_to_vis_json
+from services.edge_aggregation import get_edge_pairs, filter_edge_pairs
 from services.metrics_calculator import (
     calculate_system_health_metrics,
-    calculate_individual_metrics,
     calculate_subgroup_metrics,
 )
-import pandas as pd
-import numpy as np
+from services.feedback_analyzer import calculate_feedback_metrics
+from services.person_table import (
+    GRAPH_METRIC_COLUMNS,
+    FEEDBACK_COLUMNS,
+    build_person_table,
+    get_person_table,
+    get_person_table_async,
+    query_person_table,
+    top_percent_lists,
+)
+from services.adjacency_index import get_ego_network
+from services.org_tree import get_org_tree
+from services.search_index import get_search_index
+from services.metric_cube import lookup_metric_cube
+from services.query_engine import query_system_health, query_subgroup_metrics
+from services.table_export import EXPORT_FORMATS, is_format_available, iter_table_chunks
+from services.single_flight import SingleFlight
+from services.compute_pool import compute_pool_running, offload, offload_async
+from services.admission import admission_slot, estimate_cost
+from services.perf import TimedRoute, stage
 
-router = APIRouter(prefix="/api", tags=["network"])
+router = APIRouter(prefix="/api", tags=["network"], route_class=TimedRoute)
+
+# 동기 라우트의 동시 동일 요청 병합 (키: 분석 종류 + filter_key)
+_analysis_flight = SingleFlight("analysis")
 
 
 # ──────────────────────────────────────────────
@@ -37,6 +81,7 @@ class FilterRequest(BaseModel):
     orgs2: list[str] = []
     jobs: list[str] = []
     grades: list[str] = []
+    weighted: bool = False   # True: Gini/평균 평가자 수/평가 부담을 고유 쌍 대신 평가 건수로 계산
 
 
 class SubgroupRequest(FilterRequest):
@@ -44,22 +89,321 @@ class SubgroupRequest(FilterRequest):
     group_col: str = "ORG1_OP"
 
 
+class PersonQueryRequest(FilterRequest):
+    """개인 지표 테이블 조회용: 기본 필터 + 정렬/페이지/임계값"""
+    sort: str = "selection_burden"
+    order: str = "desc"
+    offset: int = Field(0, ge=0)
+    limit: int = Field(50, ge=1, le=PERSON_QUERY_MAX_LIMIT)
+    cursor: str | None = None
+    min_values: dict[str, float] = {}   # 컬럼 → 최소값 (이상)
+    max_values: dict[str, float] = {}   # 컬럼 → 최대값 (이하)
+
+
+class EgoRequest(FilterRequest):
+    """에고 네트워크 조회용: 기본 필터(핵심/Ghost 구분) + 대상 사번 + hop 수"""
+    사번: str
+    hops: int = Field(1, ge=1, le=EGO_MAX_HOPS)
+
+
 # ──────────────────────────────────────────────
 # 공통 헬퍼
 # ──────────────────────────────────────────────
 
-def _get_filtered_data(req: FilterRequest):
-    """필터 적용된 노드/엣지 DataFrame을 반환하는 공통 로직"""
-    raw_edges, all_nodes = prepare_combined_network_data(req.years)
+def _no_progress(stage: str) -> None:
+    """동기 요청용 progress 콜백 (아무것도 하지 않음)"""
+
+
+def filter_key(req: FilterRequest) -> tuple:
+    """요청의 정규화된 키 (잡 중복 제거용) — 필터 + 하위 모델의 추가 파라미터"""
+    key = _person_table_key(req)
+    extra = {k: v for k, v in req.model_dump().items() if k not in FilterRequest.model_fields}
+    if extra:
+        key = key + (json.dumps(extra, sort_keys=True, ensure_ascii=False),)
+    return key
+
+
+def _coalesced(kind: str, req: FilterRequest, runner):
+    """
+    같은 분석·같은 필터의 동시 요청은 먼저 온 요청의 계산 결과를 함께 받습니다.
+
+    Why: 프론트엔드는 분석 실행 시 여러 엔드포인트를 병렬로 호출하고, 사용자가 버튼을 연달아 누르면
+         같은 요청이 겹칩니다. 백그라운드 잡은 JobManager가 이미 같은 키를 하나의 잡으로 합칩니다.
+    """
+    return _analysis_flight.do((kind,) + filter_key(req), lambda: runner(req))
+
+
+async def _admitted(req: FilterRequest, compute):
+    """
+    요청의 비용(노드/엣지 수)을 추정해 등급 슬롯을 얻은 뒤 compute()(코루틴 함수)를 실행합니다.
+
+    ★ 실제 계산을 시작하는 쪽(single-flight leader, 캐시 miss)에서만 호출합니다 — 병합 대기는 슬롯을 쓰지 않음.
+      슬롯을 얻지 못하면 503 + Retry-After (같은 계산을 기다리던 요청도 같은 응답을 받음)
+    """
+    with stage("admission"):
+        # 추정 표 조회(연도당 수 ms, 데이터 변경 직후엔 표 생성)는 이벤트 루프 밖에서
+        nodes, edges = await asyncio.to_thread(estimate_cost, req.years, req.orgs1, req.orgs2, req.jobs, req.grades)
+    async with admission_slot(nodes, edges):
+        return await compute()
+
+
+async def _offloaded(kind: str, req: FilterRequest, kernel):
+    """
+    kernel(req)을 프로세스 풀에서 실행합니다. (같은 분석·같은 필터의 동시 요청은 한 번만 계산)
+
+    Why: async 핸들러는 결과를 기다리는 동안 이벤트 루프를 놓아주므로, 무거운 계산이 진행 중이어도
+         가벼운 엔드포인트가 스레드 풀 자리를 기다리지 않습니다.
+    """
+    return await _analysis_flight.do_async(
+        (kind,) + filter_key(req), lambda: _admitted(req, lambda: offload_async(kernel, req))
+    )
+
+
+def _get_filtered_data(req: FilterRequest, progress=_no_progress):
+    """
+    필터 적용된 노드 + 쌍 엣지 테이블을 반환하는 공통 로직
+
+    ★ 엣지는 연도 조합별로 캐시된 쌍 엣지 테이블에서 거릅니다 (원본 행 사번 정규화·필터를 요청마다 반복하지 않음).
+    """
+    progress("load")
+    with stage("prepare_combined"):
+        raw_edges, all_nodes = prepare_combined_network_data(req.years)
     if raw_edges is None or all_nodes is None:
         raise HTTPException(status_code=404, detail="선택한 연도에 해당하는 데이터가 없습니다.")
 
-    filtered_nodes, filtered_edges = filter_network_data(
-        all_nodes, raw_edges, req.orgs1, req.orgs2, req.jobs, req.grades
-    )
+    progress("filter")
+    with stage("filter"):
+        filtered_nodes = filter_nodes(all_nodes, req.orgs1, req.orgs2, req.jobs, req.grades)
+        filtered_edges = filter_edge_pairs(get_edge_pairs(req.years), filtered_nodes['사번'])
     return filtered_nodes, filtered_edges, all_nodes
 
 
+# ──────────────────────────────────────────────
+# 분석 실행 함수 (동기 라우트와 백그라운드 잡이 공유)
+#   progress(stage)는 각 단계 진입 시 호출됩니다.
+# ──────────────────────────────────────────────
+
+def run_network(req: FilterRequest, progress=_no_progress) -> dict:
+    filtered_nodes, filtered_edges, all_nodes = _get_filtered_data(req, progress)
+
+    if len(filtered_edges) == 0:
+        return {"nodes": [], "edges": [], "summary": {"node_count": len(filtered_nodes), "edge_count": 0, "evaluation_count": 0, "ghost_count": 0}, "color_legend": {}}
+
+    progress("render")
+    with stage("vis_json"):
+        return graph_to_vis_json(filtered_nodes, filtered_edges, all_nodes)
+
+
+def org_metrics_from_cube(req: FilterRequest) -> dict | None:
+    # ★ 한 해 × (전체 | ORG1 하나 | ORG2 하나)는 서버 시작 시 계산한 큐브에서 바로 응답 (큐브는 고유 쌍 기준)
+    if req.weighted:
+        return None
+    with stage("metric_cube"):
+        return lookup_metric_cube(req.years, req.orgs1, req.orgs2, req.jobs, req.grades)
+
+
+def compute_org_metrics(req: FilterRequest, progress=_no_progress) -> dict:
+    """큐브에 없는 조합의 제도 건전성 지표 (프로세스 풀에서 실행)"""
+    progress("query")
+    with stage("query_engine"):
+        pushed = query_system_health(req.years, req.orgs1, req.orgs2, req.jobs, req.grades, req.weighted)
+    if pushed is not None:
+        metrics, edge_count = pushed
+        if edge_count == 0:
+            raise HTTPException(status_code=400, detail="선택한 조건에 해당하는 엣지가 없습니다.")
+        return metrics
+
+    filtered_nodes, filtered_edges, _ = _get_filtered_data(req, progress)
+
+    if len(filtered_edges) == 0:
+        raise HTTPException(status_code=400, detail="선택한 조건에 해당하는 엣지가 없습니다.")
+
+    progress("graph")
+    with stage("build_graph"):
+        G = build_graph(filtered_nodes, filtered_edges)
+    progress("metrics")
+    with stage("system_health"):
+        return calculate_system_health_metrics(G, filtered_nodes, filtered_edges, req.weighted)
+
+
+def _with_benchmarks(metrics: dict) -> dict:
+    # ★ 동적 벤치마크(Method 1 & 2) 포함
+    benchmarks = get_cached_benchmarks()
+    return {**metrics, "benchmarks": benchmarks}
+
+
+def run_org_metrics(req: FilterRequest, progress=_no_progress) -> dict:
+    metrics = org_metrics_from_cube(req)
+    if metrics is None:
+        metrics = offload(compute_org_metrics, req, progress=progress)
+    return _with_benchmarks(metrics)
+
+
+def compute_person_table(req: FilterRequest, progress=_no_progress) -> pd.DataFrame:
+    """필터 대상 전원의 개인 지표 테이블 계산 (프로세스 풀에서 실행, 결과는 요청 프로세스가 캐시)"""
+    filtered_nodes, filtered_edges, _ = _get_filtered_data(req, progress)
+    raw_edges, _ = prepare_combined_network_data(req.years)
+    progress("graph")
+    with stage("build_graph"):
+        G = build_graph(filtered_nodes, filtered_edges)
+    progress("metrics")
+    with stage("person_table"):
+        return build_person_table(G, filtered_nodes, filtered_edges, raw_edges, req.weighted)
+
+
+def _person_table_key(req: FilterRequest) -> tuple:
+    key = canonical_filter_key(req.years, req.orgs1, req.orgs2, req.jobs, req.grades)
+    return key + ("weighted",) if req.weighted else key
+
+
+def run_person_table(req: FilterRequest, progress=_no_progress) -> pd.DataFrame:
+    """필터 대상 전원의 개인 지표 테이블 (필터별 캐시, 없으면 계산)"""
+    def build() -> pd.DataFrame:
+        return offload(compute_person_table, req, progress=progress)
+
+    return get_person_table(_person_table_key(req), build)
+
+
+async def _person_table_async(req: FilterRequest) -> pd.DataFrame:
+    """run_person_table의 async 버전 (캐시 miss면 입장 후 프로세스 풀 결과를 기다림)"""
+    return await get_person_table_async(
+        _person_table_key(req), lambda: _admitted(req, lambda: offload_async(compute_person_table, req))
+    )
+
+
+def _individual_from_table(table: pd.DataFrame) -> dict:
+    # 필터된 엣지는 모두 핵심 노드 하나 이상에 닿으므로, 차수 합이 0이면 엣지가 없는 것
+    if int(table['selection_burden'].sum() + table['in_degree'].sum()) == 0:
+        raise HTTPException(status_code=400, detail="선택한 조건에 해당하는 엣지가 없습니다.")
+
+    with stage("individual_metrics"):
+        return top_percent_lists(table)
+
+
+def run_individual_metrics(req: FilterRequest, progress=_no_progress) -> dict:
+    return _individual_from_table(run_person_table(req, progress))
+
+
+def _query_table(req: PersonQueryRequest, table: pd.DataFrame) -> dict:
+    with stage("person_query"):
+        try:
+            return query_person_table(
+                table, req.sort, req.order, req.offset, req.limit, req.cursor, req.min_values, req.max_values
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+
+def run_person_query(req: PersonQueryRequest, progress=_no_progress) -> dict:
+    return _query_table(req, run_person_table(req, progress))
+
+
+def compute_subgroup_metrics(req: SubgroupRequest, progress=_no_progress) -> list[dict]:
+    """하위 조직별 비교 지표 (프로세스 풀에서 실행)"""
+    progress("query")
+    with stage("query_engine"):
+        pushed = query_subgroup_metrics(req.years, req.orgs1, req.orgs2, req.jobs, req.grades, req.group_col)
+    if pushed is not None:
+        groups, edge_count = pushed
+        if edge_count == 0:
+            raise HTTPException(status_code=400, detail="선택한 조건에 해당하는 엣지가 없습니다.")
+        return groups
+
+    filtered_nodes, filtered_edges, _ = _get_filtered_data(req, progress)
+
+    if len(filtered_edges) == 0:
+        raise HTTPException(status_code=400, detail="선택한 조건에 해당하는 엣지가 없습니다.")
+
+    progress("graph")
+    with stage("build_graph"):
+        G = build_graph(filtered_nodes, filtered_edges)
+    progress("metrics")
+    with stage("subgroup_metrics"):
+        return calculate_subgroup_metrics(filtered_nodes, filtered_edges, G, req.group_col)
+
+
+def run_subgroup_metrics(req: SubgroupRequest, progress=_no_progress) -> list[dict]:
+    return offload(compute_subgroup_metrics, req, progress=progress)
+
+
+def compute_feedback_metrics(req: FilterRequest, progress=_no_progress) -> dict:
+    """정성 피드백 품질 + 담합 의심 플래그 (프로세스 풀에서 실행)"""
+    progress("load")
+    with stage("prepare_combined"):
+        raw_edges, all_nodes = prepare_combined_network_data(req.years)
+    if raw_edges is None or all_nodes is None:
+        raise HTTPException(status_code=404, detail="데이터 없음")
+
+    progress("filter")
+    with stage("filter"):
+        filtered_nodes, filtered_edges = filter_network_data(
+            all_nodes, raw_edges, req.orgs1, req.orgs2, req.jobs, req.grades
+        )[:2]
+
+    progress("metrics")
+    with stage("feedback_metrics"):
+        return calculate_feedback_metrics(raw_edges, all_nodes, filtered_nodes)
+
+
+def run_feedback_metrics(req: FilterRequest, progress=_no_progress) -> dict:
+    return offload(compute_feedback_metrics, req, progress=progress)
+
+
+def run_individual_table(req: FilterRequest, include_feedback: bool = False, progress=_no_progress) -> pd.DataFrame:
+    """
+    필터 대상 전원의 내보내기용 테이블 (조직 속성 + 지표 [+ 피드백 특성])
+
+    ★ Top N%만 돌려주는 /metrics/individual과 달리 전원을 포함합니다.
+    """
+    table = run_person_table(req, progress)
+    if not include_feedback:
+        table = table.drop(columns=FEEDBACK_COLUMNS)
+    table = table.copy()
+    float_cols = [c for c in GRAPH_METRIC_COLUMNS if pd.api.types.is_float_dtype(table[c])]
+    table[float_cols] = table[float_cols].round(4)
+    return table
+
+
+def run_ego_network(req: EgoRequest, progress=_no_progress) -> dict:
+    """
+    에고 네트워크 (인접 인덱스 조회 — 필터 DataFrame/전체 그래프를 만들지 않음)
+
+    ★ 조직 필터가 있으면 필터에 맞지 않는 이웃을 Ghost 노드로 표시합니다 (전체 네트워크와 같은 규칙).
+    """
+    core_filter = None
+    if req.orgs1 or req.orgs2 or req.jobs or req.grades:
+        def core_filter(attrs: pd.DataFrame):
+            matched = filter_nodes(attrs.reset_index(), req.orgs1, req.orgs2, req.jobs, req.grades)
+            return attrs.index.isin(matched['사번'])
+
+    progress("load")
+    with stage("ego_network"):
+        result = get_ego_network(req.사번.strip(), req.years, req.hops, core_filter)
+    if result is None:
+        raise HTTPException(status_code=404, detail=f"선택한 연도에 해당 사번이 없습니다: {req.사번}")
+    return result
+
+
+# 분석 종류 → (요청 모델, 실행 함수, 단계 목록, 프로세스 풀 사용 여부)
+#   ★ 단계 목록은 요청 프로세스에서 실행할 때 progress로 보고되는 단계입니다 ("query"는 쿼리 엔진 경로).
+#     풀에서 실행하는 분석은 워커 안의 단계를 보고할 수 없으므로 POOL_STAGES 하나만 보고합니다.
+ANALYSES = {
+    "network": (FilterRequest, run_network, ["load", "filter", "render"], False),
+    "organization": (FilterRequest, run_org_metrics, ["query", "load", "filter", "graph", "metrics"], True),
+    "individual": (FilterRequest, run_individual_metrics, ["load", "filter", "graph", "metrics"], True),
+    "individual_query": (PersonQueryRequest, run_person_query, ["load", "filter", "graph", "metrics"], True),
+    "subgroup": (SubgroupRequest, run_subgroup_metrics, ["query", "load", "filter", "graph", "metrics"], True),
+    "feedback": (FilterRequest, run_feedback_metrics, ["load", "filter", "metrics"], True),
+}
+POOL_STAGES = ["compute"]
+
+
+def analysis_stages(kind: str) -> list[str]:
+    """잡이 실제로 보고할 단계 목록 (프로세스 풀이 떠 있으면 풀 분석은 "compute" 하나)"""
+    _, _, stages, pooled = ANALYSES[kind]
+    return POOL_STAGES if pooled and compute_pool_running() else stages
+
+
 # ──────────────────────────────────────────────
 # API 엔드포인트
 # ──────────────────────────────────────────────
@@ -73,71 +417,170 @@ def api_filter_options(years: str = "2025", orgs1: str = ""):
     """
     year_list = [int(y.strip()) for y in years.split(",") if y.strip()]
     org1_list = [o.strip() for o in orgs1.split(",") if o.strip()] if orgs1 else None
-    return get_filter_options(year_list, org1_list)
+    with stage("filter_options"):
+        return get_filter_options(year_list, org1_list)
+
+
+@router.get("/org-tree")
+def api_org_tree(request: Request, years: str = "2025"):
+    """
+    연도 조합의 조직 계층 트리(ORG1 → ORG2 → ORG3, 단계별 인원 + 직군/직급별 인원)를 반환합니다.
+
+    ★ 프론트엔드는 연도 조합마다 한 번 받아 캐스케이드 선택지를 직접 계산합니다 (ORG1 변경 시 왕복 없음).
+      ETag가 같으면(If-None-Match) 본문 없이 304로 응답합니다.
+    """
+    year_list = [int(y.strip()) for y in years.split(",") if y.strip()]
+    with stage("org_tree"):
+        result = get_org_tree(year_list)
+    if result is None:
+        raise HTTPException(status_code=404, detail="선택한 연도에 해당하는 데이터가 없습니다.")
+    body, etag = result
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@router.get("/search")
+def api_search(
+    q: str = Query("", max_length=50),
+    years: str = "",
+    limit: int = Query(SEARCH_DEFAULT_LIMIT, ge=1, le=SEARCH_MAX_LIMIT),
+):
+    """
+    이름 또는 사번으로 인원을 찾습니다 (자동완성).
+
+    ★ 사번 접두 → 이름 일치/접두 → 이름 포함 순으로 limit개를 돌려줍니다. 요청마다 인덱스 조회만 합니다.
+      years를 주면 그 연도 중 하나라도 평가 관계가 있는 인원만 (조직 정보는 데이터의 최신 연도 기준).
+    """
+    year_list = [int(y.strip()) for y in years.split(",") if y.strip()]
+    with stage("search"):
+        index = get_search_index()
+        results, truncated = index.search(q, year_list, limit) if index is not None else ([], False)
+    return {"query": q, "results": results, "truncated": truncated}
+
+
+@router.get("/data-version")
+def api_data_version():
+    """
+    현재 로드된 데이터의 버전을 반환합니다. (원본 파일 지문 또는 공유 데이터 버전 기반)
+
+    ★ 프론트엔드는 응답 캐시 키에 이 값을 포함하므로, 값이 바뀌면 이전 캐시 항목을 쓰지 않습니다.
+    """
+    with stage("data_version"):
+        return {"version": data_version()}
 
 
 @router.post("/network")
-def api_network(req: FilterRequest):
+async def api_network(req: FilterRequest):
     """
     필터 적용된 네트워크 데이터 (노드 + 엣지 + 요약)를 반환합니다.
     
     ★ Ghost Node 지원: 필터 외부 연결 노드도 반투명으로 포함합니다.
+    ★ 입장 후 asyncio 실행기 스레드에서 만듭니다 (동기 핸들러 스레드 풀은 가벼운 엔드포인트 몫).
     """
-    filtered_nodes, filtered_edges, all_nodes = _get_filtered_data(req)
+    return await _analysis_flight.do_async(
+        ("network",) + filter_key(req), lambda: _admitted(req, lambda: asyncio.to_thread(run_network, req))
+    )
 
-    if len(filtered_edges) == 0:
-        return {"nodes": [], "edges": [], "summary": {"node_count": len(filtered_nodes), "edge_count": 0, "ghost_count": 0}, "color_legend": {}}
 
-    return graph_to_vis_json(filtered_nodes, filtered_edges, all_nodes)
+@router.post("/network/ego")
+def api_ego_network(req: EgoRequest):
+    """
+    특정 인원 중심의 k-hop 에고 네트워크와 그 인원의 개인 지표를 반환합니다.
+
+    Body (필터 조건 외):
+        사번: 중심 인원, hops: 1 ~ EGO_MAX_HOPS (방향 무시 거리)
+
+    Why: 서버 시작 시 만든 연도별 인접 인덱스(CSR)에서 이웃만 모으므로,
+         필터 DataFrame이나 전체 그래프를 만들지 않고 응답 크기에 비례하는 시간으로 조회합니다.
+
+    Returns:
+        graph_to_vis_json 형식(nodes/edges/summary/color_legend)
+        + { "ego", "hops", "metrics": {selection_burden, in_degree, cross_org_rate, mutual_selection, group_closure} }
+        (노드에 hop, isEgo 추가 / 개인 지표는 필터 없는 선택 연도 전체 네트워크 기준)
+    """
+    return _coalesced("ego", req, run_ego_network)
 
 
 @router.post("/metrics/organization")
-def api_org_metrics(req: FilterRequest):
+async def api_org_metrics(req: FilterRequest):
     """
     조직 수준 제도 건전성 지표를 반환합니다.
-    """
-    filtered_nodes, filtered_edges, _ = _get_filtered_data(req)
-
-    if len(filtered_edges) == 0:
-        raise HTTPException(status_code=400, detail="선택한 조건에 해당하는 엣지가 없습니다.")
 
-    G = build_graph(filtered_nodes, filtered_edges)
-    metrics = calculate_system_health_metrics(G, filtered_nodes, filtered_edges)
-    
-    # ★ 동적 벤치마크(Method 1 & 2) 포함
-    benchmarks = get_cached_benchmarks()
-    return {**metrics, "benchmarks": benchmarks}
+    ★ 큐브 조회는 요청 프로세스에서, 큐브에 없는 조합만 프로세스 풀에서 계산합니다.
+    """
+    metrics = org_metrics_from_cube(req)
+    if metrics is None:
+        metrics = await _offloaded("organization", req, compute_org_metrics)
+    return _with_benchmarks(metrics)
 
 
 @router.post("/metrics/individual")
-def api_individual_metrics(req: FilterRequest):
+async def api_individual_metrics(req: FilterRequest):
     """
     개인 수준 평가 참여 패턴 (Top 10%)을 반환합니다.
     
     Why: 평가부담(양), 크로스-조직률(공간), 상호선정률(관계), 그룹폐쇄성(구조)
          4개 핵심 축의 상위 10% 리스트를 프론트엔드의 탭별 테이블에 표시합니다.
     """
-    filtered_nodes, filtered_edges, _ = _get_filtered_data(req)
+    return _individual_from_table(await _person_table_async(req))
 
-    if len(filtered_edges) == 0:
-        raise HTTPException(status_code=400, detail="선택한 조건에 해당하는 엣지가 없습니다.")
 
-    G = build_graph(filtered_nodes, filtered_edges)
-    return calculate_individual_metrics(G, filtered_nodes, filtered_edges)
+@router.post("/metrics/individual/query")
+async def api_individual_query(req: PersonQueryRequest):
+    """
+    필터 대상 전원의 개인 지표 테이블을 정렬·페이지 단위로 조회합니다.
 
+    ★ 테이블은 필터별로 한 번만 계산되어 캐시되므로, 정렬/페이지/임계값만 바꾼 요청은 재계산하지 않습니다.
 
-@router.post("/metrics/subgroup")
-def api_subgroup_metrics(req: SubgroupRequest):
+    Body (필터 조건 외):
+        sort: 정렬 컬럼 (아무 컬럼), order: "desc" | "asc"
+        offset/limit: 오프셋 페이지 (limit ≤ PERSON_QUERY_MAX_LIMIT)
+        cursor: 이전 응답의 next_cursor (키셋 페이지, 지정 시 offset 무시)
+        min_values/max_values: { 컬럼: 값 } 숫자 컬럼 임계값
+
+    Returns:
+        { "total", "matched", "sort", "order", "offset", "limit", "rows": [...], "next_cursor" }
     """
-    하위 조직별 제도 건전성 비교를 반환합니다.
+    return _query_table(req, await _person_table_async(req))
+
+
+@router.post("/metrics/individual/export")
+async def api_individual_export(req: FilterRequest, format: str = "csv", feedback: bool = False):
     """
-    filtered_nodes, filtered_edges, _ = _get_filtered_data(req)
+    필터 대상 전원의 개인 지표 테이블을 파일로 내려받습니다.
+
+    Query:
+        format: "csv" (UTF-8 BOM, Excel 호환) | "parquet" (pyarrow 필요)
+        feedback: true면 작성 피드백 특성(평균 길이, 건수, 건설적 비율) 컬럼 포함
+
+    Why: 테이블 계산은 메모리에서 하되, 직렬화는 청크 단위 제너레이터로 스트리밍하여
+         전사 × 전체 연도 규모에서도 응답 직렬화 메모리가 늘지 않게 합니다.
+    """
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"지원하지 않는 형식입니다: {format} (csv, parquet)")
+    if not is_format_available(format):
+        raise HTTPException(status_code=400, detail="Parquet 내보내기에는 pyarrow가 필요합니다.")
+
+    # ★ 테이블 계산(캐시 miss)은 입장 제어를 거치고, 이후 정리·직렬화는 캐시된 테이블로
+    await _person_table_async(req)
+    table = await asyncio.to_thread(run_individual_table, req, feedback)
+    media_type, ext = EXPORT_FORMATS[format]
+    filename = f"individual_metrics_{'-'.join(map(str, sorted(req.years)))}.{ext}"
+    return StreamingResponse(
+        iter_table_chunks(table, format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
-    if len(filtered_edges) == 0:
-        raise HTTPException(status_code=400, detail="선택한 조건에 해당하는 엣지가 없습니다.")
 
-    G = build_graph(filtered_nodes, filtered_edges)
-    return calculate_subgroup_metrics(filtered_nodes, filtered_edges, G, req.group_col)
+@router.post("/metrics/subgroup")
+async def api_subgroup_metrics(req: SubgroupRequest):
+    """
+    하위 조직별 제도 건전성 비교를 반환합니다. (프로세스 풀에서 계산)
+    """
+    return await _offloaded("subgroup", req, compute_subgroup_metrics)
 
 
 # ──────────────────────────────────────────────
@@ -145,7 +588,7 @@ def api_subgroup_metrics(req: SubgroupRequest):
 # ──────────────────────────────────────────────
 
 @router.post("/metrics/feedback")
-def api_feedback_metrics(req: FilterRequest):
+async def api_feedback_metrics(req: FilterRequest):
     """
     정성 피드백 데이터를 네트워크 분석에 접목합니다.
     NLP를 사용하지 않고 텍스트 길이·입력 패턴만으로 품질을 추정합니다.
@@ -157,115 +600,4 @@ def api_feedback_metrics(req: FilterRequest):
             "collusion_flags": [ 담합 의심 플래그 ],
         }
     """
-    raw_edges, all_nodes = prepare_combined_network_data(req.years)
-    if raw_edges is None or all_nodes is None:
-        raise HTTPException(status_code=404, detail="데이터 없음")
-
-    filtered_nodes, filtered_edges = filter_network_data(
-        all_nodes, raw_edges, req.orgs1, req.orgs2, req.jobs, req.grades
-    )[:2]
-
-    # ── 텍스트 컬럼 탐색 ──
-    feedback_cols = [c for c in raw_edges.columns if '의견' in c or '피드백' in c or '강점' in c or '보완' in c or '코멘트' in c]
-    if not feedback_cols:
-        return {"cross_org_feedback_quality": None, "individual_feedback": [], "collusion_flags": []}
-
-    src_col = [c for c in raw_edges.columns if '평가자사번' in c][0]
-    dst_col = [c for c in raw_edges.columns if '피평가자사번' in c][0]
-
-    # 필터 적용
-    valid_ids = set(filtered_nodes['사번'])
-    fb_df = raw_edges[
-        (raw_edges[src_col].isin(valid_ids)) | (raw_edges[dst_col].isin(valid_ids))
-    ].copy()
-
-    # ── 피드백 길이 계산 ──
-    fb_df['_fb_combined'] = fb_df[feedback_cols].fillna('').astype(str).agg(' '.join, axis=1)
-    fb_df['_fb_len'] = fb_df['_fb_combined'].str.strip().str.len()
-
-    # ── 1단계: 크로스-조직 피드백 품질 비교 ──
-    org_col = 'ORG3_OP' if 'ORG3_OP' in all_nodes.columns else 'ORG2_OP'
-    node_org = all_nodes[['사번', org_col]].drop_duplicates(subset=['사번'])
-    
-    fb_merged = fb_df.merge(
-        node_org.rename(columns={'사번': src_col, org_col: 'src_org'}), on=src_col, how='left'
-    ).merge(
-        node_org.rename(columns={'사번': dst_col, org_col: 'tgt_org'}), on=dst_col, how='left'
-    )
-    fb_merged['_same_org'] = fb_merged['src_org'] == fb_merged['tgt_org']
-
-    same_len = fb_merged[fb_merged['_same_org']]['_fb_len'].mean()
-    cross_len = fb_merged[~fb_merged['_same_org']]['_fb_len'].mean()
-
-    cross_quality = {
-        "same_org_avg_len": round(same_len, 1) if not pd.isna(same_len) else 0,
-        "cross_org_avg_len": round(cross_len, 1) if not pd.isna(cross_len) else 0,
-        "org_level_used": org_col,
-    }
-
-    # ── 2단계: 개인별 피드백 길이 + 건설적 피드백 비율 ──
-    # "건설적 피드백" = 보완점/개선 관련 컬럼이 비어있지 않은 비율
-    improvement_cols = [c for c in feedback_cols if '보완' in c or '개선' in c or '발전' in c]
-    
-    individual_fb = fb_df.groupby(src_col).agg(
-        avg_feedback_len=('_fb_len', 'mean'),
-        feedback_count=('_fb_len', 'count'),
-    ).reset_index().rename(columns={src_col: '사번'})
-    individual_fb['avg_feedback_len'] = individual_fb['avg_feedback_len'].round(1)
-
-    if improvement_cols:
-        fb_df['_has_constructive'] = fb_df[improvement_cols].fillna('').astype(str).apply(
-            lambda row: any(len(v.strip()) > 5 for v in row), axis=1
-        )
-        constructive_rate = fb_df.groupby(src_col)['_has_constructive'].mean().reset_index()
-        constructive_rate.columns = ['사번', 'constructive_rate']
-        constructive_rate['constructive_rate'] = (constructive_rate['constructive_rate'] * 100).round(1)
-        individual_fb = individual_fb.merge(constructive_rate, on='사번', how='left')
-    else:
-        individual_fb['constructive_rate'] = None
-
-    # 노드 정보 결합
-    individual_fb = individual_fb.merge(
-        filtered_nodes[['사번', '성명', 'ORG1_OP', 'ORG2_OP', 'GRADE']],
-        on='사번', how='inner'
-    )
-    individual_fb = individual_fb.sort_values('avg_feedback_len', ascending=True).head(50)
-
-    # ── 3단계: 담합 의심 플래그 ──
-    # 조건: 상호선정 + 피드백 극단적으로 짧음 (보완점 기피)
-    edge_set = set(zip(fb_df[src_col] if src_col in fb_df.columns else fb_df['source'],
-                       fb_df[dst_col] if dst_col in fb_df.columns else fb_df['target']))
-
-    collusion_flags = []
-    for _, row in individual_fb.iterrows():
-        person_id = row['사번']
-        # 상호선정 확인
-        outgoing = {t for s, t in edge_set if s == person_id}
-        incoming = {s for s, t in edge_set if t == person_id}
-        mutual_count = len(outgoing & incoming)
-        total_connections = len(outgoing | incoming)
-        mutual_rate = mutual_count / total_connections if total_connections > 0 else 0
-
-        # 담합 의심 조건: 상호선정률 60%+ & 피드백 짧고 & 건설적 비율 낮음
-        is_suspect = (
-            mutual_rate > 0.6
-            and row['avg_feedback_len'] < 30
-            and (row.get('constructive_rate') is not None and row['constructive_rate'] < 20)
-        )
-
-        if is_suspect:
-            collusion_flags.append({
-                "사번": person_id,
-                "성명": row['성명'],
-                "ORG1_OP": row['ORG1_OP'],
-                "mutual_rate": round(mutual_rate * 100, 1),
-                "avg_feedback_len": row['avg_feedback_len'],
-                "constructive_rate": row.get('constructive_rate', 0),
-                "flag": "⚠️ 상호선정 高 + 피드백 짧음 + 보완점 기피",
-            })
-
-    return {
-        "cross_org_feedback_quality": cross_quality,
-        "individual_feedback": individual_fb.to_dict(orient='records'),
-        "collusion_flags": collusion_flags,
-    }
+    return await _offloaded("feedback", req, compute_feedback_metrics)
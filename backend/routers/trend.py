@@ -0,0 +1,123 @@
+"""
+routers/trend.py — 임의 필터의 연도별 추세 API를 정의합니다.
+
+★ 대시보드를 연도마다 다시 실행하지 않아도, 선택한 조직(예: ORG2 하나)의 제도 건전성 지표와
+  하위 조직 지표가 해마다 어떻게 변했는지 한 번에 돌려줍니다.
+  - 연도별 계산은 동시에 시작합니다 (프로세스 풀 워커마다 한 해씩, 큐브에 있는 조합은 바로 응답).
+  - 캐시에 없는 해가 있으면 그 해들의 추정 비용 합으로 입장 슬롯 하나를 잡고 계산합니다
+    (/metrics/*와 같은 입장 제어 — 연도마다 슬롯을 잡으면 긴 추세 하나가 대기열을 혼자 채움).
+  - 연도별 결과는 (연도 + 필터) 키로 캐시되어 연도 범위가 겹치는 추세 요청이 재사용합니다.
+  - 전사 벤치마크 사분위와 연도별 전사 값을 같은 연도 축으로 함께 제공합니다.
+"""
+import asyncio
+from fastapi import APIRouter, HTTPException
+from config import AVAILABLE_YEARS
+from services.data_loader import get_cached_benchmarks, load_qualitative_data, refresh_stale_sources
+from services.trend import build_trend, get_trend_point_async, has_trend_point
+from services.admission import admission_slot, estimate_cost
+from services.compute_pool import offload_async
+from services.perf import TimedRoute, stage
+from routers.network import (
+    SubgroupRequest,
+    compute_org_metrics,
+    compute_subgroup_metrics,
+    filter_key,
+    org_metrics_from_cube,
+)
+
+router = APIRouter(prefix="/api/metrics", tags=["trend"], route_class=TimedRoute)
+
+
+class TrendRequest(SubgroupRequest):
+    """추세 조회: 기본 필터(연도 = 추세 범위, 생략 시 데이터가 있는 전체 연도) + 하위 조직 기준 컬럼"""
+    years: list[int] | None = None
+    subgroups: bool = True   # False면 조직 지표만 (하위 조직 계산 생략)
+
+
+def _years_with_data() -> list[int]:
+    return [y for y in sorted(AVAILABLE_YEARS) if load_qualitative_data(y) is not None]
+
+
+async def _or_none(awaitable):
+    """그 해에 데이터(404)나 엣지(400)가 없으면 None — 추세에서는 빈 자리로 표시"""
+    try:
+        return await awaitable
+    except HTTPException as e:
+        if e.status_code in (400, 404):
+            return None
+        raise
+
+
+async def _org_point(req: SubgroupRequest):
+    metrics = org_metrics_from_cube(req)
+    if metrics is not None:
+        return metrics
+    return await _or_none(offload_async(compute_org_metrics, req))
+
+
+def _year_request(req: TrendRequest, year: int) -> SubgroupRequest:
+    return SubgroupRequest(**{**req.model_dump(exclude={"subgroups"}), "years": [year]})
+
+
+def _point_key(year_req: SubgroupRequest, subgroups: bool) -> tuple:
+    # 하위 조직 기준(group_col)은 filter_key에 포함됨
+    return filter_key(year_req) + (subgroups,)
+
+
+def _missing_cost(req: TrendRequest, years: list[int]) -> tuple[int, int]:
+    """캐시에 없는 해들의 추정 비용 합 (노드 수, 엣지 수)"""
+    nodes = edges = 0
+    for year in years:
+        if not has_trend_point(_point_key(_year_request(req, year), req.subgroups)):
+            n, e = estimate_cost([year], req.orgs1, req.orgs2, req.jobs, req.grades)
+            nodes, edges = nodes + n, edges + e
+    return nodes, edges
+
+
+async def _year_point(req: TrendRequest, year: int) -> dict:
+    year_req = _year_request(req, year)
+
+    async def compute() -> dict:
+        if not req.subgroups:
+            return {"organization": await _org_point(year_req), "subgroups": None}
+        org, subgroups = await asyncio.gather(
+            _org_point(year_req),
+            _or_none(offload_async(compute_subgroup_metrics, year_req)),
+        )
+        return {"organization": org, "subgroups": subgroups}
+
+    return await get_trend_point_async(_point_key(year_req, req.subgroups), compute)
+
+
+@router.post("/trend")
+async def api_trend(req: TrendRequest):
+    """
+    필터 대상의 연도별 조직 지표(+ 하위 조직 지표) 시계열과 전사 벤치마크 사분위를 반환합니다.
+
+    Body: FilterRequest + group_col(하위 조직 기준, 기본 ORG1_OP) + subgroups(기본 true)
+          years는 추세 범위입니다 (생략 시 데이터가 있는 전체 연도).
+
+    Returns:
+        { years, missing_years, series: {지표: [연도별 값|null]},
+          benchmarks: {지표: {q1, median, q3, min, max, total_avg, global: [연도별 전사 값|null]}},
+          subgroups: {group_col, groups: [{group_name, series}]} }
+    """
+    if req.years is None:
+        years = await asyncio.to_thread(_years_with_data)
+    else:
+        years = sorted(set(req.years))
+    if not years:
+        raise HTTPException(status_code=400, detail="분석할 연도를 1개 이상 선택해주세요.")
+
+    # 원본 변경 확인(파일 stat)은 이벤트 루프 밖에서 — 바뀌었으면 연도별 캐시도 비워짐
+    await asyncio.to_thread(refresh_stale_sources, years)
+    with stage("admission"):
+        nodes, edges = await asyncio.to_thread(_missing_cost, req, years)
+    async with admission_slot(nodes, edges):
+        with stage("trend_years"):
+            points = await asyncio.gather(*(_year_point(req, y) for y in years))
+    if all(p["organization"] is None for p in points):
+        raise HTTPException(status_code=404, detail="선택한 연도에 해당하는 데이터가 없습니다.")
+
+    with stage("trend_assemble"):
+        return build_trend(years, points, get_cached_benchmarks(), req.group_col if req.subgroups else None)
@@ -0,0 +1,244 @@
+"""
+adjacency_index.py — 연도별 인접 인덱스(CSR)로 에고 네트워크를 빠르게 조회합니다.
+
+핵심 설계 결정:
+  - 데이터 로드 시 연도마다 사번 → 정수 코드와 나가는/들어오는 이웃 CSR 배열을 만들어 둡니다.
+  - 에고 조회는 DataFrame 필터링이나 전체 그래프 생성 없이 CSR 슬라이스만으로 k-hop 이웃을 모읍니다.
+  - 여러 연도 선택 시 연도별 인덱스의 합집합으로 계산합니다 (쌍별 엣지 행 수는 연도별로 합산해 엣지 하나로 응답).
+  - 개인 지표는 필터 없는 전체 네트워크 기준이며, 그룹 폐쇄성은 에고 + 이웃의 작은 부분 그래프로
+    계산합니다 (방향 clustering은 이웃 사이 엣지만 사용하므로 전체 그래프 값과 같습니다).
+"""
+import networkx as nx
+import numpy as np
+import pandas as pd
+from config import AVAILABLE_YEARS, EGO_MAX_NODES
+from .cache_registry import TrackedCache
+from .data_loader import prepare_combined_network_data, normalize_employee_ids
+
+NODE_ATTRS = ['성명', 'ORG1_OP', 'ORG2_OP', 'ORG3_OP', 'JOB_FAMILY_CODE', 'GRADE']
+
+_adjacency_cache = TrackedCache("adjacency", description="연도 → 인접 인덱스 (CSR)", derived=True, snapshot=True)
+
+
+class YearAdjacency:
+    """한 연도의 인접 인덱스. 코드는 ids(정렬된 고유 사번)의 위치입니다."""
+
+    def __init__(self, year: int, edges: pd.DataFrame, nodes: pd.DataFrame):
+        src_col = [c for c in edges.columns if '평가자사번' in c][0]
+        dst_col = [c for c in edges.columns if '피평가자사번' in c][0]
+        src_ids = normalize_employee_ids(edges[src_col])
+        dst_ids = normalize_employee_ids(edges[dst_col])
+
+        self.year = year
+        self.ids = pd.Index(pd.unique(pd.concat([src_ids, dst_ids, nodes['사번']])), dtype=object).sort_values()
+        n = len(self.ids)
+        src = self.ids.get_indexer(src_ids).astype(np.int64)
+        dst = self.ids.get_indexer(dst_ids).astype(np.int64)
+
+        # (source, target) 쌍별 엣지 행 수
+        pair_keys, counts = np.unique(src * n + dst, return_counts=True)
+        pair_src, pair_dst = pair_keys // n, pair_keys % n
+        self.out_indptr, self.out_indices, self.out_counts = self._csr(pair_src, pair_dst, counts, n)
+        self.in_indptr, self.in_indices, self.in_counts = self._csr(pair_dst, pair_src, counts, n)
+
+    @staticmethod
+    def _csr(rows: np.ndarray, cols: np.ndarray, counts: np.ndarray, n: int):
+        order = np.lexsort((cols, rows))
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=n), out=indptr[1:])
+        return indptr, cols[order].astype(np.int32), counts[order].astype(np.int32)
+
+    def codes(self, person_ids) -> np.ndarray:
+        """사번 목록 → 이 연도에 있는 코드만"""
+        codes = self.ids.get_indexer(pd.Index(list(person_ids), dtype=object))
+        return codes[codes >= 0]
+
+    @staticmethod
+    def _gather(indptr: np.ndarray, indices: np.ndarray, codes: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """codes 각각의 CSR 행을 이어 붙여 (행 소유자 코드, 이웃 위치) 배열로 반환합니다."""
+        starts, ends = indptr[codes], indptr[codes + 1]
+        lengths = ends - starts
+        owners = np.repeat(codes, lengths)
+        positions = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+        return owners, positions
+
+    def neighbors(self, codes: np.ndarray) -> np.ndarray:
+        """codes의 나가는 + 들어오는 이웃 코드 (중복 제거 X)"""
+        _, out_pos = self._gather(self.out_indptr, self.out_indices, codes)
+        _, in_pos = self._gather(self.in_indptr, self.in_indices, codes)
+        return np.concatenate([self.out_indices[out_pos], self.in_indices[in_pos]])
+
+    def induced_pairs(self, codes: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """codes 사이의 (source, target, 엣지 행 수) — 양 끝이 모두 codes에 속한 쌍"""
+        inside = np.zeros(len(self.ids), dtype=bool)
+        inside[codes] = True
+        owners, pos = self._gather(self.out_indptr, self.out_indices, codes)
+        targets = self.out_indices[pos]
+        keep = inside[targets]
+        return owners[keep], targets[keep].astype(np.int64), self.out_counts[pos][keep]
+
+
+# ──────────────────────────────────────────────
+# 인덱스 생성 / 조회
+# ──────────────────────────────────────────────
+
+def get_year_adjacency(year: int) -> YearAdjacency | None:
+    return _adjacency_cache.get_or_compute(year, lambda: _build_year_adjacency(year))
+
+
+def _build_year_adjacency(year: int) -> YearAdjacency | None:
+    edges, nodes = prepare_combined_network_data([year])
+    if edges is None or nodes is None:
+        return None
+    return YearAdjacency(year, edges, nodes)
+
+
+def get_node_attrs(years: list[int]) -> pd.DataFrame | None:
+    """
+    선택 연도의 노드 속성 (사번 인덱스).
+
+    ★ 여러 연도면 prepare_combined_network_data와 같이 선택 연도 중 최신 HR을 씁니다.
+      연도별 인덱스에서 조합하면 특정 연도 엣지에 없는 사람의 최신 HR을 놓치므로 결합 노드를 그대로 씁니다.
+    """
+    year_key = tuple(sorted(set(years)))
+    return _adjacency_cache.get_or_compute(("attrs", year_key), lambda: _build_node_attrs(list(year_key)))
+
+
+def _build_node_attrs(years: list[int]) -> pd.DataFrame | None:
+    _, nodes = prepare_combined_network_data(years)
+    if nodes is None:
+        return None
+    cols = [c for c in NODE_ATTRS if c in nodes.columns]
+    return nodes.drop_duplicates(subset=['사번']).set_index('사번')[cols]
+
+
+def build_adjacency_indexes() -> None:
+    """서버 시작 시 전체 연도의 인접 인덱스를 미리 만듭니다."""
+    built = [y for y in AVAILABLE_YEARS if get_year_adjacency(y) is not None]
+    if built:
+        get_node_attrs(built)
+        print(f"  ✓ 인접 인덱스 생성 완료 ({len(built)}개 연도)")
+
+
+# ──────────────────────────────────────────────
+# 에고 네트워크
+# ──────────────────────────────────────────────
+
+def _ego_metrics(ego: str, pairs: dict, attrs: pd.DataFrame) -> dict:
+    """에고의 개인 지표 (person_table과 같은 정의, 필터 없는 전체 네트워크 기준)"""
+    incident = {(s, t): c for (s, t), c in pairs.items() if s == ego or t == ego}
+    out_targets = {t for s, t in incident if s == ego}
+    in_sources = {s for s, t in incident if t == ego}
+
+    # 크로스-조직: 엣지 행 기준 (ORG3 없으면 ORG2)
+    level = 'ORG3_OP' if 'ORG3_OP' in attrs.columns else 'ORG2_OP'
+    org = attrs[level].to_dict()
+    rows = sum(incident.values())
+    cross_rows = sum(c for (s, t), c in incident.items() if org.get(s) != org.get(t))
+    mutual = sum(1 for (s, t) in incident if (t, s) in pairs)
+
+    # 그룹 폐쇄성: 에고 + 1-hop 이웃 사이의 엣지만으로 충분
+    local = out_targets | in_sources | {ego}
+    sub = nx.DiGraph()
+    sub.add_node(ego)
+    sub.add_edges_from(p for p in pairs if p[0] in local and p[1] in local)
+
+    return {
+        "selection_burden": len(out_targets),
+        "in_degree": len(in_sources),
+        "cross_org_rate": round(cross_rows / rows, 4) if rows else 0.0,
+        "mutual_selection": round(mutual / len(incident), 4) if incident else 0.0,
+        "group_closure": round(nx.clustering(sub, ego), 4),
+    }
+
+
+def get_ego_network(
+    person_id: str,
+    years: list[int],
+    hops: int,
+    core_filter=None
+) -> dict | None:
+    """
+    사번의 k-hop 에고 네트워크를 Vis.js 형식으로 반환합니다.
+
+    Args:
+        core_filter: 노드 속성 DataFrame(사번 인덱스) → 핵심 노드 bool 배열 (None이면 전원 핵심)
+                     조직 필터에 맞지 않는 이웃은 Ghost 노드로 표시됩니다.
+
+    Returns:
+        graph_to_vis_json과 같은 형식 + { "ego", "hops", "metrics", summary.truncated } — 사번이 없으면 None
+    """
+    from .network_builder import vis_core_node, vis_ghost_node, vis_edge, org_color_map
+
+    indexes = [i for i in (get_year_adjacency(y) for y in sorted(set(years))) if i is not None]
+    if not any(len(i.codes([person_id])) for i in indexes):
+        return None
+
+    # ── k-hop BFS (방향 무시) ──
+    hop_of = {person_id: 0}
+    frontier = [person_id]
+    truncated = False
+    for hop in range(1, hops + 1):
+        found = set()
+        for index in indexes:
+            codes = index.codes(frontier)
+            if len(codes):
+                found.update(index.ids[np.unique(index.neighbors(codes))])
+        new_ids = [pid for pid in found if pid not in hop_of]
+        # ★ 1-hop은 에고 지표에 필요하므로 항상 포함하고, 2-hop부터 노드 상한을 적용
+        if hop > 1 and len(hop_of) + len(new_ids) > EGO_MAX_NODES:
+            truncated = True
+            break
+        for pid in new_ids:
+            hop_of[pid] = hop
+        frontier = new_ids
+        if not frontier:
+            break
+
+    # ── 유도 부분 그래프의 엣지 (연도별 행 수 합산 + 평가 연도) ──
+    member_ids = list(hop_of)
+    pairs: dict[tuple[str, str], int] = {}
+    pair_years: dict[tuple[str, str], list[int]] = {}
+    for index in indexes:
+        src, dst, counts = index.induced_pairs(index.codes(member_ids))
+        for s, t, c in zip(index.ids[src], index.ids[dst], counts):
+            pairs[(s, t)] = pairs.get((s, t), 0) + int(c)
+            pair_years.setdefault((s, t), []).append(index.year)
+
+    attrs = get_node_attrs(years).reindex(member_ids)
+    metrics = _ego_metrics(person_id, pairs, attrs)
+
+    # ── Vis.js 변환 (graph_to_vis_json과 같은 스타일) ──
+    is_core = np.asarray(core_filter(attrs)) if core_filter is not None else np.ones(len(attrs), dtype=bool)
+    core = attrs[is_core]
+    ghost_ids = set(attrs.index[~is_core])
+    color_map = org_color_map(core['ORG1_OP'])
+
+    vis_nodes = []
+    for pid, row in core.iterrows():
+        node = vis_core_node({**row.to_dict(), '사번': pid}, color_map)
+        vis_nodes.append({**node, "hop": hop_of[pid], "isEgo": pid == person_id})
+    for pid, row in attrs[~is_core].iterrows():
+        vis_nodes.append({**vis_ghost_node(pid, row['성명'], row['ORG1_OP']), "hop": hop_of[pid], "isEgo": pid == person_id})
+
+    # 전체 네트워크와 같이 쌍마다 엣지 하나 (value = 평가 건수)
+    vis_edges = [
+        vis_edge(s, t, (s in ghost_ids) or (t in ghost_ids), count, pair_years[(s, t)])
+        for (s, t), count in pairs.items()
+    ]
+
+    return {
+        "ego": person_id,
+        "hops": hops,
+        "nodes": vis_nodes,
+        "edges": vis_edges,
+        "summary": {
+            "node_count": len(core),
+            "edge_count": len(vis_edges),
+            "evaluation_count": sum(pairs.values()),
+            "ghost_count": len(ghost_ids),
+            "truncated": truncated,
+        },
+        "color_legend": color_map,
+        "metrics": metrics,
+    }
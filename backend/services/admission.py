@@ -0,0 +1,297 @@
+"""
+admission.py — 분석 요청의 비용을 계산 전에 추정하고, 비용 등급별로 동시 실행 수를 제한합니다 (admission control).
+
+핵심 설계 결정:
+  - 비용 추정: 데이터 로드 시 연도마다 (ORG1, ORG2, 직군, 직급) 조합(그룹)별 인원 수와 그룹 쌍별 쌍 엣지 수를
+    만들어 둡니다. 요청이 오면 필터에 맞는 그룹만 표시해 노드 수 N, 엣지 수 E를 구합니다 (한 해는 정확한 값).
+    여러 연도는 전체 데이터에서 잰 연도 간 반복 비율로 연도별 값을 합칩니다. 조회는 연도당 1~3ms입니다.
+  - 등급: N + E가 ADMISSION_LIGHT_COST 미만이면 light(제한 없음), ADMISSION_HEAVY_COST 이상이면 heavy, 나머지는 medium.
+    분석 시간은 종류와 무관하게 N + E에 거의 비례합니다 (합성 데이터 실측).
+  - medium/heavy는 등급마다 동시 실행 슬롯과 길이 제한이 있는 FIFO 대기열을 둡니다.
+    대기열이 가득 찼거나 ADMISSION_MAX_WAIT_SEC 안에 차례가 오지 않으면 503 + Retry-After로 바로 응답합니다.
+    (모두 받아 두고 모두 늦게 끝내는 것보다, 넘치는 요청은 빨리 돌려보내 다시 시도하게 합니다)
+  - Retry-After = 등급의 최근 평균 실행 시간 × (대기 중 + 1) ÷ 슬롯 수 (1 ~ ADMISSION_RETRY_AFTER_MAX_SEC초).
+  - 슬롯은 실제 계산을 시작하는 쪽만 잡습니다. 캐시 적중(큐브, 개인 지표 테이블)이나 진행 중인 같은 계산을
+    기다리는 요청(single-flight)은 슬롯을 쓰지 않습니다.
+
+Why: 평가 시즌에 여러 관리자가 필터 없이 전체 연도로 동시에 분석을 실행하면, 요청마다 전사 그래프 생성과
+     개인 지표 계산이 겹쳐 스레드 풀이 포화되고 /api/filter-options 같은 가벼운 요청까지 시간 초과가 났습니다.
+     분석 계산은 입장한 뒤에만 이벤트 루프 밖(프로세스 풀/asyncio 실행기)에서 돌고, FastAPI 동기 핸들러용
+     스레드 풀은 필터 선택지·조직 트리·검색·데이터 버전 같은 가벼운 엔드포인트 몫으로 남습니다.
+
+메모: 대기열과 슬롯은 이벤트 루프 안에서만 다룹니다 (async 핸들러 전용, 락 불필요).
+      백그라운드 잡(/api/jobs)은 JOB_WORKERS 스레드로 이미 동시 실행 수가 제한되어 있어 여기를 거치지 않습니다.
+"""
+import asyncio
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+import numpy as np
+import pandas as pd
+from fastapi import HTTPException
+from config import (
+    AVAILABLE_YEARS,
+    ADMISSION_ENABLED,
+    ADMISSION_LIGHT_COST,
+    ADMISSION_HEAVY_COST,
+    ADMISSION_SLOTS,
+    ADMISSION_QUEUE,
+    ADMISSION_MAX_WAIT_SEC,
+    ADMISSION_RETRY_AFTER_MAX_SEC,
+)
+from .cache_registry import TrackedCache
+from .data_loader import filter_nodes, prepare_combined_network_data
+from .edge_aggregation import get_edge_pairs
+from .perf import stage
+
+GROUP_COLS = ['ORG1_OP', 'ORG2_OP', 'JOB_FAMILY_CODE', 'GRADE']
+
+_size_cache = TrackedCache(
+    "admission_sizes", description="연도 → 조직·직군·직급 조합별 인원/엣지 수 (요청 비용 추정)",
+    derived=True, snapshot=True,
+)
+
+
+# ──────────────────────────────────────────────
+# 비용 추정
+# ──────────────────────────────────────────────
+
+class YearSizes:
+    """
+    한 연도의 조합(그룹)별 인원 수 + 그룹 쌍별 쌍 엣지 수.
+
+    ★ 필터는 그룹 속성만으로 결정되므로, 한 해 안에서는 "핵심 노드에 닿는 엣지 수"가 그룹 쌍 단위로 정확히 나옵니다.
+    """
+
+    def __init__(self, nodes: pd.DataFrame, pairs: pd.DataFrame):
+        nodes = nodes.drop_duplicates(subset=['사번'])
+        cols = [c for c in GROUP_COLS if c in nodes.columns]
+        gid = nodes.groupby(cols, dropna=False).ngroup().to_numpy()
+        groups = nodes[cols].assign(gid=gid).drop_duplicates(subset=['gid']).sort_values('gid')
+        self.groups = groups.reset_index(drop=True).assign(nodes=np.bincount(gid, minlength=len(groups)))
+        ids = pd.Index(nodes['사번'])
+
+        # 그룹 번호 + 1 (0 = 노드 표에 없는 사번 — 핵심 노드가 될 수 없음)
+        person_gid = np.append(gid + 1, 0)
+        src = person_gid[ids.get_indexer(pairs['source'])]
+        dst = person_gid[ids.get_indexer(pairs['target'])]
+        width = len(self.groups) + 1
+        keys, counts = np.unique(src.astype(np.int64) * width + dst, return_counts=True)
+        self.pair_src, self.pair_dst, self.pair_counts = keys // width, keys % width, counts
+
+    def estimate(self, orgs1, orgs2, jobs, grades) -> tuple[int, int]:
+        matched = filter_nodes(self.groups, orgs1, orgs2, jobs, grades)
+        core = np.zeros(len(self.groups) + 1, dtype=bool)
+        core[matched['gid'].to_numpy() + 1] = True
+        touching = core[self.pair_src] | core[self.pair_dst]
+        return int(matched['nodes'].sum()), int(self.pair_counts[touching].sum())
+
+
+def _build_year_sizes(year: int) -> YearSizes | None:
+    _, nodes = prepare_combined_network_data([year])
+    pairs = get_edge_pairs([year])
+    if nodes is None or pairs is None:
+        return None
+    return YearSizes(nodes, pairs)
+
+
+def _year_sizes(year: int) -> YearSizes | None:
+    return _size_cache.get_or_compute(year, lambda: _build_year_sizes(year))
+
+
+def _build_overlap() -> tuple[float, float]:
+    """
+    여러 연도 합 보정 비율 (노드, 엣지): (고유 수 - 최대 연도) / (연도별 합 - 최대 연도).
+
+    ★ 같은 사람·같은 쌍은 해마다 반복되므로 여러 연도의 분석 크기는 최대 연도 값과 연도별 합 사이에 있습니다.
+      전체 데이터 연도에서 잰 반복 비율을 요청의 연도 조합에도 씁니다.
+    """
+    ids, pair_keys = [], []
+    for year in AVAILABLE_YEARS:
+        _, nodes = prepare_combined_network_data([year])
+        pairs = get_edge_pairs([year])
+        if nodes is not None and pairs is not None:
+            ids.append(pd.Index(nodes['사번']).unique())
+            pair_keys.append(pairs['source'].astype(str) + "\t" + pairs['target'].astype(str))
+
+    def ratio(parts) -> float:
+        sizes = [len(p) for p in parts]
+        total, largest = sum(sizes), max(sizes, default=0)
+        if total <= largest:
+            return 1.0
+        unique = len(pd.concat([pd.Series(p) for p in parts]).unique())
+        return (unique - largest) / (total - largest)
+
+    return ratio(ids), ratio(pair_keys)
+
+
+def estimate_cost(
+    years: list[int],
+    orgs1: list[str],
+    orgs2: list[str],
+    jobs: list[str],
+    grades: list[str]
+) -> tuple[int, int]:
+    """필터 조건의 (노드 수, 엣지 수) 추정 — 핵심 노드 + 핵심 노드에 닿는 쌍 엣지 (Ghost 규칙과 같은 범위)"""
+    per_year = [sizes.estimate(orgs1, orgs2, jobs, grades)
+                for sizes in (_year_sizes(y) for y in sorted(set(years))) if sizes is not None]
+    if len(per_year) <= 1:
+        return per_year[0] if per_year else (0, 0)
+
+    overlap = _size_cache.get_or_compute("overlap", _build_overlap)
+    estimate = []
+    for values, ratio in zip(zip(*per_year), overlap):
+        largest = max(values)
+        estimate.append(int(largest + (sum(values) - largest) * ratio))
+    return estimate[0], estimate[1]
+
+
+def cost_class(nodes: int, edges: int) -> str:
+    cost = nodes + edges
+    if cost < ADMISSION_LIGHT_COST:
+        return "light"
+    return "heavy" if cost >= ADMISSION_HEAVY_COST else "medium"
+
+
+def build_admission_tables() -> None:
+    """서버 시작 시 연도별 비용 추정 표와 연도 간 반복 비율을 미리 만듭니다."""
+    built = [y for y in AVAILABLE_YEARS if _year_sizes(y) is not None]
+    if built:
+        node_ratio, edge_ratio = _size_cache.get_or_compute("overlap", _build_overlap)
+        print(f"  ✓ 요청 비용 추정 표 생성 완료 ({len(built)}개 연도, 연도 간 새 노드/엣지 비율 "
+              f"{node_ratio:.2f}/{edge_ratio:.2f})")
+
+
+# ──────────────────────────────────────────────
+# 등급별 슬롯 + 대기열
+# ──────────────────────────────────────────────
+
+class _Lane:
+    """한 비용 등급의 동시 실행 슬롯과 FIFO 대기열"""
+
+    def __init__(self, name: str, slots: int, queue_max: int):
+        self.name = name
+        self.slots = max(1, slots)
+        self.queue_max = queue_max
+        self.active = 0
+        self.waiters: deque[asyncio.Future] = deque()
+        self.avg_hold_sec: float | None = None
+        self.admitted = 0
+        self.queued = 0
+        self.rejected = 0
+        self.timed_out = 0
+
+    def retry_after(self) -> int:
+        """앞선 대기 + 실행 중 작업이 빠지는 데 걸릴 시간 추정 (초)"""
+        hold = self.avg_hold_sec if self.avg_hold_sec is not None else 1.0
+        estimate = math.ceil(hold * (len(self.waiters) + 1) / self.slots)
+        return int(min(ADMISSION_RETRY_AFTER_MAX_SEC, max(1, estimate)))
+
+    def _overloaded(self, reason: str) -> HTTPException:
+        retry_after = self.retry_after()
+        return HTTPException(
+            status_code=503,
+            detail=f"분석 요청이 많아 처리하지 못했습니다 ({reason}). {retry_after}초 후 다시 시도하세요.",
+            headers={"Retry-After": str(retry_after)},
+        )
+
+    async def acquire(self) -> None:
+        if self.active < self.slots and not self.waiters:
+            self.active += 1
+            self.admitted += 1
+            return
+        if len(self.waiters) >= self.queue_max:
+            self.rejected += 1
+            raise self._overloaded("대기열 초과")
+
+        future = asyncio.get_running_loop().create_future()
+        self.waiters.append(future)
+        self.queued += 1
+        try:
+            await asyncio.wait_for(future, ADMISSION_MAX_WAIT_SEC)
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            self._drop(future)
+            raise self._overloaded("대기 시간 초과") from None
+        except BaseException:
+            # 차례를 넘겨받은 직후 취소되면 슬롯을 다음 대기자에게 돌려줌
+            if future.done() and not future.cancelled():
+                self.release()
+            else:
+                self._drop(future)
+            raise
+        self.admitted += 1
+
+    def _drop(self, future: asyncio.Future) -> None:
+        future.cancel()
+        try:
+            self.waiters.remove(future)
+        except ValueError:
+            pass
+
+    def release(self) -> None:
+        # ★ 대기자가 있으면 슬롯을 그대로 넘김 (active 유지) — 새로 온 요청이 대기자를 앞지르지 않음
+        while self.waiters:
+            future = self.waiters.popleft()
+            if not future.done():
+                future.set_result(None)
+                return
+        self.active -= 1
+
+    def record(self, held_sec: float) -> None:
+        self.avg_hold_sec = held_sec if self.avg_hold_sec is None else 0.8 * self.avg_hold_sec + 0.2 * held_sec
+
+    def stats(self) -> dict:
+        return {
+            "slots": self.slots,
+            "queue_max": self.queue_max,
+            "active": self.active,
+            "waiting": len(self.waiters),
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "avg_hold_sec": round(self.avg_hold_sec, 3) if self.avg_hold_sec is not None else None,
+            "retry_after_sec": self.retry_after(),
+        }
+
+
+_lanes = {name: _Lane(name, ADMISSION_SLOTS[name], ADMISSION_QUEUE[name]) for name in ("medium", "heavy")}
+_light_count = 0
+
+
+@asynccontextmanager
+async def admission_slot(nodes: int, edges: int):
+    """
+    추정 비용 (nodes, edges)의 등급 슬롯을 잡고 블록을 실행합니다. light이거나 입장 제어가 꺼져 있으면 바로 실행.
+
+    Raises:
+        HTTPException(503, Retry-After): 대기열이 가득 찼거나 대기 시간이 한도를 넘었을 때
+    """
+    global _light_count
+    lane = _lanes.get(cost_class(nodes, edges)) if ADMISSION_ENABLED else None
+    if lane is None:
+        _light_count += 1
+        yield
+        return
+
+    with stage("admission_wait"):
+        await lane.acquire()
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        lane.record(time.perf_counter() - started)
+        lane.release()
+
+
+def admission_stats() -> dict:
+    """/api/debug/perf용 입장 제어 상태"""
+    return {
+        "enabled": ADMISSION_ENABLED,
+        "light_cost": ADMISSION_LIGHT_COST,
+        "heavy_cost": ADMISSION_HEAVY_COST,
+        "light_requests": _light_count,
+        "lanes": {name: lane.stats() for name, lane in _lanes.items()},
+    }
@@ -0,0 +1,285 @@
+"""
+cache_registry.py — 전역 데이터 캐시의 통계·메모리 추적과 관리 기능을 제공합니다.
+
+핵심 설계 결정:
+  - 모듈 전역 캐시는 dict 대신 TrackedCache를 사용하고, 생성 시 registry에 자동 등록됩니다.
+  - 항목 수, 추정 메모리(deep bytes), 적중/실패/축출 횟수, 항목 나이를 추적합니다.
+  - max_entries가 있으면 LRU 방식으로 가장 오래 사용되지 않은 항목부터 축출합니다.
+  - 메모리 추정은 비용이 크므로 통계 조회 시점에 계산하고, 값이 바뀌기 전까지 재사용합니다.
+  - derived=True 캐시는 원본 데이터에서 파생된 값이므로, 원본을 다시 로드할 때 clear_derived()로 함께 비웁니다.
+  - snapshot=True 캐시는 서버 시작 시 워밍업으로 채워지는 상태이므로 웜 스냅샷(warm_snapshot)에 저장·복원됩니다.
+  - get_or_compute()는 같은 키의 동시 miss를 single-flight로 합쳐 계산을 한 번만 실행합니다.
+    (async 핸들러는 get_or_compute_async()로 이벤트 루프를 막지 않고 기다립니다)
+    계산 도중 clear()가 일어나면(데이터 재로드) 이전 데이터로 만든 결과는 저장하지 않습니다.
+"""
+import fnmatch
+import sys
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from .single_flight import SingleFlight
+
+
+def estimate_deep_bytes(obj, _seen: set | None = None) -> int:
+    """DataFrame/ndarray/컨테이너를 재귀적으로 따라가 대략적인 메모리 사용량을 추정합니다."""
+    seen = _seen if _seen is not None else set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(deep=True, index=True).sum())
+    if isinstance(obj, (pd.Series, pd.Index)):
+        return int(obj.memory_usage(deep=True))
+    if isinstance(obj, np.ndarray):
+        if obj.dtype == object:
+            return obj.nbytes + sum(estimate_deep_bytes(v, seen) for v in obj.ravel())
+        return obj.nbytes
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(
+            estimate_deep_bytes(k, seen) + estimate_deep_bytes(v, seen) for k, v in obj.items()
+        )
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return sys.getsizeof(obj) + sum(estimate_deep_bytes(v, seen) for v in obj)
+    if hasattr(obj, "__dict__") and not isinstance(obj, type):
+        return sys.getsizeof(obj) + estimate_deep_bytes(vars(obj), seen)
+    return sys.getsizeof(obj)
+
+
+class _Entry:
+    __slots__ = ("value", "created_at", "last_access", "hits", "bytes")
+
+    def __init__(self, value):
+        self.value = value
+        self.created_at = time.time()
+        self.last_access = self.created_at
+        self.hits = 0
+        self.bytes: int | None = None
+
+
+class TrackedCache:
+    """
+    적중/실패/축출 통계를 기록하는 스레드 안전 캐시.
+
+    사용법:
+        _combined_cache = TrackedCache("combined", max_entries=32)
+        cached = _combined_cache.get(key)      # 없으면 None (miss로 기록)
+        _combined_cache.put(key, value)
+        value = _combined_cache.get_or_compute(key, lambda: build(key))  # 동시 miss는 한 번만 계산
+    """
+
+    def __init__(self, name: str, max_entries: int | None = None, description: str = "", derived: bool = False,
+                 snapshot: bool = False):
+        self.name = name
+        self.max_entries = max_entries
+        self.description = description
+        self.derived = derived
+        self.snapshot = snapshot
+        self._entries: "OrderedDict[object, _Entry]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._flight = SingleFlight(f"cache:{name}")
+        self._generation = 0  # clear()마다 증가 (계산 중 재로드 감지)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        registry.register(self)
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self.hits += 1
+            entry.hits += 1
+            entry.last_access = time.time()
+            self._entries.move_to_end(key)
+            return entry.value
+
+    def peek(self, key, default=None):
+        """통계·LRU 순서에 영향 없이 값을 조회합니다. (내보내기/진단용)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            return default if entry is None else entry.value
+
+    def put(self, key, value) -> None:
+        with self._lock:
+            self._entries[key] = _Entry(value)
+            self._entries.move_to_end(key)
+            if self.max_entries is not None:
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+
+    def get_or_compute(self, key, compute):
+        """
+        캐시된 값을 반환하고, 없으면 compute()로 만들어 저장합니다.
+
+        ★ 같은 키를 동시에 요청한 스레드는 한 번의 compute() 결과를 함께 받습니다.
+          compute()가 None을 반환하면(데이터 없음) 저장하지 않습니다.
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+        return self._flight.do(key, lambda: self._compute_and_put(key, compute))
+
+    async def get_or_compute_async(self, key, compute):
+        """get_or_compute()의 asyncio 버전 — compute는 코루틴 함수입니다."""
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        async def compute_and_put():
+            value = self.peek(key)
+            if value is not None:
+                return value
+            generation = self._generation
+            value = await compute()
+            if value is not None:
+                with self._lock:
+                    if self._generation == generation:
+                        self.put(key, value)
+            return value
+
+        return await self._flight.do_async(key, compute_and_put)
+
+    def _compute_and_put(self, key, compute):
+        # 앞선 leader가 방금 저장했을 수 있음
+        value = self.peek(key)
+        if value is not None:
+            return value
+        generation = self._generation
+        value = compute()
+        if value is not None:
+            with self._lock:
+                if self._generation == generation:
+                    self.put(key, value)
+        return value
+
+    def evict(self, key) -> bool:
+        with self._lock:
+            if self._entries.pop(key, None) is None:
+                return False
+            self.evictions += 1
+            return True
+
+    def evict_matching(self, pattern: str) -> list:
+        """str(key)가 fnmatch 패턴과 일치하는 항목을 축출하고, 축출된 키 목록을 반환합니다."""
+        with self._lock:
+            targets = [k for k in self._entries if fnmatch.fnmatch(str(k), pattern)]
+            for k in targets:
+                self.evict(k)
+            return targets
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+
+    def keys(self) -> list:
+        with self._lock:
+            return list(self._entries.keys())
+
+    def items(self) -> list:
+        """(키, 값) 목록 (통계에 영향 없음)"""
+        with self._lock:
+            return [(k, e.value) for k, e in self._entries.items()]
+
+    def __contains__(self, key) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self, detail: bool = False) -> dict:
+        with self._lock:
+            entries = list(self._entries.items())
+        now = time.time()
+        total_bytes = 0
+        detail_rows = []
+        for key, entry in entries:
+            if entry.bytes is None:
+                entry.bytes = estimate_deep_bytes(entry.value)
+            total_bytes += entry.bytes
+            if detail:
+                detail_rows.append({
+                    "key": str(key),
+                    "bytes": entry.bytes,
+                    "hits": entry.hits,
+                    "age_sec": round(now - entry.created_at, 1),
+                    "idle_sec": round(now - entry.last_access, 1),
+                })
+
+        lookups = self.hits + self.misses
+        result = {
+            "name": self.name,
+            "description": self.description,
+            "derived": self.derived,
+            "snapshot": self.snapshot,
+            "entries": len(entries),
+            "max_entries": self.max_entries,
+            "bytes": total_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            "evictions": self.evictions,
+            "coalesced": self._flight.coalesced,
+            "oldest_age_sec": round(now - min(e.created_at for _, e in entries), 1) if entries else None,
+        }
+        if detail:
+            result["items"] = detail_rows
+        return result
+
+
+class CacheRegistry:
+    """프로세스의 모든 TrackedCache를 이름으로 관리합니다."""
+
+    def __init__(self):
+        self._caches: dict[str, TrackedCache] = {}
+        self._lock = threading.Lock()
+
+    def register(self, cache: TrackedCache) -> None:
+        with self._lock:
+            self._caches[cache.name] = cache
+
+    def get(self, name: str) -> TrackedCache | None:
+        return self._caches.get(name)
+
+    def all(self) -> list[TrackedCache]:
+        with self._lock:
+            return list(self._caches.values())
+
+    def stats(self, detail: bool = False) -> dict:
+        caches = [c.stats(detail) for c in self.all()]
+        return {
+            "total_bytes": sum(c["bytes"] for c in caches),
+            "caches": caches,
+        }
+
+    def snapshot_caches(self) -> list[TrackedCache]:
+        """웜 스냅샷 대상 캐시 (snapshot=True)"""
+        return [cache for cache in self.all() if cache.snapshot]
+
+    def clear_derived(self) -> None:
+        """원본 데이터가 바뀔 때 파생 캐시(derived=True)를 모두 비웁니다."""
+        for cache in self.all():
+            if cache.derived:
+                cache.clear()
+
+    def evict(self, pattern: str, cache_name: str | None = None) -> dict[str, list[str]]:
+        """패턴과 일치하는 항목을 축출합니다. cache_name이 없으면 모든 캐시 대상."""
+        targets = [self.get(cache_name)] if cache_name else self.all()
+        evicted = {}
+        for cache in targets:
+            if cache is None:
+                continue
+            keys = cache.evict_matching(pattern)
+            if keys:
+                evicted[cache.name] = [str(k) for k in keys]
+        return evicted
+
+
+registry = CacheRegistry()
@@ -0,0 +1,280 @@
+"""
+churn_analyzer.py — 연도 간 평가자→피평가자 관계의 변화(신규/유지/중단)를 분석합니다.
+
+핵심 설계 결정:
+  - 전체 연도의 사번을 하나의 정수 코드 체계로 통일한 뒤, (피평가자, 평가자) 쌍을
+    int64 하나로 인코딩합니다: key = 피평가자코드 << 32 | 평가자코드
+  - 연도별로 정렬된 고유 키 배열을 만들어 두고, 집합 연산은 np.intersect1d/setdiff1d로 처리합니다.
+    (키가 피평가자 우선이므로 `key >> 32`만으로 사람별 집계가 가능)
+  - 연도 쌍 결과와 연속 유지(chain) 결과는 한 번 계산 후 캐시하고,
+    조직 필터는 캐시된 배열에 피평가자 마스크만 적용합니다.
+
+용어:
+  - 평가자 집합 안정성(Jaccard): 피평가자가 두 해에 선정한 평가자 집합의 |교집합| / |합집합|
+  - 연속 유지 길이: 같은 쌍이 연속된 연도에 몇 해 이어졌는지 (최장 구간)
+"""
+import numpy as np
+import pandas as pd
+from config import AVAILABLE_YEARS, CHURN_CACHE_MAX_ENTRIES
+from .cache_registry import TrackedCache
+from .data_loader import load_qualitative_data, normalize_employee_ids
+
+_SHIFT = np.int64(32)
+_LOW_MASK = np.int64((1 << 32) - 1)
+
+_churn_cache = TrackedCache("churn", max_entries=CHURN_CACHE_MAX_ENTRIES,
+                            description="사번 코드표 / 연도별 쌍 키 / 연도 쌍·연속 유지 결과", derived=True)
+
+
+# ──────────────────────────────────────────────
+# 사번 코드표 + 연도별 쌍 키
+# ──────────────────────────────────────────────
+
+def _year_edges(year: int) -> tuple[pd.Series, pd.Series] | None:
+    df = load_qualitative_data(year)
+    if df is None:
+        return None
+    src_col = [c for c in df.columns if '평가자사번' in c][0]
+    dst_col = [c for c in df.columns if '피평가자사번' in c][0]
+    return normalize_employee_ids(df[src_col]), normalize_employee_ids(df[dst_col])
+
+
+def get_id_index() -> pd.Index:
+    """전체 연도 사번 → 정수 코드 (정렬된 고유 사번 Index, 위치가 코드)"""
+    return _churn_cache.get_or_compute("id_index", _build_id_index)
+
+
+def _build_id_index() -> pd.Index:
+    ids = []
+    for year in AVAILABLE_YEARS:
+        edges = _year_edges(year)
+        if edges is not None:
+            ids.extend(edges)
+    return pd.Index(pd.unique(pd.concat(ids)) if ids else [], dtype=object).sort_values()
+
+
+def get_year_pair_keys(year: int) -> np.ndarray | None:
+    """해당 연도의 (피평가자, 평가자) 쌍 키 — 정렬된 고유 int64 배열"""
+    return _churn_cache.get_or_compute(("pairs", year), lambda: _build_year_pair_keys(year))
+
+
+def _build_year_pair_keys(year: int) -> np.ndarray | None:
+    edges = _year_edges(year)
+    if edges is None:
+        return None
+    index = get_id_index()
+    src = index.get_indexer(edges[0]).astype(np.int64)
+    dst = index.get_indexer(edges[1]).astype(np.int64)
+    return np.unique((dst << _SHIFT) | src)
+
+
+def _target_codes(keys: np.ndarray) -> np.ndarray:
+    return keys >> _SHIFT
+
+
+def _source_codes(keys: np.ndarray) -> np.ndarray:
+    return keys & _LOW_MASK
+
+
+# ──────────────────────────────────────────────
+# 연도 쌍 변화 (캐시 단위: 연도 쌍)
+# ──────────────────────────────────────────────
+
+def _compute_year_pair(year_from: int, year_to: int) -> dict | None:
+    keys_from = get_year_pair_keys(year_from)
+    keys_to = get_year_pair_keys(year_to)
+    if keys_from is None or keys_to is None:
+        return None
+
+    repeated = np.intersect1d(keys_from, keys_to, assume_unique=True)
+    n_codes = len(get_id_index())
+    # 피평가자별 평가자 수 (두 해 각각, 공통)
+    count_from = np.bincount(_target_codes(keys_from), minlength=n_codes)
+    count_to = np.bincount(_target_codes(keys_to), minlength=n_codes)
+    count_common = np.bincount(_target_codes(repeated), minlength=n_codes)
+
+    return {
+        "repeated": repeated,
+        "new": np.setdiff1d(keys_to, keys_from, assume_unique=True),
+        "dropped": np.setdiff1d(keys_from, keys_to, assume_unique=True),
+        "count_from": count_from,
+        "count_to": count_to,
+        "count_common": count_common,
+    }
+
+
+def get_year_pair_churn(year_from: int, year_to: int) -> dict | None:
+    return _churn_cache.get_or_compute(("churn", year_from, year_to), lambda: _compute_year_pair(year_from, year_to))
+
+
+def _restrict(keys: np.ndarray, target_mask: np.ndarray | None) -> np.ndarray:
+    """피평가자가 필터 대상인 쌍만 남깁니다."""
+    return keys if target_mask is None else keys[target_mask[_target_codes(keys)]]
+
+
+def _target_mask(target_ids: list[str] | None) -> np.ndarray | None:
+    """필터 대상 사번 → 코드 불리언 마스크 (None이면 전체)"""
+    if target_ids is None:
+        return None
+    index = get_id_index()
+    codes = index.get_indexer(pd.Index(target_ids))
+    mask = np.zeros(len(index), dtype=bool)
+    mask[codes[codes >= 0]] = True
+    return mask
+
+
+def calculate_pair_churn(
+    year_from: int,
+    year_to: int,
+    target_ids: list[str] | None = None,
+    person_limit: int = 50
+) -> dict | None:
+    """
+    두 연도 사이의 평가 관계 변화와 피평가자별 평가자 집합 안정성을 계산합니다.
+
+    Args:
+        target_ids: 피평가자 범위 (조직 필터 결과, None이면 전체)
+        person_limit: 안정성이 낮은 순 명단 길이
+
+    Returns:
+        {
+            "pairs": { from_count, to_count, repeated, new, dropped, retention_rate, new_rate },
+            "stability": { person_count, only_from, only_to, mean_jaccard, median_jaccard, histogram },
+            "persons": [ {사번, evaluators_from, evaluators_to, common, jaccard} — 두 해 모두 평가받은 사람, 낮은 순 ],
+        }
+    """
+    churn = get_year_pair_churn(year_from, year_to)
+    if churn is None:
+        return None
+    mask = _target_mask(target_ids)
+
+    repeated = _restrict(churn["repeated"], mask)
+    new = _restrict(churn["new"], mask)
+    dropped = _restrict(churn["dropped"], mask)
+    from_count = len(repeated) + len(dropped)
+    to_count = len(repeated) + len(new)
+
+    # ── 피평가자별 Jaccard ──
+    count_from, count_to, common = churn["count_from"], churn["count_to"], churn["count_common"]
+    in_scope = np.ones(len(count_from), dtype=bool) if mask is None else mask
+    both = np.flatnonzero(in_scope & (count_from > 0) & (count_to > 0))
+    union = count_from[both] + count_to[both] - common[both]
+    jaccard = common[both] / union
+
+    histogram = np.histogram(jaccard, bins=10, range=(0.0, 1.0))[0] if len(jaccard) else np.zeros(10, dtype=int)
+    order = np.lexsort((both, jaccard))[:person_limit]
+    index = get_id_index()
+
+    return {
+        "pairs": {
+            "from_count": from_count,
+            "to_count": to_count,
+            "repeated": len(repeated),
+            "new": len(new),
+            "dropped": len(dropped),
+            "retention_rate": round(len(repeated) / from_count, 4) if from_count else 0.0,
+            "new_rate": round(len(new) / to_count, 4) if to_count else 0.0,
+        },
+        "stability": {
+            "person_count": int(len(both)),
+            "only_from": int((in_scope & (count_from > 0) & (count_to == 0)).sum()),
+            "only_to": int((in_scope & (count_from == 0) & (count_to > 0)).sum()),
+            "mean_jaccard": round(float(jaccard.mean()), 4) if len(jaccard) else 0.0,
+            "median_jaccard": round(float(np.median(jaccard)), 4) if len(jaccard) else 0.0,
+            "histogram": [
+                {"range": f"{i / 10:.1f}~{(i + 1) / 10:.1f}", "count": int(c)} for i, c in enumerate(histogram)
+            ],
+        },
+        "persons": [
+            {
+                "사번": index[both[i]],
+                "evaluators_from": int(count_from[both[i]]),
+                "evaluators_to": int(count_to[both[i]]),
+                "common": int(common[both[i]]),
+                "jaccard": round(float(jaccard[i]), 4),
+            }
+            for i in order
+        ],
+    }
+
+
+# ──────────────────────────────────────────────
+# 연속 유지 쌍 (전체 AVAILABLE_YEARS)
+# ──────────────────────────────────────────────
+
+def get_pair_chains() -> dict | None:
+    """
+    전체 연도에 걸친 쌍별 등장 여부와 최장 연속 유지 길이를 계산합니다 (캐시).
+
+    Returns:
+        { "years": [...], "keys": 전체 쌍 키, "presence": (연도 × 쌍) bool, "run": 최장 연속 길이, "run_end": 구간 끝 연도 위치 }
+    """
+    return _churn_cache.get_or_compute("chains", _compute_pair_chains)
+
+
+def _compute_pair_chains() -> dict | None:
+    years = sorted(y for y in AVAILABLE_YEARS if get_year_pair_keys(y) is not None)
+    if not years:
+        return None
+    per_year = [get_year_pair_keys(y) for y in years]
+    all_keys = np.unique(np.concatenate(per_year))
+    presence = np.vstack([np.isin(all_keys, keys, assume_unique=True) for keys in per_year])
+
+    # ★ 연도가 비어 있으면(파일 없음) 연속이 끊긴 것으로 간주하기 위해 실제 연도 간격도 확인
+    run = np.zeros(len(all_keys), dtype=np.int64)
+    best = np.zeros(len(all_keys), dtype=np.int64)
+    best_end = np.zeros(len(all_keys), dtype=np.int64)
+    for i, year in enumerate(years):
+        if i > 0 and year - years[i - 1] != 1:
+            run[:] = 0
+        run = np.where(presence[i], run + 1, 0)
+        improved = run > best
+        best[improved] = run[improved]
+        best_end[improved] = i
+
+    return {"years": years, "keys": all_keys, "presence": presence, "run": best, "run_end": best_end}
+
+
+def calculate_pair_chains(target_ids: list[str] | None = None, limit: int = 50) -> dict | None:
+    """
+    연속 유지 쌍 분포와 최장 유지 쌍 목록을 반환합니다.
+
+    Returns:
+        {
+            "years": 분석 연도,
+            "pair_count": 전체 쌍 수,
+            "length_distribution": { "1": 쌍 수, "2": ..., },
+            "all_years_count": 모든 연도에 등장한 쌍 수,
+            "top_chains": [ {source, target, run_length, years} ],
+        }
+    """
+    chains = get_pair_chains()
+    if chains is None:
+        return None
+    mask = _target_mask(target_ids)
+    keys, run, run_end, presence = chains["keys"], chains["run"], chains["run_end"], chains["presence"]
+    if mask is not None:
+        selected = mask[_target_codes(keys)]
+        keys, run, run_end, presence = keys[selected], run[selected], run_end[selected], presence[:, selected]
+
+    years = chains["years"]
+    lengths, counts = np.unique(run, return_counts=True)
+    index = get_id_index()
+    # 최장 유지 순 (동점은 쌍 키 순)
+    order = np.lexsort((keys, -run))[:limit]
+
+    return {
+        "years": years,
+        "pair_count": int(len(keys)),
+        "length_distribution": {str(int(l)): int(c) for l, c in zip(lengths, counts)},
+        "all_years_count": int(presence.all(axis=0).sum()) if len(keys) else 0,
+        "top_chains": [
+            {
+                "source": index[int(_source_codes(keys[i]))],
+                "target": index[int(_target_codes(keys[i]))],
+                "run_length": int(run[i]),
+                "years": years[int(run_end[i]) - int(run[i]) + 1: int(run_end[i]) + 1],
+            }
+            for i in order
+        ],
+    }
@@ -0,0 +1,247 @@
+"""
+compute_pool.py — CPU 집약 분석을 미리 띄운 프로세스 풀에서 실행합니다.
+
+핵심 설계 결정:
+  - 지표 계산(pandas/NetworkX/순수 파이썬 루프)은 GIL 때문에 스레드로는 한 코어에 직렬화되고,
+    긴 계산이 가벼운 엔드포인트까지 느리게 만듭니다. 무거운 분석만 프로세스 풀로 보내고,
+    가벼운 엔드포인트(필터 옵션, 큐브 조회, 에고 네트워크 등)는 요청 프로세스에서 처리합니다.
+  - 워커는 시작 시 데이터를 한 번 설치합니다 (공유 데이터 모드면 memory-map 연결, 아니면 부모가 로드한 테이블).
+    요청마다 프로세스 경계를 넘는 것은 실행 함수(모듈 경로) + 필터 모델과 결과뿐입니다.
+  - 서버 시작 시 모든 워커를 띄우고 최신 연도 결합 데이터까지 준비해 둡니다 (첫 요청 지연 방지).
+  - 데이터 버전(data_version)이 바뀌면 새 데이터로 풀을 다시 띄웁니다 (워커 캐시가 이전 데이터를 쓰지 않도록).
+  - 워커의 단계 시간(stage)은 결과와 함께 돌려받아 요청의 Server-Timing에 합칩니다.
+  - 풀이 없는 프로세스(COMPUTE_WORKERS=0, precompute.py, 풀 워커 자신)에서는 같은 함수를 그 자리에서 실행합니다.
+
+사용법:
+    result = offload(compute_subgroup_metrics, req)              # 동기 (잡 스레드, 동기 라우트)
+    result = offload(compute_subgroup_metrics, req, progress=progress)  # 잡 (풀이 없으면 단계별 보고)
+    result = await offload_async(compute_subgroup_metrics, req)  # async 라우트 (이벤트 루프를 막지 않음)
+"""
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout, wait
+from concurrent.futures.process import BrokenProcessPool
+from fastapi import HTTPException
+from config import AVAILABLE_YEARS, COMPUTE_WORKERS, COMPUTE_POOL_START_TIMEOUT_SEC
+from .perf import add_stages, collect_stages, stage
+
+_pool: ProcessPoolExecutor | None = None
+_pool_version: str | None = None     # 풀 워커에 설치된 데이터 버전
+_pool_workers = 0
+_pool_shared_dir: str | None = None  # 공유 데이터 모드면 워커가 직접 연결할 경로
+_pool_lock = threading.Lock()
+_restart_lock = threading.Lock()     # 버전 변경 시 재시작은 한 스레드만
+_stats = {"submitted": 0, "failed": 0, "restarts": 0}
+_ready_barrier = None                # 워커 쪽: 프리워밍 배리어 (_init_worker에서 설치)
+
+
+# ──────────────────────────────────────────────
+# 워커 쪽
+# ──────────────────────────────────────────────
+
+def _init_worker(shared_dir, qualitative, hr_df, benchmarks, version, barrier) -> None:
+    """워커 프로세스 초기화: 데이터 설치 + 최신 연도 결합 데이터 준비"""
+    global _ready_barrier
+    _ready_barrier = barrier
+    from .data_loader import install_shared_data, get_loaded_data, prepare_combined_network_data
+    if not (shared_dir and _attach(shared_dir)):
+        install_shared_data(qualitative, hr_df, benchmarks, version)
+
+    years = sorted(y for y, df in get_loaded_data()[0].items() if df is not None)
+    if years:
+        prepare_combined_network_data([years[-1]])
+
+
+def _attach(shared_dir: str) -> bool:
+    from .shared_store import attach_shared_data
+    return attach_shared_data(shared_dir)
+
+
+def _invoke(fn, args: tuple):
+    """
+    워커에서 fn(*args)를 실행하고 (결과, HTTP 오류, 단계 시간)을 반환합니다.
+
+    ★ HTTPException(엣지 없음 등)은 (상태, 메시지)로 보내 부모가 같은 응답을 만들게 합니다.
+    """
+    with collect_stages() as stages:
+        try:
+            return fn(*args), None, stages
+        except HTTPException as e:
+            return None, (e.status_code, e.detail), stages
+
+
+def _ready() -> int:
+    """
+    프리워밍 작업: 모든 워커가 이 지점에 올 때까지 기다립니다.
+
+    ★ 배리어가 없으면 먼저 초기화를 마친 워커 하나가 프리워밍 작업을 모두 가져가,
+      나머지 워커가 아직 데이터를 설치하는 중에도 시작이 끝난 것으로 보일 수 있습니다.
+    """
+    _ready_barrier.wait(COMPUTE_POOL_START_TIMEOUT_SEC)
+    return os.getpid()
+
+
+# ──────────────────────────────────────────────
+# 부모 쪽 (풀 관리)
+# ──────────────────────────────────────────────
+
+def start_compute_pool(workers: int = COMPUTE_WORKERS, shared_dir: str | None = None) -> bool:
+    """
+    프로세스 풀을 띄우고 모든 워커가 초기화될 때까지 기다립니다. (기존 풀이 있으면 교체)
+
+    Args:
+        workers: 워커 수 (0 이하면 풀을 쓰지 않음)
+        shared_dir: 공유 데이터 모드 경로 — 워커가 memory-map으로 직접 연결 (데이터를 복사해 넘기지 않음)
+    """
+    global _pool, _pool_version, _pool_workers, _pool_shared_dir
+    if workers <= 0:
+        print("[INFO] 계산 프로세스 풀 사용 안 함 (COMPUTE_WORKERS=0)")
+        return False
+
+    from .data_loader import (
+        data_version, get_cached_benchmarks, get_loaded_data, load_hr_master_data, load_qualitative_data,
+    )
+    version = data_version()
+    ctx = multiprocessing.get_context("spawn")
+    barrier = ctx.Barrier(workers)
+    if shared_dir:
+        initargs = (shared_dir, None, None, None, version, barrier)
+    else:
+        # 원본 변경으로 캐시가 비워졌을 수 있으므로 다시 로드한 뒤 넘김
+        for year in AVAILABLE_YEARS:
+            load_qualitative_data(year)
+        load_hr_master_data()
+        qualitative, hr_df = get_loaded_data()
+        qualitative = {y: df for y, df in qualitative.items() if df is not None}
+        initargs = (None, qualitative, hr_df, get_cached_benchmarks(), version, barrier)
+
+    started = time.perf_counter()
+    # ★ spawn: 스레드가 떠 있는 서버 프로세스를 fork하지 않음 (Windows와 같은 동작)
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=ctx,
+                               initializer=_init_worker, initargs=initargs)
+    # 프리워밍: 워커 수만큼 작업을 보내 모든 프로세스가 초기화를 마칠 때까지 대기
+    #   (작업은 배리어에서 서로를 기다리므로 워커마다 정확히 하나씩 실행됨)
+    try:
+        futures = [pool.submit(_ready) for _ in range(workers)]
+        done, pending = wait(futures, timeout=COMPUTE_POOL_START_TIMEOUT_SEC)
+        if pending:
+            raise FutureTimeout()
+        pids = {f.result() for f in done}
+    except (BrokenProcessPool, FutureTimeout, threading.BrokenBarrierError) as e:
+        # 워커를 띄울 수 없는 환경(실행 스크립트를 다시 import할 수 없음 등) → 요청 프로세스에서 계산
+        pool.shutdown(wait=False, cancel_futures=True)
+        print(f"[WARN] 계산 프로세스 풀 시작 실패 → 요청 프로세스에서 계산합니다: {e!r}")
+        return False
+
+    with _pool_lock:
+        old = _pool
+        _pool, _pool_version, _pool_workers, _pool_shared_dir = pool, version, workers, shared_dir
+    if old is not None:
+        old.shutdown(wait=False, cancel_futures=False)
+    print(f"[INFO] 계산 프로세스 풀 준비: 워커 {len(pids)}개, 데이터 {version} "
+          f"({time.perf_counter() - started:.1f}s)")
+    return True
+
+
+def shutdown_compute_pool() -> None:
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _current_pool() -> ProcessPoolExecutor | None:
+    """현재 데이터 버전의 풀 — 버전이 바뀌었거나 풀이 깨졌으면 다시 띄웁니다."""
+    if _pool is None:
+        return None
+    from .data_loader import data_version
+    if data_version() != _pool_version:
+        with _restart_lock:
+            # 기다리는 동안 다른 스레드가 이미 재시작했으면 건너뜀
+            if data_version() != _pool_version:
+                print("[INFO] 데이터 버전 변경 → 계산 프로세스 풀 재시작")
+                _stats["restarts"] += 1
+                if not start_compute_pool(_pool_workers, _pool_shared_dir):
+                    shutdown_compute_pool()  # 이전 데이터의 워커는 쓰지 않음
+    return _pool
+
+
+def _submit(fn, args: tuple):
+    pool = _current_pool()
+    if pool is None:
+        return None
+    _stats["submitted"] += 1
+    try:
+        return pool.submit(_invoke, fn, args)
+    except BrokenProcessPool as e:
+        raise _broken(e)
+
+
+def _unwrap(reply):
+    result, error, stages = reply
+    add_stages(stages)
+    if error is not None:
+        raise HTTPException(status_code=error[0], detail=error[1])
+    return result
+
+
+def _broken(e: BrokenProcessPool):
+    """워커가 비정상 종료(메모리 부족 등)하면 다음 요청에서 풀을 다시 띄우도록 표시합니다."""
+    global _pool_version
+    _stats["failed"] += 1
+    _pool_version = None
+    print(f"[ERROR] 계산 프로세스 풀 중단: {e}")
+    return HTTPException(status_code=503, detail="계산 프로세스가 중단되었습니다. 잠시 후 다시 시도하세요.")
+
+
+def compute_pool_running() -> bool:
+    """풀이 떠 있는지 (잡이 보고할 단계 목록을 고를 때 사용)"""
+    return _pool is not None
+
+
+def offload(fn, *args, progress=None):
+    """
+    fn(*args)를 프로세스 풀에서 실행하고 결과를 기다립니다. (풀이 없으면 그 자리에서 실행)
+
+    ★ progress(잡 콜백)는 프로세스 경계를 넘지 못하므로: 풀이 없으면 fn(*args, progress=progress)로
+      단계마다 보고하고, 풀이 있으면 제출 직전에 "compute" 단계 하나만 보고합니다 (취소 확인 지점).
+    """
+    if _pool is not None and progress is not None:
+        progress("compute")
+    future = _submit(fn, args)
+    if future is None:
+        return fn(*args) if progress is None else fn(*args, progress=progress)
+    try:
+        with stage("compute_pool"):
+            reply = future.result()
+    except BrokenProcessPool as e:
+        raise _broken(e)
+    return _unwrap(reply)
+
+
+async def offload_async(fn, *args):
+    """offload()의 async 버전 — 이벤트 루프는 결과를 기다리는 동안 다른 요청을 처리합니다."""
+    # 제출 전 데이터 버전 확인(파일 stat, 드물게 풀 재시작)은 이벤트 루프 밖에서
+    future = await asyncio.to_thread(_submit, fn, args)
+    if future is None:
+        return await asyncio.to_thread(fn, *args)
+    try:
+        with stage("compute_pool"):
+            reply = await asyncio.wrap_future(future)
+    except BrokenProcessPool as e:
+        raise _broken(e)
+    return _unwrap(reply)
+
+
+def compute_pool_stats() -> dict:
+    """/api/debug/perf용 풀 상태"""
+    return {
+        "workers": _pool_workers if _pool is not None else 0,
+        "data_version": _pool_version,
+        "shared_data": bool(_pool_shared_dir),
+        **_stats,
+    }
@@ -4,50 +4,206 @@ data_loader.py — 엑셀 데이터를 로드하고 전처리합니다.
 핵심 설계 결정:
   - 서버 시작(startup) 시 데이터를 1회만 로드하여 메모리에 상주시킵니다.
   - 연도별 캐싱으로 중복 I/O를 방지합니다.
+  - 캐시 miss는 TrackedCache.get_or_compute로 채워, 같은 키의 동시 요청은 엑셀 로드/결합을 한 번만 합니다.
+  - 엑셀은 헤더를 먼저 읽어 필요한 컬럼만 스트리밍으로 읽습니다 (excel_reader).
+  - 원본 파일의 지문(크기, 수정 시각)을 기억해 두고, 파일이 바뀌면 캐시를 버리고 다시 읽습니다.
   - 필터링은 노드 기준으로 적용한 뒤, 해당 노드가 관여한 엣지만 남깁니다.
 """
+import hashlib
+import json
 import os
 import pandas as pd
-from config import DATA_DIR, AVAILABLE_YEARS
+from config import DATA_DIR, AVAILABLE_YEARS, COMBINED_CACHE_MAX_ENTRIES
+from .cache_registry import TrackedCache, registry
+from .excel_reader import read_columns, file_fingerprint
 from .network_builder import build_graph
 from .metrics_calculator import calculate_system_health_metrics, calculate_dynamic_benchmarks
 
-# 전역 데이터 캐시
-_qualitative_cache: dict[int, pd.DataFrame] = {}
-_hr_cache: pd.DataFrame | None = None
-_combined_cache: dict[tuple, tuple] = {}
-_benchmarks_cache: dict = {}
+# 전역 데이터 캐시 (cache_registry에 등록되어 /api/debug/caches에서 조회)
+_qualitative_cache = TrackedCache("qualitative", description="연도 → 정성평가 원본", snapshot=True)
+_hr_cache = TrackedCache("hr", max_entries=1, description="HR 기본정보 (단일 키 'hr')", snapshot=True)
+_combined_cache = TrackedCache("combined", max_entries=COMBINED_CACHE_MAX_ENTRIES,
+                               description="연도 조합 → (엣지, 노드)", derived=True, snapshot=True)
+_benchmarks_cache = TrackedCache("benchmarks", max_entries=1, description="동적 벤치마크 (단일 키 'global')",
+                                 snapshot=True)
+
+# 엑셀에서 직접 읽은 캐시 항목의 원본 파일 지문: (캐시 이름, 키) → (크기, 수정 시각 ns)
+# ★ 공유 데이터로 설치된 항목은 지문이 없으므로 파일 변경 검사를 하지 않습니다.
+_source_fingerprints: dict[tuple[str, object], tuple[int, int] | None] = {}
+# 공유 데이터로 설치된 경우의 데이터 버전 (install_shared_data의 version)
+_installed_version: str | None = None
+
+HR_COLUMNS = ['평가년도', '사번', 'ORG1_OP', 'ORG2_OP', 'ORG3_OP', 'JOB_FAMILY_CODE', 'GRADE']
+FEEDBACK_KEYWORDS = ['의견', '피드백', '강점', '보완', '코멘트']
 
 def get_cached_benchmarks():
-    return _benchmarks_cache
+    return _benchmarks_cache.get("global") or {}
+
+
+def get_loaded_data() -> tuple[dict[int, pd.DataFrame], pd.DataFrame | None]:
+    """현재 메모리에 로드된 연도별 정성평가 데이터와 HR 데이터를 반환합니다."""
+    return dict(_qualitative_cache.items()), _hr_cache.peek("hr")
+
+
+def install_shared_data(
+    qualitative: dict[int, pd.DataFrame],
+    hr_df: pd.DataFrame | None,
+    benchmarks: dict,
+    version: str | None = None
+) -> None:
+    """
+    외부에서 준비된 데이터(공유 memory-map 등)로 전역 캐시를 교체합니다.
+
+    Why: 공유 데이터 모드의 워커는 엑셀을 읽지 않으므로, 로더가 만든 테이블을
+         그대로 캐시에 넣고 파생 캐시(결합 데이터, 개인 지표 테이블 등)는 비워 다시 계산하게 합니다.
+
+    Args:
+        version: 데이터 버전 (data_version()이 반환, 클라이언트 캐시 키)
+    """
+    global _installed_version
+    _installed_version = version
+    _source_fingerprints.clear()
+    _qualitative_cache.clear()
+    for year, df in qualitative.items():
+        _qualitative_cache.put(year, df)
+    _hr_cache.clear()
+    if hr_df is not None:
+        _hr_cache.put("hr", hr_df)
+    registry.clear_derived()
+    _benchmarks_cache.put("global", benchmarks)
+
+
+def normalize_employee_ids(ids: pd.Series) -> pd.Series:
+    """사번을 문자열로 통일하고 공백/nbsp를 제거합니다. (엑셀에서 숫자로 읽힌 사번 포함)"""
+    return ids.astype(str).str.strip().str.replace('\xa0', '', regex=False).str.replace('&nbsp;', '', regex=False)
+
+
+def is_feedback_column(name: str) -> bool:
+    """자유 서술형 피드백 컬럼 여부 (feedback_analyzer.find_feedback_columns와 공유)"""
+    return any(k in name for k in FEEDBACK_KEYWORDS)
+
+
+def _qualitative_path(year: int) -> str:
+    return os.path.join(DATA_DIR, f"02.정성평가_{year}.xlsx")
+
+
+def _hr_path() -> str:
+    return os.path.join(DATA_DIR, "00.HR기본정보.xlsx")
+
+
+def _qualitative_columns(header: list[str]) -> dict[str, str]:
+    """정성평가 헤더 → 읽을 컬럼 (평가년도, 평가자/피평가자 사번·성명, 피드백)"""
+    kinds = {}
+    for c in header:
+        if c == '평가년도':
+            kinds[c] = "int"
+        elif '평가자사번' in c:
+            kinds[c] = "id"
+        elif '평가자성명' in c or is_feedback_column(c):
+            kinds[c] = "text"
+    return kinds
+
+
+def _hr_columns(header: list[str]) -> dict[str, str]:
+    """HR 헤더 → 읽을 컬럼 (HR_COLUMNS 중 있는 것)"""
+    kinds = {'평가년도': "int", '사번': "id"}
+    return {c: kinds.get(c, "text") for c in header if c in HR_COLUMNS}
+
+
+def _is_stale(cache: TrackedCache, key, path: str) -> bool:
+    """
+    엑셀에서 읽은 캐시 항목의 원본 파일이 바뀌었으면 그 항목을 버리고 True를 반환합니다.
+    """
+    fp_key = (cache.name, key)
+    if fp_key not in _source_fingerprints or key not in cache:
+        return False
+    if file_fingerprint(path) == _source_fingerprints[fp_key]:
+        return False
+    print(f"[INFO] 원본 파일 변경 감지 → 다시 로드: {os.path.basename(path)}")
+    cache.evict(key)
+    _source_fingerprints.pop(fp_key, None)
+    return True
+
+
+def refresh_stale_sources(years: list[int]) -> bool:
+    """
+    선택 연도의 정성평가/HR 원본 파일 변경을 확인합니다.
+    바뀐 파일이 있으면 해당 원본 캐시와 파생 캐시(결합 데이터 등)를 비우고 True를 반환합니다.
+    """
+    stale = [_is_stale(_qualitative_cache, y, _qualitative_path(y)) for y in set(years)]
+    stale.append(_is_stale(_hr_cache, "hr", _hr_path()))
+    if any(stale):
+        registry.clear_derived()
+        return True
+    return False
+
+
+def data_version() -> str:
+    """
+    현재 로드된 원본 데이터의 버전 — 원본 파일이 바뀌거나 공유 데이터 버전이 바뀌면 달라집니다.
+
+    Why: 브라우저 응답 캐시(api.js)가 이 값을 키에 포함해, 데이터가 바뀌면 이전 결과를 쓰지 않습니다.
+         워커가 여러 개여도 같은 파일/같은 공유 버전이면 같은 값이 나오도록 내용 기반으로 만듭니다.
+    """
+    refresh_stale_sources([key for (name, key) in _source_fingerprints if name == _qualitative_cache.name])
+    if _installed_version is not None:
+        return _installed_version
+    sources = sorted((name, str(key), fp) for (name, key), fp in _source_fingerprints.items())
+    return hashlib.sha1(json.dumps(sources).encode()).hexdigest()[:16]
+
+
+def source_file_fingerprints() -> dict[tuple[str, object], tuple[int, int] | None]:
+    """
+    분석 가능 연도 전체 + HR 원본 파일의 현재 지문 (파일이 없으면 None) — 웜 스냅샷 유효성 검사용
+    """
+    files = {(_qualitative_cache.name, y): file_fingerprint(_qualitative_path(y)) for y in AVAILABLE_YEARS}
+    files[(_hr_cache.name, "hr")] = file_fingerprint(_hr_path())
+    return files
+
+
+def loaded_source_fingerprints() -> dict[tuple[str, object], tuple[int, int] | None]:
+    """
+    source_file_fingerprints()와 같은 키로, 메모리에 로드된 데이터를 읽을 때의 지문 (로드되지 않았으면 None)
+    """
+    return {key: _source_fingerprints.get(key) for key in source_file_fingerprints()}
+
+
+def restore_source_fingerprints(fingerprints: dict[tuple[str, object], tuple[int, int] | None]) -> None:
+    """웜 스냅샷으로 복원한 캐시의 원본 지문을 설치합니다 (이후 파일 변경 감지는 평소와 같음)"""
+    global _installed_version
+    _installed_version = None
+    _source_fingerprints.clear()
+    _source_fingerprints.update({key: fp for key, fp in fingerprints.items() if fp is not None})
 
 
 def load_qualitative_data(year: int) -> pd.DataFrame | None:
     """
     특정 연도의 정성평가 엑셀 파일을 로드합니다.
     """
-    if year in _qualitative_cache:
-        return _qualitative_cache[year]
+    if _is_stale(_qualitative_cache, year, _qualitative_path(year)):
+        registry.clear_derived()
+    return _qualitative_cache.get_or_compute(year, lambda: _read_qualitative_file(year))
 
-    filepath = os.path.join(DATA_DIR, f"02.정성평가_{year}.xlsx")
+
+def _read_qualitative_file(year: int) -> pd.DataFrame | None:
+    filepath = _qualitative_path(year)
     if not os.path.exists(filepath):
         return None
 
     try:
-        df = pd.read_excel(filepath)
+        # ★ 지문은 읽기 전에 기록 (읽는 도중 파일이 바뀌면 다음 조회에서 다시 읽음)
+        fingerprint = file_fingerprint(filepath)
+        df = read_columns(filepath, _qualitative_columns)
         if '평가년도' not in df.columns:
             df['평가년도'] = year
 
-        essential_cols = ['평가년도']
         src_col = [c for c in df.columns if '평가자사번' in c]
         dst_col = [c for c in df.columns if '피평가자사번' in c]
         if not src_col or not dst_col:
             print(f"[WARN] {year} 데이터에 평가자사번/피평가자사번 컬럼이 없습니다.")
             return None
 
-        # 컬럼명 표준화 (필요시)
-        
-        _qualitative_cache[year] = df
+        _source_fingerprints[(_qualitative_cache.name, year)] = fingerprint
         return df
     except Exception as e:
         print(f"[ERROR] {year} 데이터 로드 실패: {e}")
@@ -58,23 +214,23 @@ def load_hr_master_data() -> pd.DataFrame | None:
     """
     HR 기본 정보(조직, 직군, 직급 등)를 로드합니다.
     """
-    global _hr_cache
-    if _hr_cache is not None:
-        return _hr_cache
+    if _is_stale(_hr_cache, "hr", _hr_path()):
+        registry.clear_derived()
+    return _hr_cache.get_or_compute("hr", _read_hr_file)
+
 
-    filepath = os.path.join(DATA_DIR, "00.HR기본정보.xlsx")
+def _read_hr_file() -> pd.DataFrame | None:
+    filepath = _hr_path()
     if not os.path.exists(filepath):
         print(f"[WARN] HR 기본정보 파일이 없습니다: {filepath}")
         return None
 
     try:
-        df = pd.read_excel(filepath)
-        use_cols = ['평가년도', '사번', 'ORG1_OP', 'ORG2_OP', 'ORG3_OP', 'JOB_FAMILY_CODE', 'GRADE']
-        available = [c for c in use_cols if c in df.columns]
-        _hr_cache = df[available].copy()
-        # ★ 사번을 문자열로 통일 (int/str 혼재 방지)
-        _hr_cache['사번'] = _hr_cache['사번'].astype(str).str.strip()
-        return _hr_cache
+        fingerprint = file_fingerprint(filepath)
+        # ★ 사번은 excel_reader에서 문자열로 통일 (int/str 혼재 방지)
+        hr_df = read_columns(filepath, _hr_columns)
+        _source_fingerprints[(_hr_cache.name, "hr")] = fingerprint
+        return hr_df
     except Exception as e:
         print(f"[ERROR] HR 데이터 로드 실패: {e}")
         return None
@@ -84,15 +240,18 @@ def prepare_combined_network_data(selected_years: list[int]) -> tuple[pd.DataFra
     """
     선택된 연도의 정성평가 데이터와 HR 데이터를 결합합니다.
     """
+    refresh_stale_sources(selected_years)
     cache_key = tuple(sorted(selected_years))
-    if cache_key in _combined_cache:
-        return _combined_cache[cache_key]
+    result = _combined_cache.get_or_compute(cache_key, lambda: _combine_network_data(selected_years))
+    return result if result is not None else (None, None)
 
+
+def _combine_network_data(selected_years: list[int]) -> tuple[pd.DataFrame, pd.DataFrame] | None:
     qual_list = [load_qualitative_data(y) for y in selected_years]
     qual_list = [d for d in qual_list if d is not None]
 
     if not qual_list:
-        return None, None
+        return None
 
     combined_qual_df = pd.concat(qual_list, ignore_index=True)
     
@@ -115,9 +274,7 @@ def prepare_combined_network_data(selected_years: list[int]) -> tuple[pd.DataFra
         for col in ['ORG1_OP', 'ORG2_OP', 'ORG3_OP', 'JOB_FAMILY_CODE', 'GRADE']:
             all_nodes_base[col] = 'Unknown'
             
-        result = (combined_qual_df, all_nodes_base)
-        _combined_cache[cache_key] = result
-        return result
+        return combined_qual_df, all_nodes_base
 
     # 가장 최신의 HR 정보를 기준으로 노드 속성 정의
     latest_hr = hr_df[hr_df['평가년도'].isin(selected_years)].sort_values('평가년도').drop_duplicates('사번', keep='last')
@@ -146,22 +303,39 @@ def prepare_combined_network_data(selected_years: list[int]) -> tuple[pd.DataFra
     )
     nodes_with_attr.fillna('Unknown', inplace=True)
 
-    result = (combined_qual_df, nodes_with_attr)
-    _combined_cache[cache_key] = result
-    return result
+    return combined_qual_df, nodes_with_attr
 
 
-def filter_network_data(
-    nodes_df: pd.DataFrame,
-    edges_df: pd.DataFrame,
+def canonical_filter_key(
+    years: list[int],
     orgs1: list[str],
     orgs2: list[str],
     jobs: list[str],
     grades: list[str]
-) -> tuple[pd.DataFrame, pd.DataFrame]:
+) -> tuple:
     """
-    사용자가 선택한 필터 조건에 따라 노드와 엣지를 필터링합니다.
+    필터 조건을 순서/중복에 무관한 정규화된 키로 변환합니다.
+
+    Why: 프론트엔드의 칩 선택 순서가 달라도 같은 분석은 같은 키로 취급해야
+         잡 중복 제거와 결과 캐싱이 동작합니다.
     """
+    return (
+        tuple(sorted(set(years))),
+        tuple(sorted(set(map(str, orgs1)))),
+        tuple(sorted(set(map(str, orgs2)))),
+        tuple(sorted(set(map(str, jobs)))),
+        tuple(sorted(set(map(str, grades)))),
+    )
+
+
+def filter_nodes(
+    nodes_df: pd.DataFrame,
+    orgs1: list[str],
+    orgs2: list[str],
+    jobs: list[str],
+    grades: list[str]
+) -> pd.DataFrame:
+    """조직/직군/직급 필터 조건에 맞는 노드만 남깁니다."""
     filtered = nodes_df.copy()
 
     if orgs1:
@@ -172,6 +346,21 @@ def filter_network_data(
         filtered = filtered[filtered['JOB_FAMILY_CODE'].isin(jobs)]
     if grades and 'GRADE' in filtered.columns:
         filtered = filtered[filtered['GRADE'].isin(grades)]
+    return filtered
+
+
+def filter_network_data(
+    nodes_df: pd.DataFrame,
+    edges_df: pd.DataFrame,
+    orgs1: list[str],
+    orgs2: list[str],
+    jobs: list[str],
+    grades: list[str]
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    사용자가 선택한 필터 조건에 따라 노드와 엣지를 필터링합니다.
+    """
+    filtered = filter_nodes(nodes_df, orgs1, orgs2, jobs, grades)
 
     valid_ids = set(filtered['사번'])
 
@@ -220,9 +409,8 @@ def preload_all_data():
     """
     서버 시작 시 모든 연도 데이터를 미리 로드하고 벤치마크를 계산합니다.
     """
-    global _combined_cache, _benchmarks_cache
-    _combined_cache = {}  # stale 방지
-    _benchmarks_cache = {}
+    registry.clear_derived()  # stale 방지 (결합 데이터 + 파생 테이블)
+    _benchmarks_cache.clear()
 
     print("[INFO] 데이터 사전 로딩 및 벤치마크 계산 시작...")
     
@@ -256,7 +444,7 @@ def preload_all_data():
 
     # 3. Method 1 & 2: Calculate Dynamic Benchmarks
     try:
-        _benchmarks_cache = calculate_dynamic_benchmarks(history_metrics)
+        _benchmarks_cache.put("global", calculate_dynamic_benchmarks(history_metrics))
         print(f"  ✓ 동적 벤치마크 계산 완료 ({len(history_metrics)}개 연도 기반)")
     except Exception as e:
         print(f"  ⚠️ 벤치마크 계산 실패: {e}")
@@ -0,0 +1,110 @@
+"""
+edge_aggregation.py — 여러 연도의 평가 행을 고유 (source, target) 쌍으로 집계합니다.
+
+핵심 설계 결정:
+  - 여러 연도를 선택하면 결합 데이터에 같은 쌍이 연도마다 한 행씩 반복됩니다. 그래프(DiGraph)는
+    이를 엣지 하나로 합치는데 지표의 행 기준 계산과 Vis.js 응답은 행마다 엣지를 만들어 서로 어긋났습니다.
+    연도 조합마다 쌍 단위 엣지 테이블을 한 번 만들어 캐시하고, 분석/시각화는 이 테이블을 씁니다.
+  - 쌍마다 평가 건수(weight), 처음/마지막 연도, 연도 비트마스크를 작은 정수 배열로 담습니다.
+    (year_mask의 i번째 비트 = first_year + i년에 평가 — 쌍마다 자기 첫 연도 기준이라 연도 범위와 무관)
+  - 행 기준 지표(크로스-조직 비율 등)는 weight 합으로 계산하면 원본 행과 같은 값이 됩니다.
+  - 쌍 순서는 원본에서 처음 등장한 순서입니다 (단일 연도·중복 없는 데이터는 원본 행 순서와 같음).
+
+엣지 테이블:
+    DataFrame[source, target, weight(int32), first_year(int16), last_year(int16), year_mask(int32)]
+"""
+import numpy as np
+import pandas as pd
+from config import COMBINED_CACHE_MAX_ENTRIES
+from .cache_registry import TrackedCache
+from .data_loader import normalize_employee_ids, prepare_combined_network_data, refresh_stale_sources
+
+YEAR_MASK_BITS = 31  # int32 부호 비트 제외 — 첫 연도로부터 30년 이후는 마지막 비트에 합침
+
+_edge_pair_cache = TrackedCache("edge_pairs", max_entries=COMBINED_CACHE_MAX_ENTRIES,
+                                description="연도 조합 → 고유 (평가자, 피평가자) 쌍 엣지 테이블", derived=True,
+                                snapshot=True)
+
+
+def _empty_pairs() -> pd.DataFrame:
+    return pd.DataFrame({
+        'source': pd.Series(dtype=object), 'target': pd.Series(dtype=object),
+        'weight': pd.Series(dtype=np.int32), 'first_year': pd.Series(dtype=np.int16),
+        'last_year': pd.Series(dtype=np.int16), 'year_mask': pd.Series(dtype=np.int32),
+    })
+
+
+def aggregate_edges(edges: pd.DataFrame) -> pd.DataFrame:
+    """
+    평가 행(원본 정성평가 컬럼 또는 source/target)을 고유 쌍 엣지 테이블로 집계합니다.
+
+    ★ 평가년도가 비어 있는 행은 데이터의 마지막 연도로 취급합니다 (건수에는 포함).
+    """
+    if edges is None or len(edges) == 0:
+        return _empty_pairs()
+    if 'source' in edges.columns:
+        src_ids, dst_ids = edges['source'], edges['target']
+    else:
+        src_col = [c for c in edges.columns if '평가자사번' in c][0]
+        dst_col = [c for c in edges.columns if '피평가자사번' in c][0]
+        src_ids, dst_ids = normalize_employee_ids(edges[src_col]), normalize_employee_ids(edges[dst_col])
+
+    m = len(edges)
+    codes, uniques = pd.factorize(pd.concat([src_ids, dst_ids], ignore_index=True))
+    codes = codes.astype(np.int64)
+    n = len(uniques)
+    keys = codes[:m] * n + codes[m:]
+
+    if '평가년도' in edges.columns:
+        years = pd.to_numeric(edges['평가년도'], errors='coerce')
+        years = years.fillna(years.max() if years.notna().any() else 0).to_numpy(np.int64)
+    else:
+        years = np.zeros(m, dtype=np.int64)
+
+    # 쌍 키로 정렬 (stable → 그룹의 첫 원소가 원본에서 처음 등장한 행)
+    order = np.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+    starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+    weight = np.diff(np.r_[starts, m])
+
+    sorted_years = years[order]
+    first = np.minimum.reduceat(sorted_years, starts)
+    last = np.maximum.reduceat(sorted_years, starts)
+    offset = np.minimum(sorted_years - np.repeat(first, weight), YEAR_MASK_BITS - 1)
+    mask = np.bitwise_or.reduceat(np.left_shift(np.int64(1), offset), starts)
+
+    # 처음 등장한 순서로 되돌림
+    appear = np.argsort(order[starts], kind='stable')
+    pair_keys = sorted_keys[starts][appear]
+    return pd.DataFrame({
+        'source': uniques[pair_keys // n],
+        'target': uniques[pair_keys % n],
+        'weight': weight[appear].astype(np.int32),
+        'first_year': first[appear].astype(np.int16),
+        'last_year': last[appear].astype(np.int16),
+        'year_mask': mask[appear].astype(np.int32),
+    })
+
+
+def year_list(first_year: int, year_mask: int) -> list[int]:
+    """(첫 연도, 비트마스크) → 평가 연도 목록 (오름차순)"""
+    return [int(first_year) + i for i in range(YEAR_MASK_BITS) if (int(year_mask) >> i) & 1]
+
+
+def get_edge_pairs(selected_years: list[int]) -> pd.DataFrame | None:
+    """연도 조합의 쌍 엣지 테이블 (결합 데이터가 없으면 None)"""
+    years = sorted(set(selected_years))
+
+    def compute():
+        raw_edges, _ = prepare_combined_network_data(years)
+        return aggregate_edges(raw_edges) if raw_edges is not None else None
+
+    # 원본이 바뀌었으면 derived 캐시(이 캐시 포함)가 먼저 비워짐
+    refresh_stale_sources(years)
+    return _edge_pair_cache.get_or_compute(tuple(years), compute)
+
+
+def filter_edge_pairs(pairs: pd.DataFrame, core_ids) -> pd.DataFrame:
+    """source 또는 target이 핵심 노드인 쌍만 (Ghost Node 규칙 — filter_network_data와 같음)"""
+    core = pd.Index(core_ids)
+    return pairs[pairs['source'].isin(core) | pairs['target'].isin(core)]
@@ -0,0 +1,303 @@
+"""
+excel_reader.py — 필요한 컬럼만 골라 읽는 스트리밍 엑셀 로더
+
+핵심 설계 결정:
+  - 헤더 행을 먼저 읽어 필요한 컬럼을 결정한 뒤, 본문은 그 컬럼의 셀만 값으로 변환합니다.
+    (pd.read_excel은 모든 셀을 파이썬 객체로 만든 뒤에야 컬럼을 고를 수 있습니다.)
+  - 엔진 (config.EXCEL_ENGINE)
+      calamine : python-calamine(Rust)이 설치되어 있으면 auto에서 우선 사용
+      xml      : 시트 XML을 iterparse로 스트리밍 — 필요 없는 컬럼의 셀은 값 변환 없이 버립니다.
+                 openpyxl read-only 모드보다 수 배 빠르며, 실패하면 openpyxl로 다시 읽습니다.
+      openpyxl : openpyxl read-only 모드로 행 스트리밍 (전체 DOM을 만들지 않음)
+  - 컬럼 종류별로 명시적인 타입을 적용합니다.
+      "id"   : 사번 — 정규화된 문자열 (엑셀에서 숫자로 읽힌 사번은 정수로 바꾼 뒤 문자열화)
+      "int"  : 평가년도 — 정수
+      "text" : 이름/조직/피드백 — 문자열 (빈 셀은 결측)
+  - 선택 컬럼이 모두 비어 있는 행은 건너뜁니다 (서식만 남은 꼬리 행 등).
+
+메모: xml 엔진은 셀 서식을 해석하지 않으므로 날짜 서식 셀은 엑셀 일련번호(숫자)로 읽힙니다.
+      사번/연도/이름/조직/피드백 컬럼에는 해당하지 않습니다.
+
+파일 변경 감지:
+  file_fingerprint(경로)는 (크기, 수정 시각 ns)를 반환합니다. 로더는 읽기 직전의 지문을 보관하고,
+  캐시 조회 시 지문이 달라졌으면 캐시를 버리고 다시 읽습니다 (data_loader 참고).
+"""
+import os
+import posixpath
+import zipfile
+import xml.etree.ElementTree as ET
+from typing import Callable
+import numpy as np
+import pandas as pd
+from config import EXCEL_ENGINE
+
+try:
+    import python_calamine  # noqa: F401
+    HAS_CALAMINE = True
+except ImportError:
+    HAS_CALAMINE = False
+
+# 헤더 컬럼명 목록 → {컬럼명: 종류("id" | "int" | "text")}
+ColumnSelector = Callable[[list[str]], dict[str, str]]
+
+_REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+
+
+def file_fingerprint(path: str) -> tuple[int, int] | None:
+    """파일 지문 (크기, 수정 시각 ns) — 파일이 없으면 None"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+ENGINES = ("calamine", "xml", "openpyxl")
+
+if EXCEL_ENGINE != "auto" and EXCEL_ENGINE not in ENGINES:
+    print(f"[WARN] 알 수 없는 EXCEL_ENGINE={EXCEL_ENGINE!r} → auto로 읽습니다 (auto | {' | '.join(ENGINES)})")
+
+
+def _engine() -> str:
+    if EXCEL_ENGINE in ENGINES:
+        return EXCEL_ENGINE
+    return "calamine" if HAS_CALAMINE else "xml"
+
+
+# ──────────────────────────────────────────────
+# 셀 값 → 명시적 타입
+# ──────────────────────────────────────────────
+
+def _plain(value):
+    """정수 값의 float(100000.0)는 int로 (pd.read_excel과 동일)"""
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def _header_names(row) -> list[str]:
+    """헤더 셀 → 컬럼명 (pd.read_excel과 같이 빈 셀은 'Unnamed: i', 중복은 '.1' 접미사)"""
+    names, seen = [], {}
+    for i, value in enumerate(row):
+        name = str(_plain(value)) if value is not None and value == value else f"Unnamed: {i}"
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+
+def _to_series(values: list, kind: str) -> pd.Series:
+    if kind == "id":
+        from .data_loader import normalize_employee_ids
+        return normalize_employee_ids(pd.Series([np.nan if v is None else _plain(v) for v in values], dtype=object))
+    if kind == "int":
+        years = pd.to_numeric(pd.Series(values, dtype=object), errors="coerce")
+        return years.astype("int64") if years.notna().all() else years
+    # 값은 문자열 또는 결측뿐이므로 pandas 기본 문자열 타입으로 만들어집니다 (pandas 3: str, 2: object)
+    return pd.Series([np.nan if v is None else str(_plain(v)) for v in values])
+
+
+# ──────────────────────────────────────────────
+# 읽기
+# ──────────────────────────────────────────────
+
+def read_columns(path: str, select: ColumnSelector) -> pd.DataFrame:
+    """
+    첫 시트에서 select가 고른 컬럼만 읽습니다.
+
+    Args:
+        select: 헤더 컬럼명 목록 → {컬럼명: 종류("id" | "int" | "text")}
+
+    Returns:
+        선택 컬럼만 가진 DataFrame (헤더 순서)
+    """
+    engine = _engine()
+    if engine == "calamine":
+        names, kinds, columns = _read_calamine(path, select)
+    elif engine == "xml":
+        try:
+            names, kinds, columns = _stream_xml(path, select)
+        except Exception as e:
+            print(f"[WARN] XML 스트리밍 실패, openpyxl로 다시 읽습니다 ({os.path.basename(path)}): {e}")
+            names, kinds, columns = _stream_openpyxl(path, select)
+    else:
+        names, kinds, columns = _stream_openpyxl(path, select)
+
+    # 선택 컬럼이 모두 빈 행 제외
+    if columns:
+        keep = [any(v is not None for v in row) for row in zip(*columns)]
+        if not all(keep):
+            columns = [[v for v, k in zip(col, keep) if k] for col in columns]
+
+    return pd.DataFrame({name: _to_series(col, kinds[name]) for name, col in zip(names, columns)})
+
+
+def _resolve(header: list[str], select: ColumnSelector) -> tuple[list[str], dict[str, str], list[int]]:
+    """헤더 → (선택 컬럼명, 종류, 헤더 내 위치) — 헤더 순서 유지"""
+    kinds = select(header)
+    positions = [i for i, c in enumerate(header) if c in kinds]
+    return [header[i] for i in positions], kinds, positions
+
+
+def _read_calamine(path: str, select: ColumnSelector):
+    header = _header_names(pd.read_excel(path, engine="calamine", header=None, nrows=1).iloc[0].tolist())
+    names, kinds, positions = _resolve(header, select)
+    raw = pd.read_excel(path, engine="calamine", header=None, skiprows=1, usecols=positions, dtype=object)
+    columns = [raw.iloc[:, i].where(raw.iloc[:, i].notna(), None).tolist() for i in range(len(positions))]
+    return names, kinds, columns
+
+
+def _stream_openpyxl(path: str, select: ColumnSelector):
+    """openpyxl read-only 모드로 행을 스트리밍하며 선택 컬럼 값만 모읍니다."""
+    import openpyxl
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True, keep_links=False)
+    try:
+        rows = wb.worksheets[0].iter_rows(values_only=True)
+        names, kinds, positions = _resolve(_header_names(next(rows, ())), select)
+        columns = [[] for _ in positions]
+        for row in rows:
+            width = len(row)
+            for out, p in zip(columns, positions):
+                out.append(row[p] if p < width else None)
+        return names, kinds, columns
+    finally:
+        wb.close()
+
+
+# ──────────────────────────────────────────────
+# xml 엔진 (시트 XML 직접 스트리밍)
+# ──────────────────────────────────────────────
+
+def _column_index(ref: str) -> int:
+    """셀 참조 'AB12' → 0부터 시작하는 컬럼 위치 27"""
+    n = 0
+    for ch in ref:
+        if ch.isdigit():
+            break
+        n = n * 26 + (ord(ch) - 64)
+    return n - 1
+
+
+def _part_path(target: str) -> str:
+    """관계 Target → zip 내부 경로 (절대 '/xl/...' 또는 xl/ 기준 상대 경로)"""
+    if target.startswith("/"):
+        return target.lstrip("/")
+    return posixpath.normpath(posixpath.join("xl", target))
+
+
+def _workbook_parts(z: zipfile.ZipFile) -> tuple[str, str | None]:
+    """(첫 시트 XML 경로, sharedStrings 경로 | None)"""
+    rels, shared = {}, None
+    for rel in ET.fromstring(z.read("xl/_rels/workbook.xml.rels")):
+        rels[rel.get("Id")] = rel.get("Target")
+        if rel.get("Type", "").endswith("/sharedStrings"):
+            shared = _part_path(rel.get("Target"))
+    workbook = ET.fromstring(z.read("xl/workbook.xml"))
+    first = next(el for el in workbook.iter() if el.tag.endswith("}sheet"))
+    return _part_path(rels[first.get(_REL_NS + "id")]), shared
+
+
+def _tags(tag: str) -> dict[str, str]:
+    """첫 요소의 네임스페이스로 태그 이름 표 (Transitional/Strict OOXML 모두 대응)"""
+    ns = tag[:tag.index("}") + 1] if tag.startswith("{") else ""
+    return {name: ns + name for name in ("si", "row", "c", "v", "is", "t", "r")}
+
+
+def _rich_text(el, tags: dict[str, str]) -> str:
+    """<si> / <is> 요소의 텍스트 (서식 run 포함, 윗주 rPh 제외)"""
+    parts = []
+    for child in el:
+        if child.tag == tags["t"]:
+            parts.append(child.text or "")
+        elif child.tag == tags["r"]:
+            parts.append(child.findtext(tags["t"]) or "")
+    return "".join(parts)
+
+
+def _shared_strings(z: zipfile.ZipFile, part: str | None) -> list[str]:
+    if part is None or part not in z.namelist():
+        return []
+    strings, tags = [], None
+    with z.open(part) as f:
+        for _, el in ET.iterparse(f):
+            tags = tags or _tags(el.tag)
+            if el.tag == tags["si"]:
+                strings.append(_rich_text(el, tags))
+                el.clear()
+    return strings
+
+
+def _cell_value(el, strings: list[str], tags: dict[str, str]):
+    """<c> 요소 → 파이썬 값 (빈 문자열/오류 셀은 None)"""
+    t = el.get("t")
+    if t == "inlineStr":
+        inline = el.find(tags["is"])
+        value = _rich_text(inline, tags) if inline is not None else None
+    else:
+        value = el.findtext(tags["v"])
+        if value is None or t == "e":
+            return None
+        if t == "s":
+            value = strings[int(value)]
+        elif t == "b":
+            return value == "1"
+        elif t not in ("str", "d"):
+            try:
+                return int(value)
+            except ValueError:
+                return _plain(float(value))
+    return value or None
+
+
+def _stream_xml(path: str, select: ColumnSelector):
+    """
+    첫 시트 XML을 iterparse로 스트리밍합니다.
+
+    ★ 셀 참조(r)로 컬럼 위치만 확인하고 선택하지 않은 컬럼의 셀은 값 변환 없이 버립니다.
+      처리한 행은 바로 clear하므로 메모리에는 선택 컬럼 값 목록만 남습니다.
+    """
+    with zipfile.ZipFile(path) as z:
+        sheet_part, shared_part = _workbook_parts(z)
+        strings = _shared_strings(z, shared_part)
+
+        tags = None
+        header_cells: dict[int, object] = {}
+        slot_of: dict[int, int] | None = None   # 헤더 처리 전에는 None
+        names, kinds, columns = [], {}, []
+        row_values: list = []
+        next_pos = 0
+
+        with z.open(sheet_part) as f:
+            for _, el in ET.iterparse(f):
+                tags = tags or _tags(el.tag)
+                tag = el.tag
+                if tag == tags["c"]:
+                    ref = el.get("r")
+                    pos = _column_index(ref) if ref else next_pos
+                    next_pos = pos + 1
+                    if slot_of is None:
+                        header_cells[pos] = _cell_value(el, strings, tags)
+                    elif pos in slot_of:
+                        row_values[slot_of[pos]] = _cell_value(el, strings, tags)
+                    el.clear()
+                elif tag == tags["row"]:
+                    if slot_of is None:
+                        if not header_cells:   # 헤더 앞의 빈 행
+                            el.clear()
+                            continue
+                        width = max(header_cells) + 1 if header_cells else 0
+                        header = _header_names([header_cells.get(i) for i in range(width)])
+                        names, kinds, positions = _resolve(header, select)
+                        slot_of = {p: i for i, p in enumerate(positions)}
+                        columns = [[] for _ in positions]
+                    else:
+                        for out, value in zip(columns, row_values):
+                            out.append(value)
+                    row_values = [None] * len(slot_of)
+                    next_pos = 0
+                    el.clear()
+
+        return names, kinds, columns
@@ -0,0 +1,187 @@
+"""
+feedback_analyzer.py — 정성 피드백 텍스트를 네트워크 분석에 접목합니다.
+
+핵심 설계 결정:
+  - NLP를 사용하지 않고 텍스트 길이·입력 패턴만으로 품질을 추정합니다.
+  - 라우터와 백그라운드 잡이 같은 계산을 공유하도록 서비스 계층에 둡니다.
+"""
+import pandas as pd
+from .data_loader import normalize_employee_ids, is_feedback_column
+
+
+def find_feedback_columns(edges_df: pd.DataFrame) -> list[str]:
+    """정성평가 데이터에서 자유 서술형 피드백 컬럼을 찾습니다."""
+    return [c for c in edges_df.columns if is_feedback_column(c)]
+
+
+def _prepare_feedback_frame(
+    raw_edges: pd.DataFrame,
+    valid_ids: set
+) -> tuple[pd.DataFrame, str, str, list[str]] | None:
+    """
+    valid_ids가 관여한 엣지만 남기고 피드백 길이(_fb_len)를 붙입니다.
+
+    Returns:
+        (fb_df, 평가자사번 컬럼, 피평가자사번 컬럼, 피드백 컬럼 목록) — 피드백 컬럼/대상 엣지가 없으면 None
+    """
+    # ── 텍스트 컬럼 탐색 ──
+    feedback_cols = find_feedback_columns(raw_edges)
+    if not feedback_cols:
+        return None
+
+    src_col = [c for c in raw_edges.columns if '평가자사번' in c][0]
+    dst_col = [c for c in raw_edges.columns if '피평가자사번' in c][0]
+
+    # 필터 적용
+    # ★ 노드 사번은 정규화된 문자열이므로 엣지 사번도 정규화한 뒤 비교 (숫자 사번 대응)
+    src_ids = normalize_employee_ids(raw_edges[src_col])
+    dst_ids = normalize_employee_ids(raw_edges[dst_col])
+    mask = src_ids.isin(valid_ids) | dst_ids.isin(valid_ids)
+    fb_df = raw_edges[mask].copy()
+    fb_df[src_col] = src_ids[mask]
+    fb_df[dst_col] = dst_ids[mask]
+    if fb_df.empty:
+        return None
+
+    # ── 피드백 길이 계산 ──
+    # 컬럼 단위 문자열 결합 (행 단위 ' '.join과 같은 결과, 벡터 연산)
+    texts = fb_df[feedback_cols].fillna('').astype(str)
+    combined = texts.iloc[:, 0]
+    for col in feedback_cols[1:]:
+        combined = combined + ' ' + texts[col]
+    fb_df['_fb_combined'] = combined
+    fb_df['_fb_len'] = fb_df['_fb_combined'].str.strip().str.len()
+    return fb_df, src_col, dst_col, feedback_cols
+
+
+def _individual_feedback_features(fb_df: pd.DataFrame, src_col: str, feedback_cols: list[str]) -> pd.DataFrame:
+    """
+    평가자(작성자)별 평균 피드백 길이, 작성 건수, 건설적 피드백 비율을 계산합니다.
+
+    "건설적 피드백" = 보완점/개선 관련 컬럼이 비어있지 않은 비율
+    """
+    improvement_cols = [c for c in feedback_cols if '보완' in c or '개선' in c or '발전' in c]
+
+    individual_fb = fb_df.groupby(src_col).agg(
+        avg_feedback_len=('_fb_len', 'mean'),
+        feedback_count=('_fb_len', 'count'),
+    ).reset_index().rename(columns={src_col: '사번'})
+    individual_fb['avg_feedback_len'] = individual_fb['avg_feedback_len'].round(1)
+
+    if improvement_cols:
+        # 컬럼 단위 문자열 연산 (행 단위 apply 대비 수십 배 빠름)
+        fb_df['_has_constructive'] = fb_df[improvement_cols].fillna('').astype(str).apply(
+            lambda col: col.str.strip().str.len() > 5
+        ).any(axis=1)
+        constructive_rate = fb_df.groupby(src_col)['_has_constructive'].mean().reset_index()
+        constructive_rate.columns = ['사번', 'constructive_rate']
+        constructive_rate['constructive_rate'] = (constructive_rate['constructive_rate'] * 100).round(1)
+        individual_fb = individual_fb.merge(constructive_rate, on='사번', how='left')
+    else:
+        individual_fb['constructive_rate'] = None
+    return individual_fb
+
+
+def calculate_feedback_features(raw_edges: pd.DataFrame, filtered_nodes: pd.DataFrame) -> pd.DataFrame | None:
+    """
+    필터된 노드 전원의 (작성자 기준) 피드백 특성 테이블을 반환합니다. (전체 내보내기용)
+
+    Returns:
+        DataFrame[사번, avg_feedback_len, feedback_count, constructive_rate] — 피드백 컬럼이 없으면 None
+    """
+    prepared = _prepare_feedback_frame(raw_edges, set(filtered_nodes['사번']))
+    if prepared is None:
+        return None
+    fb_df, src_col, _, feedback_cols = prepared
+    features = _individual_feedback_features(fb_df, src_col, feedback_cols)
+    return features[features['사번'].isin(set(filtered_nodes['사번']))]
+
+
+def calculate_feedback_metrics(
+    raw_edges: pd.DataFrame,
+    all_nodes: pd.DataFrame,
+    filtered_nodes: pd.DataFrame
+) -> dict:
+    """
+    필터된 노드가 관여한 정성 피드백의 품질 지표를 계산합니다.
+
+    Returns:
+        {
+            "cross_org_feedback_quality": { 같은팀/다른팀 피드백 평균 길이 비교 },
+            "individual_feedback": [ 개인별 평균 피드백 길이 + 건설적 비율 ],
+            "collusion_flags": [ 담합 의심 플래그 ],
+        }
+    """
+    prepared = _prepare_feedback_frame(raw_edges, set(filtered_nodes['사번']))
+    if prepared is None:
+        return {"cross_org_feedback_quality": None, "individual_feedback": [], "collusion_flags": []}
+    fb_df, src_col, dst_col, feedback_cols = prepared
+
+    # ── 1단계: 크로스-조직 피드백 품질 비교 ──
+    org_col = 'ORG3_OP' if 'ORG3_OP' in all_nodes.columns else 'ORG2_OP'
+    node_org = all_nodes[['사번', org_col]].drop_duplicates(subset=['사번'])
+
+    fb_merged = fb_df.merge(
+        node_org.rename(columns={'사번': src_col, org_col: 'src_org'}), on=src_col, how='left'
+    ).merge(
+        node_org.rename(columns={'사번': dst_col, org_col: 'tgt_org'}), on=dst_col, how='left'
+    )
+    fb_merged['_same_org'] = fb_merged['src_org'] == fb_merged['tgt_org']
+
+    same_len = fb_merged[fb_merged['_same_org']]['_fb_len'].mean()
+    cross_len = fb_merged[~fb_merged['_same_org']]['_fb_len'].mean()
+
+    cross_quality = {
+        "same_org_avg_len": round(same_len, 1) if not pd.isna(same_len) else 0,
+        "cross_org_avg_len": round(cross_len, 1) if not pd.isna(cross_len) else 0,
+        "org_level_used": org_col,
+    }
+
+    # ── 2단계: 개인별 피드백 길이 + 건설적 피드백 비율 ──
+    individual_fb = _individual_feedback_features(fb_df, src_col, feedback_cols)
+
+    # 노드 정보 결합
+    individual_fb = individual_fb.merge(
+        filtered_nodes[['사번', '성명', 'ORG1_OP', 'ORG2_OP', 'GRADE']],
+        on='사번', how='inner'
+    )
+    individual_fb = individual_fb.sort_values('avg_feedback_len', ascending=True).head(50)
+
+    # ── 3단계: 담합 의심 플래그 ──
+    # 조건: 상호선정 + 피드백 극단적으로 짧음 (보완점 기피)
+    edge_set = set(zip(fb_df[src_col] if src_col in fb_df.columns else fb_df['source'],
+                       fb_df[dst_col] if dst_col in fb_df.columns else fb_df['target']))
+
+    collusion_flags = []
+    for _, row in individual_fb.iterrows():
+        person_id = row['사번']
+        # 상호선정 확인
+        outgoing = {t for s, t in edge_set if s == person_id}
+        incoming = {s for s, t in edge_set if t == person_id}
+        mutual_count = len(outgoing & incoming)
+        total_connections = len(outgoing | incoming)
+        mutual_rate = mutual_count / total_connections if total_connections > 0 else 0
+
+        # 담합 의심 조건: 상호선정률 60%+ & 피드백 짧고 & 건설적 비율 낮음
+        is_suspect = (
+            mutual_rate > 0.6
+            and row['avg_feedback_len'] < 30
+            and (row.get('constructive_rate') is not None and row['constructive_rate'] < 20)
+        )
+
+        if is_suspect:
+            collusion_flags.append({
+                "사번": person_id,
+                "성명": row['성명'],
+                "ORG1_OP": row['ORG1_OP'],
+                "mutual_rate": round(mutual_rate * 100, 1),
+                "avg_feedback_len": row['avg_feedback_len'],
+                "constructive_rate": row.get('constructive_rate', 0),
+                "flag": "⚠️ 상호선정 高 + 피드백 짧음 + 보완점 기피",
+            })
+
+    return {
+        "cross_org_feedback_quality": cross_quality,
+        "individual_feedback": individual_fb.to_dict(orient='records'),
+        "collusion_flags": collusion_flags,
+    }
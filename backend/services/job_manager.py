@@ -0,0 +1,168 @@
+"""
+job_manager.py — 장시간 분석을 백그라운드 잡으로 실행하고 진행 상황을 추적합니다.
+
+핵심 설계 결정:
+  - 같은 (분석 종류, 정규화된 필터) 조합은 하나의 잡으로 중복 제거합니다.
+  - 완료된 결과는 JOB_RESULT_TTL_SEC 동안만 보관한 뒤 만료시킵니다.
+  - 취소는 협력적(cooperative)으로 처리합니다: 단계가 바뀔 때마다 취소 플래그를 확인합니다.
+"""
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from config import JOB_WORKERS, JOB_RESULT_TTL_SEC
+
+
+class JobCancelled(Exception):
+    """취소 요청된 잡이 다음 단계로 넘어가려 할 때 발생합니다."""
+
+
+class Job:
+    """단일 분석 잡의 상태 (queued → running → done/failed/cancelled)"""
+
+    def __init__(self, kind: str, key: tuple, stages: list[str]):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.key = key
+        self.status = "queued"
+        self.stages = [{"name": s, "status": "pending"} for s in stages]
+        self.result = None
+        self.error: dict | None = None
+        self.created_at = time.time()
+        self.finished_at: float | None = None
+        self._cancel_event = threading.Event()
+
+    def report(self, stage: str) -> None:
+        """
+        분석 함수가 새 단계에 진입할 때 호출하는 progress 콜백입니다.
+
+        Why: 취소 확인 지점을 단계 경계로 두면 pandas 연산 도중 강제 중단 없이
+             안전하게 잡을 멈출 수 있습니다.
+        """
+        if self._cancel_event.is_set():
+            raise JobCancelled()
+        for s in self.stages:
+            if s["status"] == "running":
+                s["status"] = "done"
+            if s["name"] == stage:
+                s["status"] = "running"
+                break
+
+    @property
+    def progress(self) -> float:
+        if self.status == "done":
+            return 1.0
+        done = sum(1 for s in self.stages if s["status"] == "done")
+        return round(done / len(self.stages), 2) if self.stages else 0.0
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in ("done", "failed", "cancelled")
+
+    def to_dict(self, include_result: bool = True) -> dict:
+        current = next((s["name"] for s in self.stages if s["status"] == "running"), None)
+        payload = {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "progress": self.progress,
+            "current_stage": current,
+            "stages": self.stages,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+        }
+        if include_result and self.status == "done":
+            payload["result"] = self.result
+        return payload
+
+
+class JobManager:
+    """
+    스레드 풀 위에서 잡을 실행하는 로컬 잡 큐.
+
+    Why: 동기 라우트가 Starlette 스레드 풀을 오래 점유하는 대신, 잡으로 실행하면
+         요청은 즉시 반환되고 클라이언트는 /api/jobs/{id}를 폴링합니다.
+    """
+
+    def __init__(self, max_workers: int = JOB_WORKERS, ttl_sec: float = JOB_RESULT_TTL_SEC):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._ttl_sec = ttl_sec
+        self._jobs: dict[str, Job] = {}
+        self._by_key: dict[tuple, str] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, kind: str, key: tuple, stages: list[str], fn) -> Job:
+        """
+        잡을 제출합니다. 같은 키로 진행 중이거나 결과가 유효한 잡이 있으면 그 잡을 반환합니다.
+
+        fn은 progress 콜백(stage: str) 하나를 인자로 받는 호출 가능 객체입니다.
+        """
+        with self._lock:
+            self._purge_expired()
+            existing_id = self._by_key.get((kind, key))
+            if existing_id is not None:
+                existing = self._jobs.get(existing_id)
+                if existing is not None and existing.status not in ("failed", "cancelled"):
+                    return existing
+
+            job = Job(kind, key, stages)
+            self._jobs[job.id] = job
+            self._by_key[(kind, key)] = job.id
+
+        self._executor.submit(self._run, job, fn)
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        with self._lock:
+            self._purge_expired()
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Job | None:
+        job = self.get(job_id)
+        if job is None:
+            return None
+        job._cancel_event.set()
+        if job.status == "queued":
+            # 아직 실행 전이면 즉시 취소 상태로 표시 (_run에서 건너뜀)
+            self._finish(job, "cancelled")
+        return job
+
+    def _run(self, job: Job, fn) -> None:
+        if job._cancel_event.is_set():
+            return
+        job.status = "running"
+        try:
+            job.result = fn(job.report)
+            for s in job.stages:
+                s["status"] = "done"
+            self._finish(job, "done")
+        except JobCancelled:
+            self._finish(job, "cancelled")
+        except Exception as e:
+            # HTTPException 등 status_code를 가진 예외는 그대로 전달
+            job.error = {
+                "status_code": getattr(e, "status_code", 500),
+                "detail": getattr(e, "detail", None) or str(e),
+            }
+            self._finish(job, "failed")
+
+    def _finish(self, job: Job, status: str) -> None:
+        job.status = status
+        job.finished_at = time.time()
+
+    def _purge_expired(self) -> None:
+        """TTL이 지난 완료 잡을 제거합니다. (호출자가 _lock 보유)"""
+        now = time.time()
+        expired = [
+            jid for jid, job in self._jobs.items()
+            if job.is_finished and job.finished_at is not None and now - job.finished_at > self._ttl_sec
+        ]
+        for jid in expired:
+            job = self._jobs.pop(jid)
+            if self._by_key.get((job.kind, job.key)) == jid:
+                del self._by_key[(job.kind, job.key)]
+
+
+# 전역 잡 매니저 (프로세스당 1개)
+job_manager = JobManager()
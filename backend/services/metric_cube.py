@@ -0,0 +1,212 @@
+"""
+metric_cube.py — 단일 연도 × ORG1 / ORG2 조합의 제도 건전성 지표를 미리 계산해 둡니다.
+
+핵심 설계 결정:
+  - 대시보드 요청 대부분은 "한 해 + ORG1 하나" 또는 "한 해 + ORG2 하나"이므로,
+    서버 시작 시 연도마다 (전체, ORG1 값별, ORG2 값별) 지표를 한 번에 계산합니다.
+  - 셀마다 필터/그래프를 만들지 않고, 연도 엣지 전체를 정수 코드 배열로 바꾼 뒤
+    np.bincount 집계로 모든 그룹을 동시에 계산합니다.
+  - 값은 calculate_system_health_metrics와 같은 정의·같은 반올림 경로로 계산합니다
+    (크로스-조직 비율은 numpy 정수, 나머지는 파이썬 정수에서 나눔).
+  - 큐브에 없는 조합(여러 연도, 여러 조직, 직군/직급 필터 등)은 None을 반환해 실시간 계산으로 넘깁니다.
+
+정의 (calculate_system_health_metrics 기준):
+  - 엣지 범위: source 또는 target이 그룹 소속인 행 (Ghost 포함)
+  - 크로스-조직 분포: Ghost 끝점의 조직은 결측이므로, 양 끝이 모두 그룹 소속이고 조직이 같은 행만 '같음'
+  - Gini / 평균 평가자 수: 그룹 구성원의 고유 out/in-degree (전체 그래프와 같음)
+  - 상호 선정 / 밀도: 양 끝이 모두 그룹 소속인 고유 (source, target) 쌍
+"""
+import numpy as np
+import pandas as pd
+from config import AVAILABLE_YEARS
+from .cache_registry import TrackedCache
+from .data_loader import prepare_combined_network_data, normalize_employee_ids
+
+CUBE_LEVELS = ['ORG1_OP', 'ORG2_OP']
+
+_cube_cache = TrackedCache("metric_cube", description="연도 → { total, ORG1_OP: {값: 지표}, ORG2_OP: {값: 지표} }",
+                           derived=True, snapshot=True)
+
+
+# ──────────────────────────────────────────────
+# 연도별 큐브 계산
+# ──────────────────────────────────────────────
+
+def _gini_sorted(values: list[int]) -> float:
+    """metrics_calculator._gini와 같은 계산 (values는 오름차순)"""
+    n = len(values)
+    total = sum(values)
+    if n == 0 or total == 0:
+        return 0.0
+    cumsum = sum((2 * (i + 1) - n - 1) * val for i, val in enumerate(values))
+    return round(cumsum / (n * total), 4)
+
+
+def _group_metrics(
+    groups: np.ndarray,
+    n_groups: int,
+    src: np.ndarray,
+    tgt: np.ndarray,
+    row_flags: dict[str, np.ndarray],
+    pair_src: np.ndarray,
+    pair_tgt: np.ndarray,
+    reciprocal: np.ndarray,
+    out_deg: np.ndarray,
+    in_deg: np.ndarray,
+    has_org3: bool,
+) -> list[dict | None]:
+    """
+    노드별 그룹 코드(groups)에 대해 그룹마다 제도 건전성 지표를 계산합니다. 엣지가 없는 그룹은 None.
+    """
+    gs, gt = groups[src], groups[tgt]
+    inside = gs == gt
+
+    def count(mask: np.ndarray | None = None) -> np.ndarray:
+        """그룹별 '양 끝 모두 그룹 소속' 행 중 mask인 행 수"""
+        selected = inside if mask is None else inside & mask
+        return np.bincount(gs[selected], minlength=n_groups)
+
+    touching = np.bincount(gs, minlength=n_groups) + np.bincount(gt, minlength=n_groups) - count()
+    same_org2 = count(row_flags['same_org2'])
+    if has_org3:
+        same_org3 = count(row_flags['same_org3'])
+        same_org2_diff_org3 = count(row_flags['same_org2'] & ~row_flags['same_org3'])
+
+    pg = groups[pair_src]
+    within = pg == groups[pair_tgt]
+    within_pairs = np.bincount(pg[within], minlength=n_groups)
+    reciprocal_pairs = np.bincount(pg[within & reciprocal], minlength=n_groups)
+
+    members = np.bincount(groups, minlength=n_groups)
+    in_sum = np.bincount(groups, weights=in_deg, minlength=n_groups)
+    # 그룹별 out-degree 오름차순 (Gini)
+    order = np.lexsort((out_deg, groups))
+    bounds = np.concatenate([[0], np.cumsum(members)])
+    sorted_out = out_deg[order]
+
+    cells = []
+    for g in range(n_groups):
+        total_edges = int(touching[g])
+        if total_edges == 0:
+            cells.append(None)
+            continue
+        m = {}
+        diff_org2 = total_edges - same_org2[g]
+        m['cross_org2_ratio'] = round(diff_org2 / total_edges, 4)
+        if has_org3:
+            m['cross_org3_ratio'] = round((total_edges - same_org3[g]) / total_edges, 4)
+            m['same_team_ratio'] = round(same_org3[g] / total_edges, 4)
+            m['same_dept_diff_team_ratio'] = round(same_org2_diff_org3[g] / total_edges, 4)
+        else:
+            m['cross_org3_ratio'] = m['cross_org2_ratio']
+            m['same_team_ratio'] = round(same_org2[g] / total_edges, 4)
+            m['same_dept_diff_team_ratio'] = 0.0
+        m['cross_dept_ratio'] = round(diff_org2 / total_edges, 4)
+
+        n = int(members[g])
+        m['gini_coefficient'] = _gini_sorted(sorted_out[bounds[g]:bounds[g + 1]].tolist())
+        pairs = int(within_pairs[g])
+        m['reciprocity'] = round(int(reciprocal_pairs[g]) / pairs, 4) if pairs else 0.0
+        m['avg_evaluators'] = round(int(in_sum[g]) / n, 1)
+        # nx.density는 엣지가 없으면 정수 0을 반환 (응답 값 형식까지 동일하게)
+        m['participation_density'] = (round(pairs / (n * (n - 1)), 4) if pairs else 0) if n > 1 else 0.0
+        cells.append(m)
+    return cells
+
+
+def build_cube(edges: pd.DataFrame, nodes: pd.DataFrame) -> dict:
+    """
+    결합 데이터(prepare_combined_network_data 결과) 하나에 대한 큐브를 계산합니다.
+
+    Returns:
+        { "total": 지표, "ORG1_OP": {값: 지표}, "ORG2_OP": {값: 지표} } — 엣지가 없는 셀은 제외(total은 None)
+    """
+    src_col = [c for c in edges.columns if '평가자사번' in c][0]
+    dst_col = [c for c in edges.columns if '피평가자사번' in c][0]
+    attrs = nodes.drop_duplicates(subset=['사번']).set_index('사번')
+    n = len(attrs)
+    src = attrs.index.get_indexer(normalize_employee_ids(edges[src_col])).astype(np.int64)
+    tgt = attrs.index.get_indexer(normalize_employee_ids(edges[dst_col])).astype(np.int64)
+
+    has_org3 = 'ORG3_OP' in attrs.columns
+    org2 = attrs['ORG2_OP'].to_numpy(dtype=object)
+    row_flags = {'same_org2': org2[src] == org2[tgt]}
+    if has_org3:
+        org3 = attrs['ORG3_OP'].to_numpy(dtype=object)
+        row_flags['same_org3'] = org3[src] == org3[tgt]
+
+    # 고유 (source, target) 쌍 + 역방향 존재 여부
+    pair_keys = np.unique(src * n + tgt)
+    pair_src, pair_tgt = pair_keys // n, pair_keys % n
+    reciprocal = np.isin(pair_tgt * n + pair_src, pair_keys)
+    out_deg = np.bincount(pair_src, minlength=n)
+    in_deg = np.bincount(pair_tgt, minlength=n)
+
+    def cells(groups: np.ndarray, n_groups: int) -> list[dict | None]:
+        return _group_metrics(groups, n_groups, src, tgt, row_flags, pair_src, pair_tgt,
+                              reciprocal, out_deg, in_deg, has_org3)
+
+    cube = {"total": cells(np.zeros(n, dtype=np.int64), 1)[0]}
+    for level in CUBE_LEVELS:
+        codes, values = pd.factorize(attrs[level], use_na_sentinel=False)
+        cube[level] = {
+            value: metrics for value, metrics in zip(values, cells(codes.astype(np.int64), len(values)))
+            if metrics is not None
+        }
+    return cube
+
+
+def _build_year_cube(year: int) -> dict | None:
+    edges, nodes = prepare_combined_network_data([year])
+    if edges is None or nodes is None or nodes.empty:
+        return None
+    return build_cube(edges, nodes)
+
+
+def get_year_cube(year: int) -> dict | None:
+    return _cube_cache.get_or_compute(year, lambda: _build_year_cube(year))
+
+
+def build_metric_cube() -> None:
+    """서버 시작 시 전체 연도의 지표 큐브를 미리 계산합니다."""
+    built = [y for y in AVAILABLE_YEARS if get_year_cube(y) is not None]
+    if built:
+        cells = sum(len(get_year_cube(y)[level]) for y in built for level in CUBE_LEVELS)
+        print(f"  ✓ 지표 큐브 계산 완료 ({len(built)}개 연도, 조직 셀 {cells}개)")
+
+
+# ──────────────────────────────────────────────
+# 조회
+# ──────────────────────────────────────────────
+
+def lookup_metric_cube(
+    years: list[int],
+    orgs1: list[str],
+    orgs2: list[str],
+    jobs: list[str],
+    grades: list[str]
+) -> dict | None:
+    """
+    필터가 큐브 셀(한 해 × [전체 | ORG1 하나 | ORG2 하나])과 정확히 일치하면 그 지표를 반환합니다.
+
+    Returns:
+        calculate_system_health_metrics와 같은 dict (복사본) — 일치하는 셀이 없으면 None
+    """
+    if len(set(years)) != 1:
+        return None
+    cube = get_year_cube(next(iter(years)))
+    return cube_cell(cube, orgs1, orgs2, jobs, grades) if cube is not None else None
+
+
+def cube_cell(cube: dict, orgs1: list[str], orgs2: list[str], jobs: list[str], grades: list[str]) -> dict | None:
+    """필터가 큐브 셀(전체 | ORG1 하나 | ORG2 하나)이면 그 지표의 복사본, 아니면 None"""
+    orgs1, orgs2 = set(orgs1), set(orgs2)
+    if jobs or grades or (orgs1 and orgs2) or len(orgs1) > 1 or len(orgs2) > 1:
+        return None
+    if orgs1:
+        metrics = cube['ORG1_OP'].get(next(iter(orgs1)))
+    elif orgs2:
+        metrics = cube['ORG2_OP'].get(next(iter(orgs2)))
+    else:
+        metrics = cube['total']
+    return dict(metrics) if metrics is not None else None
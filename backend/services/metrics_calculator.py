@@ -11,6 +11,11 @@ metrics_calculator.py — 동료평가 제도 건전성 지표를 계산합니
 
   Out-degree(어떤 사람) = 이 사람을 평가자로 선정한 피평가자 수 → 평가 부담
   In-degree(어떤 사람)  = 이 사람이 선정한 평가자 수 → (피평가자로서) 받은 평가 수
+
+엣지 입력은 원본 평가 행 또는 쌍 엣지 테이블(edge_aggregation, weight = 연도별 평가 건수)입니다.
+  - 행 기준 지표(크로스-조직 비율, 하위 조직 평균 평가자 수 등)는 weight 합으로 계산해 두 입력의 결과가 같습니다.
+  - weighted=True면 차수 기반 지표(Gini, 평균 평가자 수, 평가 부담)도 고유 쌍 대신 평가 건수로 셉니다.
+    상호 선정·밀도·폐쇄성은 관계 구조 지표이므로 항상 고유 쌍 기준입니다.
 """
 import networkx as nx
 import pandas as pd
@@ -35,6 +40,13 @@ def _gini(values: list) -> float:
     return round(cumsum / (n * total), 4)
 
 
+def _edge_weights(edges_df: pd.DataFrame) -> np.ndarray:
+    """엣지 행별 평가 건수 — 쌍 엣지 테이블이면 weight, 원본 행이면 1"""
+    if 'weight' in edges_df.columns:
+        return edges_df['weight'].to_numpy(np.int64)
+    return np.ones(len(edges_df), dtype=np.int64)
+
+
 def _enrich_edges_with_org(edges_df: pd.DataFrame, nodes_df: pd.DataFrame) -> pd.DataFrame:
     """ìţì§ì source/targetì ORG1, ORG2, ORG3 ì ë³´ë¥¼ ê²°í©í©ëë¤."""
     org_cols = ['사번', 'ORG1_OP', 'ORG2_OP']
@@ -63,11 +75,15 @@ def _enrich_edges_with_org(edges_df: pd.DataFrame, nodes_df: pd.DataFrame) -> pd
 def calculate_system_health_metrics(
     G: nx.DiGraph,
     nodes_df: pd.DataFrame,
-    edges_df: pd.DataFrame
+    edges_df: pd.DataFrame,
+    weighted: bool = False
 ) -> dict:
     """
     조직 전체의 동료평가 제도 건전성을 진단합니다.
 
+    Args:
+        weighted: True면 Gini/평균 평가자 수를 평가 건수(엣지 weight)로 계산
+
     Returns:
         {
             "cross_org_ratio":  크로스-조직 선정 비율 (0~1),
@@ -78,7 +94,9 @@ def calculate_system_health_metrics(
         }
     """
     metrics = {}
-    total_edges = len(edges_df)
+    weights = _edge_weights(edges_df)
+    total_edges = int(weights.sum())
+    degree_weight = 'weight' if weighted else None
 
     # ── 1. 크로스-조직 선정 3단계 분포 ──
     # ★ ORG3 기준이 기본 (팀 레벨에서의 크로스 비율)
@@ -87,18 +105,18 @@ def calculate_system_health_metrics(
         has_org3 = 'src_org3' in enriched.columns
 
         # ORG2 기준
-        same_org2 = (enriched['src_org2'] == enriched['tgt_org2']).sum()
+        same_org2 = int(weights[(enriched['src_org2'] == enriched['tgt_org2']).to_numpy()].sum())
         diff_org2 = total_edges - same_org2
         metrics['cross_org2_ratio'] = round(diff_org2 / total_edges, 4)
 
         # ORG3 기준 (팀 레벨) — KPI 카드의 기본 크로스 비율
         if has_org3:
-            same_org3 = (enriched['src_org3'] == enriched['tgt_org3']).sum()
+            same_org3 = int(weights[(enriched['src_org3'] == enriched['tgt_org3']).to_numpy()].sum())
             diff_org3 = total_edges - same_org3
             metrics['cross_org3_ratio'] = round(diff_org3 / total_edges, 4)
 
-            same_org2_diff_org3 = ((enriched['src_org2'] == enriched['tgt_org2']) &
-                                   (enriched['src_org3'] != enriched['tgt_org3'])).sum()
+            same_org2_diff_org3 = int(weights[((enriched['src_org2'] == enriched['tgt_org2']) &
+                                               (enriched['src_org3'] != enriched['tgt_org3'])).to_numpy()].sum())
 
             metrics['same_team_ratio'] = round(same_org3 / total_edges, 4)
             metrics['same_dept_diff_team_ratio'] = round(same_org2_diff_org3 / total_edges, 4)
@@ -119,7 +137,7 @@ def calculate_system_health_metrics(
     # Why: 특정인에게 평가 요청이 과도하게 집중되면 평가 품질이 저하됩니다.
     #      분모: 필터링된 Core Nodes (조직 구성원)
     core_ids = set(nodes_df['사번'])
-    out_degrees = [G.out_degree(n) for n in core_ids]
+    out_degrees = [G.out_degree(n, weight=degree_weight) for n in core_ids]
     metrics['gini_coefficient'] = _gini(out_degrees)
 
     # ── 3. 상호 선정 비율 (Reciprocity) ──
@@ -136,7 +154,7 @@ def calculate_system_health_metrics(
     # ── 4. 피평가자당 평균 평가자 수 ──
     # Why: 구성원이 평균적으로 몇 명의 평가자로부터 피드백을 받는지 (외부 평가 포함).
     #      분모: Core Nodes 전체 (0점자 포함)
-    in_degrees = [G.in_degree(n) for n in core_ids]
+    in_degrees = [G.in_degree(n, weight=degree_weight) for n in core_ids]
     metrics['avg_evaluators'] = round(sum(in_degrees) / len(core_ids), 1) if core_ids else 0.0
 
     # ── 5. 제도 참여 밀도 ──
@@ -247,6 +265,76 @@ def calculate_individual_metrics(
     return result
 
 
+def _per_person_rate(src: np.ndarray, tgt: np.ndarray, flags: np.ndarray,
+                     weights: np.ndarray | None = None) -> pd.Series:
+    """
+    엣지 단위 플래그를 양 끝 사람에게 배분해 사람별 비율(플래그 수 / 관여 엣지 수)을 구합니다.
+
+    ★ 자기 엣지(source == target)는 그 사람에게 1번만 집계 (원래 루프 구현과 동일)
+    ★ weights가 있으면 엣지마다 그 수만큼 센 것과 같음 (쌍 엣지 테이블 = 원본 행)
+    """
+    if weights is None:
+        weights = np.ones(len(src), dtype=np.int64)
+    not_self = src != tgt
+    people = np.concatenate([src, tgt[not_self]])
+    counts = np.concatenate([weights, weights[not_self]])
+    values = np.concatenate([flags, flags[not_self]]) * counts
+    stats = pd.DataFrame({'사번': people, 'flag': values, 'n': counts}).groupby('사번', sort=False)[['flag', 'n']].sum()
+    return (stats['flag'] / stats['n']).round(4)
+
+
+def compute_individual_metric_table(
+    G: nx.DiGraph,
+    nodes_df: pd.DataFrame,
+    edges_df: pd.DataFrame,
+    weighted: bool = False
+) -> pd.DataFrame:
+    """
+    핵심 노드 전원의 개인 지표 4종을 한 테이블로 계산합니다.
+
+    ★ calculate_individual_metrics와 같은 정의를 사람별 루프 대신 벡터 연산으로 계산합니다.
+      (사람마다 전체 엣지를 다시 훑는 O(N×E) → groupby 한 번의 O(E))
+
+    Args:
+        weighted: True면 평가 부담을 평가 건수(엣지 weight)로 계산
+
+    Returns:
+        DataFrame[사번, selection_burden, cross_org_rate, mutual_selection, group_closure]
+        (nodes_df 순서, 엣지가 없는 사람은 0)
+    """
+    core_ids = nodes_df['사번'].drop_duplicates().reset_index(drop=True)
+    table = pd.DataFrame({'사번': core_ids})
+
+    # ── 1. 평가 부담 집중도 (Out-degree) ──
+    out_deg = G.out_degree(core_ids, weight='weight' if weighted else None)
+    table['selection_burden'] = core_ids.map(dict(out_deg)).fillna(0).astype(int)
+
+    # ── 2. 크로스-조직 비율: 엣지 행(연도 중복 포함) 기준, ORG3 없으면 ORG2 ──
+    enriched = _enrich_edges_with_org(edges_df, nodes_df)
+    level = 'org3' if 'src_org3' in enriched.columns else 'org2'
+    cross = (enriched[f'src_{level}'] != enriched[f'tgt_{level}']).to_numpy()
+    cross_rate = _per_person_rate(enriched['source'].to_numpy(), enriched['target'].to_numpy(), cross,
+                                  _edge_weights(edges_df))
+    table['cross_org_rate'] = core_ids.map(cross_rate).fillna(0.0)
+
+    # ── 3. 상호 선정 비율: 고유 (source, target) 쌍 기준 ──
+    pairs = edges_df[['source', 'target']].drop_duplicates()
+    ps, pt = pairs['source'].to_numpy(), pairs['target'].to_numpy()
+    codes, uniques = pd.factorize(np.concatenate([ps, pt]))
+    codes = codes.astype(np.int64)
+    s_code, t_code = codes[:len(ps)], codes[len(ps):]
+    n = len(uniques)
+    # 쌍을 int64 하나로 인코딩해 역방향 쌍 존재 여부를 한 번에 검사
+    mutual = np.isin(t_code * n + s_code, s_code * n + t_code)
+    mutual_rate = _per_person_rate(ps, pt, mutual)
+    table['mutual_selection'] = core_ids.map(mutual_rate).fillna(0.0)
+
+    # ── 4. 평가 그룹 폐쇄성 (Clustering) — 핵심 노드만 계산 ──
+    table['group_closure'] = core_ids.map(nx.clustering(G, core_ids.tolist())).fillna(0.0)
+
+    return table
+
+
 # ══════════════════════════════════════════════
 #  하위 조직별 비교
 # ══════════════════════════════════════════════
@@ -262,8 +350,10 @@ def calculate_subgroup_metrics(
 
     ★ 엣지 범위: KPI 카드와 동일하게 Ghost 포함 (source OR target이 그룹 소속)
     ★ 크로스-조직: ORG1, ORG2, ORG3 3개 레벨 모두 계산
+    ★ 엣지 수·평균 평가자 수·Gini는 평가 건수 기준 (쌍 엣지 테이블이면 weight 합)
     """
     groups = nodes_df[group_col].dropna().unique()
+    edges_df = edges_df.assign(weight=_edge_weights(edges_df))
     enriched = _enrich_edges_with_org(edges_df, nodes_df)
     edge_set = set(zip(edges_df['source'], edges_df['target']))
     has_org3 = 'src_org3' in enriched.columns
@@ -288,18 +378,19 @@ def calculate_subgroup_metrics(
             (enriched['source'].isin(member_ids)) | (enriched['target'].isin(member_ids))
         ]
 
-        n_edges = len(group_edges)
+        n_edges = int(group_edges['weight'].sum())
         if n_edges == 0:
             continue
 
         # ── 크로스-조직 비율: 3개 레벨 모두 계산 ──
-        cross_org1 = (group_enriched['src_org1'] != group_enriched['tgt_org1']).sum()
-        cross_org2 = (group_enriched['src_org2'] != group_enriched['tgt_org2']).sum()
+        group_weights = group_enriched['weight']
+        cross_org1 = int(group_weights[group_enriched['src_org1'] != group_enriched['tgt_org1']].sum())
+        cross_org2 = int(group_weights[group_enriched['src_org2'] != group_enriched['tgt_org2']].sum())
         cross_org1_ratio = round(cross_org1 / n_edges, 4)
         cross_org2_ratio = round(cross_org2 / n_edges, 4)
 
         if has_org3:
-            cross_org3 = (group_enriched['src_org3'] != group_enriched['tgt_org3']).sum()
+            cross_org3 = int(group_weights[group_enriched['src_org3'] != group_enriched['tgt_org3']].sum())
             cross_org3_ratio = round(cross_org3 / n_edges, 4)
         else:
             cross_org3_ratio = cross_org2_ratio
@@ -317,11 +408,11 @@ def calculate_subgroup_metrics(
         # ── 평균 평가자 수 (in-degree: 그룹 멤버가 받은 평가 수) ──
         # 분모: 해당 그룹의 총 인원 수 (node_count) - 0점자 포함
         in_edges = edges_df[edges_df['target'].isin(member_ids)]
-        avg_eval = round(len(in_edges) / node_count, 1)
+        avg_eval = round(int(in_edges['weight'].sum()) / node_count, 1)
 
         # ── Gini (평가 부담 집중도 — 그룹 멤버의 out-degree) ──
         group_src_edges = edges_df[edges_df['source'].isin(member_ids)]
-        out_degs = group_src_edges.groupby('source').size().reindex(member_ids, fill_value=0).tolist()
+        out_degs = group_src_edges.groupby('source')['weight'].sum().reindex(member_ids, fill_value=0).tolist()
         gini = _gini(out_degs)
 
         results.append({
@@ -5,6 +5,8 @@ network_builder.py — NetworkX 그래프를 생성합니다.
   - 필터링된 노드/엣지 DataFrame으로부터 NetworkX DiGraph를 생성합니다.
   - Ghost Node(경계 노드) 지원: 필터 대상이 아닌 외부 연결 노드를 반투명으로 표시합니다.
   - Vis.js가 브라우저에서 직접 렌더링하므로, 서버에서 HTML을 생성할 필요가 없습니다.
+  - 쌍 엣지 테이블(edge_aggregation)을 받으면 평가 건수를 그래프 엣지의 weight 속성과
+    Vis.js 엣지 하나(value = 건수, 연도 목록)로 전달합니다.
 """
 import networkx as nx
 import pandas as pd
@@ -14,9 +16,12 @@ from config import COLORS
 def build_graph(nodes_df: pd.DataFrame, edges_df: pd.DataFrame) -> nx.DiGraph:
     """
     필터링된 데이터로 NetworkX 방향 그래프(DiGraph)를 생성합니다.
+
+    ★ 쌍 엣지 테이블이면 엣지에 weight(평가 건수) 속성을 붙입니다 (degree(weight='weight')로 건수 합).
     """
     G = nx.from_pandas_edgelist(
         edges_df, source='source', target='target',
+        edge_attr='weight' if 'weight' in edges_df.columns else None,
         create_using=nx.DiGraph()
     )
     # 고립 노드 추가 (밀도 계산 등에서 분모가 됨)
@@ -24,6 +29,70 @@ def build_graph(nodes_df: pd.DataFrame, edges_df: pd.DataFrame) -> nx.DiGraph:
     return G
 
 
+# ──────────────────────────────────────────────
+# Vis.js 노드/엣지 스타일 (전체 네트워크와 에고 네트워크가 공유)
+# ──────────────────────────────────────────────
+
+def vis_core_node(row, color_map: dict) -> dict:
+    """핵심 노드 (row: 사번/성명/ORG1_OP/ORG2_OP/JOB_FAMILY_CODE/GRADE를 가진 Series 또는 dict)"""
+    return {
+        "id": row['사번'],
+        "label": f"{row['성명']}",
+        "title": (
+            f"성명: {row['성명']}\n"
+            f"사번: {row['사번']}\n"
+            f"ORG1: {row['ORG1_OP']}\n"
+            f"ORG2: {row['ORG2_OP']}\n"
+            f"직군: {row.get('JOB_FAMILY_CODE', '-')}\n"
+            f"직급: {row.get('GRADE', '-')}"
+        ),
+        "color": color_map.get(row['ORG1_OP'], '#97C2FC'),
+        "org1": row['ORG1_OP'],
+        "isGhost": False,
+    }
+
+
+def vis_ghost_node(gid, name: str, org1: str) -> dict:
+    """Ghost 노드 (필터 외부 연결, 반투명)"""
+    return {
+        "id": gid,
+        "label": f"{name}",
+        "title": f"[외부 연결] ORG1: {org1}",
+        "color": {
+            "background": "rgba(180,180,180,0.3)",
+            "border": "rgba(120,120,120,0.5)",
+        },
+        "org1": org1,
+        "isGhost": True,
+        "borderDashes": [5, 5],
+        "font": {"color": "rgba(100,100,100,0.6)"},
+    }
+
+
+def vis_edge(src, tgt, is_cross: bool, weight: int | None = None, years: list[int] | None = None) -> dict:
+    """
+    엣지 (Ghost 노드와 연결된 엣지는 점선)
+
+    weight/years를 주면 쌍 하나에 평가 건수와 평가 연도를 담습니다. (프론트엔드는 건수로 선 두께를 정함)
+    """
+    edge = {
+        "from": src,
+        "to": tgt,
+        "dashes": is_cross,
+        "color": {"color": "rgba(150,150,150,0.4)"} if is_cross else {"color": "rgba(100,100,100,0.6)"},
+    }
+    if weight is not None:
+        edge["value"] = weight
+        edge["years"] = years or []
+        edge["title"] = f"평가 {weight}회 ({', '.join(map(str, years or []))})"
+    return edge
+
+
+def org_color_map(org1_values) -> dict:
+    """ORG1 등장 순서대로 팔레트 색상을 배정합니다."""
+    return {org: COLORS[i % len(COLORS)] for i, org in enumerate(pd.unique(pd.Series(list(org1_values), dtype=object)))}
+
+
 def graph_to_vis_json(
     nodes_df: pd.DataFrame,
     edges_df: pd.DataFrame,
@@ -36,10 +105,12 @@ def graph_to_vis_json(
       - nodes_df: 필터로 선택된 '핵심' 노드
       - all_nodes_df: HR 정보가 포함된 전체 노드 (Ghost 노드 정보 조회용)
       - edges_df에 등장하지만 nodes_df에 없는 노드 → Ghost Node로 표시
+
+    ★ edges_df가 쌍 엣지 테이블이면 쌍마다 엣지 하나 (value = 평가 건수, years = 평가 연도)
+      summary.edge_count는 쌍 수, summary.evaluation_count는 평가 건수(원본 행 수)입니다.
     """
     # 조직별 색상 매핑
-    unique_orgs = nodes_df['ORG1_OP'].unique()
-    color_map = {org: COLORS[i % len(COLORS)] for i, org in enumerate(unique_orgs)}
+    color_map = org_color_map(nodes_df['ORG1_OP'])
 
     core_ids = set(nodes_df['사번'])
 
@@ -57,51 +128,29 @@ def graph_to_vis_json(
     vis_nodes = []
     # 핵심 노드 (정상 표시)
     for _, row in nodes_df.iterrows():
-        vis_nodes.append({
-            "id": row['사번'],
-            "label": f"{row['성명']}",
-            "title": (
-                f"성명: {row['성명']}\n"
-                f"사번: {row['사번']}\n"
-                f"ORG1: {row['ORG1_OP']}\n"
-                f"ORG2: {row['ORG2_OP']}\n"
-                f"직군: {row.get('JOB_FAMILY_CODE', '-')}\n"
-                f"직급: {row.get('GRADE', '-')}"
-            ),
-            "color": color_map.get(row['ORG1_OP'], '#97C2FC'),
-            "org1": row['ORG1_OP'],
-            "isGhost": False,
-        })
+        vis_nodes.append(vis_core_node(row, color_map))
 
     # Ghost 노드 (반투명 표시)
-    for gid in ghost_ids:
+    # 번들·캐시 결과가 프로세스마다 같도록 정렬 (set 순회 순서는 해시 시드에 따라 다름)
+    for gid in sorted(ghost_ids):
         info = ghost_info.get(gid, {})
         org1 = info.get('ORG1_OP', 'Unknown') if isinstance(info, pd.Series) else info.get('ORG1_OP', 'Unknown')
         name = info.get('성명', str(gid)) if isinstance(info, pd.Series) else str(gid)
-        vis_nodes.append({
-            "id": gid,
-            "label": f"{name}",
-            "title": f"[외부 연결] ORG1: {org1}",
-            "color": {
-                "background": "rgba(180,180,180,0.3)",
-                "border": "rgba(120,120,120,0.5)",
-            },
-            "org1": org1,
-            "isGhost": True,
-            "borderDashes": [5, 5],
-            "font": {"color": "rgba(100,100,100,0.6)"},
-        })
+        vis_nodes.append(vis_ghost_node(gid, name, org1))
 
     vis_edges = []
-    for _, row in edges_df.iterrows():
-        src, tgt = row['source'], row['target']
-        is_cross = (src in ghost_ids) or (tgt in ghost_ids)
-        vis_edges.append({
-            "from": src,
-            "to": tgt,
-            "dashes": is_cross,
-            "color": {"color": "rgba(150,150,150,0.4)"} if is_cross else {"color": "rgba(100,100,100,0.6)"},
-        })
+    if 'weight' in edges_df.columns:
+        from .edge_aggregation import year_list  # edge_aggregation → data_loader → network_builder 순환 방지
+        for src, tgt, weight, first, mask in zip(edges_df['source'], edges_df['target'], edges_df['weight'],
+                                                 edges_df['first_year'], edges_df['year_mask']):
+            vis_edges.append(vis_edge(src, tgt, (src in ghost_ids) or (tgt in ghost_ids),
+                                      int(weight), year_list(first, mask)))
+        evaluation_count = int(edges_df['weight'].sum())
+    else:
+        for _, row in edges_df.iterrows():
+            src, tgt = row['source'], row['target']
+            vis_edges.append(vis_edge(src, tgt, (src in ghost_ids) or (tgt in ghost_ids)))
+        evaluation_count = len(vis_edges)
 
     return {
         "nodes": vis_nodes,
@@ -109,6 +158,7 @@ def graph_to_vis_json(
         "summary": {
             "node_count": len([n for n in vis_nodes if not n.get('isGhost')]),
             "edge_count": len(vis_edges),
+            "evaluation_count": evaluation_count,
             "ghost_count": len(ghost_ids),
         },
         "color_legend": {org: color for org, color in color_map.items()},
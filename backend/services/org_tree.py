@@ -0,0 +1,102 @@
+"""
+org_tree.py — 연도 조합별 조직 계층 트리(ORG1 → ORG2 → ORG3)를 만들어 캐시합니다.
+
+핵심 설계 결정:
+  - 필터 캐스케이드(ORG1 선택 → ORG2/직군/직급 선택지)를 프론트엔드가 트리 하나로 직접 계산하도록,
+    연도 조합마다 트리를 한 번만 만들어 직렬화된 JSON 바이트 + ETag로 보관합니다.
+  - 단계마다 인원 수와 직군/직급별 인원 수를 담습니다. 직군/직급 값은 최상위 사전(dims)의
+    인덱스로 참조해 응답 크기를 줄입니다.
+  - ETag는 응답 본문의 해시이므로 서버를 재시작해도 데이터가 같으면 같은 값입니다 (If-None-Match → 304).
+  - 인원 기준은 get_filter_options와 같은 노드 테이블(평가자 + 피평가자, 속성 결측은 'Unknown')입니다.
+
+응답 구조:
+    {
+      "years": [2025],
+      "dims": {"jobs": ["J01", ...], "grades": ["G1", ...]},
+      "count": 1234, "jobs": [[0, 500], [1, 734]], "grades": [[0, 12], ...],
+      "orgs1": [
+        {"name": "A본부", "count": 300, "jobs": [[i, n], ...], "grades": [[i, n], ...],
+         "children": [{"name": "A1실", ..., "children": [{"name": "A1팀", ...}]}]}
+      ]
+    }
+"""
+import hashlib
+import json
+import pandas as pd
+from config import ORG_TREE_CACHE_MAX_ENTRIES
+from .cache_registry import TrackedCache
+from .data_loader import prepare_combined_network_data
+
+LEVELS = ['ORG1_OP', 'ORG2_OP', 'ORG3_OP']
+
+_org_tree_cache = TrackedCache("org_tree", max_entries=ORG_TREE_CACHE_MAX_ENTRIES,
+                               description="연도 조합 → (조직 트리 JSON 바이트, ETag)", derived=True)
+
+
+def _value_codes(nodes: pd.DataFrame, col: str) -> tuple[list[str], pd.Series | None]:
+    """컬럼 값 사전(오름차순)과 행별 인덱스. 컬럼이 없으면 ([], None)"""
+    if col not in nodes.columns:
+        return [], None
+    values = nodes[col].dropna().astype(str)
+    names = sorted(values.unique().tolist())
+    codes = values.map({name: i for i, name in enumerate(names)})
+    return names, codes
+
+
+def _counts(codes: pd.Series | None) -> list[list[int]]:
+    """[[값 인덱스, 인원 수], ...] (인덱스 오름차순)"""
+    if codes is None or codes.empty:
+        return []
+    counts = codes.value_counts().sort_index()
+    return [[int(i), int(n)] for i, n in counts.items()]
+
+
+def build_org_tree(nodes: pd.DataFrame, years: list[int]) -> dict:
+    """
+    노드 테이블(prepare_combined_network_data 결과)로 조직 계층 트리를 만듭니다.
+    """
+    nodes = nodes.drop_duplicates(subset=['사번'])
+    job_names, job_codes = _value_codes(nodes, 'JOB_FAMILY_CODE')
+    grade_names, grade_codes = _value_codes(nodes, 'GRADE')
+    levels = [col for col in LEVELS if col in nodes.columns]
+
+    def subtree(index: pd.Index, depth: int) -> dict:
+        node = {
+            "count": int(len(index)),
+            "jobs": _counts(job_codes.reindex(index).dropna() if job_codes is not None else None),
+            "grades": _counts(grade_codes.reindex(index).dropna() if grade_codes is not None else None),
+        }
+        if depth < len(levels):
+            col = levels[depth]
+            groups = nodes.loc[index].groupby(col, sort=True).groups
+            node["children"] = [
+                {"name": str(name), **subtree(groups[name], depth + 1)} for name in sorted(groups, key=str)
+            ]
+        return node
+
+    root = subtree(nodes.index, 0)
+    return {
+        "years": years,
+        "dims": {"jobs": job_names, "grades": grade_names},
+        "count": root["count"],
+        "jobs": root["jobs"],
+        "grades": root["grades"],
+        "orgs1": root.get("children", []),
+    }
+
+
+def get_org_tree(selected_years: list[int]) -> tuple[bytes, str] | None:
+    """
+    연도 조합의 조직 트리를 (JSON 바이트, ETag)로 반환합니다. 데이터가 없으면 None.
+    """
+    years = sorted(set(selected_years))
+
+    def compute():
+        _, nodes = prepare_combined_network_data(years)
+        if nodes is None:
+            return None
+        tree = build_org_tree(nodes, years)
+        body = json.dumps(tree, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        return body, f'"{hashlib.sha1(body).hexdigest()[:20]}"'
+
+    return _org_tree_cache.get_or_compute(tuple(years), compute)
@@ -0,0 +1,310 @@
+"""
+perf.py — 요청 단위 단계별 시간 측정과 롤링 지연 통계를 관리합니다.
+
+핵심 설계 결정:
+  - 요청마다 RequestTimer를 ContextVar에 두고, 핫패스 코드는 `with stage("build_graph"):`로 구간을 기록합니다.
+    (계측 대상 요청이 아니면 stage()는 아무것도 하지 않으므로 잡/스크립트 실행에는 비용이 없습니다.)
+  - 결과는 Server-Timing 응답 헤더로 내보내 브라우저 개발자 도구에서 바로 확인합니다.
+  - 엔드포인트 × 단계별 최근 PERF_WINDOW개 요청으로 백분위를, 누적 버킷으로 히스토그램을 유지합니다.
+  - PERF_PROFILING_ENABLED일 때만 X-Profile 요청에 대해 cProfile을 캡처합니다.
+    프로파일러는 프로세스에 하나만 켭니다 — 이미 다른 요청을 캡처 중이면 건너뛰고 X-Profile-Skipped로 알림.
+    async 핸들러는 이벤트 루프 스레드의 구간만 측정합니다 (asyncio.to_thread·프로세스 풀의 계산은 포함되지 않음).
+"""
+import cProfile
+import functools
+import inspect
+import io
+import pstats
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from fastapi.routing import APIRoute
+from config import PERF_WINDOW, PERF_BUCKETS_MS, PERF_PROFILING_ENABLED, PERF_PROFILE_KEEP
+
+
+class RequestTimer:
+    """한 요청의 단계별 소요 시간 (ms)"""
+
+    def __init__(self, profile: bool = False):
+        self.started = time.perf_counter()
+        self.stages: dict[str, float] = {}
+        self.handler_ms: float | None = None
+        self.handler_done_at: float | None = None
+        self.profile = profile
+        self.profile_id: str | None = None
+        self.profile_skipped = False
+
+    def add(self, name: str, ms: float) -> None:
+        # 같은 단계가 여러 번 실행되면 합산 (예: 연도별 로딩)
+        self.stages[name] = self.stages.get(name, 0.0) + ms
+
+
+_current_timer: ContextVar[RequestTimer | None] = ContextVar("perf_timer", default=None)
+
+
+@contextmanager
+def stage(name: str):
+    """현재 요청의 단계 구간을 측정합니다. 계측 중인 요청이 없으면 no-op입니다."""
+    timer = _current_timer.get()
+    if timer is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timer.add(name, (time.perf_counter() - started) * 1000)
+
+
+@contextmanager
+def collect_stages():
+    """
+    블록 안의 stage() 시간을 새 타이머에 모아 dict로 제공합니다.
+
+    Why: 프로세스 풀 워커에는 요청 타이머가 없으므로, 워커에서 모은 단계 시간을
+         결과와 함께 돌려보내 add_stages()로 요청의 Server-Timing에 합칩니다.
+    """
+    timer = RequestTimer()
+    token = _current_timer.set(timer)
+    try:
+        yield timer.stages
+    finally:
+        _current_timer.reset(token)
+
+
+def add_stages(stages: dict[str, float]) -> None:
+    """다른 프로세스에서 잰 단계 시간을 현재 요청에 더합니다. 계측 중인 요청이 없으면 no-op입니다."""
+    timer = _current_timer.get()
+    if timer is not None:
+        for name, ms in stages.items():
+            timer.add(name, ms)
+
+
+# ──────────────────────────────────────────────
+# 롤링 지연 통계
+# ──────────────────────────────────────────────
+
+class _Series:
+    """단일 (엔드포인트, 단계)의 최근 샘플 + 누적 히스토그램"""
+
+    def __init__(self):
+        self.samples: deque[float] = deque(maxlen=PERF_WINDOW)
+        self.buckets = [0] * (len(PERF_BUCKETS_MS) + 1)
+        self.count = 0
+
+    def record(self, ms: float) -> None:
+        self.samples.append(ms)
+        self.count += 1
+        for i, bound in enumerate(PERF_BUCKETS_MS):
+            if ms <= bound:
+                self.buckets[i] += 1
+                break
+        else:
+            self.buckets[-1] += 1
+
+    def summary(self) -> dict:
+        ordered = sorted(self.samples)
+        n = len(ordered)
+
+        def pct(p: float) -> float:
+            return round(ordered[min(n - 1, int(p * n))], 2) if n else 0.0
+
+        labels = [f"le_{b}" for b in PERF_BUCKETS_MS] + ["gt_" + str(PERF_BUCKETS_MS[-1])]
+        return {
+            "count": self.count,
+            "window": n,
+            "p50_ms": pct(0.50),
+            "p90_ms": pct(0.90),
+            "p99_ms": pct(0.99),
+            "max_ms": round(ordered[-1], 2) if n else 0.0,
+            "histogram": dict(zip(labels, self.buckets)),
+        }
+
+
+class PerfStats:
+    def __init__(self):
+        self._series: dict[str, dict[str, _Series]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, endpoint: str, timings: dict[str, float]) -> None:
+        with self._lock:
+            per_stage = self._series.setdefault(endpoint, {})
+            for name, ms in timings.items():
+                per_stage.setdefault(name, _Series()).record(ms)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                endpoint: {name: series.summary() for name, series in stages.items()}
+                for endpoint, stages in sorted(self._series.items())
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+
+perf_stats = PerfStats()
+
+# 최근 프로파일 (id → pstats 텍스트)
+_profiles: "OrderedDict[str, dict]" = OrderedDict()
+_profiles_lock = threading.Lock()
+# ★ cProfile 훅은 스레드/이벤트 루프 단위로 겹치면 서로 덮어쓰고, 3.12+에서는 두 번째 enable()이 실패함
+_profiler_lock = threading.Lock()
+
+
+def get_profile(profile_id: str) -> dict | None:
+    with _profiles_lock:
+        return _profiles.get(profile_id)
+
+
+def list_profiles() -> list[dict]:
+    with _profiles_lock:
+        return [{"profile_id": pid, "endpoint": p["endpoint"], "created_at": p["created_at"]} for pid, p in _profiles.items()]
+
+
+def _store_profile(profiler: cProfile.Profile, endpoint: str) -> str:
+    buffer = io.StringIO()
+    pstats.Stats(profiler, stream=buffer).sort_stats("cumulative").print_stats(50)
+    profile_id = uuid.uuid4().hex[:12]
+    with _profiles_lock:
+        _profiles[profile_id] = {"endpoint": endpoint, "created_at": time.time(), "stats": buffer.getvalue()}
+        while len(_profiles) > PERF_PROFILE_KEEP:
+            _profiles.popitem(last=False)
+    return profile_id
+
+
+@contextmanager
+def _profiled(timer: "RequestTimer | None", endpoint: str):
+    """요청이 프로파일을 원하고 다른 캡처가 없으면 블록을 cProfile로 측정합니다."""
+    if timer is None or not timer.profile:
+        yield
+        return
+    if not _profiler_lock.acquire(blocking=False):
+        timer.profile_skipped = True
+        yield
+        return
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+        yield
+    finally:
+        profiler.disable()
+        _profiler_lock.release()
+        timer.profile_id = _store_profile(profiler, endpoint)
+
+
+# ──────────────────────────────────────────────
+# FastAPI 연결: 라우트 클래스 + ASGI 미들웨어
+# ──────────────────────────────────────────────
+
+def _timed_endpoint(endpoint, path: str):
+    """
+    엔드포인트 함수를 감싸 핸들러 시간과 종료 시각을 기록합니다.
+
+    Why: 핸들러 종료 ~ 응답 헤더 전송 사이가 곧 JSON 인코딩 시간이므로,
+         종료 시각을 남겨두면 미들웨어가 encode 단계를 계산할 수 있습니다.
+         동기 핸들러는 스레드 풀에서 실행되므로 cProfile도 이 안에서 켜야 해당 스레드가 측정됩니다.
+         async 핸들러의 프로파일은 이벤트 루프에서 실행된 부분(대기 중 처리한 다른 요청 포함)만 담습니다.
+    """
+    if getattr(endpoint, "_perf_timed", False):
+        # include_router가 라우트를 다시 만들 때 이미 감싼 함수가 다시 들어오므로 중복 래핑 방지
+        return endpoint
+
+    def _finish(timer: RequestTimer, started: float) -> None:
+        timer.handler_done_at = time.perf_counter()
+        timer.handler_ms = (timer.handler_done_at - started) * 1000
+
+    if inspect.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def async_wrapper(*args, **kwargs):
+            timer = _current_timer.get()
+            started = time.perf_counter()
+            try:
+                with _profiled(timer, path):
+                    return await endpoint(*args, **kwargs)
+            finally:
+                if timer is not None:
+                    _finish(timer, started)
+        async_wrapper._perf_timed = True
+        return async_wrapper
+
+    @functools.wraps(endpoint)
+    def wrapper(*args, **kwargs):
+        timer = _current_timer.get()
+        started = time.perf_counter()
+        try:
+            with _profiled(timer, path):
+                return endpoint(*args, **kwargs)
+        finally:
+            if timer is not None:
+                _finish(timer, started)
+    wrapper._perf_timed = True
+    return wrapper
+
+
+class TimedRoute(APIRoute):
+    """핸들러 시간을 기록하는 APIRoute (APIRouter(route_class=TimedRoute)로 사용)"""
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        super().__init__(path, _timed_endpoint(endpoint, path), **kwargs)
+
+
+def _wants_profile(scope) -> bool:
+    if not PERF_PROFILING_ENABLED:
+        return False
+    headers = dict(scope.get("headers") or [])
+    if headers.get(b"x-profile") == b"1":
+        return True
+    return b"profile=1" in (scope.get("query_string") or b"").split(b"&")
+
+
+class ServerTimingMiddleware:
+    """
+    /api 요청의 단계별 시간을 Server-Timing 헤더로 내보내고 롤링 통계에 기록합니다.
+
+    Server-Timing 예: prepare_combined;dur=12.3, filter;dur=40.1, build_graph;dur=95.0,
+                      handler;dur=210.4, encode;dur=18.2, total;dur=231.0
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith("/api"):
+            await self.app(scope, receive, send)
+            return
+
+        timer = RequestTimer(profile=_wants_profile(scope))
+        token = _current_timer.set(timer)
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                now = time.perf_counter()
+                timings = dict(timer.stages)
+                if timer.handler_ms is not None:
+                    timings["handler"] = timer.handler_ms
+                    timings["encode"] = (now - timer.handler_done_at) * 1000
+                timings["total"] = (now - timer.started) * 1000
+
+                route = scope.get("route")
+                endpoint = f"{scope['method']} {route.path if route is not None else scope['path']}"
+                perf_stats.record(endpoint, timings)
+
+                header = ", ".join(f"{name};dur={ms:.1f}" for name, ms in timings.items())
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", header.encode("latin-1")))
+                if timer.profile_id:
+                    headers.append((b"x-profile-id", timer.profile_id.encode("latin-1")))
+                elif timer.profile_skipped:
+                    headers.append((b"x-profile-skipped", b"busy"))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_timer.reset(token)
@@ -0,0 +1,242 @@
+"""
+person_table.py — 필터별 개인 지표 테이블을 만들어 캐시하고, 정렬·페이지 단위 조회를 제공합니다.
+
+핵심 설계 결정:
+  - 필터(정규화 키)마다 전원의 지표 테이블을 한 번만 계산해 TrackedCache에 보관합니다.
+    탭 전환·페이지 이동·정렬 변경은 테이블을 다시 계산하지 않습니다.
+  - 상위 k개는 np.argpartition으로 후보만 고른 뒤 후보만 정렬합니다 (전체 정렬 X).
+  - 동점은 테이블 행 순서로 풀어서 페이지 경계가 항상 결정적입니다.
+  - 커서(keyset) 페이지네이션: 마지막 행의 (정렬 키, 행 번호)를 토큰으로 전달합니다.
+"""
+import base64
+import json
+from typing import Awaitable, Callable
+import networkx as nx
+import numpy as np
+import pandas as pd
+from config import TOP_PERCENT, PERSON_TABLE_CACHE_MAX_ENTRIES
+from .cache_registry import TrackedCache
+from .metrics_calculator import compute_individual_metric_table
+from .feedback_analyzer import calculate_feedback_features
+
+ATTR_COLUMNS = ['사번', '성명', 'ORG1_OP', 'ORG2_OP', 'ORG3_OP', 'JOB_FAMILY_CODE', 'GRADE']
+GRAPH_METRIC_COLUMNS = ['selection_burden', 'in_degree', 'cross_org_rate', 'mutual_selection', 'group_closure']
+FEEDBACK_COLUMNS = ['avg_feedback_len', 'feedback_count', 'constructive_rate']
+# /api/metrics/individual (Top N%)이 내보내는 지표
+TOP_LIST_METRICS = ['selection_burden', 'cross_org_rate', 'mutual_selection', 'group_closure']
+
+_person_table_cache = TrackedCache("person_table", max_entries=PERSON_TABLE_CACHE_MAX_ENTRIES,
+                                   description="필터 키 → 개인 지표 테이블", derived=True)
+
+
+# ──────────────────────────────────────────────
+# 테이블 생성 / 캐시
+# ──────────────────────────────────────────────
+
+def build_person_table(
+    G: nx.DiGraph,
+    nodes_df: pd.DataFrame,
+    edges_df: pd.DataFrame,
+    raw_edges: pd.DataFrame,
+    weighted: bool = False
+) -> pd.DataFrame:
+    """
+    필터 대상 전원의 조직 속성 + 네트워크 지표 + 작성 피드백 특성 테이블을 만듭니다.
+
+    weighted=True면 평가 부담/받은 평가 수를 평가 건수(엣지 weight)로 계산합니다.
+
+    Returns:
+        DataFrame[사번, 성명, ORG1~3, 직군, 직급, selection_burden, in_degree, cross_org_rate,
+                  mutual_selection, group_closure, avg_feedback_len, feedback_count, constructive_rate]
+    """
+    metrics = compute_individual_metric_table(G, nodes_df, edges_df, weighted)
+    # 받은 평가 수 (이 사람이 선정한 평가자 수)
+    in_deg = G.in_degree(metrics['사번'], weight='weight' if weighted else None)
+    metrics.insert(2, 'in_degree', metrics['사번'].map(dict(in_deg)).fillna(0).astype(int))
+
+    attr_cols = [c for c in ATTR_COLUMNS if c in nodes_df.columns]
+    table = nodes_df[attr_cols].drop_duplicates(subset=['사번']).merge(metrics, on='사번', how='left')
+
+    features = calculate_feedback_features(raw_edges, nodes_df) if len(edges_df) else None
+    if features is None:
+        table = table.assign(avg_feedback_len=np.nan, feedback_count=0, constructive_rate=np.nan)
+    else:
+        table = table.merge(features, on='사번', how='left')
+        table['feedback_count'] = table['feedback_count'].fillna(0).astype(int)
+    return table.reset_index(drop=True)
+
+
+def get_person_table(key: tuple, builder: Callable[[], pd.DataFrame]) -> pd.DataFrame:
+    """필터 키의 캐시된 테이블을 반환하고, 없으면 builder()로 만들어 캐시합니다. (동시 miss는 한 번만 계산)"""
+    return _person_table_cache.get_or_compute(key, builder)
+
+
+async def get_person_table_async(key: tuple, builder: Callable[[], Awaitable[pd.DataFrame]]) -> pd.DataFrame:
+    """get_person_table의 async 버전 (builder는 코루틴 함수 — 프로세스 풀 계산을 기다림)"""
+    return await _person_table_cache.get_or_compute_async(key, builder)
+
+
+# ──────────────────────────────────────────────
+# 정렬 키 + 부분 선택 (Top-k)
+# ──────────────────────────────────────────────
+
+def _sort_keys(column: pd.Series, descending: bool) -> np.ndarray:
+    """
+    컬럼을 '작을수록 앞' 순서의 float 키로 변환합니다.
+
+    ★ 문자열 컬럼은 정렬된 고유값의 순번으로, 결측값은 방향과 무관하게 항상 맨 뒤(inf)로 보냅니다.
+    """
+    if pd.api.types.is_numeric_dtype(column) and not pd.api.types.is_bool_dtype(column):
+        keys = column.to_numpy(dtype=float, na_value=np.nan)
+    else:
+        codes, _ = pd.factorize(column, sort=True)
+        keys = codes.astype(float)
+        keys[codes < 0] = np.nan
+    keys = -keys if descending else keys.copy()
+    keys[np.isnan(keys)] = np.inf
+    return keys
+
+
+def top_k(keys: np.ndarray, candidates: np.ndarray, k: int) -> np.ndarray:
+    """
+    candidates(행 번호, 오름차순) 중 (키, 행 번호) 순서 상위 k개를 정렬된 상태로 반환합니다.
+
+    Why: 전원 정렬(O(N log N)) 대신 argpartition으로 k번째 키를 찾고(O(N)),
+         그 이하 후보(동점 포함)만 정렬합니다.
+    """
+    if k <= 0 or len(candidates) == 0:
+        return candidates[:0]
+    cand_keys = keys[candidates]
+    if k < len(candidates):
+        kth = cand_keys[np.argpartition(cand_keys, k - 1)[k - 1]]
+        within = cand_keys <= kth
+        candidates, cand_keys = candidates[within], cand_keys[within]
+    order = np.lexsort((candidates, cand_keys))[:k]
+    return candidates[order]
+
+
+def _encode_cursor(sort: str, order: str, key: float, row: int) -> str:
+    payload = json.dumps({"s": sort, "o": order, "k": key, "i": int(row)})
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def _decode_cursor(cursor: str, sort: str, order: str) -> tuple[float, int]:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        key, row = float(payload["k"]), int(payload["i"])
+    except (ValueError, KeyError, TypeError):
+        raise ValueError("잘못된 커서입니다.")
+    if payload.get("s") != sort or payload.get("o") != order:
+        raise ValueError("커서의 정렬 조건이 요청과 다릅니다.")
+    return key, row
+
+
+def _to_records(page: pd.DataFrame) -> list[dict]:
+    page = page.round(4)
+    # ★ NaN → None (JSON null)
+    return page.astype(object).where(page.notna(), None).to_dict(orient='records')
+
+
+# ──────────────────────────────────────────────
+# 조회
+# ──────────────────────────────────────────────
+
+def query_person_table(
+    table: pd.DataFrame,
+    sort: str = "selection_burden",
+    order: str = "desc",
+    offset: int = 0,
+    limit: int = 50,
+    cursor: str | None = None,
+    min_values: dict[str, float] | None = None,
+    max_values: dict[str, float] | None = None,
+) -> dict:
+    """
+    정렬·임계값·페이지 조건으로 테이블 일부를 반환합니다.
+
+    ★ cursor가 있으면 offset은 무시하고 커서 다음 행부터 반환합니다.
+
+    Raises:
+        ValueError: 알 수 없는 컬럼, 숫자가 아닌 컬럼의 임계값, 잘못된 커서
+
+    Returns:
+        { "total", "matched", "sort", "order", "offset", "limit", "rows": [...], "next_cursor" }
+    """
+    if sort not in table.columns:
+        raise ValueError(f"정렬할 수 없는 컬럼입니다: {sort}")
+    if order not in ("asc", "desc"):
+        raise ValueError("order는 asc 또는 desc여야 합니다.")
+
+    mask = np.ones(len(table), dtype=bool)
+    for bounds, is_min in ((min_values or {}, True), (max_values or {}, False)):
+        for col, value in bounds.items():
+            if col not in table.columns or not pd.api.types.is_numeric_dtype(table[col]):
+                raise ValueError(f"임계값을 적용할 수 없는 컬럼입니다: {col}")
+            values = table[col].to_numpy(dtype=float, na_value=np.nan)
+            mask &= (values >= value) if is_min else (values <= value)
+    candidates = np.flatnonzero(mask)
+    matched = len(candidates)
+
+    keys = _sort_keys(table[sort], order == "desc")
+    if cursor:
+        last_key, last_row = _decode_cursor(cursor, sort, order)
+        cand_keys = keys[candidates]
+        candidates = candidates[(cand_keys > last_key) | ((cand_keys == last_key) & (candidates > last_row))]
+        offset = 0
+
+    selected = top_k(keys, candidates, offset + limit)[offset:]
+    remaining = len(candidates) - offset - len(selected)
+    next_cursor = None
+    if len(selected) and remaining > 0:
+        last = selected[-1]
+        next_cursor = _encode_cursor(sort, order, keys[last], last)
+
+    return {
+        "total": len(table),
+        "matched": matched,
+        "sort": sort,
+        "order": order,
+        "offset": offset,
+        "limit": limit,
+        "rows": _to_records(table.iloc[selected]),
+        "next_cursor": next_cursor,
+    }
+
+
+def top_percent_lists(table: pd.DataFrame) -> dict:
+    """
+    지표별 상위 TOP_PERCENT 명단 (/api/metrics/individual 응답 형식)
+
+    Returns:
+        { "selection_burden": [{사번, value, 성명, ORG1_OP, ORG2_OP, GRADE}, ...], ... }
+    """
+    all_rows = np.arange(len(table))
+    top_n = max(5, int(len(table) * TOP_PERCENT))
+    display = table[['사번', '성명', 'ORG1_OP', 'ORG2_OP', 'GRADE']].fillna(
+        {'성명': '-', 'ORG1_OP': 'Unknown', 'ORG2_OP': 'Unknown', 'GRADE': '-'}
+    )
+
+    result = {}
+    for key in TOP_LIST_METRICS:
+        rows = top_k(_sort_keys(table[key], descending=True), all_rows, top_n)
+        df_top = display.iloc[rows].copy()
+        df_top.insert(1, 'value', table[key].iloc[rows].round(4).to_numpy())
+        result[key] = _to_records(df_top)
+    return result
+
+
+def export_rankings(table: pd.DataFrame, columns: list[str]) -> dict:
+    """
+    테이블 전체 행(JSON 레코드)과 컬럼별 내림차순 순위(행 번호 목록)를 반환합니다.
+
+    ★ 정적 번들(precompute.py)에서 사용합니다. 순위는 query_person_table과 같은 키/동점 규칙으로
+      반올림 전 값 기준이므로, 번들에서 순위를 잘라 쓰면 서버 조회와 같은 페이지가 나옵니다.
+
+    Returns:
+        { "rows": [...], "order": {컬럼: [행 번호, ...]} }
+    """
+    everyone = np.arange(len(table))
+    return {
+        "rows": _to_records(table),
+        "order": {c: top_k(_sort_keys(table[c], True), everyone, len(table)).tolist() for c in columns},
+    }
@@ -0,0 +1,515 @@
+"""
+query_engine.py — (선택) DuckDB 쿼리 엔진: 연도별 Parquet 파티션에 대한 필터·조직 결합·집계
+
+핵심 설계 결정:
+  - 로드된 정성평가(연도별)와 HR 기본정보를 데이터 버전마다 연도별 Parquet 파티션으로 기록합니다.
+    정성평가는 분석에 필요한 컬럼(정규화된 사번, 이름, 행 순번)만, HR은 평가년도별로 나눠 씁니다.
+  - 노드 속성 결합(최신 HR), 필터(filter_network_data), 엣지의 조직 결합(_enrich_edges_with_org),
+    제도 건전성/하위 조직 집계를 SQL로 실행합니다. 선택 연도의 파티션만 읽고,
+    DuckDB가 여러 스레드로 실행하며 memory_limit를 넘으면 임시 디렉토리로 내려씁니다 (out-of-core).
+  - 정의는 pandas 경로(prepare_combined_network_data + metrics_calculator)와 같습니다.
+    정수 집계(건수, 차수, 상호 쌍)까지 SQL에서 구하고, 비율/반올림/Gini는 파이썬에서 같은 식으로 계산합니다.
+  - duckdb가 없거나(QUERY_ENGINE=pandas 포함) 쿼리가 실패하면 None을 반환하고, 호출부는 pandas로 계산합니다.
+
+정의 (pandas 경로 기준):
+  - 노드: 선택 연도 엣지의 평가자 → 피평가자 순으로 처음 등장한 사번, 속성은 선택 연도 중 최신 HR (없으면 Unknown)
+  - 엣지 범위: source 또는 target이 필터 대상인 행 (Ghost 포함), 끝점 조직은 필터 대상 노드에서만 결합
+  - 크로스-조직: 같음은 양 끝이 모두 필터 대상이고 조직이 같은 행 (Ghost 끝점은 결측 → 다름)
+  - Gini / 평균 평가자 수: 고유 쌍 차수 (weighted면 평가 건수), 상호 선정 / 밀도: 필터 대상 간 고유 쌍
+
+디렉토리 구조:
+    QUERY_ENGINE_DIR/
+      <데이터 버전>/
+        manifest.json                       ← 연도 목록, HR 컬럼
+        edges/year=2025/part-0.parquet      ← source, target, src_name, tgt_name, year, row_id
+        hr/year=2025/part-0.parquet         ← 사번, ORG1_OP…GRADE, year, hr_row
+
+메모: duckdb가 설치된 경우에만 동작합니다. 그래프가 필요한 분석(네트워크, 개인 지표)은 pandas/networkx 경로를 씁니다.
+"""
+import json
+import os
+import re
+import shutil
+import threading
+import time
+import numpy as np
+import pandas as pd
+from config import (
+    AVAILABLE_YEARS,
+    QUERY_ENGINE,
+    QUERY_ENGINE_DIR,
+    QUERY_ENGINE_THREADS,
+    QUERY_ENGINE_MEMORY_LIMIT,
+    QUERY_ENGINE_KEEP_VERSIONS,
+)
+from .data_loader import data_version, load_hr_master_data, load_qualitative_data, normalize_employee_ids
+
+try:
+    import duckdb
+except ImportError:  # 선택 의존성
+    duckdb = None
+
+ATTR_COLUMNS = ['ORG1_OP', 'ORG2_OP', 'ORG3_OP', 'JOB_FAMILY_CODE', 'GRADE']
+_MANIFEST = "manifest.json"
+
+_engine: "QueryEngine | None" = None
+_failed_version: str | None = None   # 파티션 기록에 실패한 버전 (요청마다 다시 시도하지 않음)
+_engine_lock = threading.Lock()
+
+
+def is_available() -> bool:
+    return duckdb is not None and QUERY_ENGINE != "pandas"
+
+
+def _gini_sorted(values: list[int]) -> float:
+    """metrics_calculator._gini와 같은 계산 (values는 오름차순)"""
+    n = len(values)
+    total = sum(values)
+    if n == 0 or total == 0:
+        return 0.0
+    cumsum = sum((2 * (i + 1) - n - 1) * val for i, val in enumerate(values))
+    return round(cumsum / (n * total), 4)
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+# ──────────────────────────────────────────────
+# 파티션 기록
+# ──────────────────────────────────────────────
+
+def _text(values: pd.Series) -> pd.Series:
+    """이름/조직 값을 문자열로 통일 (엑셀에서 숫자로 읽힌 값 포함, 결측은 유지)"""
+    return values.map(lambda v: None if pd.isna(v) else str(v)).astype(object)
+
+
+def _copy_parquet(con, df: pd.DataFrame, path: str) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    con.register("part_df", df)
+    try:
+        con.execute(f"COPY part_df TO '{path.replace(chr(39), chr(39) * 2)}' (FORMAT parquet, COMPRESSION zstd)")
+    finally:
+        con.unregister("part_df")
+
+
+def write_partitions(qualitative: dict[int, pd.DataFrame | None], hr_df: pd.DataFrame | None, out_dir: str) -> dict:
+    """
+    정성평가(연도별)와 HR 기본정보를 out_dir 아래 연도별 Parquet 파티션으로 기록합니다.
+
+    Returns:
+        manifest {"years", "hr_years", "hr_columns"(HR이 없으면 None), "created_at"}
+    """
+    con = duckdb.connect()
+    years = []
+    try:
+        for year, df in sorted(qualitative.items()):
+            if df is None or df.empty:
+                continue
+            src_id_col = [c for c in df.columns if '평가자사번' in c][0]
+            dst_id_col = [c for c in df.columns if '피평가자사번' in c][0]
+            src_name_col = next((c for c in df.columns if '평가자성명' in c), None)
+            dst_name_col = next((c for c in df.columns if '피평가자성명' in c), None)
+            no_name = pd.Series([None] * len(df), index=df.index, dtype=object)
+            edges = pd.DataFrame({
+                'source': normalize_employee_ids(df[src_id_col]).astype(object),
+                'target': normalize_employee_ids(df[dst_id_col]).astype(object),
+                'src_name': _text(df[src_name_col]) if src_name_col else no_name,
+                'tgt_name': _text(df[dst_name_col]) if dst_name_col else no_name,
+                'year': np.full(len(df), year, dtype=np.int32),
+                'row_id': np.arange(len(df), dtype=np.int64),
+            })
+            _copy_parquet(con, edges, os.path.join(out_dir, "edges", f"year={year}", "part-0.parquet"))
+            years.append(int(year))
+
+        hr_years, hr_columns = [], None
+        if hr_df is not None:
+            hr_columns = [c for c in ATTR_COLUMNS if c in hr_df.columns]
+            hr = pd.DataFrame({'사번': _text(hr_df['사번'])})
+            for col in hr_columns:
+                hr[col] = _text(hr_df[col])
+            hr['year'] = pd.to_numeric(hr_df['평가년도'], errors='coerce')
+            hr['hr_row'] = np.arange(len(hr), dtype=np.int64)
+            for year, part in hr.dropna(subset=['year']).groupby('year', sort=True):
+                part = part.assign(year=part['year'].astype(np.int32))
+                _copy_parquet(con, part, os.path.join(out_dir, "hr", f"year={int(year)}", "part-0.parquet"))
+                hr_years.append(int(year))
+    finally:
+        con.close()
+
+    manifest = {"years": years, "hr_years": hr_years, "hr_columns": hr_columns, "created_at": time.time()}
+    with open(os.path.join(out_dir, _MANIFEST), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False)
+    return manifest
+
+
+def _ensure_partitions(version: str, qualitative: dict, hr_df: pd.DataFrame | None) -> str:
+    """데이터 버전의 파티션 디렉토리 (없으면 임시 디렉토리에 기록한 뒤 이름을 바꿔 원자적으로 공개)"""
+    root = os.path.join(QUERY_ENGINE_DIR, re.sub(r'[^0-9A-Za-z._-]', '_', version))
+    if os.path.exists(os.path.join(root, _MANIFEST)):
+        return root
+
+    os.makedirs(QUERY_ENGINE_DIR, exist_ok=True)
+    tmp = f"{root}.tmp-{os.getpid()}-{threading.get_ident()}"
+    shutil.rmtree(tmp, ignore_errors=True)
+    write_partitions(qualitative, hr_df, tmp)
+    try:
+        os.rename(tmp, root)
+    except OSError:
+        # 다른 프로세스(풀 워커 등)가 같은 버전을 먼저 기록함
+        shutil.rmtree(tmp, ignore_errors=True)
+    _cleanup_old_versions(keep=os.path.basename(root))
+    return root
+
+
+def _cleanup_old_versions(keep: str) -> None:
+    """오래된 버전 파티션을 정리합니다. (최근 QUERY_ENGINE_KEEP_VERSIONS개 보관)"""
+    versions = [
+        d for d in os.listdir(QUERY_ENGINE_DIR)
+        if d != keep and '.tmp-' not in d and os.path.exists(os.path.join(QUERY_ENGINE_DIR, d, _MANIFEST))
+    ]
+    versions.sort(key=lambda d: os.path.getmtime(os.path.join(QUERY_ENGINE_DIR, d)))
+    for old in versions[:-QUERY_ENGINE_KEEP_VERSIONS] if QUERY_ENGINE_KEEP_VERSIONS else versions:
+        shutil.rmtree(os.path.join(QUERY_ENGINE_DIR, old), ignore_errors=True)
+
+
+# ──────────────────────────────────────────────
+# 쿼리 엔진
+# ──────────────────────────────────────────────
+
+class QueryEngine:
+    """
+    한 데이터 버전의 파티션 디렉토리에 대한 쿼리.
+
+    요청마다 커서(독립 연결)를 열어 필터 대상 노드(core)와 범위 엣지(fe)를 임시 테이블로 만든 뒤 집계합니다.
+    선택 연도에 파티션이 하나도 없으면 None (호출부의 pandas 경로가 404를 응답).
+    """
+
+    def __init__(self, root: str, version: str | None = None):
+        with open(os.path.join(root, _MANIFEST), encoding="utf-8") as f:
+            manifest = json.load(f)
+        self.root = root
+        self.version = version
+        self.years = set(manifest["years"])
+        self.hr_years = set(manifest["hr_years"])
+        self.hr_columns = manifest["hr_columns"]
+        # prepare_combined_network_data의 노드 컬럼: HR이 없으면 속성 전체(Unknown), 있으면 HR에 있는 속성만
+        self.node_columns = ATTR_COLUMNS if self.hr_columns is None else list(self.hr_columns)
+        self._con = duckdb.connect(config={
+            "threads": max(1, QUERY_ENGINE_THREADS),
+            "memory_limit": QUERY_ENGINE_MEMORY_LIMIT,
+            "temp_directory": os.path.join(QUERY_ENGINE_DIR, f"spill-{os.getpid()}"),
+        })
+
+    @classmethod
+    def from_frames(cls, qualitative: dict[int, pd.DataFrame | None], hr_df: pd.DataFrame | None, root: str) -> "QueryEngine":
+        """메모리의 테이블로 파티션을 기록하고 엔진을 엽니다 (검증 하네스용)"""
+        write_partitions(qualitative, hr_df, root)
+        return cls(root)
+
+    def _files(self, kind: str, years: list[int], available: set[int]) -> list[str]:
+        return [os.path.join(self.root, kind, f"year={y}", "part-0.parquet") for y in sorted(set(years)) if y in available]
+
+    # ── 공통: 노드 결합 + 필터 ──
+
+    def _open(self, years: list[int], orgs1: list[str], orgs2: list[str], jobs: list[str], grades: list[str]):
+        """
+        core(필터 대상 노드)와 fe(범위 엣지 + 끝점 속성) 임시 테이블을 만든 커서. 선택 연도에 데이터가 없으면 None.
+        """
+        edge_files = self._files("edges", years, self.years)
+        if not edge_files:
+            return None
+        hr_files = self._files("hr", years, self.hr_years)
+        attrs = self.node_columns
+        attr_list = ", ".join(_quote(c) for c in attrs)
+        params = [edge_files]
+
+        if self.hr_columns is not None and hr_files:
+            # ★ 선택 연도 중 최신 HR 행 (같은 연도면 파일의 뒤쪽 행)
+            latest = (f'SELECT "사번", {attr_list} FROM read_parquet(?) '
+                      f'QUALIFY row_number() OVER (PARTITION BY "사번" ORDER BY year DESC, hr_row DESC) = 1')
+            params.append(hr_files)
+        else:
+            latest = "SELECT " + ", ".join(f"NULL::VARCHAR AS {_quote(c)}" for c in ['사번'] + attrs) + " WHERE false"
+        # HR이 있으면 결합 결과 전체(이름 포함)의 결측을 Unknown으로 채움 — HR이 없으면 이름은 원본 그대로
+        name_expr = "coalesce(ids.name, 'Unknown')" if self.hr_columns is not None else "ids.name"
+        attr_exprs = ", ".join(f"coalesce(h.{_quote(c)}, 'Unknown') AS {_quote(c)}" for c in attrs)
+
+        conditions = []
+        for col, values in (('ORG1_OP', orgs1), ('ORG2_OP', orgs2), ('JOB_FAMILY_CODE', jobs), ('GRADE', grades)):
+            if not values:
+                continue
+            if col not in attrs:
+                if col in ('ORG1_OP', 'ORG2_OP'):
+                    return None  # pandas 경로와 같은 오류 응답을 위해 넘김
+                continue  # 직군/직급 컬럼이 없으면 필터 생략 (filter_nodes와 같음)
+            conditions.append(f"list_contains(?::VARCHAR[], {_quote(col)})")
+            params.append([str(v) for v in values])
+        where = " AND ".join(conditions) or "true"
+
+        cur = self._con.cursor()
+        try:
+            # 처음 등장 순서 키: (평가자 0 / 피평가자 1, 연도, 행 순번)
+            cur.execute(f"""
+                CREATE TEMP TABLE core AS
+                WITH e AS (SELECT * FROM read_parquet(?)),
+                appear AS (
+                    SELECT source AS id, src_name AS name, (year::BIGINT << 32) | row_id AS k FROM e
+                    UNION ALL
+                    SELECT target, tgt_name, (1::BIGINT << 56) | (year::BIGINT << 32) | row_id FROM e
+                ),
+                ids AS (SELECT id, arg_min_null(name, k) AS name, min(k) AS pos FROM appear GROUP BY id),
+                latest AS ({latest}),
+                nodes AS (
+                    SELECT ids.id AS "사번", {name_expr} AS "성명", {attr_exprs}, ids.pos
+                    FROM ids LEFT JOIN latest h ON h."사번" = ids.id
+                )
+                SELECT * FROM nodes WHERE {where}
+            """, params)
+
+            endpoint_cols = ", ".join(
+                f"{side}.{_quote(c)} AS {side}_{c}" for side in ('s', 't') for c in attrs
+            )
+            cur.execute(f"""
+                CREATE TEMP TABLE fe AS
+                SELECT e.source, e.target, e.year, e.row_id, {endpoint_cols},
+                       s."사번" IS NOT NULL AS s_core, t."사번" IS NOT NULL AS t_core
+                FROM read_parquet(?) e
+                LEFT JOIN core s ON s."사번" = e.source
+                LEFT JOIN core t ON t."사번" = e.target
+                WHERE s."사번" IS NOT NULL OR t."사번" IS NOT NULL
+            """, [edge_files])
+        except Exception:
+            cur.close()
+            raise
+        return cur
+
+    def filter_network(
+        self, years: list[int], orgs1: list[str], orgs2: list[str], jobs: list[str], grades: list[str]
+    ) -> tuple[pd.DataFrame, pd.DataFrame] | None:
+        """
+        filter_network_data와 같은 필터 결과: (필터 대상 노드, 범위 엣지[source, target, 평가년도])
+
+        ★ 엣지는 분석에 필요한 컬럼만 반환합니다 (원본 피드백 컬럼 제외).
+        """
+        cur = self._open(years, orgs1, orgs2, jobs, grades)
+        if cur is None:
+            return None
+        try:
+            nodes = cur.execute("SELECT * EXCLUDE (pos) FROM core ORDER BY pos").df()
+            edges = cur.execute('SELECT source, target, year AS "평가년도" FROM fe ORDER BY year, row_id').df()
+        finally:
+            cur.close()
+        return nodes, edges
+
+    # ── 제도 건전성 (calculate_system_health_metrics) ──
+
+    def system_health(
+        self, years: list[int], orgs1: list[str], orgs2: list[str], jobs: list[str], grades: list[str],
+        weighted: bool = False
+    ) -> tuple[dict, int] | None:
+        """
+        Returns:
+            (calculate_system_health_metrics와 같은 dict, 범위 엣지 행 수) — 데이터가 없으면 None
+        """
+        if 'ORG1_OP' not in self.node_columns or 'ORG2_OP' not in self.node_columns:
+            return None
+        has_org3 = 'ORG3_OP' in self.node_columns
+        cur = self._open(years, orgs1, orgs2, jobs, grades)
+        if cur is None:
+            return None
+        try:
+            org3_counts = ("count(*) FILTER (WHERE s_ORG3_OP = t_ORG3_OP), "
+                           "count(*) FILTER (WHERE s_ORG2_OP = t_ORG2_OP AND s_ORG3_OP <> t_ORG3_OP)"
+                           if has_org3 else "0, 0")
+            total, same_org2, same_org3, same_org2_diff_org3 = cur.execute(
+                f"SELECT count(*), count(*) FILTER (WHERE s_ORG2_OP = t_ORG2_OP), {org3_counts} FROM fe"
+            ).fetchone()
+            (n_core,) = cur.execute("SELECT count(*) FROM core").fetchone()
+
+            out_deg = "count(*)" if weighted else "count(DISTINCT target)"
+            in_deg = "count(*)" if weighted else "count(DISTINCT source)"
+            out_degrees = [d for (d,) in cur.execute(
+                f"SELECT {out_deg} AS d FROM fe WHERE s_core GROUP BY source ORDER BY d"
+            ).fetchall()]
+            (in_total,) = cur.execute(
+                f"SELECT coalesce(sum(d), 0) FROM (SELECT {in_deg} AS d FROM fe WHERE t_core GROUP BY target)"
+            ).fetchone()
+            core_pairs, reciprocal = cur.execute("""
+                WITH cc AS (SELECT DISTINCT source, target FROM fe WHERE s_core AND t_core)
+                SELECT (SELECT count(*) FROM cc),
+                       (SELECT count(*) FROM cc a JOIN cc b ON a.source = b.target AND a.target = b.source)
+            """).fetchone()
+        finally:
+            cur.close()
+
+        metrics = {}
+        if total > 0:
+            diff_org2 = total - same_org2
+            metrics['cross_org2_ratio'] = round(diff_org2 / total, 4)
+            if has_org3:
+                metrics['cross_org3_ratio'] = round((total - same_org3) / total, 4)
+                metrics['same_team_ratio'] = round(same_org3 / total, 4)
+                metrics['same_dept_diff_team_ratio'] = round(same_org2_diff_org3 / total, 4)
+            else:
+                metrics['cross_org3_ratio'] = metrics['cross_org2_ratio']
+                metrics['same_team_ratio'] = round(same_org2 / total, 4)
+                metrics['same_dept_diff_team_ratio'] = 0.0
+            metrics['cross_dept_ratio'] = round(diff_org2 / total, 4)
+        else:
+            for key in ['cross_org2_ratio', 'cross_org3_ratio', 'same_team_ratio',
+                        'same_dept_diff_team_ratio', 'cross_dept_ratio']:
+                metrics[key] = 0.0
+
+        # 평가 이력이 없는 필터 대상은 차수 0
+        metrics['gini_coefficient'] = _gini_sorted([0] * (n_core - len(out_degrees)) + out_degrees)
+        metrics['reciprocity'] = round(reciprocal / core_pairs, 4) if core_pairs else 0.0
+        metrics['avg_evaluators'] = round(int(in_total) / n_core, 1) if n_core else 0.0
+        metrics['participation_density'] = round(core_pairs / (n_core * (n_core - 1)), 4) if n_core > 1 else 0.0
+        return metrics, int(total)
+
+    # ── 하위 조직 비교 (calculate_subgroup_metrics) ──
+
+    def subgroup_metrics(
+        self, years: list[int], orgs1: list[str], orgs2: list[str], jobs: list[str], grades: list[str],
+        group_col: str
+    ) -> tuple[list[dict], int] | None:
+        """
+        Returns:
+            (calculate_subgroup_metrics와 같은 목록, 범위 엣지 행 수) — 데이터가 없거나 그룹 컬럼이 노드 속성이 아니면 None
+        """
+        if group_col not in self.node_columns or 'ORG1_OP' not in self.node_columns or 'ORG2_OP' not in self.node_columns:
+            return None
+        has_org3 = 'ORG3_OP' in self.node_columns
+        cur = self._open(years, orgs1, orgs2, jobs, grades)
+        if cur is None:
+            return None
+        g = _quote(group_col)
+        sg, tg = _quote(f"s_{group_col}"), _quote(f"t_{group_col}")
+        # 조직 비교: Ghost 끝점의 조직은 결측 → 다름 (pandas의 NaN != 값)
+        cross = ", ".join(
+            f"NOT coalesce(s_{c} = t_{c}, false) AS x{i}"
+            for i, c in enumerate(['ORG1_OP', 'ORG2_OP'] + (['ORG3_OP'] if has_org3 else []), start=1)
+        )
+        flags = "x1, x2" + (", x3" if has_org3 else "")
+        try:
+            (total,) = cur.execute("SELECT count(*) FROM fe").fetchone()
+            rows = cur.execute(f"""
+                WITH gm AS (
+                    SELECT {g} AS grp, count(*) AS members, min(pos) AS first_pos
+                    FROM core WHERE {g} IS NOT NULL AND {g} <> 'Unknown'
+                    GROUP BY {g} HAVING count(*) >= 3
+                ),
+                flagged AS (SELECT {sg} AS sg, {tg} AS tg, {cross} FROM fe),
+                grp_rows AS (
+                    SELECT sg AS grp, {flags} FROM flagged WHERE sg IS NOT NULL
+                    UNION ALL
+                    SELECT tg, {flags} FROM flagged WHERE tg IS NOT NULL AND tg IS DISTINCT FROM sg
+                ),
+                agg AS (
+                    SELECT grp, count(*) AS n_edges, count(*) FILTER (WHERE x1) AS c1,
+                           count(*) FILTER (WHERE x2) AS c2{", count(*) FILTER (WHERE x3) AS c3" if has_org3 else ""}
+                    FROM grp_rows GROUP BY grp
+                ),
+                ind AS (SELECT {tg} AS grp, count(*) AS n_in FROM fe WHERE {tg} IS NOT NULL GROUP BY {tg}),
+                outd AS (
+                    SELECT grp, list(d) AS degs FROM (
+                        SELECT {sg} AS grp, count(*) AS d FROM fe WHERE {sg} IS NOT NULL GROUP BY {sg}, source
+                    ) GROUP BY grp
+                ),
+                cg AS (SELECT DISTINCT {sg} AS grp, source, target FROM fe WHERE {sg} = {tg}),
+                rc AS (
+                    SELECT a.grp, count(*) AS n_pairs, count(b.source) AS n_recip
+                    FROM cg a LEFT JOIN cg b ON b.grp = a.grp AND b.source = a.target AND b.target = a.source
+                    GROUP BY a.grp
+                )
+                SELECT gm.grp, gm.members, agg.n_edges, agg.c1, agg.c2, {"agg.c3" if has_org3 else "NULL"},
+                       coalesce(ind.n_in, 0), outd.degs, coalesce(rc.n_pairs, 0), coalesce(rc.n_recip, 0)
+                FROM gm JOIN agg USING (grp) LEFT JOIN ind USING (grp) LEFT JOIN outd USING (grp) LEFT JOIN rc USING (grp)
+                ORDER BY gm.members DESC, gm.first_pos
+            """).fetchall()
+        finally:
+            cur.close()
+
+        results = []
+        for group, members, n_edges, c1, c2, c3, n_in, degs, n_pairs, n_recip in rows:
+            cross_org2_ratio = round(c2 / n_edges, 4)
+            degs = degs or []
+            results.append({
+                'group_name': group,
+                'member_count': int(members),
+                'cross_org1_ratio': round(c1 / n_edges, 4),
+                'cross_org2_ratio': cross_org2_ratio,
+                'cross_org3_ratio': round(c3 / n_edges, 4) if has_org3 else cross_org2_ratio,
+                'reciprocity': round(n_recip / n_pairs, 4) if n_pairs else 0.0,
+                'avg_evaluators': round(int(n_in) / members, 1),
+                'gini_coefficient': _gini_sorted(sorted([0] * (members - len(degs)) + list(degs))),
+            })
+        return results, int(total)
+
+
+# ──────────────────────────────────────────────
+# 현재 데이터 버전의 엔진
+# ──────────────────────────────────────────────
+
+def get_query_engine() -> QueryEngine | None:
+    """
+    현재 데이터 버전의 엔진 (파티션이 없으면 기록). duckdb가 없거나 QUERY_ENGINE=pandas면 None.
+    """
+    global _engine, _failed_version
+    if not is_available():
+        return None
+    version = data_version()
+    engine = _engine
+    if engine is not None and engine.version == version:
+        return engine
+    if version == _failed_version:
+        return None
+
+    with _engine_lock:
+        if _engine is not None and _engine.version == data_version():
+            return _engine
+        try:
+            # 전체 연도를 로드한 뒤의 버전 (로드되지 않았던 연도의 지문이 버전에 포함됨)
+            qualitative = {y: load_qualitative_data(y) for y in AVAILABLE_YEARS}
+            hr_df = load_hr_master_data()
+            version = data_version()
+            _engine = QueryEngine(_ensure_partitions(version, qualitative, hr_df), version)
+            _failed_version = None
+        except Exception as e:
+            print(f"[WARN] 쿼리 엔진 파티션 준비 실패, pandas로 계산합니다: {e}")
+            _failed_version = version
+            return None
+        return _engine
+
+
+def build_query_engine() -> None:
+    """서버 시작 시 현재 데이터의 파티션을 미리 기록합니다 (풀 워커는 같은 버전의 파티션을 그대로 엶)."""
+    if duckdb is None:
+        if QUERY_ENGINE == "duckdb":
+            print("[WARN] QUERY_ENGINE=duckdb이지만 duckdb가 설치되어 있지 않습니다. pandas로 계산합니다.")
+        return
+    engine = get_query_engine()
+    if engine is not None:
+        print(f"  ✓ 쿼리 엔진(DuckDB) 파티션 준비 완료 ({len(engine.years)}개 연도, {engine.root})")
+
+
+def _run(method: str, *args):
+    engine = get_query_engine()
+    if engine is None:
+        return None
+    try:
+        return getattr(engine, method)(*args)
+    except Exception as e:
+        print(f"[WARN] 쿼리 엔진 실행 실패, pandas로 계산합니다: {e}")
+        return None
+
+
+def query_system_health(years, orgs1, orgs2, jobs, grades, weighted: bool = False) -> tuple[dict, int] | None:
+    """필터 대상의 제도 건전성 지표 (엔진을 쓸 수 없으면 None → pandas 경로)"""
+    return _run("system_health", years, orgs1, orgs2, jobs, grades, weighted)
+
+
+def query_subgroup_metrics(years, orgs1, orgs2, jobs, grades, group_col: str) -> tuple[list[dict], int] | None:
+    """필터 대상의 하위 조직 비교 지표 (엔진을 쓸 수 없으면 None → pandas 경로)"""
+    return _run("subgroup_metrics", years, orgs1, orgs2, jobs, grades, group_col)
@@ -0,0 +1,200 @@
+"""
+search_index.py — 사번/이름 인원 검색(자동완성)용 인덱스를 만들고 조회합니다.
+
+핵심 설계 결정:
+  - 데이터 로드 시 연도별 결합 노드에서 인원 목록(사번 정렬)을 한 번 만들고, 사람마다 최신 연도의
+    성명·조직과 등장 연도 비트마스크를 둡니다 (연도 필터는 비트 AND 한 번).
+  - 사번 접두 검색: 정렬된 사번 배열에서 bisect로 [lo, hi) 구간을 찾습니다 (구간 = 접두가 같은 사번 전부).
+  - 이름 접두 검색: (정규화 이름, 사번) 순으로 정렬한 배열에서 같은 방식으로 구간을 찾습니다.
+    정확히 같은 이름은 구간 맨 앞에 모입니다.
+  - 이름 부분 검색: 이름의 글자(1-gram)와 2-gram → 인원 위치 posting 배열을 두고, 질의의 n-gram
+    posting을 짧은 것부터 교집합한 뒤 후보만 부분 문자열로 확인합니다 (한글 이름은 음절 단위).
+  - 결과 순서: 사번 일치 → 사번 접두 → 이름 일치 → 이름 접두 → 이름 포함. limit개를 채우면 멈춥니다.
+
+Why: 사이드바 필터는 조직 단위라, 특정 인원을 찾으려면 네트워크 그래프를 눈으로 뒤져야 했습니다.
+     키 입력마다 호출되는 자동완성이므로 요청당 DataFrame 스캔 없이 인덱스 조회만 합니다.
+"""
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+import numpy as np
+import pandas as pd
+from config import AVAILABLE_YEARS
+from .cache_registry import TrackedCache
+from .data_loader import load_qualitative_data, prepare_combined_network_data, refresh_stale_sources
+
+ORG_COLS = ['ORG1_OP', 'ORG2_OP', 'ORG3_OP']
+
+_search_cache = TrackedCache(
+    "search_index", max_entries=1, description="인원 검색 인덱스 (사번 접두 + 이름 n-gram)",
+    derived=True, snapshot=True,
+)
+
+# 접두 구간의 상한 (어떤 문자보다 뒤에 정렬되는 문자)
+_PREFIX_END = chr(0x10FFFF)
+
+
+def _normalize(text) -> str:
+    """검색용 이름 키: 공백 제거 + 소문자 (영문 이름 대소문자 무시)"""
+    if text is None or (isinstance(text, float) and np.isnan(text)):
+        return ""
+    return "".join(str(text).split()).lower()
+
+
+def _grams(key: str) -> set[str]:
+    """1-gram + 2-gram (한글 이름은 2~4음절이라 3-gram 이상은 이득이 적음)"""
+    return set(key) | {key[i:i + 2] for i in range(len(key) - 1)}
+
+
+class SearchIndex:
+    """인원 위치 = ids(정렬된 고유 사번)의 위치"""
+
+    def __init__(self, people: pd.DataFrame, years: list[int]):
+        self.years = years
+        self.ids = people.index.tolist()
+        self.names = ["" if pd.isna(n) else str(n) for n in people['성명']]
+        self.orgs = {c: people[c].where(people[c].notna(), None).tolist() for c in ORG_COLS if c in people.columns}
+        self.year_masks = people['year_mask'].to_numpy(np.int64)
+
+        self.keys = [_normalize(n) for n in self.names]
+        order = sorted(range(len(self.ids)), key=lambda i: self.keys[i])   # 안정 정렬 → 같은 이름은 사번 순
+        self.sorted_keys = [self.keys[i] for i in order]
+        self.name_order = np.array(order, dtype=np.int32)
+
+        postings = defaultdict(list)
+        for i, key in enumerate(self.keys):
+            for gram in _grams(key):
+                postings[gram].append(i)
+        self.postings = {g: np.array(v, dtype=np.int32) for g, v in postings.items()}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def year_mask(self, years: list[int] | None) -> int:
+        """연도 목록 → 비트마스크 (None이면 0 = 연도 조건 없음, 인덱스에 없는 연도만이면 -1 = 결과 없음)"""
+        if not years:
+            return 0
+        mask = 0
+        for y in set(years):
+            if y in self.years:
+                mask |= 1 << self.years.index(y)
+        return mask or -1
+
+    # ── 단계별 후보 (인원 위치 배열, 정렬 순서 유지) ──
+
+    def _id_prefix(self, query: str) -> np.ndarray:
+        lo = bisect_left(self.ids, query)
+        hi = bisect_left(self.ids, query + _PREFIX_END, lo)
+        return np.arange(lo, hi, dtype=np.int32)
+
+    def _name_prefix(self, key: str) -> tuple[np.ndarray, int]:
+        """(이름 접두 후보, 그중 앞쪽 정확히 일치하는 수)"""
+        lo = bisect_left(self.sorted_keys, key)
+        hi = bisect_left(self.sorted_keys, key + _PREFIX_END, lo)
+        exact = bisect_right(self.sorted_keys, key, lo, hi) - lo
+        return self.name_order[lo:hi], exact
+
+    def _name_grams(self, key: str) -> np.ndarray:
+        grams = [key] if len(key) == 1 else [key[i:i + 2] for i in range(len(key) - 1)]
+        lists = [self.postings.get(g) for g in set(grams)]
+        if any(p is None for p in lists):
+            return np.empty(0, dtype=np.int32)
+        lists.sort(key=len)
+        candidates = lists[0]
+        for p in lists[1:]:
+            candidates = np.intersect1d(candidates, p, assume_unique=True)
+            if not len(candidates):
+                break
+        return candidates
+
+    def search(self, query: str, years: list[int] | None = None, limit: int = 10) -> tuple[list[dict], bool]:
+        """
+        Returns:
+            (결과 목록, truncated) — 결과: {사번, 성명, ORG1_OP.., years, match}, truncated: limit 초과분 있음
+        """
+        query = query.strip()
+        key = _normalize(query)
+        mask = self.year_mask(years)
+        if not key or mask < 0:
+            return [], False
+
+        picked: list[tuple[int, str]] = []
+        seen: set[int] = set()
+
+        def take(candidates: np.ndarray, match: str, verify=None) -> bool:
+            """후보를 순서대로 담고, limit + 1개(잘림 판단용)가 모이면 True"""
+            if mask and len(candidates):
+                candidates = candidates[(self.year_masks[candidates] & mask) != 0]
+            if verify is None:
+                candidates = candidates[:limit + 1]   # 넓은 접두 구간도 필요한 만큼만 (중복 건너뜀 포함)
+            for i in candidates.tolist():
+                if i in seen or (verify is not None and not verify(i)):
+                    continue
+                seen.add(i)
+                picked.append((i, match))
+                if len(picked) > limit:
+                    return True
+            return False
+
+        ids = self._id_prefix(query)
+        exact = int(len(ids) > 0 and self.ids[ids[0]] == query)   # 같은 사번은 구간 맨 앞 하나
+        full = take(ids[:exact], "id") or take(ids[exact:], "id_prefix")
+
+        if not full:
+            prefix, exact = self._name_prefix(key)
+            full = take(prefix[:exact], "name") or take(prefix[exact:], "name_prefix")
+        if not full:
+            # ★ n-gram 교집합은 후보일 뿐 (예: "가나다"의 2-gram은 "나다가나"에도 모두 있음) → 부분 문자열 확인
+            full = take(self._name_grams(key), "name_contains", verify=lambda i: key in self.keys[i])
+
+        return [self._row(i, match) for i, match in picked[:limit]], full
+
+    def _row(self, i: int, match: str) -> dict:
+        bits = int(self.year_masks[i])
+        row = {"사번": self.ids[i], "성명": self.names[i]}
+        row.update({c: values[i] for c, values in self.orgs.items()})
+        row["years"] = [y for b, y in enumerate(self.years) if bits >> b & 1]
+        row["match"] = match
+        return row
+
+
+# ──────────────────────────────────────────────
+# 인덱스 생성 / 조회
+# ──────────────────────────────────────────────
+
+def _years_with_data() -> list[int]:
+    return [y for y in sorted(AVAILABLE_YEARS) if load_qualitative_data(y) is not None]
+
+
+def _build_search_index(years: list[int]) -> SearchIndex | None:
+    frames = []
+    for bit, year in enumerate(years):
+        _, nodes = prepare_combined_network_data([year])
+        if nodes is None:
+            continue
+        cols = ['사번', '성명'] + [c for c in ORG_COLS if c in nodes.columns]
+        frame = nodes[cols].drop_duplicates(subset=['사번'])
+        frames.append(frame.assign(year_mask=np.int64(1) << bit))
+    if not frames:
+        return None
+
+    # 연도 오름차순으로 이어 붙였으므로 마지막 행 = 최신 연도의 성명·조직
+    stacked = pd.concat(frames, ignore_index=True)
+    stacked['사번'] = stacked['사번'].astype(str)
+    masks = stacked.groupby('사번', sort=True)['year_mask'].sum()   # 사람당 연도별 한 행 → 합 = OR
+    people = stacked.drop_duplicates(subset=['사번'], keep='last').set_index('사번').drop(columns='year_mask')
+    people = people.loc[masks.index].assign(year_mask=masks)
+    return SearchIndex(people, years)
+
+
+def get_search_index() -> SearchIndex | None:
+    """데이터가 있는 전체 연도의 검색 인덱스 (원본이 바뀌면 파생 캐시와 함께 다시 만듦)"""
+    years = _years_with_data()
+    refresh_stale_sources(years)
+    return _search_cache.get_or_compute(tuple(years), lambda: _build_search_index(years))
+
+
+def build_search_index() -> None:
+    """서버 시작 시 검색 인덱스를 미리 만듭니다."""
+    index = get_search_index()
+    if index is not None:
+        print(f"  ✓ 검색 인덱스 생성 완료 ({len(index):,}명, {len(index.years)}개 연도)")
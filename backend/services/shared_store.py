@@ -0,0 +1,234 @@
+"""
+shared_store.py — 멀티 워커가 공유하는 memory-mapped 데이터 저장소
+
+핵심 설계 결정:
+  - 로더 프로세스가 연도별 정성평가 테이블과 HR 기본정보를 Arrow IPC(비압축) 파일로 기록합니다.
+  - 워커는 파일을 읽기 전용 memory-map으로 열어 OS 페이지 캐시를 공유합니다 (워커 수만큼 복사하지 않음).
+  - 버전 디렉토리에 모두 기록한 뒤 CURRENT 파일을 os.replace로 교체하므로,
+    워커는 항상 완성된 한 버전만 보게 됩니다 (원자적 전환).
+  - 새 버전 감지·전환은 서버 시작 시 띄운 백그라운드 태스크(watch_shared_data)가 스레드에서 수행합니다.
+    요청 경로는 전환을 기다리지 않습니다 (전환이 끝나면 다음 요청부터 새 데이터).
+
+디렉토리 구조:
+    SHARED_DATA_DIR/
+      CURRENT                  ← 현재 버전 디렉토리 이름
+      v20261019-021700-1234/
+        manifest.json          ← 연도 목록, 벤치마크, 생성 시각
+        qual_2025.arrow        ← 정성평가 (연도별)
+        hr.arrow               ← HR 기본정보
+
+로더 실행 (backend 디렉토리에서):
+    python -m services.shared_store [--out 경로]
+
+메모: pyarrow가 설치된 경우에만 동작합니다. 없으면 워커는 기존처럼 엑셀을 직접 로드합니다.
+"""
+import asyncio
+import json
+import os
+import shutil
+import sys
+import time
+import pandas as pd
+from config import SHARED_DATA_DIR, SHARED_DATA_POLL_SEC, SHARED_DATA_KEEP_VERSIONS
+from .data_loader import preload_all_data, get_loaded_data, get_cached_benchmarks, install_shared_data
+from .feedback_analyzer import find_feedback_columns
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+except ImportError:  # 선택 의존성
+    pa = None
+
+_CURRENT_FILE = "CURRENT"
+
+# 워커가 현재 매핑 중인 버전 (변경 감지용)
+_attached_version: str | None = None
+
+
+def is_available() -> bool:
+    return pa is not None
+
+
+# ──────────────────────────────────────────────
+# 로더 (쓰기)
+# ──────────────────────────────────────────────
+
+def _to_arrow_table(df: pd.DataFrame) -> "pa.Table":
+    """
+    DataFrame을 Arrow 테이블로 변환합니다.
+
+    Why: 엑셀에서 읽은 object 컬럼은 int/str이 섞여 있을 수 있어 Arrow 타입 추론이 실패하므로,
+         혼합 타입 컬럼만 문자열로 통일합니다 (결측값은 유지).
+    """
+    df = df.copy()
+    for col in df.columns:
+        if df[col].dtype == object:
+            types = {type(v) for v in df[col].dropna()}
+            if len(types) > 1:
+                df[col] = df[col].map(lambda v: v if pd.isna(v) else str(v))
+    return pa.Table.from_pandas(df, preserve_index=False)
+
+
+def _write_arrow(table: "pa.Table", path: str) -> None:
+    with pa.OSFile(path, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+
+def export_shared_data(out_dir: str = SHARED_DATA_DIR) -> str:
+    """
+    모든 연도 데이터를 로드해 새 버전 디렉토리에 기록하고 CURRENT를 전환합니다.
+
+    Returns:
+        새로 기록된 버전 이름
+    """
+    if pa is None:
+        raise RuntimeError("공유 데이터 모드에는 pyarrow가 필요합니다. (pip install pyarrow)")
+    if not out_dir:
+        raise RuntimeError("SHARED_DATA_DIR 환경변수 또는 --out 경로를 지정해주세요.")
+
+    # 기존 경로(엑셀 로드 + 벤치마크 계산)를 그대로 사용
+    preload_all_data()
+    qualitative, hr_df = get_loaded_data()
+
+    version = time.strftime("v%Y%m%d-%H%M%S") + f"-{os.getpid()}"
+    version_dir = os.path.join(out_dir, version)
+    os.makedirs(version_dir, exist_ok=True)
+
+    for year, df in qualitative.items():
+        if df is not None:
+            _write_arrow(_to_arrow_table(df), os.path.join(version_dir, f"qual_{year}.arrow"))
+    if hr_df is not None:
+        _write_arrow(_to_arrow_table(hr_df), os.path.join(version_dir, "hr.arrow"))
+
+    manifest = {
+        "version": version,
+        "created_at": time.time(),
+        "years": sorted(y for y, df in qualitative.items() if df is not None),
+        "has_hr": hr_df is not None,
+        "benchmarks": get_cached_benchmarks(),
+    }
+    with open(os.path.join(version_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, default=str)
+
+    # ★ 원자적 전환: 임시 파일에 쓴 뒤 교체
+    tmp_path = os.path.join(out_dir, _CURRENT_FILE + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(version)
+    os.replace(tmp_path, os.path.join(out_dir, _CURRENT_FILE))
+
+    _cleanup_old_versions(out_dir, keep=version)
+    print(f"[INFO] 공유 데이터 기록 완료: {version_dir}")
+    return version
+
+
+def _cleanup_old_versions(out_dir: str, keep: str) -> None:
+    """오래된 버전 디렉토리를 정리합니다. (최근 SHARED_DATA_KEEP_VERSIONS개 보관)"""
+    versions = sorted(
+        d for d in os.listdir(out_dir)
+        if d.startswith("v") and os.path.isdir(os.path.join(out_dir, d)) and d != keep
+    )
+    for old in versions[:-SHARED_DATA_KEEP_VERSIONS] if SHARED_DATA_KEEP_VERSIONS else versions:
+        # Windows에서는 매핑 중인 파일 삭제가 실패할 수 있으므로 무시
+        shutil.rmtree(os.path.join(out_dir, old), ignore_errors=True)
+
+
+# ──────────────────────────────────────────────
+# 워커 (읽기)
+# ──────────────────────────────────────────────
+
+def _read_current_version(shared_dir: str) -> str | None:
+    try:
+        with open(os.path.join(shared_dir, _CURRENT_FILE), encoding="utf-8") as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def _map_arrow(path: str) -> pd.DataFrame:
+    """
+    Arrow IPC 파일을 memory-map으로 열어 DataFrame을 만듭니다.
+
+    ★ 피드백 텍스트 컬럼(메모리의 대부분)은 ArrowDtype으로 매핑된 버퍼를 그대로 참조합니다 (zero-copy).
+      사번/조직 등 키 컬럼은 조인·비교 의미를 기존 경로와 동일하게 유지하기 위해 일반 컬럼으로 변환합니다.
+    """
+    source = pa.memory_map(path, "r")
+    table = pa.ipc.open_file(source).read_all()
+    text_cols = set(find_feedback_columns(pd.DataFrame(columns=table.column_names)))
+
+    columns = {}
+    for name in table.column_names:
+        column = table.column(name)
+        if name in text_cols:
+            columns[name] = pd.Series(pd.arrays.ArrowExtensionArray(column), name=name)
+        else:
+            columns[name] = column.to_pandas()
+    return pd.DataFrame(columns, copy=False)
+
+
+def attach_shared_data(shared_dir: str = SHARED_DATA_DIR) -> bool:
+    """
+    CURRENT가 가리키는 버전을 매핑해 데이터 캐시에 설치합니다.
+
+    Returns:
+        성공 여부 (False면 호출자가 기존 preload로 대체)
+    """
+    global _attached_version
+    if pa is None:
+        print("[WARN] pyarrow가 없어 공유 데이터 모드를 사용할 수 없습니다.")
+        return False
+    if not shared_dir:
+        return False
+
+    version = _read_current_version(shared_dir)
+    if version is None:
+        print(f"[WARN] 공유 데이터가 없습니다: {shared_dir} (로더를 먼저 실행하세요)")
+        return False
+
+    version_dir = os.path.join(shared_dir, version)
+    try:
+        with open(os.path.join(version_dir, "manifest.json"), encoding="utf-8") as f:
+            manifest = json.load(f)
+
+        qualitative = {
+            year: _map_arrow(os.path.join(version_dir, f"qual_{year}.arrow"))
+            for year in manifest["years"]
+        }
+        hr_df = _map_arrow(os.path.join(version_dir, "hr.arrow")) if manifest["has_hr"] else None
+    except Exception as e:
+        print(f"[ERROR] 공유 데이터 매핑 실패 ({version}): {e}")
+        return False
+
+    install_shared_data(qualitative, hr_df, manifest.get("benchmarks", {}), version)
+    _attached_version = version
+    print(f"[INFO] 공유 데이터 연결 완료: {version} ({len(qualitative)}개 연도)")
+    return True
+
+
+def refresh_if_changed(shared_dir: str = SHARED_DATA_DIR) -> None:
+    """CURRENT가 바뀌었으면 새 버전으로 다시 매핑합니다. (블로킹 — 이벤트 루프에서 직접 호출하지 않음)"""
+    if _attached_version is None:
+        return
+    version = _read_current_version(shared_dir)
+    if version is not None and version != _attached_version:
+        attach_shared_data(shared_dir)
+
+
+async def watch_shared_data(shared_dir: str = SHARED_DATA_DIR) -> None:
+    """
+    SHARED_DATA_POLL_SEC 간격으로 새 버전을 확인해 전환합니다. (lifespan에서 태스크로 실행, 종료 시 취소)
+
+    Why: 전환(Arrow 파일 재매핑, 데이터 설치, 파생 캐시 비우기)을 이벤트 루프에서 하면
+         그동안 진행 중인 모든 async 요청이 멈춥니다 → 확인과 전환 모두 스레드에서 실행합니다.
+    """
+    while True:
+        await asyncio.sleep(SHARED_DATA_POLL_SEC)
+        try:
+            await asyncio.to_thread(refresh_if_changed, shared_dir)
+        except Exception as e:
+            print(f"[ERROR] 공유 데이터 새 버전 확인 실패: {e}")
+
+
+if __name__ == "__main__":
+    out = sys.argv[sys.argv.index("--out") + 1] if "--out" in sys.argv else SHARED_DATA_DIR
+    export_shared_data(out)
@@ -0,0 +1,111 @@
+"""
+single_flight.py — 같은 키의 동시 계산을 하나로 합칩니다 (single-flight).
+
+핵심 설계 결정:
+  - 키별로 먼저 도착한 스레드(leader)만 계산하고, 계산 중에 들어온 같은 키의 호출은 결과를 기다립니다.
+  - 결과는 보관하지 않습니다. 계산이 끝나면 키가 비워지므로, 캐시가 필요하면
+    TrackedCache.get_or_compute처럼 바깥에서 결과를 저장합니다.
+  - leader가 예외로 끝나면 기다리던 호출도 같은 예외를 받습니다.
+
+  - async 핸들러용 do_async()는 이벤트 루프 안에서 같은 key의 진행 중인 Task를 함께 기다립니다.
+    한 요청이 끊겨도(취소) 공유 계산은 계속되도록 asyncio.shield로 기다립니다.
+
+Why: uvicorn은 동기 핸들러를 여러 스레드에서 실행하고, 프론트엔드는 같은 필터로 여러 요청을
+     동시에 보냅니다. 캐시 miss가 겹치면 같은 엑셀 로드/결합/그래프 계산이 스레드 수만큼 중복됩니다.
+"""
+import asyncio
+import threading
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: BaseException | None = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    키 단위 동시 호출 병합기.
+
+    사용법:
+        _flight = SingleFlight("analysis")
+        result = _flight.do(key, lambda: expensive(key))
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: dict[object, _Call] = {}
+        self._tasks: dict[object, asyncio.Task] = {}
+        self._lock = threading.Lock()
+        self.executed = 0    # 실제로 계산한 횟수
+        self.coalesced = 0   # 진행 중인 계산을 기다려 결과를 받은 횟수
+        _groups.append(self)
+
+    def do(self, key, fn):
+        """key의 계산이 진행 중이면 그 결과를 기다리고, 아니면 fn()을 실행합니다."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                call.waiters += 1
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+                self.executed += 1
+            call.done.set()
+        return call.result
+
+    async def do_async(self, key, fn):
+        """do()의 asyncio 버전 — fn은 코루틴 함수. key의 Task가 진행 중이면 그 결과를 기다립니다."""
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._tasks[key] = task
+            task.add_done_callback(lambda _: self._finish_task(key))
+        else:
+            with self._lock:
+                self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _finish_task(self, key) -> None:
+        self._tasks.pop(key, None)
+        with self._lock:
+            self.executed += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            in_flight = [{"key": str(k), "waiters": c.waiters} for k, c in self._calls.items()]
+        in_flight += [{"key": str(k), "async": True} for k in list(self._tasks)]
+        return {
+            "name": self.name,
+            "executed": self.executed,
+            "coalesced": self.coalesced,
+            "in_flight": in_flight,
+        }
+
+
+_groups: list[SingleFlight] = []
+
+
+def single_flight_stats() -> list[dict]:
+    """프로세스의 모든 SingleFlight 통계 (/api/debug/caches)"""
+    return [g.stats() for g in _groups]
@@ -0,0 +1,93 @@
+"""
+table_export.py — 분석 테이블을 CSV/Parquet 바이트 청크로 스트리밍합니다.
+
+핵심 설계 결정:
+  - 테이블 전체를 하나의 문자열/버퍼로 직렬화하지 않고 EXPORT_CHUNK_ROWS 행씩 인코딩해 yield 합니다.
+    (StreamingResponse가 청크를 바로 내보내므로 응답 크기와 무관하게 직렬화 메모리가 일정)
+  - CSV는 Excel에서 한글이 깨지지 않도록 UTF-8 BOM으로 시작합니다.
+  - Parquet는 청크마다 row group 하나를 기록하고, 그때까지 쓰인 바이트만 내보냅니다.
+
+메모: Parquet는 pyarrow가 설치된 경우에만 지원합니다.
+"""
+from typing import Iterator
+import pandas as pd
+from config import EXPORT_CHUNK_ROWS
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # 선택 의존성
+    pa = None
+
+# 형식 → (media type, 파일 확장자)
+EXPORT_FORMATS = {
+    "csv": ("text/csv; charset=utf-8", "csv"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+
+def is_format_available(fmt: str) -> bool:
+    if fmt == "parquet":
+        return pa is not None
+    return fmt in EXPORT_FORMATS
+
+
+def iter_csv_chunks(df: pd.DataFrame, chunk_rows: int = EXPORT_CHUNK_ROWS) -> Iterator[bytes]:
+    """헤더(BOM 포함) 후 chunk_rows 행씩 CSV 바이트를 생성합니다."""
+    yield "\ufeff".encode("utf-8") + df.head(0).to_csv(index=False).encode("utf-8")
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows].to_csv(index=False, header=False).encode("utf-8")
+
+
+class _ChunkSink:
+    """ParquetWriter가 쓰는 바이트를 모아두었다가 청크 단위로 꺼내는 최소 파일 객체"""
+
+    def __init__(self):
+        self._parts: list[bytes] = []
+        self._pos = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        chunk = bytes(data)
+        self._parts.append(chunk)
+        self._pos += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self._pos
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts.clear()
+        return data
+
+
+def iter_parquet_chunks(df: pd.DataFrame, chunk_rows: int = EXPORT_CHUNK_ROWS) -> Iterator[bytes]:
+    """chunk_rows 행마다 row group을 기록하며 Parquet 바이트를 생성합니다."""
+    if pa is None:
+        raise RuntimeError("Parquet 내보내기에는 pyarrow가 필요합니다.")
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    sink = _ChunkSink()
+    with pq.ParquetWriter(pa.PythonFile(sink, mode="w"), schema) as writer:
+        for start in range(0, max(len(df), 1), chunk_rows):
+            chunk = df.iloc[start:start + chunk_rows]
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+            data = sink.drain()
+            if data:
+                yield data
+    # 파일 푸터(메타데이터)는 writer 종료 시 기록됨
+    tail = sink.drain()
+    if tail:
+        yield tail
+
+
+def iter_table_chunks(df: pd.DataFrame, fmt: str) -> Iterator[bytes]:
+    if fmt == "parquet":
+        return iter_parquet_chunks(df)
+    return iter_csv_chunks(df)
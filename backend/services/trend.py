@@ -0,0 +1,93 @@
+"""
+trend.py — 필터별 연도 추세: 연도별 지표 캐시 + 같은 연도 축의 시계열 조립
+
+핵심 설계 결정:
+  - 전사 벤치마크(calculate_dynamic_benchmarks)는 조직 전체만 다룹니다. 추세는 임의 필터(예: ORG2 하나)의
+    조직 지표와 하위 조직 지표를 연도마다 따로 계산해 (연도 + 필터) 키로 캐시합니다.
+    연도 범위가 겹치는 추세 요청은 이미 계산된 해를 다시 씁니다.
+  - 시계열은 요청 연도 순서에 맞춰 정렬하고, 데이터/엣지가 없는 해는 None으로 자리를 유지합니다.
+  - 전사 벤치마크의 사분위(q1/median/q3)와 연도별 전사 값을 같은 연도 축으로 함께 돌려줍니다.
+
+응답 구조:
+    {
+      "years": [2023, 2024, 2025], "missing_years": [],
+      "series": {"reciprocity": [0.05, 0.06, None], ...},
+      "benchmarks": {"reciprocity": {"q1", "median", "q3", "min", "max", "total_avg", "global": [...]}},
+      "subgroups": {"group_col": "ORG2_OP", "groups": [{"group_name", "series": {지표: [...]}}]}
+    }
+"""
+from typing import Awaitable, Callable
+from config import TREND_CACHE_MAX_ENTRIES
+from .cache_registry import TrackedCache
+
+# 벤치마크에서 가져오는 통계 (history/years는 연도 축에 맞춘 global로 대체)
+BENCHMARK_STATS = ['q1', 'median', 'q3', 'min', 'max', 'total_avg']
+
+_trend_cache = TrackedCache("trend_points", max_entries=TREND_CACHE_MAX_ENTRIES,
+                            description="(연도, 필터) → 조직 지표 + 하위 조직 지표", derived=True)
+
+
+async def get_trend_point_async(key: tuple, builder: Callable[[], Awaitable[dict]]) -> dict:
+    """한 해의 추세 지점 {"organization", "subgroups"} (캐시, 없으면 builder()로 계산 — 동시 miss는 한 번만)"""
+    return await _trend_cache.get_or_compute_async(key, builder)
+
+
+def has_trend_point(key: tuple) -> bool:
+    """그 해의 추세 지점이 캐시에 있는지 (입장 제어 대상 판단용, LRU 순서는 바꾸지 않음)"""
+    return key in _trend_cache
+
+
+def _metric_keys(rows: list[dict | None]) -> list[str]:
+    """처음 등장한 순서의 수치 지표 키"""
+    keys = []
+    for row in rows:
+        for key, value in (row or {}).items():
+            if key not in keys and isinstance(value, (int, float)) and not isinstance(value, bool):
+                keys.append(key)
+    return keys
+
+
+def _aligned(rows: list[dict | None], keys: list[str]) -> dict[str, list]:
+    return {key: [row.get(key) if row else None for row in rows] for key in keys}
+
+
+def build_trend(years: list[int], points: list[dict], benchmarks: dict, group_col: str | None) -> dict:
+    """
+    연도별 지점(points, years와 같은 순서)을 시계열로 조립합니다.
+    """
+    orgs = [p["organization"] for p in points]
+    keys = _metric_keys(orgs)
+
+    overlay = {}
+    for key in keys:
+        bench = benchmarks.get(key)
+        if not bench:
+            continue
+        by_year = dict(zip(bench.get("years", []), bench.get("history", [])))
+        overlay[key] = {**{s: bench[s] for s in BENCHMARK_STATS if s in bench},
+                        "global": [by_year.get(y) for y in years]}
+
+    result = {
+        "years": years,
+        "missing_years": [y for y, org in zip(years, orgs) if org is None],
+        "series": _aligned(orgs, keys),
+        "benchmarks": overlay,
+    }
+    if group_col is None:
+        return result
+
+    # ── 하위 조직: 연도별 목록 → 그룹별 시계열 (최근 인원 많은 순) ──
+    by_group: dict[str, list[dict | None]] = {}
+    for i, point in enumerate(points):
+        for row in point["subgroups"] or []:
+            by_group.setdefault(row["group_name"], [None] * len(points))[i] = row
+    latest_size = {g: next((r["member_count"] for r in reversed(rows) if r), 0) for g, rows in by_group.items()}
+    group_keys = _metric_keys([r for rows in by_group.values() for r in rows])
+    result["subgroups"] = {
+        "group_col": group_col,
+        "groups": [
+            {"group_name": g, "series": _aligned(by_group[g], group_keys)}
+            for g in sorted(by_group, key=lambda g: (-latest_size[g], str(g)))
+        ],
+    }
+    return result
@@ -0,0 +1,216 @@
+"""
+warm_snapshot.py — 워밍업이 끝난 상태를 파일로 저장하고, 재시작 시 원본이 같으면 한 번에 복원합니다.
+
+핵심 설계 결정:
+  - 재시작마다 엑셀 파싱, 사번 정규화, HR 결합, 연도별 그래프 + 제도 건전성 지표(벤치마크용),
+    인접 인덱스·지표 큐브를 다시 만듭니다. 원본이 바뀌지 않았다면 결과는 매번 같습니다.
+  - 워밍업 후 snapshot=True 캐시(정성평가/HR 테이블, 결합 엣지·노드, 쌍 엣지, 벤치마크, 인접 인덱스,
+    지표 큐브)의 내용과 원본 지문을 버전이 있는 파일 하나에 기록합니다 (임시 파일 → os.replace).
+  - 파일 앞부분의 헤더(형식 버전, DATA_DIR, 분석 연도, 원본 파일 지문, 코드 지문, 파이썬/pandas 버전)가
+    현재와 모두 같을 때만 본문을 한 번에 읽어 캐시에 설치합니다. 하나라도 다르면 평소처럼 워밍업합니다.
+  - 코드 지문은 services/*.py와 config.py의 내용 해시입니다 (계산 로직이 바뀐 배포는 스냅샷을 쓰지 않음).
+
+보안 (pickle은 읽는 순간 임의 코드를 실행할 수 있음):
+  - 헤더와 본문은 각각 HMAC-SHA256 태그를 붙여 기록하고, 태그가 맞을 때만 unpickle합니다.
+    키는 WARM_SNAPSHOT_KEY 또는 스냅샷 옆 "<경로>.key" 파일(처음 기록할 때 생성, 권한 0600)입니다.
+  - 읽기 전에 스냅샷·키 파일의 소유자가 서버 사용자이고 그룹/다른 사용자 쓰기 권한이 없는지 확인합니다 (POSIX).
+  - 기본 위치는 서버 사용자 홈 아래(~/.cache/peer-eval)이며, 디렉토리는 0700으로 만듭니다.
+
+파일 형식:
+    MAGIC | 헤더 길이(8) | 헤더 태그(32) | header(pickle) | 본문 태그(32) | payload(pickle)
+    header  = {"format", "data_dir", "years", "sources", "code", "python", "pandas", "created_at"}
+    payload = {"caches": {캐시 이름: [(키, 값), ...]}, "fingerprints": {(캐시 이름, 키): 지문}}
+
+메모: 공유 데이터 모드에서는 사용하지 않습니다.
+"""
+import glob
+import hashlib
+import hmac
+import os
+import pickle
+import secrets
+import stat
+import sys
+import time
+import pandas as pd
+from config import AVAILABLE_YEARS, DATA_DIR, WARM_SNAPSHOT_ENABLED, WARM_SNAPSHOT_KEY, WARM_SNAPSHOT_PATH
+from .cache_registry import registry
+from .data_loader import loaded_source_fingerprints, restore_source_fingerprints, source_file_fingerprints
+
+SNAPSHOT_FORMAT = 2
+MAGIC = b"PEERWARM"
+_TAG_SIZE = hashlib.sha256().digest_size
+
+_BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _code_fingerprint() -> str:
+    """캐시 내용을 만드는 코드(services/*.py, config.py)의 내용 해시"""
+    digest = hashlib.sha1()
+    paths = sorted(glob.glob(os.path.join(_BACKEND_DIR, "services", "*.py")))
+    for path in paths + [os.path.join(_BACKEND_DIR, "config.py")]:
+        digest.update(os.path.basename(path).encode())
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+def _header(sources: dict) -> dict:
+    return {
+        "format": SNAPSHOT_FORMAT,
+        "data_dir": os.path.abspath(DATA_DIR),
+        "years": sorted(AVAILABLE_YEARS),
+        "sources": sources,
+        "code": _code_fingerprint(),
+        "python": sys.version_info[:2],
+        "pandas": pd.__version__,
+    }
+
+
+# ──────────────────────────────────────────────
+# 파일 신뢰 확인 + 인증 키
+# ──────────────────────────────────────────────
+
+def _untrusted_reason(path: str) -> str | None:
+    """서버 사용자 소유가 아니거나 다른 사용자가 쓸 수 있는 파일이면 그 이유 (POSIX만 확인)"""
+    if os.name != "posix":
+        return None
+    st = os.stat(path)
+    if st.st_uid != os.geteuid():
+        return "소유자가 서버 사용자가 아님"
+    if st.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+        return "그룹/다른 사용자 쓰기 권한이 있음"
+    return None
+
+
+def _write_private(path: str, chunks: list[bytes]) -> None:
+    """권한 0600 새 파일로 기록 (O_EXCL: 미리 만들어 둔 파일·심볼릭 링크를 따라가지 않음)"""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0), 0o600)
+    with os.fdopen(fd, "wb") as f:
+        for chunk in chunks:
+            f.write(chunk)
+
+
+def _key_path(path: str) -> str:
+    return f"{path}.key"
+
+
+def _load_key(path: str, create: bool) -> bytes | None:
+    """HMAC 키 — WARM_SNAPSHOT_KEY가 없으면 키 파일 (create=True면 없을 때 생성)"""
+    if WARM_SNAPSHOT_KEY:
+        return WARM_SNAPSHOT_KEY.encode()
+    key_path = _key_path(path)
+    if not os.path.exists(key_path):
+        if not create:
+            return None
+        _write_private(key_path, [secrets.token_bytes(32)])
+    reason = _untrusted_reason(key_path)
+    if reason:
+        print(f"[WARN] 웜 스냅샷 키 파일을 쓰지 않습니다 ({reason}): {key_path}")
+        return None
+    with open(key_path, "rb") as f:
+        return f.read()
+
+
+def _tag(key: bytes, data: bytes) -> bytes:
+    return hmac.new(key, data, hashlib.sha256).digest()
+
+
+# ──────────────────────────────────────────────
+# 기록 / 복원
+# ──────────────────────────────────────────────
+
+def save_snapshot(path: str = WARM_SNAPSHOT_PATH) -> bool:
+    """
+    현재 워밍업 상태를 기록합니다. 로드 후 원본이 바뀌었거나 일부 원본을 읽지 못했으면 기록하지 않습니다.
+    """
+    if not WARM_SNAPSHOT_ENABLED or not path:
+        return False
+    started = time.perf_counter()
+    sources = loaded_source_fingerprints()
+    if sources != source_file_fingerprints():
+        print("[INFO] 웜 스냅샷 생략: 로드된 데이터와 원본 파일 지문이 다릅니다.")
+        return False
+
+    caches = {cache.name: cache.items() for cache in registry.snapshot_caches()}
+    payload = {"caches": caches, "fingerprints": sources}
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    try:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), mode=0o700, exist_ok=True)
+        key = _load_key(path, create=True)
+        if key is None:
+            return False
+        header_bytes = pickle.dumps({**_header(sources), "created_at": time.time()}, protocol=pickle.HIGHEST_PROTOCOL)
+        payload_bytes = pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL)
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        _write_private(tmp_path, [
+            MAGIC, len(header_bytes).to_bytes(8, "little"), _tag(key, header_bytes), header_bytes,
+            _tag(key, payload_bytes), payload_bytes,
+        ])
+        os.replace(tmp_path, path)
+    except Exception as e:
+        print(f"[WARN] 웜 스냅샷 기록 실패: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return False
+
+    entries = sum(len(items) for items in caches.values())
+    print(f"  ✓ 웜 스냅샷 기록 완료 (캐시 {len(caches)}개, 항목 {entries}개, "
+          f"{os.path.getsize(path) / 1e6:.1f}MB, {time.perf_counter() - started:.2f}초)")
+    return True
+
+
+def _read_verified(f, key: bytes, size: int) -> bytes:
+    tag = f.read(_TAG_SIZE)
+    data = f.read(size) if size >= 0 else f.read()
+    if len(tag) != _TAG_SIZE or (size >= 0 and len(data) != size) or not hmac.compare_digest(tag, _tag(key, data)):
+        raise ValueError("인증 태그 불일치 (다른 키로 기록되었거나 변조된 파일)")
+    return data
+
+
+def restore_snapshot(path: str = WARM_SNAPSHOT_PATH) -> bool:
+    """
+    원본 파일 지문과 코드가 스냅샷과 같으면 캐시를 복원하고 True를 반환합니다.
+
+    ★ 소유자/권한 확인과 HMAC 검증을 통과한 바이트만 unpickle합니다.
+    """
+    if not WARM_SNAPSHOT_ENABLED or not path or not os.path.exists(path):
+        return False
+    started = time.perf_counter()
+    try:
+        reason = _untrusted_reason(path)
+        if reason:
+            print(f"[WARN] 웜 스냅샷을 쓰지 않습니다 ({reason}): {path}")
+            return False
+        key = _load_key(path, create=False)
+        if key is None:
+            print("[INFO] 웜 스냅샷 키가 없어 복원하지 않습니다 → 데이터 다시 로드")
+            return False
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                print("[INFO] 웜 스냅샷 형식이 다릅니다 → 데이터 다시 로드")
+                return False
+            header_size = int.from_bytes(f.read(8), "little")
+            header = pickle.loads(_read_verified(f, key, header_size))
+            expected = _header(source_file_fingerprints())
+            changed = [field for field in expected if header.get(field) != expected[field]]
+            if changed:
+                print(f"[INFO] 웜 스냅샷을 쓰지 않습니다 (변경: {', '.join(changed)}) → 데이터 다시 로드")
+                return False
+            payload = pickle.loads(_read_verified(f, key, -1))
+    except Exception as e:
+        print(f"[WARN] 웜 스냅샷 읽기 실패 → 데이터 다시 로드: {e}")
+        return False
+
+    # ★ 모든 대상 캐시를 비운 뒤 설치 (스냅샷에 없는 항목이 이전 상태로 남지 않도록)
+    for cache in registry.snapshot_caches():
+        cache.clear()
+        for key, value in payload["caches"].get(cache.name, []):
+            cache.put(key, value)
+    restore_source_fingerprints(payload["fingerprints"])
+
+    entries = sum(len(items) for items in payload["caches"].values())
+    print(f"  ✓ 웜 스냅샷 복원 완료 (항목 {entries}개, {time.perf_counter() - started:.2f}초, "
+          f"{time.strftime('%Y-%m-%d %H:%M', time.localtime(header['created_at']))} 기록)")
+    return True
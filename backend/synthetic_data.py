@@ -0,0 +1,288 @@
+"""
+synthetic_data.py — 실제 스키마와 동일한 합성 동료평가 데이터를 생성합니다.
+
+생성 파일 (DATA_DIR와 동일한 구조):
+    00.HR기본정보.xlsx           ← 평가년도, 사번, 성명, ORG1~3, 직군, 직급
+    02.정성평가_{year}.xlsx      ← 평가자/피평가자 사번·성명 + 강점/보완점 텍스트
+
+현실성을 위한 가정:
+  - 조직 계층: ORG3(팀, 6~14명) → ORG2(4~9개 팀) → ORG1(3~8개 ORG2)
+  - 평가자 선정: 같은 팀 60% / 같은 ORG2 25% / 그 외 15%, 일부 인기인에게 요청 집중(Zipf)
+  - 상호 선정: 선정된 평가자가 일정 확률로 피평가자를 되선정
+  - 엑셀 한도: 연도별 예상 평가 행 수(인원 × 평균 평가자 수 × (1 + 되선정 확률))가 시트 최대 행 수를 넘으면
+    평가자 수 범위를 비례해 줄입니다 (기본값으로 20만 명 → 평가자 2~6명, 연도당 약 90만 행).
+  - 연도 간 변화: 입·퇴사, 조직 이동, 전년도 평가자 재선정
+  - 피드백 텍스트: 문장 조합으로 길이를 다양화하고, 일부 담합 쌍은 짧은 칭찬만 남김
+
+실행 방법 (backend 디렉토리에서):
+    python synthetic_data.py --employees 5000 --years 2023,2024,2025 --out ../synthetic_data
+"""
+import argparse
+import os
+import numpy as np
+import pandas as pd
+
+# 엑셀 시트 최대 행 수 (헤더 제외)
+EXCEL_MAX_ROWS = 1_048_575
+# 예상 행 수는 평균값이므로 한도의 95%까지만 사용
+EXCEL_ROW_BUDGET = 0.95
+
+_SURNAMES = list("김이박최정강조윤장임한오서신권황안송류홍")
+_GIVEN = list("민서지현준우도윤하은수예진성영호태경재희연소")
+_JOB_FAMILIES = ["MGT", "ENG", "SAL", "FIN", "HRM", "MKT", "OPS"]
+_GRADES = ["G1", "G2", "G3", "G4", "G5"]
+
+_STRENGTHS = [
+    "업무 이해도가 높고 일정 관리를 꼼꼼하게 합니다.",
+    "협업 과정에서 다른 구성원의 의견을 잘 경청합니다.",
+    "문제 상황에서 빠르게 대안을 제시합니다.",
+    "문서화가 잘 되어 있어 인수인계가 수월했습니다.",
+    "고객 요구사항을 정확히 파악해 반영합니다.",
+    "새로운 기술을 적극적으로 학습하고 공유합니다.",
+]
+_IMPROVEMENTS = [
+    "우선순위가 바뀔 때 공유가 조금 더 빨랐으면 합니다.",
+    "회의에서 결론을 명확히 정리해 주시면 좋겠습니다.",
+    "세부 사항에 집중하다 전체 일정이 지연되는 경우가 있습니다.",
+    "타 부서와의 협의 과정을 더 적극적으로 주도하면 좋겠습니다.",
+    "피드백을 조금 더 구체적으로 전달해 주시면 좋겠습니다.",
+]
+_SHORT_PRAISE = ["최고입니다", "항상 감사합니다", "좋아요", "잘 하십니다"]
+
+
+def _make_names(rng: np.random.Generator, n: int) -> np.ndarray:
+    s = rng.choice(_SURNAMES, n)
+    g1 = rng.choice(_GIVEN, n)
+    g2 = rng.choice(_GIVEN, n)
+    return np.char.add(np.char.add(s, g1), g2)
+
+
+def _build_org_tree(rng: np.random.Generator, n_employees: int) -> pd.DataFrame:
+    """팀 단위로 인원을 채워 ORG1 → ORG2 → ORG3 계층을 만듭니다."""
+    rows = []
+    org1_idx = org2_idx = org3_idx = 0
+    assigned = 0
+    while assigned < n_employees:
+        org1_idx += 1
+        org1 = f"본부{org1_idx:02d}"
+        for _ in range(rng.integers(3, 9)):
+            org2_idx += 1
+            org2 = f"{org1}-실{org2_idx:03d}"
+            for _ in range(rng.integers(4, 10)):
+                org3_idx += 1
+                size = int(min(rng.integers(6, 15), n_employees - assigned))
+                rows.extend([(org1, org2, f"{org2}-팀{org3_idx:04d}")] * size)
+                assigned += size
+                if assigned >= n_employees:
+                    break
+            if assigned >= n_employees:
+                break
+    return pd.DataFrame(rows, columns=["ORG1_OP", "ORG2_OP", "ORG3_OP"])
+
+
+def _feedback_text(rng: np.random.Generator, n: int, collusive: np.ndarray) -> tuple[list[str], list[str]]:
+    strengths, improvements = [], []
+    n_strength = rng.integers(1, 4, n)
+    has_improvement = rng.random(n) < 0.7
+    for i in range(n):
+        if collusive[i]:
+            strengths.append(str(rng.choice(_SHORT_PRAISE)))
+            improvements.append("")
+            continue
+        strengths.append(" ".join(rng.choice(_STRENGTHS, n_strength[i], replace=False)))
+        improvements.append(str(rng.choice(_IMPROVEMENTS)) if has_improvement[i] else "")
+    return strengths, improvements
+
+
+def fit_evaluators_to_excel(
+    n_employees: int,
+    evaluators_per_person: tuple[int, int],
+    reciprocity: float,
+) -> tuple[int, int]:
+    """연도별 예상 평가 행 수가 엑셀 한도를 넘으면 평가자 수 범위를 비례해 줄여 반환합니다."""
+    low, high = evaluators_per_person
+    expected_per_person = (low + high) / 2 * (1 + reciprocity)
+    budget_per_person = EXCEL_MAX_ROWS * EXCEL_ROW_BUDGET / max(n_employees, 1)
+    if expected_per_person <= budget_per_person:
+        return low, high
+
+    scale = budget_per_person / expected_per_person
+    fitted_low = max(1, int(low * scale))
+    fitted_high = max(fitted_low, int(high * scale))
+    print(f"[INFO] {n_employees:,}명 × 평가자 {low}~{high}명은 엑셀 최대 행 수({EXCEL_MAX_ROWS:,})를 넘습니다 "
+          f"→ 평가자 {fitted_low}~{fitted_high}명으로 생성")
+    return fitted_low, fitted_high
+
+
+def generate_dataset(
+    n_employees: int,
+    years: list[int],
+    seed: int = 42,
+    evaluators_per_person: tuple[int, int] = (3, 7),
+    reciprocity: float = 0.15,
+    repeat_rate: float = 0.5,
+) -> tuple[pd.DataFrame, dict[int, pd.DataFrame]]:
+    """
+    합성 HR 기본정보와 연도별 정성평가 데이터를 생성합니다. (평가 행이 엑셀 한도를 넘으면 평가자 수를 줄임)
+
+    Returns:
+        (hr_df, {연도: 정성평가 DataFrame})
+    """
+    rng = np.random.default_rng(seed)
+    years = sorted(years)
+    evaluators_per_person = fit_evaluators_to_excel(n_employees, evaluators_per_person, reciprocity)
+
+    # ── 인원 풀: 연도별 입·퇴사를 고려해 여유분 생성 ──
+    pool_size = int(n_employees * (1 + 0.08 * len(years)))
+    ids = np.array([f"{100000 + i}" for i in range(pool_size)])
+    names = _make_names(rng, pool_size)
+    jobs = rng.choice(_JOB_FAMILIES, pool_size)
+    grades = rng.choice(_GRADES, pool_size, p=[0.3, 0.3, 0.2, 0.15, 0.05])
+    # Zipf형 인기도: 일부에게 평가 요청이 집중됨
+    popularity = rng.zipf(2.0, pool_size).astype(float)
+
+    org_tree = _build_org_tree(rng, pool_size)
+    org = org_tree.to_numpy()
+
+    active = np.zeros(pool_size, dtype=bool)
+    active[:n_employees] = True
+    next_hire = n_employees
+
+    hr_frames = []
+    qual_by_year = {}
+    prev_evaluators: dict[int, np.ndarray] = {}
+
+    for year in years:
+        if year != years[0]:
+            # 퇴사 8%, 같은 수만큼 입사
+            leavers = np.flatnonzero(active & (rng.random(pool_size) < 0.08))
+            active[leavers] = False
+            hires = np.arange(next_hire, min(next_hire + len(leavers), pool_size))
+            active[hires] = True
+            next_hire += len(hires)
+            # 조직 이동 5%
+            movers = np.flatnonzero(active & (rng.random(pool_size) < 0.05))
+            org[movers] = org[rng.choice(pool_size, len(movers))]
+
+        members = np.flatnonzero(active)
+        hr_frames.append(pd.DataFrame({
+            "평가년도": year,
+            "사번": ids[members],
+            "성명": names[members],
+            "ORG1_OP": org[members, 0],
+            "ORG2_OP": org[members, 1],
+            "ORG3_OP": org[members, 2],
+            "JOB_FAMILY_CODE": jobs[members],
+            "GRADE": grades[members],
+        }))
+
+        # ── 조직별 멤버 인덱스 ──
+        team_of = pd.Series(org[members, 2])
+        dept_of = pd.Series(org[members, 1])
+        team_groups = {k: members[v] for k, v in team_of.groupby(team_of).indices.items()}
+        dept_groups = {k: members[v] for k, v in dept_of.groupby(dept_of).indices.items()}
+        member_weights = popularity[members] / popularity[members].sum()
+        # 조직 외 선정은 전체 인원 대상 가중 추출이므로 한 번에 미리 뽑아 순서대로 사용
+        global_picks = iter(rng.choice(members, size=len(members) * evaluators_per_person[1], p=member_weights))
+
+        def pick(pool: np.ndarray, exclude: int) -> int | None:
+            pool = pool[pool != exclude]
+            if len(pool) == 0:
+                return None
+            w = popularity[pool]
+            return int(rng.choice(pool, p=w / w.sum()))
+
+        src, dst = [], []
+        chosen: dict[int, set] = {}
+        for person in members:
+            k = int(rng.integers(evaluators_per_person[0], evaluators_per_person[1] + 1))
+            picks: set[int] = set()
+            # 전년도 평가자 재선정
+            for prev in prev_evaluators.get(person, []):
+                if active[prev] and prev != person and rng.random() < repeat_rate and len(picks) < k:
+                    picks.add(int(prev))
+            attempts = 0
+            while len(picks) < k and attempts < k * 4:
+                attempts += 1
+                r = rng.random()
+                if r < 0.60:
+                    cand = pick(team_groups[org[person, 2]], person)
+                elif r < 0.85:
+                    cand = pick(dept_groups[org[person, 1]], person)
+                else:
+                    cand = next(global_picks, None)
+                if cand is not None and cand != person:
+                    picks.add(cand)
+            chosen[person] = picks
+
+        # ── 상호 선정: 평가자가 피평가자를 되선정 ──
+        for person, picks in chosen.items():
+            for evaluator in picks:
+                if rng.random() < reciprocity:
+                    chosen[evaluator].add(person)
+
+        for person, picks in chosen.items():
+            for evaluator in picks:
+                src.append(evaluator)
+                dst.append(person)
+        src_arr, dst_arr = np.array(src), np.array(dst)
+        prev_evaluators = {p: np.fromiter(e, dtype=int) for p, e in chosen.items()}
+
+        # 담합 패턴: 같은 팀 상호선정 쌍 일부는 짧은 칭찬만 남김
+        same_team = org[src_arr, 2] == org[dst_arr, 2]
+        collusive = same_team & (rng.random(len(src_arr)) < 0.03)
+        strengths, improvements = _feedback_text(rng, len(src_arr), collusive)
+
+        qual_by_year[year] = pd.DataFrame({
+            "평가년도": year,
+            "평가자사번": ids[src_arr],
+            "평가자성명": names[src_arr],
+            "피평가자사번": ids[dst_arr],
+            "피평가자성명": names[dst_arr],
+            "강점": strengths,
+            "보완점": improvements,
+        })
+
+    return pd.concat(hr_frames, ignore_index=True), qual_by_year
+
+
+def write_dataset(out_dir: str, hr_df: pd.DataFrame, qual_by_year: dict[int, pd.DataFrame]) -> None:
+    """DATA_DIR와 같은 파일명으로 엑셀 파일을 기록합니다."""
+    os.makedirs(out_dir, exist_ok=True)
+    for year, df in qual_by_year.items():
+        if len(df) > EXCEL_MAX_ROWS:
+            raise ValueError(f"{year}년 평가 행 수({len(df)})가 엑셀 최대 행 수를 넘습니다. 인원/평가자 수를 줄여주세요.")
+    if len(hr_df) > EXCEL_MAX_ROWS:
+        raise ValueError(f"HR 행 수({len(hr_df)})가 엑셀 최대 행 수를 넘습니다. 연도 수를 줄여주세요.")
+
+    hr_df.to_excel(os.path.join(out_dir, "00.HR기본정보.xlsx"), index=False)
+    for year, df in qual_by_year.items():
+        df.to_excel(os.path.join(out_dir, f"02.정성평가_{year}.xlsx"), index=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="합성 동료평가 데이터 생성기")
+    parser.add_argument("--employees", type=int, default=1000, help="연도별 재직 인원 (1,000 ~ 200,000)")
+    parser.add_argument("--years", default="2023,2024,2025", help="생성할 평가년도 (쉼표 구분)")
+    parser.add_argument("--out", required=True, help="출력 디렉토리 (DATA_DIR로 사용)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--min-evaluators", type=int, default=3)
+    parser.add_argument("--max-evaluators", type=int, default=7)
+    parser.add_argument("--reciprocity", type=float, default=0.15, help="되선정 확률")
+    args = parser.parse_args()
+
+    years = [int(y) for y in args.years.split(",") if y.strip()]
+    hr_df, qual_by_year = generate_dataset(
+        args.employees, years, seed=args.seed,
+        evaluators_per_person=(args.min_evaluators, args.max_evaluators),
+        reciprocity=args.reciprocity,
+    )
+    write_dataset(args.out, hr_df, qual_by_year)
+    print(f"[INFO] 합성 데이터 생성 완료: {args.out}")
+    print(f"  ✓ HR 기본정보: {len(hr_df)}건")
+    for year, df in qual_by_year.items():
+        print(f"  ✓ {year}년 정성평가: {len(df)}건")
+
+
+if __name__ == "__main__":
+    main()
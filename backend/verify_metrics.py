@@ -1,18 +1,536 @@
+"""
+verify_metrics.py — 지표 계산 엔진의 차등 검증(differential) 하네스
+
+핵심 설계 결정:
+  - 지표 계열(system_health / individual / subgroup / feedback)마다 현재 구현을 기준(reference)으로 두고,
+    최적화된 대안 엔진(ENGINES[계열]["alternatives"])을 같은 입력에서 실행해 결과를 필드 단위로 비교합니다.
+  - 입력은 합성 데이터(무작위, 여러 규모/시드)와 경계 사례(Ghost, 고립 노드, ORG3 없음,
+    여러 연도 중복 쌍, 숫자 사번, 자기 엣지, HR 없는 사번)이며, 케이스마다 여러 필터를 적용합니다.
+  - 비교 규칙: 문자열·정수는 정확히 일치, 실수는 TOLERANCES의 허용 오차 이내.
+    응답 값은 이미 반올림되어 있으므로 기본 허용 오차는 부동소수 표현 차이 수준입니다.
+  - 엔진별 최소 실행 시간으로 기준 대비 속도 향상 배율을 보고합니다.
+  - 서버는 원본 행 대신 쌍 엣지 테이블(edge_aggregation)로 계산하므로, 같은 지표를 쌍 엣지 입력으로
+    실행한 엔진(edge_pairs)도 원본 행 기준 결과와 비교합니다.
+  - duckdb가 설치되어 있으면 쿼리 엔진(query_engine)도 케이스 원본으로 Parquet 파티션을 만들어
+    필터(filter) / 제도 건전성 / 하위 조직 결과를 비교합니다 (결합 후 노드를 바꾼 케이스는 적용 불가).
+
+새 엔진 등록:
+    register_engine("individual", "my_engine", lambda case: ...)
+    (반환값은 해당 계열 비교 형식 — 아래 *_view 함수 참고)
+
+실행 방법 (backend 디렉토리에서):
+    python verify_metrics.py                                  # 기본 케이스 전체
+    python verify_metrics.py --sizes 300,3000 --seeds 1,2,3 --repeat 3
+    python verify_metrics.py --family individual --json verify_results.json
+    python verify_metrics.py --integrity --years 2025         # 실데이터 정합성 점검 (기존 검사)
+"""
+import argparse
+import fnmatch
+import json
+import math
 import sys
 import os
+import tempfile
+import time
 import pandas as pd
 import numpy as np
 
 # backend 경로 추가
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from services.data_loader import prepare_combined_network_data, filter_network_data
+from config import TOP_PERCENT
+from services.data_loader import prepare_combined_network_data, filter_network_data, install_shared_data
 from services.network_builder import build_graph
-from services.metrics_calculator import calculate_system_health_metrics, calculate_subgroup_metrics
+from services.edge_aggregation import aggregate_edges, filter_edge_pairs
+from services.metrics_calculator import (
+    calculate_system_health_metrics,
+    calculate_subgroup_metrics,
+    calculate_individual_metrics,
+    compute_individual_metric_table,
+)
+from services.feedback_analyzer import calculate_feedback_metrics, calculate_feedback_features
+from services.metric_cube import build_cube, cube_cell
+from services.query_engine import ATTR_COLUMNS, QueryEngine, is_available as query_engine_available
+from synthetic_data import generate_dataset
+
+
+# ──────────────────────────────────────────────
+# 비교 규칙
+# ──────────────────────────────────────────────
+
+# (필드 경로 fnmatch 패턴, 절대 허용 오차) — 위에서부터 처음 일치하는 규칙 적용
+TOLERANCES = [
+    # 응답 값은 round(…, 1 또는 4)로 반올림되어 있으므로 반올림 자리 차이는 허용하지 않음
+    ("*", 1e-12),
+]
+
+
+def tolerance_for(path: str) -> float:
+    for pattern, tol in TOLERANCES:
+        if fnmatch.fnmatch(path, pattern):
+            return tol
+    return 0.0
+
+
+def _is_missing(value) -> bool:
+    return value is None or (isinstance(value, (float, np.floating)) and math.isnan(value))
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float, np.integer, np.floating)) and not isinstance(value, (bool, np.bool_))
+
+
+def compare_outputs(ref, alt, path: str = "", subset: bool = False) -> list[str]:
+    """
+    두 결과를 재귀적으로 비교해 불일치 목록을 반환합니다.
+
+    subset=True면 dict에서 대안 엔진 쪽의 추가 키를 허용합니다 (예: Top N% 대신 전원 테이블).
+    """
+    if _is_missing(ref) and _is_missing(alt):
+        return []
+    if isinstance(ref, dict) and isinstance(alt, dict):
+        diffs = []
+        for key in ref:
+            sub_path = f"{path}.{key}" if path else str(key)
+            if key not in alt:
+                diffs.append(f"{sub_path}: 대안 결과에 없음")
+            else:
+                diffs.extend(compare_outputs(ref[key], alt[key], sub_path, subset))
+        if not subset:
+            diffs.extend(f"{path}.{key}: 기준 결과에 없음" for key in alt if key not in ref)
+        return diffs
+    if isinstance(ref, (list, tuple)) and isinstance(alt, (list, tuple)):
+        if len(ref) != len(alt):
+            return [f"{path}: 길이 {len(ref)} != {len(alt)}"]
+        diffs = []
+        for i, (r, a) in enumerate(zip(ref, alt)):
+            diffs.extend(compare_outputs(r, a, f"{path}[{i}]", subset))
+        return diffs
+    if _is_number(ref) and _is_number(alt):
+        if abs(float(ref) - float(alt)) <= tolerance_for(path):
+            return []
+        return [f"{path}: {ref!r} != {alt!r}"]
+    if ref != alt:
+        return [f"{path}: {ref!r} != {alt!r}"]
+    return []
+
+
+# ──────────────────────────────────────────────
+# 검증 케이스
+# ──────────────────────────────────────────────
+
+class Case:
+    """하나의 결합 데이터 + 필터. 필터/그래프 준비는 엔진 시간 측정에서 제외하기 위해 미리 계산합니다."""
+
+    def __init__(self, label: str, raw_edges: pd.DataFrame, all_nodes: pd.DataFrame, flt: dict,
+                 query_engine: QueryEngine | None = None):
+        self.label = label
+        self.raw_edges = raw_edges
+        self.all_nodes = all_nodes
+        self.query_engine = query_engine   # 같은 원본의 Parquet 파티션 (없으면 쿼리 엔진 적용 불가)
+        self.years = sorted(pd.to_numeric(raw_edges['평가년도']).dropna().astype(int).unique().tolist())
+        self.filter = {"orgs1": [], "orgs2": [], "jobs": [], "grades": [], **flt}
+        self.nodes, self.edges = filter_network_data(
+            all_nodes, raw_edges, self.filter["orgs1"], self.filter["orgs2"], self.filter["jobs"], self.filter["grades"]
+        )
+        self.G = build_graph(self.nodes, self.edges)
+        # 서버 경로: 연도 조합의 쌍 엣지 테이블 → 핵심 노드 필터
+        self.pairs = filter_edge_pairs(aggregate_edges(raw_edges), self.nodes['사번'])
+        self.G_pairs = build_graph(self.nodes, self.pairs)
+
+    @property
+    def has_edges(self) -> bool:
+        return len(self.edges) > 0
+
+
+_engine_dir: tempfile.TemporaryDirectory | None = None
+
+
+def _combine(hr_df: pd.DataFrame | None, qual_by_year: dict[int, pd.DataFrame]) -> tuple[pd.DataFrame, pd.DataFrame, QueryEngine | None]:
+    """
+    서버와 같은 결합 경로(prepare_combined_network_data)로 엣지/노드를 만듭니다.
+    duckdb가 있으면 같은 원본으로 쿼리 엔진 파티션도 기록합니다.
+    """
+    global _engine_dir
+    # load_hr_master_data와 같은 컬럼 선택 + 사번 문자열화
+    use_cols = ['평가년도', '사번', 'ORG1_OP', 'ORG2_OP', 'ORG3_OP', 'JOB_FAMILY_CODE', 'GRADE']
+    hr = None
+    if hr_df is not None:
+        hr = hr_df[[c for c in use_cols if c in hr_df.columns]].copy()
+        hr['사번'] = hr['사번'].astype(str).str.strip()
+    install_shared_data(qual_by_year, hr, {})
+    edges, nodes = prepare_combined_network_data(sorted(qual_by_year))
+
+    engine = None
+    if query_engine_available():
+        if _engine_dir is None:
+            _engine_dir = tempfile.TemporaryDirectory(prefix="verify_query_engine_")
+        root = os.path.join(_engine_dir.name, str(len(os.listdir(_engine_dir.name))))
+        engine = QueryEngine.from_frames(qual_by_year, hr, root)
+    return edges, nodes, engine
+
+
+def _filters(nodes: pd.DataFrame) -> list[tuple[str, dict]]:
+    """전체 + ORG1 하나/둘 + ORG2 하나 + 직급 하나 (Ghost가 생기는 필터 포함)"""
+    org1 = sorted(v for v in nodes['ORG1_OP'].unique() if v != 'Unknown')
+    org2 = sorted(v for v in nodes['ORG2_OP'].unique() if v != 'Unknown')
+    grades = sorted(v for v in nodes['GRADE'].unique() if v != 'Unknown') if 'GRADE' in nodes.columns else []
+    result = [("전체", {})]
+    if org1:
+        result.append((f"ORG1={org1[0]}", {"orgs1": [org1[0]]}))
+    if len(org1) > 1:
+        result.append((f"ORG1={org1[0]}+{org1[-1]}", {"orgs1": [org1[0], org1[-1]]}))
+    if org2:
+        result.append((f"ORG2={org2[len(org2) // 2]}", {"orgs2": [org2[len(org2) // 2]]}))
+    if grades:
+        result.append((f"GRADE={grades[0]}", {"grades": [grades[0]]}))
+    return result
+
+
+def _handmade_dataset() -> tuple[pd.DataFrame, dict[int, pd.DataFrame]]:
+    """
+    경계 사례를 직접 구성한 소형 데이터:
+      - 2년 연속 같은 쌍(중복 행), 상호 선정, 자기 엣지
+      - 숫자 사번 (엑셀에서 int로 읽힌 경우), HR에 없는 사번(→ Unknown)
+      - 보완점이 비어 있거나 짧은 피드백
+    """
+    hr_rows = []
+    for year in (2024, 2025):
+        for pid, org1, org2, org3, grade in [
+            ("1001", "A", "A-1", "A-1-x", "G1"), ("1002", "A", "A-1", "A-1-x", "G2"),
+            ("1003", "A", "A-2", "A-2-y", "G2"), ("1004", "B", "B-1", "B-1-z", "G3"),
+            ("1005", "B", "B-1", "B-1-z", "G1"), ("1006", "B", "B-2", "B-2-w", "G3"),
+        ]:
+            hr_rows.append({"평가년도": year, "사번": pid, "ORG1_OP": org1, "ORG2_OP": org2,
+                            "ORG3_OP": org3, "JOB_FAMILY_CODE": "ENG", "GRADE": grade})
+    hr = pd.DataFrame(hr_rows)
+    # 2025년에는 1006이 A로 이동 (최신 HR 기준 속성 확인)
+    hr.loc[(hr['평가년도'] == 2025) & (hr['사번'] == "1006"), ['ORG1_OP', 'ORG2_OP', 'ORG3_OP']] = ["A", "A-2", "A-2-y"]
+
+    def qual(year: int, pairs: list[tuple[int, int, str, str]]) -> pd.DataFrame:
+        return pd.DataFrame({
+            "평가년도": year,
+            "평가자사번": [s for s, _, _, _ in pairs],
+            "평가자성명": [f"이름{s}" for s, _, _, _ in pairs],
+            "피평가자사번": [t for _, t, _, _ in pairs],
+            "피평가자성명": [f"이름{t}" for _, t, _, _ in pairs],
+            "강점": [a for _, _, a, _ in pairs],
+            "보완점": [b for _, _, _, b in pairs],
+        })
+
+    long_text = "업무 이해도가 높고 일정 관리를 꼼꼼하게 합니다."
+    fix_text = "회의에서 결론을 명확히 정리해 주시면 좋겠습니다."
+    q2024 = qual(2024, [
+        (1001, 1002, long_text, fix_text), (1002, 1001, "좋아요", ""), (1001, 1004, long_text, fix_text),
+        (1004, 1005, long_text, "없음"), (1005, 1004, "최고입니다", None), (1003, 1003, long_text, fix_text),
+        (1006, 9999, long_text, fix_text),
+    ])
+    q2025 = qual(2025, [
+        (1001, 1002, long_text, fix_text), (1002, 1001, "좋아요", ""), (1002, 1003, long_text, fix_text),
+        (1003, 1002, long_text, fix_text), (1004, 1006, long_text, fix_text), (1006, 1001, "좋아요", ""),
+        (9999, 1005, long_text, fix_text),
+    ])
+    return hr, {2024: q2024, 2025: q2025}
+
+
+def build_cases(sizes: list[int], seeds: list[int]) -> list[Case]:
+    cases = []
+
+    def add(label: str, edges: pd.DataFrame, nodes: pd.DataFrame, query_engine: QueryEngine | None = None):
+        for flt_label, flt in _filters(nodes):
+            case = Case(f"{label} / {flt_label}", edges, nodes, flt, query_engine)
+            if case.has_edges:
+                cases.append(case)
+
+    # ── 무작위 합성 데이터 ──
+    for size in sizes:
+        for seed in seeds:
+            hr, qual = generate_dataset(size, [2024, 2025], seed=seed)
+            add(f"random n={size} seed={seed} 2025", *_combine(hr, {2025: qual[2025]}))
+
+    # ── 경계 사례 ──
+    size, seed = min(sizes), seeds[0]
+    hr, qual = generate_dataset(size, [2023, 2024, 2025], seed=seed, repeat_rate=0.9)
+    add("multi-year dup pairs 2023-2025", *_combine(hr, qual))
+
+    hr, qual = generate_dataset(size, [2025], seed=seed + 100)
+    add("missing ORG3", *_combine(hr.drop(columns=['ORG3_OP']), qual))
+
+    hr, qual = generate_dataset(size, [2025], seed=seed + 200)
+    numeric_qual = {y: df.assign(평가자사번=df['평가자사번'].astype(int), 피평가자사번=df['피평가자사번'].astype(int))
+                    for y, df in qual.items()}
+    edges, nodes, engine = _combine(hr, numeric_qual)
+    add("numeric ids", edges, nodes, engine)
+    # 평가 이력이 없는 재직자 (고립 노드)
+    isolated = nodes.head(5).assign(사번=[f"ISO{i}" for i in range(5)], 성명="고립")
+    add("numeric ids + isolated nodes", edges, pd.concat([nodes, isolated], ignore_index=True))
+
+    # HR 파일이 없을 때와 같은 노드 (조직/직군/직급 모두 Unknown)
+    add("no HR attributes", edges, nodes.assign(**{c: 'Unknown' for c in ['ORG1_OP', 'ORG2_OP', 'ORG3_OP', 'JOB_FAMILY_CODE', 'GRADE']}))
+    add("handmade edge cases", *_combine(*_handmade_dataset()))
+    # HR 파일 자체가 없을 때 (결합 경로의 HR 없음 분기)
+    add("no HR file", *_combine(None, _handmade_dataset()[1]))
+    return cases
+
+
+# ──────────────────────────────────────────────
+# 엔진 (계열별 기준 + 대안)
+#   각 엔진은 Case → 비교 형식 결과를 반환합니다. None이면 해당 케이스에 적용 불가.
+# ──────────────────────────────────────────────
+
+def _top_n(count: int) -> int:
+    return max(5, int(count * TOP_PERCENT))
+
+
+def individual_reference_view(case: Case) -> dict:
+    """
+    calculate_individual_metrics → { 지표: { "values": {사번: 값}, "top_values": [값 내림차순] } }
+
+    ★ 동점의 순서/경계 인원은 기준 구현에서도 정렬 안정성에 따라 달라지므로,
+      명단에 오른 사람의 값과 Top N 값 분포(내림차순 목록)를 비교합니다.
+    """
+    result = calculate_individual_metrics(case.G, case.nodes, case.edges)
+    return {
+        key: {
+            "values": {row['사번']: row['value'] for row in rows},
+            "top_values": sorted((row['value'] for row in rows), reverse=True),
+        }
+        for key, rows in result.items()
+    }
+
+
+def individual_table_view(case: Case, pairs: bool = False) -> dict:
+    """compute_individual_metric_table (벡터 연산) → individual_reference_view 형식 (values는 전원)"""
+    if pairs:
+        table = compute_individual_metric_table(case.G_pairs, case.nodes, case.pairs)
+    else:
+        table = compute_individual_metric_table(case.G, case.nodes, case.edges)
+    top_n = _top_n(len(table))
+    view = {}
+    for key in ['selection_burden', 'cross_org_rate', 'mutual_selection', 'group_closure']:
+        values = table[key].round(4)
+        view[key] = {
+            "values": dict(zip(table['사번'], values)),
+            "top_values": sorted(values, reverse=True)[:top_n],
+        }
+    return view
+
+
+def feedback_reference_view(case: Case) -> dict:
+    return calculate_feedback_metrics(case.raw_edges, case.all_nodes, case.nodes)
+
+
+def feedback_reference_features_view(case: Case) -> dict:
+    """calculate_feedback_metrics의 individual_feedback → {사번: {avg_feedback_len, feedback_count, constructive_rate}}"""
+    result = calculate_feedback_metrics(case.raw_edges, case.all_nodes, case.nodes)
+    fields = ['avg_feedback_len', 'feedback_count', 'constructive_rate']
+    return {"persons": {row['사번']: {f: row[f] for f in fields} for row in result['individual_feedback']}}
+
+
+def feedback_features_view(case: Case) -> dict | None:
+    """calculate_feedback_features (전체 내보내기용 테이블) → feedback_reference_features_view 형식 (전원)"""
+    features = calculate_feedback_features(case.raw_edges, case.nodes)
+    if features is None:
+        return {"persons": {}}
+    records = features.set_index('사번').to_dict(orient='index')
+    return {"persons": records}
+
+
+def filter_view(nodes: pd.DataFrame, edges: pd.DataFrame) -> dict:
+    """필터 결과 → { "nodes": {사번: [성명, 속성…]}, "edges": [[source, target] 정렬] }"""
+    cols = [c for c in ['성명'] + ATTR_COLUMNS if c in nodes.columns]
+    return {
+        "nodes": {pid: list(values) for pid, *values in nodes[['사번'] + cols].itertuples(index=False)},
+        "edges": sorted([s, t] for s, t in zip(edges['source'], edges['target'])),
+    }
+
+
+def filter_reference_view(case: Case) -> dict:
+    f = case.filter
+    return filter_view(*filter_network_data(case.all_nodes, case.raw_edges, f["orgs1"], f["orgs2"], f["jobs"], f["grades"]))
+
+
+def _query_args(case: Case) -> tuple:
+    f = case.filter
+    return case.years, f["orgs1"], f["orgs2"], f["jobs"], f["grades"]
+
+
+def query_filter_view(case: Case) -> dict | None:
+    """QueryEngine.filter_network (Parquet 파티션에 대한 쿼리) → filter_view 형식"""
+    if case.query_engine is None:
+        return None
+    return filter_view(*case.query_engine.filter_network(*_query_args(case)))
+
+
+def query_system_health_view(case: Case) -> dict | None:
+    if case.query_engine is None:
+        return None
+    return case.query_engine.system_health(*_query_args(case))[0]
+
+
+def query_subgroup_view(case: Case) -> dict | None:
+    if case.query_engine is None:
+        return None
+    return {col: case.query_engine.subgroup_metrics(*_query_args(case), col)[0] for col in ('ORG1_OP', 'ORG2_OP')}
+
+
+def cube_view(case: Case) -> dict | None:
+    """metric_cube.build_cube의 셀 (전체 / ORG1 하나 / ORG2 하나 필터에만 적용)"""
+    f = case.filter
+    if f["jobs"] or f["grades"] or len(f["orgs1"]) > 1 or len(f["orgs2"]) > 1 or (f["orgs1"] and f["orgs2"]):
+        return None
+    return cube_cell(build_cube(case.raw_edges, case.all_nodes), f["orgs1"], f["orgs2"], f["jobs"], f["grades"])
+
+
+# 계열 → { reference: (이름, 엔진), alternatives: {이름: 엔진}, subset: 대안 결과의 추가 키 허용 여부 }
+ENGINES = {
+    "filter": {
+        "reference": ("filter_network_data", filter_reference_view),
+        "alternatives": {"query_engine": query_filter_view},
+        "subset": False,
+    },
+    "system_health": {
+        "reference": ("calculate_system_health_metrics",
+                      lambda c: calculate_system_health_metrics(c.G, c.nodes, c.edges)),
+        "alternatives": {
+            "metric_cube": cube_view,
+            "edge_pairs": lambda c: calculate_system_health_metrics(c.G_pairs, c.nodes, c.pairs),
+            "query_engine": query_system_health_view,
+        },
+        "subset": False,
+    },
+    "individual": {
+        "reference": ("calculate_individual_metrics", individual_reference_view),
+        "alternatives": {
+            "compute_individual_metric_table": individual_table_view,
+            "edge_pairs": lambda c: individual_table_view(c, pairs=True),
+        },
+        "subset": True,
+    },
+    "subgroup": {
+        "reference": ("calculate_subgroup_metrics",
+                      lambda c: {col: calculate_subgroup_metrics(c.nodes, c.edges, c.G, col) for col in ('ORG1_OP', 'ORG2_OP')}),
+        "alternatives": {
+            "edge_pairs": lambda c: {col: calculate_subgroup_metrics(c.nodes, c.pairs, c.G_pairs, col)
+                                     for col in ('ORG1_OP', 'ORG2_OP')},
+            "query_engine": query_subgroup_view,
+        },
+        "subset": False,
+    },
+    "feedback": {
+        "reference": ("calculate_feedback_metrics", feedback_reference_view),
+        "alternatives": {},
+        "subset": False,
+    },
+    "feedback_features": {
+        "reference": ("calculate_feedback_metrics.individual_feedback", feedback_reference_features_view),
+        "alternatives": {"calculate_feedback_features": feedback_features_view},
+        "subset": True,
+    },
+}
+
+
+def register_engine(family: str, name: str, engine) -> None:
+    """대안 엔진을 등록합니다. engine(case)는 해당 계열의 기준 엔진과 같은 형식을 반환해야 합니다."""
+    ENGINES[family]["alternatives"][name] = engine
+
+
+# ──────────────────────────────────────────────
+# 실행
+# ──────────────────────────────────────────────
+
+def _timed(engine, case: Case, repeat: int):
+    """repeat회 실행 중 최소 시간과 (마지막) 결과"""
+    best = math.inf
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = engine(case)
+        best = min(best, time.perf_counter() - started)
+    return result, best
+
+
+def run_harness(cases: list[Case], families: list[str], repeat: int, max_diffs: int = 5) -> dict:
+    """
+    Returns:
+        { 계열: { "reference", "engines": { 이름: {cases, skipped, failures, ref_sec, alt_sec, speedup, mismatches} } } }
+    """
+    report = {}
+    for family in families:
+        spec = ENGINES[family]
+        ref_name, ref_engine = spec["reference"]
+        engines = {
+            name: {"cases": 0, "skipped": 0, "failures": 0, "ref_sec": 0.0, "alt_sec": 0.0, "mismatches": []}
+            for name in spec["alternatives"]
+        }
+        ref_runs, ref_errors = 0, []
+
+        for case in cases:
+            try:
+                ref_result, ref_sec = _timed(ref_engine, case, repeat)
+                ref_runs += 1
+            except Exception as e:  # 기준 구현의 예외도 보고 대상
+                ref_errors.append(f"{case.label}: {type(e).__name__}: {e}")
+                continue
+
+            for name, engine in spec["alternatives"].items():
+                stats = engines[name]
+                try:
+                    alt_result, alt_sec = _timed(engine, case, repeat)
+                except Exception as e:
+                    stats["failures"] += 1
+                    stats["mismatches"].append(f"[{case.label}] 예외 {type(e).__name__}: {e}")
+                    continue
+                if alt_result is None:
+                    stats["skipped"] += 1
+                    continue
+                stats["cases"] += 1
+                stats["ref_sec"] += ref_sec
+                stats["alt_sec"] += alt_sec
+                diffs = compare_outputs(ref_result, alt_result, family, subset=spec["subset"])
+                if diffs:
+                    stats["failures"] += 1
+                    stats["mismatches"].extend(f"[{case.label}] {d}" for d in diffs[:max_diffs])
+
+        for stats in engines.values():
+            stats["speedup"] = round(stats["ref_sec"] / stats["alt_sec"], 2) if stats["alt_sec"] > 0 else None
+            stats["ref_sec"] = round(stats["ref_sec"], 4)
+            stats["alt_sec"] = round(stats["alt_sec"], 4)
+        report[family] = {"reference": ref_name, "reference_runs": ref_runs, "reference_errors": ref_errors,
+                          "engines": engines}
+    return report
+
+
+def print_report(report: dict, case_count: int) -> bool:
+    """표 형식으로 출력하고, 모든 엔진이 일치하면 True를 반환합니다."""
+    ok = True
+    print(f"\n=== 차등 검증 결과 (케이스 {case_count}개) ===")
+    for family, fam in report.items():
+        print(f"\n[{family}] 기준: {fam['reference']} ({fam['reference_runs']}회 실행)")
+        for err in fam["reference_errors"]:
+            ok = False
+            print(f"  ✗ 기준 구현 예외 — {err}")
+        if not fam["engines"]:
+            print("  (등록된 대안 엔진 없음)")
+        for name, s in fam["engines"].items():
+            status = "✓ 일치" if s["failures"] == 0 else f"✗ 불일치 {s['failures']}건"
+            ok &= s["failures"] == 0
+            speedup = f"{s['speedup']}x" if s["speedup"] is not None else "-"
+            print(f"  {status:<12} {name:<34} 케이스 {s['cases']:>3} (적용 불가 {s['skipped']}) "
+                  f"기준 {s['ref_sec']:.4f}s / 대안 {s['alt_sec']:.4f}s → {speedup}")
+            for m in s["mismatches"][:20]:
+                print(f"      - {m}")
+    print("\n>>> SUCCESS: 모든 대안 엔진이 기준 결과와 일치합니다." if ok else "\n>>> FAILURE: 불일치가 있습니다.")
+    return ok
+
+
+# ──────────────────────────────────────────────
+# 실데이터 정합성 점검 (DATA_DIR)
+# ──────────────────────────────────────────────
 
 def verify_data_integrity(years=[2025]):
     print(f"--- Metric Verification Start (Years: {years}) ---")
-    
+
     # 1. 데이터 로드
     raw_edges, all_nodes = prepare_combined_network_data(years)
     if raw_edges is None:
@@ -22,7 +540,7 @@ def verify_data_integrity(years=[2025]):
     # 2. 전체 필터링 (테스트를 위해 전체 조직 선택)
     nodes, edges = filter_network_data(all_nodes, raw_edges, [], [], [], [])
     G = build_graph(nodes, edges)
-    
+
     # 3. 전체 지표 계산
     overall_metrics = calculate_system_health_metrics(G, nodes, edges)
     print(f"\n[Overall Metrics]")
@@ -33,12 +551,12 @@ def verify_data_integrity(years=[2025]):
 
     # 4. 하위 조직별 지표 계산 (ORG2_OP 기준)
     subgroup_metrics = calculate_subgroup_metrics(nodes, edges, G, "ORG2_OP")
-    
+
     print(f"\n[Subgroup Comparison (ORG2_OP)]")
     total_sub_members = 0
     total_sub_evals = 0
     weighted_avg_evals = 0
-    
+
     for sub in subgroup_metrics:
         sub_members = sub['member_count']
         sub_avg = sub['avg_evaluators']
@@ -48,11 +566,11 @@ def verify_data_integrity(years=[2025]):
 
     # 5. 정합성 검증
     calculated_overall_avg = round(total_sub_evals / total_sub_members, 1) if total_sub_members > 0 else 0
-    
+
     print(f"\n[Integrity Results]")
     print(f"  Overall Avg Evaluators (from KPI): {overall_metrics['avg_evaluators']}")
     print(f"  Calculated Weighted Avg from Subgroups: {calculated_overall_avg}")
-    
+
     diff = abs(overall_metrics['avg_evaluators'] - calculated_overall_avg)
     if diff <= 0.1:
         print("  >>> SUCCESS: Overall average matches weighted average of subgroups.")
@@ -66,5 +584,38 @@ def verify_data_integrity(years=[2025]):
     else:
         print("  >>> FAILURE: Gini coefficient is out of range!")
 
+
+def main():
+    parser = argparse.ArgumentParser(description="지표 엔진 차등 검증 하네스")
+    parser.add_argument("--sizes", default="300,1500", help="무작위 합성 데이터 인원 규모 (쉼표 구분)")
+    parser.add_argument("--seeds", default="1,2", help="무작위 시드 (쉼표 구분)")
+    parser.add_argument("--family", default="", help=f"검증할 계열 (쉼표 구분, 기본 전체: {', '.join(ENGINES)})")
+    parser.add_argument("--repeat", type=int, default=1, help="엔진별 반복 실행 횟수 (최소 시간 사용)")
+    parser.add_argument("--json", help="결과를 JSON 파일로 저장")
+    parser.add_argument("--integrity", action="store_true", help="DATA_DIR 실데이터 정합성 점검만 실행")
+    parser.add_argument("--years", default="2025", help="--integrity 대상 연도 (쉼표 구분)")
+    args = parser.parse_args()
+
+    if args.integrity:
+        verify_data_integrity([int(y) for y in args.years.split(",") if y.strip()])
+        return
+
+    families = [f.strip() for f in args.family.split(",") if f.strip()] or list(ENGINES)
+    unknown = [f for f in families if f not in ENGINES]
+    if unknown:
+        parser.error(f"알 수 없는 계열: {', '.join(unknown)}")
+
+    print("[INFO] 검증 케이스 생성 중...")
+    cases = build_cases([int(s) for s in args.sizes.split(",")], [int(s) for s in args.seeds.split(",")])
+    report = run_harness(cases, families, args.repeat)
+    ok = print_report(report, len(cases))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"cases": [c.label for c in cases], "families": report}, f, ensure_ascii=False, indent=2)
+        print(f"[INFO] 결과 저장: {args.json}")
+    sys.exit(0 if ok else 1)
+
+
 if __name__ == "__main__":
-    verify_data_integrity()
+    main()
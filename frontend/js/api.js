@@ -1,38 +1,552 @@
 /**
  * api.js — 백엔드 API 호출 모듈
+ *
+ * ★ 지연 예산(Latency Budget):
+ *   분석 종류별로 최근 응답 시간을 기억하고, 예산(LATENCY_BUDGET_MS)을 넘긴 종류는
+ *   다음부터 백그라운드 잡으로 제출한 뒤 /api/jobs/{id}를 폴링합니다.
+ *
+ * ★ 정적 번들(백엔드 없이 실행):
+ *   백엔드가 응답하지 않으면 backend/precompute.py가 만든 번들(BUNDLE_BASE)에서 결과를 읽습니다.
+ *   CURRENT → {버전}/manifest.json → 항목 파일(gzip JSON) 순서이며, 번들에 없는 필터 조합은 오류로 안내합니다.
+ *
+ * ★ 응답 캐시(IndexedDB):
+ *   키 = 서버 데이터 버전(/api/data-version, 번들 모드는 번들 버전) + 분석 종류 + 정규화한 필터.
+ *   같은 분석을 다시 실행하면 서버에 묻지 않고 바로 반환하고, 원본 데이터가 바뀌면 버전이 달라져 자동으로 무효화됩니다.
+ *   전체 크기가 CACHE_MAX_BYTES를 넘으면 가장 오래 쓰지 않은 항목부터 지웁니다.
+ *
+ * ★ 서버 혼잡(503 + Retry-After):
+ *   서버 입장 제어가 분석 요청을 돌려보내면 Retry-After초(+ 약간의 무작위 지연) 뒤 BUSY_RETRY_MAX번까지 다시 요청합니다.
+ *
+ * ★ 네트워크 워커:
+ *   큰 네트워크 응답의 수신·JSON 파싱·Vis.js 입력 변환은 network-worker.js에서 처리합니다.
+ *   (vis.DataSet 객체는 스레드 간에 넘길 수 없으므로 워커는 DataSet 입력 배열까지 만들고, 감싸는 것만 메인 스레드에서)
  */
 const API = (() => {
     const BASE = '';  // 같은 origin
+    const LATENCY_BUDGET_MS = 3000;
+    const POLL_INTERVAL_MS = 500;
+    const POLL_INTERVAL_MAX_MS = 2000;
+    const BUSY_RETRY_MAX = 3;                     // 503(서버 혼잡) 재시도 횟수
+
+    // precompute.py 번들 위치 (페이지에서 window.ANALYTICS_BUNDLE_BASE로 바꿀 수 있음)
+    const BUNDLE_BASE = window.ANALYTICS_BUNDLE_BASE || '/bundle/';
+
+    const WORKER_URL = '/js/network-worker.js';
+    const CACHE_DB_NAME = 'peer-eval-responses';
+    const CACHE_MAX_BYTES = 64 * 1024 * 1024;     // 응답 캐시 상한 (JSON 문자 수 기준)
+    const DATA_VERSION_TTL_MS = 60 * 1000;        // 서버 데이터 버전 재확인 주기
+
+    // 분석 종류 → 최근 관측 응답 시간 (ms)
+    const _latency = {};
+
+    // 번들 모드 상태: 백엔드 없음을 확인하면 이후 요청은 바로 번들에서 읽음
+    let _offline = false;
+    let _bundle = null;                 // Promise<{ base, manifest }>
+    const _bundleFiles = new Map();     // 항목 경로 → Promise<JSON>
+
+    /** 백엔드가 없을 때(네트워크 오류, 정적 파일 서버의 404/405/501) 던지는 오류 */
+    class BackendUnavailable extends Error {}
+
+    /** 서버가 혼잡해 분석 요청을 돌려보냈을 때(503) 던지는 오류 — retryAfter: 다시 시도할 때까지 기다릴 초 */
+    class ServerBusy extends Error {
+        constructor(message, retryAfter) {
+            super(message);
+            this.retryAfter = Math.max(1, Number(retryAfter) || 1);
+        }
+    }
+
+    const ENDPOINTS = {
+        network: '/api/network',
+        organization: '/api/metrics/organization',
+        individual: '/api/metrics/individual',
+        individual_query: '/api/metrics/individual/query',
+        subgroup: '/api/metrics/subgroup',
+        feedback: '/api/metrics/feedback',
+    };
 
     async function _fetch(url, options = {}) {
+        let res;
+        try {
+            res = await fetch(url, {
+                headers: { 'Content-Type': 'application/json' },
+                ...options,
+            });
+        } catch (err) {
+            throw new BackendUnavailable(err.message);
+        }
+        if (!res.ok) {
+            // ★ FastAPI 오류 응답은 JSON — JSON이 아닌 404/405/501은 API가 없는 정적 서버
+            const isJson = (res.headers.get('Content-Type') || '').includes('application/json');
+            if (!isJson && [404, 405, 501].includes(res.status)) {
+                throw new BackendUnavailable(`HTTP ${res.status}`);
+            }
+            const detail = await res.json().catch(() => ({}));
+            if (res.status === 503) throw new ServerBusy(detail.detail || 'HTTP 503', res.headers.get('Retry-After'));
+            throw new Error(detail.detail || `HTTP ${res.status}`);
+        }
+        return res.json();
+    }
+
+    const _sleep = (ms) => new Promise(resolve => setTimeout(resolve, ms));
+
+    /**
+     * 잡을 제출하고 완료될 때까지 폴링합니다.
+     * onProgress(job)는 상태가 갱신될 때마다 호출됩니다.
+     */
+    async function _runAsJob(kind, filters, onProgress) {
+        let job = await _fetch(`${BASE}/api/jobs`, {
+            method: 'POST',
+            body: JSON.stringify({ kind, filters }),
+        });
+        let interval = POLL_INTERVAL_MS;
+        while (job.status === 'queued' || job.status === 'running') {
+            if (onProgress) onProgress(job);
+            await _sleep(interval);
+            interval = Math.min(interval * 1.5, POLL_INTERVAL_MAX_MS);
+            job = await _fetch(`${BASE}/api/jobs/${job.job_id}`);
+        }
+        if (job.status === 'done') return job.result;
+        if (job.status === 'cancelled') throw new Error('분석이 취소되었습니다.');
+        throw new Error((job.error && job.error.detail) || '분석 잡 실행 실패');
+    }
+
+    // ── 네트워크 워커 ──
+
+    let _worker;                        // undefined: 아직 생성 전, null: 사용 불가 → 메인 스레드에서 처리
+    let _workerSeq = 0;
+    const _workerCalls = new Map();     // 메시지 id → resolve
+    const _sizes = new WeakMap();       // 응답 객체 → JSON 크기 (워커가 이미 센 값, 캐시 용량 계산용)
+
+    function _getWorker() {
+        if (_worker === undefined) {
+            try {
+                _worker = new Worker(WORKER_URL);
+                _worker.onmessage = (event) => {
+                    const resolve = _workerCalls.get(event.data.id);
+                    _workerCalls.delete(event.data.id);
+                    if (resolve) resolve(event.data);
+                };
+                // 스크립트를 못 읽는 등 워커 자체가 실패하면 대기 중인 호출은 메인 스레드로 넘김
+                _worker.onerror = () => {
+                    _worker = null;
+                    _workerCalls.forEach(resolve => resolve(null));
+                    _workerCalls.clear();
+                };
+            } catch (err) {
+                _worker = null;
+            }
+        }
+        return _worker;
+    }
+
+    /** 워커에 메시지를 보내고 응답을 기다립니다. 워커를 쓸 수 없으면 null. */
+    function _callWorker(message) {
+        const worker = _getWorker();
+        if (!worker) return Promise.resolve(null);
+        return new Promise(resolve => {
+            const id = ++_workerSeq;
+            _workerCalls.set(id, resolve);
+            worker.postMessage({ id, ...message });
+        });
+    }
+
+    /**
+     * 네트워크 응답을 워커에서 받아 변환합니다. (오류 판정은 _fetch와 같음)
+     * 워커를 쓸 수 없으면 load()로 메인 스레드에서 읽습니다.
+     */
+    async function _fetchNetwork(url, init = {}, load = () => _fetch(url, init)) {
+        const reply = await _callWorker({
+            type: 'fetch', url,
+            init: { headers: { 'Content-Type': 'application/json' }, ...init },
+        });
+        if (!reply) return NetworkPrep.prepare(await load());
+        if (reply.ok) {
+            _sizes.set(reply.result, reply.bytes);
+            return reply.result;
+        }
+        if (reply.status === 0 || (!reply.contentType.includes('application/json')
+                && [404, 405, 501].includes(reply.status))) {
+            throw new BackendUnavailable(reply.detail);
+        }
+        if (reply.status === 503) throw new ServerBusy(reply.detail, reply.retryAfter);
+        throw new Error(reply.detail);
+    }
+
+    /** 이미 받은 네트워크 응답(잡 결과 등)을 워커에서 변환합니다. */
+    async function _prepareNetwork(payload) {
+        const reply = await _callWorker({ type: 'prepare', payload });
+        return reply && reply.ok ? reply.result : NetworkPrep.prepare(payload);
+    }
+
+    // ── 응답 캐시 (IndexedDB) ──
+
+    /**
+     * 저장소 두 개: values(키 → 응답), meta(키, 크기, 마지막 사용 시각).
+     * 용량 계산·퇴출은 작은 meta만 읽고, 큰 응답은 적중했을 때만 읽습니다.
+     * IndexedDB를 쓸 수 없는 환경(사생활 보호 모드 등)에서는 캐시 없이 동작합니다.
+     */
+    const ResponseCache = (() => {
+        let _db = null;                 // Promise<IDBDatabase | null>
+        const _entrySizes = new Map();  // 키 → 크기 (열 때 meta를 한 번 읽어 채움)
+        let _total = 0;
+
+        function _done(tx) {
+            return new Promise((resolve, reject) => {
+                tx.oncomplete = () => resolve();
+                tx.onerror = tx.onabort = () => reject(tx.error);
+            });
+        }
+
+        function _open() {
+            if (!_db) {
+                _db = new Promise(resolve => {
+                    if (typeof indexedDB === 'undefined') return resolve(null);
+                    let req;
+                    try {
+                        req = indexedDB.open(CACHE_DB_NAME, 1);
+                    } catch (err) {
+                        return resolve(null);
+                    }
+                    req.onupgradeneeded = () => {
+                        req.result.createObjectStore('values');
+                        req.result.createObjectStore('meta', { keyPath: 'key' }).createIndex('at', 'at');
+                    };
+                    req.onsuccess = () => {
+                        const db = req.result;
+                        const all = db.transaction('meta').objectStore('meta').getAll();
+                        all.onsuccess = () => {
+                            all.result.forEach(m => { _entrySizes.set(m.key, m.bytes); _total += m.bytes; });
+                            resolve(db);
+                        };
+                        all.onerror = () => resolve(null);
+                    };
+                    req.onerror = () => resolve(null);
+                });
+            }
+            return _db;
+        }
+
+        async function get(key) {
+            const db = await _open();
+            if (!db || !_entrySizes.has(key)) return undefined;
+            return new Promise(resolve => {
+                const tx = db.transaction(['values', 'meta'], 'readwrite');
+                const req = tx.objectStore('values').get(key);
+                req.onsuccess = () => {
+                    // 마지막 사용 시각 갱신 (LRU)
+                    if (req.result !== undefined) {
+                        tx.objectStore('meta').put({ key, bytes: _entrySizes.get(key), at: Date.now() });
+                    }
+                    resolve(req.result);
+                };
+                req.onerror = () => resolve(undefined);
+            });
+        }
+
+        async function put(key, value, bytes) {
+            const db = await _open();
+            if (!db || bytes > CACHE_MAX_BYTES) return;
+            try {
+                const tx = db.transaction(['values', 'meta'], 'readwrite');
+                tx.objectStore('values').put(value, key);
+                tx.objectStore('meta').put({ key, bytes, at: Date.now() });
+                await _done(tx);
+            } catch (err) {
+                return;  // 용량 초과(QuotaExceeded) 등 — 캐시는 보조 수단이므로 무시
+            }
+            _total += bytes - (_entrySizes.get(key) || 0);
+            _entrySizes.set(key, bytes);
+            if (_total > CACHE_MAX_BYTES) await _evict();
+        }
+
+        /** 오래 쓰지 않은 항목부터 상한의 80%까지 지웁니다. */
+        async function _evict() {
+            const db = await _open();
+            const tx = db.transaction(['values', 'meta'], 'readwrite');
+            const cursorReq = tx.objectStore('meta').index('at').openCursor();
+            cursorReq.onsuccess = () => {
+                const cursor = cursorReq.result;
+                if (!cursor || _total <= CACHE_MAX_BYTES * 0.8) return;
+                const { key, bytes } = cursor.value;
+                tx.objectStore('values').delete(key);
+                cursor.delete();
+                _entrySizes.delete(key);
+                _total -= bytes;
+                cursor.continue();
+            };
+            await _done(tx).catch(() => {});
+        }
+
+        /** 키 접두사(데이터 버전)가 다른 항목을 모두 지웁니다. */
+        async function retainPrefix(prefix) {
+            const db = await _open();
+            const stale = db ? [..._entrySizes.keys()].filter(k => !k.startsWith(prefix)) : [];
+            if (!stale.length) return;
+            const tx = db.transaction(['values', 'meta'], 'readwrite');
+            stale.forEach(key => {
+                tx.objectStore('values').delete(key);
+                tx.objectStore('meta').delete(key);
+                _total -= _entrySizes.get(key);
+                _entrySizes.delete(key);
+            });
+            await _done(tx).catch(() => {});
+        }
+
+        return { get, put, retainPrefix };
+    })();
+
+    let _version = null;                // { value, at } — 마지막으로 확인한 서버 데이터 버전
+    let _versionRequest = null;         // 동시에 들어온 확인 요청은 하나로 합침
+
+    /**
+     * 캐시 키에 쓰는 데이터 버전. 모르면 null (→ 캐시를 쓰지 않음).
+     * 버전이 바뀌면 이전 버전 항목을 정리합니다.
+     */
+    async function _dataVersion() {
+        if (_offline) {
+            const { manifest } = await _loadBundle();
+            return `bundle:${manifest.version}`;
+        }
+        if (_version && performance.now() - _version.at < DATA_VERSION_TTL_MS) return _version.value;
+        if (!_versionRequest) {
+            _versionRequest = _fetch(`${BASE}/api/data-version`)
+                .then(({ version }) => {
+                    if (!_version || _version.value !== version) ResponseCache.retainPrefix(`${version}|`);
+                    _version = { value: version, at: performance.now() };
+                    return version;
+                })
+                .catch(() => null)
+                .finally(() => { _versionRequest = null; });
+        }
+        return _versionRequest;
+    }
+
+    /**
+     * 캐시를 먼저 보고, 없으면 load()로 계산해 저장합니다.
+     * 키는 필터 배열 순서·중복과 무관하게 정규화합니다. (번들 키와 같은 규칙 + 나머지 파라미터)
+     */
+    async function _cached(kind, params, load) {
+        const version = await _dataVersion();
+        if (!version) return load();
+        const extra = Object.keys(params)
+            .filter(k => !['years', 'orgs1', 'orgs2', 'jobs', 'grades'].includes(k))
+            .sort()
+            .map(k => [k, params[k]]);
+        const key = `${version}|${_bundleKey(kind, params, extra)}`;
+
+        const hit = await ResponseCache.get(key);
+        if (hit !== undefined) return hit;
+        const result = await load();
+        ResponseCache.put(key, result, _sizes.get(result) || JSON.stringify(result).length);
+        return result;
+    }
+
+    // ── 정적 번들 ──
+
+    /**
+     * 번들 항목 키 — precompute.py의 bundle_key와 같은 문자열 (바꿀 때는 함께 수정)
+     * JSON [종류, 연도(오름차순), ORG1, ORG2, 직군, 직급(각 문자열 오름차순), 추가 파라미터]
+     */
+    function _bundleKey(kind, filters, extra = []) {
+        const strs = (values) => [...new Set((values || []).map(String))].sort();
+        const years = [...new Set((filters.years || []).map(Number))].sort((a, b) => a - b);
+        return JSON.stringify([kind, years, strs(filters.orgs1), strs(filters.orgs2),
+            strs(filters.jobs), strs(filters.grades), extra]);
+    }
+
+    async function _readBundleFile(path) {
+        const res = await fetch(path);
+        if (!res.ok) throw new Error(`번들 파일을 읽을 수 없습니다: ${path} (HTTP ${res.status})`);
+        const bytes = new Uint8Array(await res.arrayBuffer());
+        // ★ 파일 서버는 .gz를 Content-Encoding 없이 그대로 주므로 직접 압축 해제 (이미 풀렸으면 그대로)
+        if (bytes[0] === 0x1f && bytes[1] === 0x8b) {
+            const stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream('gzip'));
+            return JSON.parse(await new Response(stream).text());
+        }
+        return JSON.parse(new TextDecoder().decode(bytes));
+    }
+
+    function _loadBundle() {
+        if (!_bundle) {
+            _bundle = (async () => {
+                const res = await fetch(`${BUNDLE_BASE}CURRENT`, { cache: 'no-cache' });
+                if (!res.ok) throw new Error('백엔드에 연결할 수 없고 사전 계산 번들도 없습니다.');
+                const base = `${BUNDLE_BASE}${(await res.text()).trim()}/`;
+                return { base, manifest: await _readBundleFile(`${base}manifest.json`) };
+            })();
+            _bundle.catch(() => { _bundle = null; });  // 실패하면 다음 호출에서 다시 시도
+        }
+        return _bundle;
+    }
+
+    async function _fromBundle(kind, filters, extra = []) {
+        const { base, manifest } = await _loadBundle();
+        const path = manifest.entries[_bundleKey(kind, filters, extra)];
+        if (!path) {
+            throw new Error('사전 계산 번들에 없는 필터 조합입니다. (번들은 연도별 전체 / ORG1 하나 단위로 제공)');
+        }
+        if (!_bundleFiles.has(path)) {
+            const url = `${base}${path}`;
+            _bundleFiles.set(path, kind === 'network'
+                ? _fetchNetwork(url, {}, () => _readBundleFile(url))
+                : _readBundleFile(url));
+        }
+        const data = await _bundleFiles.get(path);
+        if (data && data.error) throw new Error(data.error.detail);
+        return data;
+    }
+
+    /**
+     * 개인 지표 조회를 번들의 전체 테이블 + 지표별 순위로 처리합니다. (지표 내림차순 offset 페이지만)
+     */
+    async function _queryFromBundle(query) {
+        const table = await _fromBundle('individual_table', query);
+        const sort = query.sort || 'selection_burden';
+        const ranking = (query.order || 'desc') === 'desc' ? table.order[sort] : null;
+        const hasBounds = Object.keys(query.min_values || {}).length || Object.keys(query.max_values || {}).length;
+        if (!ranking || query.cursor || hasBounds) {
+            throw new Error('사전 계산 번들은 지표별 내림차순 페이지 조회만 지원합니다.');
+        }
+        const offset = query.offset || 0;
+        const limit = query.limit || 50;
+        return {
+            total: table.rows.length,
+            matched: table.rows.length,
+            sort, order: 'desc', offset, limit,
+            rows: ranking.slice(offset, offset + limit).map(i => table.rows[i]),
+            next_cursor: null,
+        };
+    }
+
+    function _runFromBundle(kind, filters) {
+        if (filters.weighted) throw new Error('사전 계산 번들은 건수 가중 지표를 제공하지 않습니다.');
+        if (kind === 'individual_query') return _queryFromBundle(filters);
+        if (kind === 'subgroup') return _fromBundle('subgroup', filters, [filters.group_col || 'ORG1_OP']);
+        return _fromBundle(kind, filters);
+    }
+
+    /**
+     * 백엔드를 먼저 시도하고, 백엔드가 없으면 번들 모드로 전환합니다.
+     */
+    async function _withFallback(online, offline) {
+        if (_offline) return offline();
+        try {
+            return await online();
+        } catch (err) {
+            if (!(err instanceof BackendUnavailable)) throw err;
+            await _loadBundle();
+            _offline = true;
+            console.info('[API] 백엔드가 없어 사전 계산 번들을 사용합니다.');
+            return offline();
+        }
+    }
+
+    /**
+     * 분석을 실행합니다. 예산 이내면 직접 호출, 예산 초과 이력이 있으면 잡으로 실행합니다.
+     * 백엔드가 없으면 사전 계산 번들에서 읽습니다.
+     */
+    function run(kind, filters, onProgress) {
+        return _cached(kind, filters, () => _withFallback(
+            () => _runOnline(kind, filters, onProgress),
+            () => _runFromBundle(kind, filters),
+        ));
+    }
+
+    async function _runOnline(kind, filters, onProgress) {
+        for (let attempt = 0; ; attempt++) {
+            try {
+                return await _runOnce(kind, filters, onProgress);
+            } catch (err) {
+                if (!(err instanceof ServerBusy) || attempt >= BUSY_RETRY_MAX) throw err;
+                // 여러 브라우저가 같은 순간에 다시 몰리지 않도록 최대 50% 무작위 지연 추가
+                const waitMs = err.retryAfter * 1000 * (1 + Math.random() * 0.5);
+                console.info(`[API] 서버 혼잡 (${kind}) — ${Math.round(waitMs / 1000)}초 후 다시 요청합니다.`);
+                await _sleep(waitMs);
+            }
+        }
+    }
+
+    async function _runOnce(kind, filters, onProgress) {
+        if ((_latency[kind] || 0) > LATENCY_BUDGET_MS) {
+            const result = await _runAsJob(kind, filters, onProgress);
+            return kind === 'network' ? _prepareNetwork(result) : result;
+        }
+        const started = performance.now();
+        const url = `${BASE}${ENDPOINTS[kind]}`;
+        const init = { method: 'POST', body: JSON.stringify(filters) };
+        const result = await (kind === 'network' ? _fetchNetwork(url, init) : _fetch(url, init));
+        _latency[kind] = performance.now() - started;
+        return result;
+    }
+
+    /**
+     * 개인 지표 전체 테이블을 파일로 내려받습니다. (format: 'csv' | 'parquet')
+     */
+    async function exportIndividual(filters, format, includeFeedback) {
+        if (_offline) throw new Error('사전 계산 번들 모드에서는 내려받기를 지원하지 않습니다.');
+        const url = `${BASE}/api/metrics/individual/export?format=${format}&feedback=${includeFeedback}`;
         const res = await fetch(url, {
+            method: 'POST',
             headers: { 'Content-Type': 'application/json' },
-            ...options,
+            body: JSON.stringify(filters),
         });
         if (!res.ok) {
             const detail = await res.json().catch(() => ({}));
             throw new Error(detail.detail || `HTTP ${res.status}`);
         }
-        return res.json();
+        const match = /filename="([^"]+)"/.exec(res.headers.get('Content-Disposition') || '');
+        const link = document.createElement('a');
+        link.href = URL.createObjectURL(await res.blob());
+        link.download = match ? match[1] : `individual_metrics.${format}`;
+        link.click();
+        URL.revokeObjectURL(link.href);
     }
 
     return {
-        getFilterOptions: (years, orgs1 = []) =>
-            _fetch(`${BASE}/api/filter-options?years=${years.join(',')}&orgs1=${orgs1.join(',')}`),
+        run,
+
+        exportIndividual,
+
+        getFilterOptions: (years, orgs1 = []) => _cached('filter_options', { years, orgs1 }, () => _withFallback(
+            () => _fetch(`${BASE}/api/filter-options?years=${years.join(',')}&orgs1=${orgs1.join(',')}`),
+            () => _fromBundle('filter_options', { years, orgs1 }),
+        )),
+
+        // 연도 조합의 조직 계층 트리 (필터 캐스케이드는 filters.js가 이 트리로 계산)
+        getOrgTree: (years) => _cached('org_tree', { years }, () => _withFallback(
+            () => _fetch(`${BASE}/api/org-tree?years=${years.join(',')}`),
+            () => _fromBundle('org_tree', { years }),
+        )),
+
+        // 인원 검색 자동완성 (사번 접두 / 이름) — 사전 계산 번들 모드에서는 결과 없음
+        searchPeople: (q, years = [], limit = 10) => _withFallback(
+            () => _fetch(`${BASE}/api/search?q=${encodeURIComponent(q)}&years=${years.join(',')}&limit=${limit}`),
+            () => ({ query: q, results: [], truncated: false }),
+        ),
+
+        isOffline: () => _offline,
+
+        getNetwork: (filters, onProgress) => run('network', filters, onProgress),
+
+        getOrgMetrics: (filters, onProgress) => run('organization', filters, onProgress),
+
+        getIndividualMetrics: (filters, onProgress) => run('individual', filters, onProgress),
 
-        getNetwork: (filters) =>
-            _fetch(`${BASE}/api/network`, { method: 'POST', body: JSON.stringify(filters) }),
+        // query: { sort, order, offset, limit, cursor, min_values, max_values }
+        queryIndividualMetrics: (filters, query, onProgress) =>
+            run('individual_query', { ...filters, ...query }, onProgress),
 
-        getOrgMetrics: (filters) =>
-            _fetch(`${BASE}/api/metrics/organization`, { method: 'POST', body: JSON.stringify(filters) }),
+        getSubgroupMetrics: (filters, onProgress) => run('subgroup', filters, onProgress),
 
-        getIndividualMetrics: (filters) =>
-            _fetch(`${BASE}/api/metrics/individual`, { method: 'POST', body: JSON.stringify(filters) }),
+        getFeedbackMetrics: (filters, onProgress) => run('feedback', filters, onProgress),
 
-        getSubgroupMetrics: (filters) =>
-            _fetch(`${BASE}/api/metrics/subgroup`, { method: 'POST', body: JSON.stringify(filters) }),
+        // 필터 대상의 연도별 지표 추세 + 전사 벤치마크 (filters.years 생략 시 데이터가 있는 전체 연도)
+        getTrend: (filters) => _cached('trend', filters, () => _withFallback(
+            () => _fetch(`${BASE}/api/metrics/trend`, { method: 'POST', body: JSON.stringify(filters) }),
+            () => { throw new Error('사전 계산 번들 모드에서는 연도별 추세를 제공하지 않습니다.'); },
+        )),
 
-        getFeedbackMetrics: (filters) =>
-            _fetch(`${BASE}/api/metrics/feedback`, { method: 'POST', body: JSON.stringify(filters) }),
+        cancelJob: (jobId) =>
+            _fetch(`${BASE}/api/jobs/${jobId}`, { method: 'DELETE' }),
     };
 })();
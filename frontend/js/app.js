@@ -4,7 +4,10 @@
 document.addEventListener('DOMContentLoaded', () => {
 
     // ── 상태 관리 ──
+    const INDIVIDUAL_PAGE_SIZE = 50;
+    const SEARCH_DEBOUNCE_MS = 150;
     let currentFilters = null;
+    let individualMetricKey = 'selection_burden';
     let cachedData = {
         network: null,
         orgMetrics: null,
@@ -17,6 +20,7 @@ document.addEventListener('DOMContentLoaded', () => {
     const btnReset = document.getElementById('btn-reset');
     const placeholder = document.getElementById('placeholder');
     const loading = document.getElementById('loading');
+    const loadingText = document.getElementById('loading-text');
     const results = document.getElementById('results');
     const disclaimer = document.getElementById('disclaimer');
     const sidebarSummary = document.getElementById('sidebar-summary');
@@ -62,13 +66,29 @@ document.addEventListener('DOMContentLoaded', () => {
             btn.addEventListener('click', (e) => {
                 document.querySelectorAll('.metric-tab-btn').forEach(b => b.classList.remove('active'));
                 e.target.classList.add('active');
-                const metricKey = e.target.dataset.metric;
-                if (cachedData.individualMetrics) {
-                    MetricsDisplay.renderIndividualTable(metricKey, cachedData.individualMetrics[metricKey]);
+                individualMetricKey = e.target.dataset.metric;
+                if (currentFilters) loadIndividualPage(0);
+            });
+        });
+
+        // 개인 지표 전체 내려받기
+        ['csv', 'parquet'].forEach(format => {
+            document.getElementById(`btn-export-${format}`).addEventListener('click', async (e) => {
+                if (!currentFilters) return;
+                const btn = e.currentTarget;
+                btn.disabled = true;
+                try {
+                    await API.exportIndividual(currentFilters, format, document.getElementById('export-feedback').checked);
+                } catch (err) {
+                    alert(`내려받기 실패: ${err.message}`);
+                } finally {
+                    btn.disabled = false;
                 }
             });
         });
 
+        bindPersonSearch();
+
         // 사이드바 토글 (모바일)
         document.getElementById('sidebar-toggle').addEventListener('click', () => {
             document.getElementById('sidebar').classList.toggle('open');
@@ -89,8 +109,8 @@ document.addEventListener('DOMContentLoaded', () => {
 
         try {
             const [networkData, orgMetrics] = await Promise.all([
-                API.getNetwork(currentFilters),
-                API.getOrgMetrics(currentFilters),
+                API.getNetwork(currentFilters, showJobProgress),
+                API.getOrgMetrics(currentFilters, showJobProgress),
             ]);
 
             cachedData.network = networkData;
@@ -104,6 +124,7 @@ document.addEventListener('DOMContentLoaded', () => {
 
             // 조직 KPI 렌더링
             MetricsDisplay.renderOrgKPIs(orgMetrics);
+            loadTrend();
 
             // 하위 조직 비교
             await loadSubgroupMetrics();
@@ -135,7 +156,8 @@ document.addEventListener('DOMContentLoaded', () => {
 
         // Lazy Loading
         if (tabId === 'tab-individual' && !cachedData.individualMetrics) {
-            loadIndividualMetrics();
+            cachedData.individualMetrics = {};
+            loadIndividualPage(0);
         }
         if (tabId === 'tab-feedback' && !cachedData.feedbackMetrics) {
             loadFeedbackMetrics();
@@ -146,13 +168,26 @@ document.addEventListener('DOMContentLoaded', () => {
     }
 
     // ── 데이터 로딩 ──
+
+    /**
+     * 조직/직군/직급 필터가 있으면 KPI 스파크라인을 전사 추세 대신 필터 대상의 연도별 추세로 바꿉니다.
+     * (분석 결과 표시를 기다리게 하지 않도록 백그라운드로 요청)
+     */
+    function loadTrend() {
+        const { years, ...scope } = currentFilters;
+        if (!(scope.orgs1.length || scope.orgs2.length || scope.jobs.length || scope.grades.length)) return;
+        const requested = currentFilters;
+        API.getTrend({ ...scope, subgroups: false })
+            .then(trend => { if (currentFilters === requested) MetricsDisplay.renderTrend(trend); })
+            .catch(err => console.warn('연도별 추세 로드 실패:', err.message));
+    }
     async function loadSubgroupMetrics() {
         const groupCol = document.querySelector('input[name="subgroup-level"]:checked').value;
         try {
             const data = await API.getSubgroupMetrics({
                 ...currentFilters,
                 group_col: groupCol,
-            });
+            }, showJobProgress);
             MetricsDisplay.renderSubgroupTable(data);
         } catch (err) {
             console.warn('하위 조직 지표 로드 실패:', err.message);
@@ -160,12 +195,27 @@ document.addEventListener('DOMContentLoaded', () => {
         }
     }
 
-    async function loadIndividualMetrics() {
+    /**
+     * 개인 지표 한 페이지 로드 (지표 기준 내림차순)
+     * ★ 서버가 필터별 테이블을 캐시하므로 탭/페이지 이동은 재계산 없이 조회만 합니다.
+     *   이미 받은 페이지는 cachedData.individualMetrics에 보관해 다시 요청하지 않습니다.
+     */
+    async function loadIndividualPage(offset) {
+        const metricKey = individualMetricKey;
+        const cacheKey = `${metricKey}:${offset}`;
+        const render = (page) => MetricsDisplay.renderIndividualTable(metricKey, page, loadIndividualPage);
+        if (cachedData.individualMetrics && cachedData.individualMetrics[cacheKey]) {
+            render(cachedData.individualMetrics[cacheKey]);
+            return;
+        }
         try {
             showLoading(true);
-            const data = await API.getIndividualMetrics(currentFilters);
-            cachedData.individualMetrics = data;
-            MetricsDisplay.renderIndividualTable('selection_burden', data.selection_burden);
+            const page = await API.queryIndividualMetrics(currentFilters, {
+                sort: metricKey, order: 'desc', offset, limit: INDIVIDUAL_PAGE_SIZE,
+            }, showJobProgress);
+            if (cachedData.individualMetrics) cachedData.individualMetrics[cacheKey] = page;
+            // 응답 대기 중 다른 지표 탭을 눌렀으면 렌더링하지 않음
+            if (metricKey === individualMetricKey) render(page);
         } catch (err) {
             console.warn('개인 지표 로드 실패:', err.message);
         } finally {
@@ -176,7 +226,7 @@ document.addEventListener('DOMContentLoaded', () => {
     async function loadFeedbackMetrics() {
         try {
             showLoading(true);
-            const data = await API.getFeedbackMetrics(currentFilters);
+            const data = await API.getFeedbackMetrics(currentFilters, showJobProgress);
             cachedData.feedbackMetrics = data;
             MetricsDisplay.renderFeedbackMetrics(data);
         } catch (err) {
@@ -186,9 +236,120 @@ document.addEventListener('DOMContentLoaded', () => {
         }
     }
 
+    // ── 인원 검색 (자동완성) ──
+
+    /**
+     * 헤더 검색창: 입력이 멈추면 /api/search로 후보를 받아 목록을 보여주고,
+     * 고르면 네트워크 탭에서 해당 노드로 이동합니다.
+     * ★ 분석을 실행했으면 분석 연도, 아니면 사이드바에서 선택한 연도의 인원만 찾습니다.
+     */
+    function bindPersonSearch() {
+        const input = document.getElementById('person-search-input');
+        const list = document.getElementById('person-search-results');
+        let timer = null;
+        let requestSeq = 0;
+        let items = [];
+        let active = -1;
+
+        const close = () => { list.hidden = true; active = -1; };
+        const choose = (person) => {
+            close();
+            input.value = person.성명;
+            focusPerson(person);
+        };
+
+        input.addEventListener('input', () => {
+            clearTimeout(timer);
+            const q = input.value.trim();
+            if (!q) { close(); return; }
+            timer = setTimeout(async () => {
+                const seq = ++requestSeq;
+                const years = (currentFilters || Filters.getCurrentFilters()).years || [];
+                try {
+                    const data = await API.searchPeople(q, years);
+                    if (seq !== requestSeq) return;   // 늦게 도착한 이전 입력의 응답은 버림
+                    items = data.results;
+                    active = -1;
+                    renderSearchResults(list, data);
+                } catch (err) {
+                    console.warn('인원 검색 실패:', err.message);
+                }
+            }, SEARCH_DEBOUNCE_MS);
+        });
+
+        input.addEventListener('keydown', (e) => {
+            if (list.hidden || !items.length) return;
+            if (e.key === 'ArrowDown' || e.key === 'ArrowUp') {
+                e.preventDefault();
+                active = (active + (e.key === 'ArrowDown' ? 1 : items.length - 1)) % items.length;
+                list.querySelectorAll('.person-search-item').forEach((el, i) => el.classList.toggle('active', i === active));
+            } else if (e.key === 'Enter') {
+                choose(items[Math.max(active, 0)]);
+            } else if (e.key === 'Escape') {
+                close();
+            }
+        });
+
+        // blur보다 먼저 처리되도록 mousedown 사용
+        list.addEventListener('mousedown', (e) => {
+            const el = e.target.closest('.person-search-item');
+            if (!el) return;
+            e.preventDefault();
+            choose(items[Number(el.dataset.index)]);
+        });
+        input.addEventListener('blur', close);
+    }
+
+    function renderSearchResults(list, data) {
+        list.replaceChildren();
+        if (!data.results.length) {
+            list.appendChild(Object.assign(document.createElement('li'), {
+                className: 'person-search-more', textContent: '검색 결과가 없습니다.',
+            }));
+        }
+        data.results.forEach((person, i) => {
+            const li = document.createElement('li');
+            li.className = 'person-search-item';
+            li.dataset.index = i;
+            const org = [person.ORG1_OP, person.ORG2_OP, person.ORG3_OP].filter(Boolean).pop() || '-';
+            li.innerHTML = '<span class="person-search-name"></span> <span class="person-search-id"></span>'
+                + '<div class="person-search-meta"></div>';
+            li.querySelector('.person-search-name').textContent = person.성명;
+            li.querySelector('.person-search-id').textContent = person.사번;
+            li.querySelector('.person-search-meta').textContent = `${org} · ${person.years.join(', ')}년`;
+            list.appendChild(li);
+        });
+        if (data.truncated) {
+            list.appendChild(Object.assign(document.createElement('li'), {
+                className: 'person-search-more', textContent: '결과가 더 있습니다. 검색어를 더 입력해주세요.',
+            }));
+        }
+        list.hidden = false;
+    }
+
+    function focusPerson(person) {
+        if (!cachedData.network) {
+            alert(`${person.성명}(${person.사번}) — 분석을 실행하면 네트워크 그래프에서 위치를 확인할 수 있습니다.`);
+            return;
+        }
+        if (!document.getElementById('tab-network').classList.contains('active')) switchTab('tab-network');
+        if (!NetworkGraph.focusNode(person.사번)) {
+            alert(`${person.성명}(${person.사번})님은 현재 분석 범위의 네트워크에 없습니다.`);
+        }
+    }
+
     // ── 유틸 ──
     function showLoading(show) {
         loading.style.display = show ? 'flex' : 'none';
         btnAnalyze.disabled = show;
+        if (!show) loadingText.textContent = '분석 중입니다...';
+    }
+
+    // 백그라운드 잡 진행률 표시 (지연 예산 초과 시 API가 잡 모드로 전환)
+    function showJobProgress(job) {
+        const total = job.stages.length;
+        const done = job.stages.filter(s => s.status === 'done').length;
+        const stage = job.current_stage ? ` · ${job.current_stage}` : '';
+        loadingText.textContent = `분석 중입니다... (${done}/${total} 단계${stage})`;
     }
 });
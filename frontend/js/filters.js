@@ -3,8 +3,9 @@
  *
  * ★ 주요 기능:
  *   1. 선택된 필터를 하이라이트 (active 클래스)
- *   2. ORG1 선택 시 ORG2/직군/직급 캐스케이드 갱신
+ *   2. ORG1 선택 시 ORG2/직군/직급 캐스케이드 갱신 (연도 조합별 조직 트리로 브라우저에서 계산, 서버 왕복 없음)
  *   3. 필터 리셋 버튼 지원
+ *   4. 반복 평가 건수 가중 옵션 (체크 시에만 weighted: true — 기본 요청·캐시 키는 그대로)
  */
 const Filters = (() => {
 
@@ -13,7 +14,8 @@ const Filters = (() => {
     let _selectedOrgs2 = [];
     let _selectedJobs = [];
     let _selectedGrades = [];
-    let _allOptions = null;
+    let _orgTree = null;    // 선택 연도의 조직 트리 (/api/org-tree)
+    let _loadSeq = 0;       // 연도를 빠르게 바꿀 때 늦게 도착한 이전 응답 무시
 
     /**
      * 초기화: 연도 칩 생성 및 필터 옵션 로드
@@ -26,6 +28,7 @@ const Filters = (() => {
             chip.addEventListener('click', () => {
                 chip.classList.toggle('active');
                 _syncSelectedYears();
+                _loadFilterOptions();
             });
             yearContainer.appendChild(chip);
         });
@@ -38,62 +41,101 @@ const Filters = (() => {
     }
 
     /**
-     * 필터 옵션을 API에서 로드합니다.
-     * ★ ORG1 선택 시 캐스케이드: ORG1에 속한 하위 옵션만 표시
+     * 선택 연도의 조직 트리를 API에서 로드합니다. (연도 조합이 바뀔 때만)
      */
     async function _loadFilterOptions() {
         try {
             const years = _selectedYears.length ? _selectedYears : [2025];
-            _allOptions = await API.getFilterOptions(years, _selectedOrgs1);
-
-            _renderFilterChips('org1-chips', _allOptions.orgs1, _selectedOrgs1, (selected) => {
-                _selectedOrgs1 = selected;
-                // 캐스케이드: ORG1 변경 시 하위 필터 갱신
-                _selectedOrgs2 = [];
-                _selectedJobs = [];
-                _selectedGrades = [];
-                _loadFilterOptions();
-                // 히트 표시
-                const hint = document.getElementById('cascade-hint');
-                if (_selectedOrgs1.length > 0) {
-                    hint.textContent = `← ${_selectedOrgs1.join(', ')} 기준`;
-                } else {
-                    hint.textContent = '';
-                }
-            });
+            const seq = ++_loadSeq;
+            const tree = await API.getOrgTree(years);
+            if (seq !== _loadSeq) return;
+            _orgTree = tree;
+            _renderOptions();
+        } catch (err) {
+            console.warn('필터 옵션 로드 실패:', err.message);
+        }
+    }
 
-            _renderFilterChips('org2-chips', _allOptions.orgs2, _selectedOrgs2, (selected) => {
-                _selectedOrgs2 = selected;
-            });
+    /**
+     * 조직 트리에서 선택지와 인원 수를 계산합니다.
+     * ★ ORG1 선택 시 캐스케이드: ORG1에 속한 하위 옵션만 (ORG1 자체는 항상 전체)
+     *
+     * @returns {{orgs1: Map, orgs2: Map, jobs: Map, grades: Map}} 값 → 인원 수
+     */
+    function _cascadeOptions(tree, orgs1) {
+        const selected = orgs1.length ? tree.orgs1.filter(o => orgs1.includes(o.name)) : tree.orgs1;
+        const scope = orgs1.length ? selected : [tree];
+        const add = (map, name, n) => map.set(name, (map.get(name) || 0) + n);
+
+        const orgs2 = new Map();
+        selected.forEach(o => (o.children || []).forEach(c => add(orgs2, c.name, c.count)));
+        const byDim = (field) => {
+            const map = new Map();
+            scope.forEach(node => node[field].forEach(([i, n]) => add(map, tree.dims[field][i], n)));
+            return map;
+        };
+        return {
+            orgs1: new Map(tree.orgs1.map(o => [o.name, o.count])),
+            orgs2,
+            jobs: byDim('jobs'),
+            grades: byDim('grades'),
+        };
+    }
 
-            _renderFilterChips('job-chips', _allOptions.jobs, _selectedJobs, (selected) => {
-                _selectedJobs = selected;
-            });
+    function _renderOptions() {
+        const options = _cascadeOptions(_orgTree, _selectedOrgs1);
+        // 연도가 바뀌어 없어진 값은 선택에서 제외
+        const keep = (selected, map) => selected.filter(v => map.has(v));
+        _selectedOrgs1 = keep(_selectedOrgs1, options.orgs1);
+        _selectedOrgs2 = keep(_selectedOrgs2, options.orgs2);
+        _selectedJobs = keep(_selectedJobs, options.jobs);
+        _selectedGrades = keep(_selectedGrades, options.grades);
+
+        _renderFilterChips('org1-chips', options.orgs1, _selectedOrgs1, (selected) => {
+            _selectedOrgs1 = selected;
+            // 캐스케이드: ORG1 변경 시 하위 필터 갱신
+            _selectedOrgs2 = [];
+            _selectedJobs = [];
+            _selectedGrades = [];
+            _renderOptions();
+            // 히트 표시
+            const hint = document.getElementById('cascade-hint');
+            if (_selectedOrgs1.length > 0) {
+                hint.textContent = `← ${_selectedOrgs1.join(', ')} 기준`;
+            } else {
+                hint.textContent = '';
+            }
+        });
 
-            _renderFilterChips('grade-chips', _allOptions.grades, _selectedGrades, (selected) => {
-                _selectedGrades = selected;
-            });
+        _renderFilterChips('org2-chips', options.orgs2, _selectedOrgs2, (selected) => {
+            _selectedOrgs2 = selected;
+        });
 
-        } catch (err) {
-            console.warn('필터 옵션 로드 실패:', err.message);
-        }
+        _renderFilterChips('job-chips', options.jobs, _selectedJobs, (selected) => {
+            _selectedJobs = selected;
+        });
+
+        _renderFilterChips('grade-chips', options.grades, _selectedGrades, (selected) => {
+            _selectedGrades = selected;
+        });
     }
 
     /**
      * 칩 UI를 렌더링합니다. 선택된 것은 하이라이트 표시.
      */
-    function _renderFilterChips(containerId, options, selectedArr, onChange) {
+    function _renderFilterChips(containerId, counts, selectedArr, onChange) {
         const container = document.getElementById(containerId);
         container.innerHTML = '';
 
-        if (!options || options.length === 0) {
+        if (!counts || counts.size === 0) {
             container.innerHTML = '<span class="no-options">옵션 없음</span>';
             return;
         }
 
-        options.forEach(opt => {
+        [...counts.keys()].sort().forEach(opt => {
             const isSelected = selectedArr.includes(opt);
             const chip = _createChip(opt, isSelected);
+            chip.title = `${counts.get(opt).toLocaleString()}명`;
             chip.addEventListener('click', () => {
                 chip.classList.toggle('active');
                 // 선택 동기화
@@ -135,20 +177,26 @@ const Filters = (() => {
         _selectedJobs = [];
         _selectedGrades = [];
         document.getElementById('cascade-hint').textContent = '';
-        _loadFilterOptions();
+        const weighted = document.getElementById('weighted-metrics');
+        if (weighted) weighted.checked = false;
+        if (_orgTree) _renderOptions();
+        else _loadFilterOptions();
     }
 
     /**
      * 현재 선택된 필터를 객체로 반환합니다.
      */
     function getCurrentFilters() {
-        return {
+        const filters = {
             years: _selectedYears,
             orgs1: _selectedOrgs1,
             orgs2: _selectedOrgs2,
             jobs: _selectedJobs,
             grades: _selectedGrades,
         };
+        const weighted = document.getElementById('weighted-metrics');
+        if (weighted && weighted.checked) filters.weighted = true;
+        return filters;
     }
 
     return { init, getCurrentFilters, reset };
@@ -189,6 +189,7 @@ const MetricsDisplay = (() => {
                     </div>
                 `;
             } else {
+                card.dataset.metric = key;
                 const value = metrics[key];
                 const display = (meta.format === 'percent') ? (value * 100).toFixed(1) + '%' :
                     (meta.format === 'number') ? value.toFixed(1) : value.toFixed(4);
@@ -228,6 +229,44 @@ const MetricsDisplay = (() => {
         });
     }
 
+    /**
+     * 필터 대상의 연도별 추세(/api/metrics/trend)로 KPI 카드의 스파크라인을 교체합니다.
+     * 필터 추세는 진하게, 같은 연도의 전사 값은 회색 점선으로 겹쳐 그립니다.
+     */
+    function renderTrend(trend) {
+        document.querySelectorAll('#kpi-grid .kpi-card[data-metric]').forEach(card => {
+            const key = card.dataset.metric;
+            const series = trend.series[key];
+            const spark = card.querySelector('.kpi-spark');
+            if (!series || !spark) return;
+            const global = (trend.benchmarks[key] || {}).global || [];
+            spark.innerHTML = _createTrendSparkline(series, global, trend.years);
+        });
+    }
+
+    function _createTrendSparkline(series, global, years, width = 70, height = 24) {
+        const values = [...series, ...global].filter(v => v !== null && v !== undefined);
+        if (series.filter(v => v !== null).length < 2) return '';
+        const minVal = Math.min(...values);
+        const range = (Math.max(...values) - minVal) || 1;
+        const x = (i) => (i / (years.length - 1)) * width;
+        const y = (v) => height - ((v - minVal) / range) * height;
+        const line = (vals) => vals.map((v, i) => (v === null || v === undefined) ? null : `${x(i)},${y(v)}`)
+            .filter(p => p).join(' ');
+
+        const dots = series.map((v, i) => v === null ? '' :
+            `<circle cx="${x(i)}" cy="${y(v)}" r="2.5" fill="#002D80" class="spark-dot">
+                <title>${years[i]}년: ${v.toFixed(4)}${global[i] != null ? ` (전사 ${global[i].toFixed(4)})` : ''}</title>
+            </circle>`).join('');
+        return `
+            <svg width="${width}" height="${height}" viewBox="-2 -2 ${width + 4} ${height + 4}" class="sparkline-svg">
+                <polyline points="${line(global)}" fill="none" stroke="#999" stroke-width="1" stroke-dasharray="2,2" />
+                <polyline points="${line(series)}" fill="none" stroke="#002D80" stroke-width="1.5" stroke-linecap="round" stroke-linejoin="round" />
+                ${dots}
+            </svg>
+        `;
+    }
+
     // ══════════════════════════════════════════════
     //  테이블 렌더링 및 정렬 (기존 로직 유지)
     // ══════════════════════════════════════════════
@@ -305,9 +344,14 @@ const MetricsDisplay = (() => {
         render();
     }
 
-    let _individualCache = { metricKey: null, data: null };
-    function renderIndividualTable(metricKey, data) {
-        _individualCache = { metricKey, data };
+    let _individualCache = { metricKey: null, page: null, onPageChange: null };
+    /**
+     * 개인 지표 한 페이지를 렌더링합니다.
+     * page: /api/metrics/individual/query 응답 (rows, offset, limit, matched)
+     * onPageChange(offset): 이전/다음 버튼 클릭 시 호출
+     */
+    function renderIndividualTable(metricKey, page, onPageChange) {
+        _individualCache = { metricKey, page, onPageChange };
         const descEl = document.getElementById('metric-description');
         const desc = METRIC_DESCRIPTIONS[metricKey];
         if (desc) {
@@ -321,9 +365,9 @@ const MetricsDisplay = (() => {
     }
 
     function _renderIndividualInternal() {
-        const { data } = _individualCache;
+        const { metricKey, page, onPageChange } = _individualCache;
         const container = document.getElementById('individual-table');
-        if (!data || data.length === 0) { container.innerHTML = '<p class="empty-msg">데이터가 없습니다.</p>'; return; }
+        if (!page || page.rows.length === 0) { container.innerHTML = '<p class="empty-msg">데이터가 없습니다.</p>'; return; }
 
         const columns = [
             { key: 'rank', label: '#' },
@@ -334,9 +378,21 @@ const MetricsDisplay = (() => {
             { key: 'GRADE', label: '직급' },
             { key: 'value', label: '값' },
         ];
-        const rankedData = data.map((row, i) => ({ ...row, rank: i + 1 }));
-        container.innerHTML = _buildSortableTable('individual', columns, rankedData);
+        // ★ 순위는 서버 정렬 기준 (페이지 오프셋 포함)
+        const rankedData = page.rows.map((row, i) => ({ ...row, value: row[metricKey], rank: page.offset + i + 1 }));
+        const first = page.offset + 1;
+        const last = page.offset + page.rows.length;
+        container.innerHTML = _buildSortableTable('individual', columns, rankedData) + `
+            <div class="pager">
+                <button class="metric-tab-btn" data-offset="${Math.max(0, page.offset - page.limit)}" ${page.offset === 0 ? 'disabled' : ''}>◀ 이전</button>
+                <span>${first.toLocaleString()}–${last.toLocaleString()} / ${page.matched.toLocaleString()}명</span>
+                <button class="metric-tab-btn" data-offset="${last}" ${last >= page.matched ? 'disabled' : ''}>다음 ▶</button>
+            </div>
+        `;
         _bindSortEvents(container, 'individual', columns, rankedData, _renderIndividualInternal);
+        container.querySelectorAll('.pager button').forEach(btn => {
+            btn.addEventListener('click', () => onPageChange && onPageChange(Number(btn.dataset.offset)));
+        });
     }
 
     function renderFeedbackMetrics(data) {
@@ -380,5 +436,5 @@ const MetricsDisplay = (() => {
         render();
     }
 
-    return { renderOrgKPIs, renderSubgroupTable, renderIndividualTable, renderFeedbackMetrics };
+    return { renderOrgKPIs, renderTrend, renderSubgroupTable, renderIndividualTable, renderFeedbackMetrics };
 })();
@@ -6,6 +6,8 @@
  *   2. BarnesHut 물리 엔진 적용으로 대규모 그래프 레이아웃 최적화
  *   3. 노드 선택 시 연결된 노드/엣지만 하이라이트 (Focus 모드)
  *   4. 가독성 높은 폰트 및 화살표 스타일 적용
+ *   5. 노드/엣지 스타일 변환은 network-prep.js (큰 그래프는 워커에서 미리 변환됨)
+ *   6. 인원 검색에서 고른 노드로 이동 + 하이라이트 (focusNode)
  */
 const NetworkGraph = (() => {
 
@@ -30,59 +32,16 @@ const NetworkGraph = (() => {
             });
             legendHtml += `<span class="legend-item"><span class="legend-dot" style="background:rgba(180,180,180,0.4); border:1.5px dashed #999"></span>외부 연결(Ghost)</span>`;
             legendHtml += '</div>';
-            legendHtml += `<p class="legend-summary">노드 ${data.summary.node_count}명 · 엣지 ${data.summary.edge_count}건 · Ghost ${data.summary.ghost_count || 0}명</p>`;
+            const evaluations = data.summary.evaluation_count ?? data.summary.edge_count;
+            legendHtml += `<p class="legend-summary">노드 ${data.summary.node_count}명 · 엣지 ${data.summary.edge_count}쌍 (평가 ${evaluations}건) · Ghost ${data.summary.ghost_count || 0}명</p>`;
             legendEl.innerHTML = legendHtml;
         }
 
-        // --- 1. Degree(연결수) 계산 ---
-        const degreeMap = {};
-        data.edges.forEach(e => {
-            degreeMap[e.from] = (degreeMap[e.from] || 0) + 1;
-            degreeMap[e.to] = (degreeMap[e.to] || 0) + 1;
-        });
-
-        // --- 2. Vis.js 데이터 세트 준비 ---
-        _allNodes = new vis.DataSet(data.nodes.map(n => {
-            const deg = degreeMap[n.id] || 1;
-            const size = n.isGhost ? 8 : (10 + Math.sqrt(deg) * 3); // Degree 비례 크기
-
-            const node = {
-                id: n.id,
-                label: n.label,
-                title: n.title,
-                size: size,
-                color: n.isGhost ? {
-                    background: 'rgba(230,230,230,0.5)',
-                    border: 'rgba(150,150,150,0.5)',
-                    highlight: { background: '#eee', border: '#999' }
-                } : {
-                    background: n.color,
-                    border: n.color,
-                    highlight: { background: n.color, border: '#333' }
-                },
-                font: {
-                    size: 11,
-                    color: n.isGhost ? '#999' : '#333',
-                    strokeWidth: 2,
-                    strokeColor: '#ffffff'
-                }
-            };
-            if (n.isGhost) {
-                node.borderDashes = [4, 4];
-                node.opacity = 0.6;
-            }
-            return node;
-        }));
-
-        _allEdges = new vis.DataSet(data.edges.map(e => ({
-            from: e.from,
-            to: e.to,
-            dashes: e.dashes || false,
-            width: 1,
-            color: { color: e.dashes ? '#ccc' : '#bbb', opacity: 0.6, highlight: '#002D80' },
-            arrows: { to: { enabled: true, scaleFactor: 0.4 } }, // 화살표 크기 축소
-            smooth: { type: 'curvedCW', roundness: 0.1 } // 곡선 엣지
-        })));
+        // --- 1. Vis.js 데이터 세트 ---
+        // ★ api.js가 워커에서 변환한 응답(prepared)은 그대로 쓰고, 아니면 여기서 변환
+        const prepared = NetworkPrep.prepare(data);
+        _allNodes = new vis.DataSet(prepared.nodes);
+        _allEdges = new vis.DataSet(prepared.edges);
 
         const options = {
             nodes: { shape: 'dot' },
@@ -107,7 +66,7 @@ const NetworkGraph = (() => {
         if (_network) _network.destroy();
         _network = new vis.Network(container, { nodes: _allNodes, edges: _allEdges }, options);
 
-        // --- 3. 인터랙션: 클릭 시 하이라이트 ---
+        // --- 2. 인터랙션: 클릭 시 하이라이트 ---
         _network.on("click", (params) => {
             if (params.nodes.length > 0) {
                 const selectedId = params.nodes[0];
@@ -168,5 +127,19 @@ const NetworkGraph = (() => {
         _allEdges.update(updateEdges);
     }
 
-    return { render };
+    /**
+     * 노드를 선택·하이라이트하고 화면 중앙으로 이동합니다. 현재 그래프에 없으면 false.
+     */
+    function focusNode(nodeId) {
+        if (!_network || !_allNodes.get(nodeId)) return false;
+        _network.selectNodes([nodeId]);
+        _highlightConnections(nodeId);
+        const focus = () => _network.focus(nodeId, { scale: 1.2, animation: { duration: 500 } });
+        focus();
+        // 레이아웃이 아직 자리 잡는 중이면 안정화 후 다시 이동
+        _network.once('stabilizationIterationsDone', focus);
+        return true;
+    }
+
+    return { render, focusNode };
 })();
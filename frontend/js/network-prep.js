@@ -0,0 +1,72 @@
+/**
+ * network-prep.js — 네트워크 응답을 Vis.js DataSet 입력 형식으로 변환 (순수 함수)
+ *
+ * ★ 메인 페이지(<script>)와 network-worker.js(importScripts)가 같은 코드를 씁니다.
+ *   큰 그래프는 워커에서 변환하고, 워커를 쓸 수 없는 환경에서는 메인 스레드에서 변환합니다.
+ *
+ * 변환 결과는 원래 응답과 같은 객체에 nodes/edges만 Vis.js 옵션 객체로 바꾸고 prepared: true를 붙입니다.
+ * 엣지는 (평가자, 피평가자) 쌍마다 하나이고 value = 평가 건수(여러 연도 합)입니다. 선 두께를 건수로 정합니다.
+ */
+const NetworkPrep = (() => {
+
+    function prepare(data) {
+        if (!data || data.prepared || !Array.isArray(data.nodes)) return data;
+
+        // --- 1. Degree(연결수) 계산 — 평가 건수 기준 ---
+        const degreeMap = {};
+        data.edges.forEach(e => {
+            const count = e.value || 1;
+            degreeMap[e.from] = (degreeMap[e.from] || 0) + count;
+            degreeMap[e.to] = (degreeMap[e.to] || 0) + count;
+        });
+
+        // --- 2. Vis.js 노드/엣지 옵션 ---
+        const nodes = data.nodes.map(n => {
+            const deg = degreeMap[n.id] || 1;
+            const size = n.isGhost ? 8 : (10 + Math.sqrt(deg) * 3); // Degree 비례 크기
+
+            const node = {
+                id: n.id,
+                label: n.label,
+                title: n.title,
+                size: size,
+                isGhost: !!n.isGhost,
+                color: n.isGhost ? {
+                    background: 'rgba(230,230,230,0.5)',
+                    border: 'rgba(150,150,150,0.5)',
+                    highlight: { background: '#eee', border: '#999' }
+                } : {
+                    background: n.color,
+                    border: n.color,
+                    highlight: { background: n.color, border: '#333' }
+                },
+                font: {
+                    size: 11,
+                    color: n.isGhost ? '#999' : '#333',
+                    strokeWidth: 2,
+                    strokeColor: '#ffffff'
+                }
+            };
+            if (n.isGhost) {
+                node.borderDashes = [4, 4];
+                node.opacity = 0.6;
+            }
+            return node;
+        });
+
+        const edges = data.edges.map(e => ({
+            from: e.from,
+            to: e.to,
+            title: e.title,
+            dashes: e.dashes || false,
+            width: 1 + Math.log2(e.value || 1), // 여러 연도 반복 쌍은 굵게
+            color: { color: e.dashes ? '#ccc' : '#bbb', opacity: 0.6, highlight: '#002D80' },
+            arrows: { to: { enabled: true, scaleFactor: 0.4 } }, // 화살표 크기 축소
+            smooth: { type: 'curvedCW', roundness: 0.1 } // 곡선 엣지
+        }));
+
+        return { ...data, nodes, edges, prepared: true };
+    }
+
+    return { prepare };
+})();
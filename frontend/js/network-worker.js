@@ -0,0 +1,51 @@
+/**
+ * network-worker.js — 큰 네트워크 응답의 수신·JSON 파싱·Vis.js 입력 변환을 메인 스레드 밖에서 처리
+ *
+ * 메시지 (api.js가 보냄):
+ *   { id, type: 'fetch', url, init }   → 요청 후 파싱 + 변환
+ *   { id, type: 'prepare', payload }   → 이미 받은 응답을 변환 (백그라운드 잡 결과 등)
+ * 응답:
+ *   { id, ok: true, result, bytes }
+ *   { id, ok: false, status, contentType, detail, retryAfter }   (status 0 = 네트워크 오류, retryAfter = 503의 Retry-After)
+ */
+importScripts('network-prep.js');
+
+async function _fetchAndPrepare(url, init) {
+    let res;
+    try {
+        res = await fetch(url, init);
+    } catch (err) {
+        return { ok: false, status: 0, contentType: '', detail: err.message };
+    }
+    const contentType = res.headers.get('Content-Type') || '';
+    const bytes = new Uint8Array(await res.arrayBuffer());
+    if (!res.ok) {
+        let detail = `HTTP ${res.status}`;
+        try {
+            detail = JSON.parse(new TextDecoder().decode(bytes)).detail || detail;
+        } catch (e) { /* JSON이 아닌 오류 응답 */ }
+        return { ok: false, status: res.status, contentType, detail, retryAfter: res.headers.get('Retry-After') };
+    }
+
+    // ★ 정적 번들의 .gz 파일은 Content-Encoding 없이 오므로 직접 압축 해제
+    let text;
+    if (bytes[0] === 0x1f && bytes[1] === 0x8b) {
+        const stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream('gzip'));
+        text = await new Response(stream).text();
+    } else {
+        text = new TextDecoder().decode(bytes);
+    }
+    return { ok: true, result: NetworkPrep.prepare(JSON.parse(text)), bytes: text.length };
+}
+
+self.onmessage = async (event) => {
+    const { id, type } = event.data;
+    try {
+        const reply = type === 'fetch'
+            ? await _fetchAndPrepare(event.data.url, event.data.init)
+            : { ok: true, result: NetworkPrep.prepare(event.data.payload) };
+        self.postMessage({ id, ...reply });
+    } catch (err) {
+        self.postMessage({ id, ok: false, status: -1, contentType: '', detail: err.message });
+    }
+};